@@ -0,0 +1,67 @@
+import argparse
+import pathlib
+import sys
+import time
+
+from src.tile_detection.batch import common_root, discover_images, open_sink, run_batch
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Detect tiles in many images and stream results to JSONL or Parquet."
+    )
+    parser.add_argument("inputs", nargs="+", help="Image files, directories or glob patterns")
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=pathlib.Path,
+        required=True,
+        help="Result file (.jsonl) or Parquet directory",
+    )
+    parser.add_argument("--format", choices=["jsonl", "parquet"], help="Defaults to the output suffix")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Worker processes")
+    parser.add_argument("--model", type=pathlib.Path, help="Model weights (defaults to best.pt)")
+    parser.add_argument("--annotate-dir", type=pathlib.Path, help="Also write annotated images here")
+    parser.add_argument("--no-resume", action="store_true", help="Reprocess images already in the output")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    paths = discover_images(args.inputs)
+    if not paths:
+        print("Error: No images found")
+        sys.exit(1)
+    # Taken before resume filtering so annotated paths don't move between runs
+    root = common_root(paths)
+
+    sink = open_sink(args.output, args.format)
+    if not args.no_resume:
+        done = sink.completed()
+        paths = [p for p in paths if str(p) not in done]
+        if done:
+            print(f"Resuming: {len(done)} images already processed")
+
+    print(f"Processing {len(paths)} images with {args.workers} worker(s)")
+
+    start = time.perf_counter()
+    processed = 0
+    with sink:
+        for record in run_batch(paths, args.model, args.workers, args.annotate_dir, root):
+            sink.write(record)
+            processed += 1
+            if record["error"]:
+                print(f"  {record['path']}: {record['error']}")
+            if processed % 100 == 0:
+                elapsed = time.perf_counter() - start
+                print(f"  {processed}/{len(paths)} ({processed / elapsed:.1f} images/s)")
+
+    elapsed = time.perf_counter() - start
+    if processed:
+        print(f"\nDone: {processed} images in {elapsed:.1f}s ({processed / elapsed:.1f} images/s)")
+    print(f"Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Load test of the adaptive inference resolution against a fixed 640px input.
+
+Clients upload photos at a steady rate, in phases of light load, a burst
+above what the model can serve at 640 and light load again. Every request
+goes through the same path as the API, pending on the controller, waiting
+for the model lock and detecting at the chosen `imgsz`. Inference is stood
+in for by a sleep that grows with imgsz ** 2, or run on a real model with
+`--model`. Reports latency percentiles per phase and the sizes chosen.
+
+    python -m benchmarks.bench_adaptive_resolution
+    python -m benchmarks.bench_adaptive_resolution --model yolov8n.yaml --rates 2 12 2
+"""
+
+import argparse
+import asyncio
+import pathlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.tile_detection.detection import detect_tiles, load_model
+from src.tile_detection.resolution import DEFAULT_IMGSZ, DEFAULT_TARGET_SECONDS, ResolutionController
+
+
+def percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(p * len(ordered)), len(ordered) - 1)]
+
+
+def run(controller: ResolutionController | None, infer, args: argparse.Namespace) -> list[list[float]]:
+    """Latencies per phase; `controller` None detects everything at DEFAULT_IMGSZ."""
+    model_lock = threading.Lock()
+    image = np.zeros((args.height, args.width, 3), dtype=np.uint8)
+
+    def detect() -> None:
+        if controller is None:
+            with model_lock:
+                infer(image, DEFAULT_IMGSZ)
+            return
+        with controller.pending(), model_lock:
+            imgsz = controller.choose(image.shape)
+            with controller.timed(imgsz):
+                infer(image, imgsz)
+
+    async def phases() -> list[list[float]]:
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=256)
+        latencies: list[list[float]] = [[] for _ in args.rates]
+
+        async def request(phase: int) -> None:
+            start = time.perf_counter()
+            await loop.run_in_executor(executor, detect)
+            latencies[phase].append(time.perf_counter() - start)
+
+        tasks = []
+        for phase, rate in enumerate(args.rates):
+            for _ in range(int(rate * args.phase_seconds)):
+                tasks.append(asyncio.create_task(request(phase)))
+                await asyncio.sleep(1 / rate)
+        await asyncio.gather(*tasks)
+        executor.shutdown()
+        return latencies
+
+    return asyncio.run(phases())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rates", type=float, nargs="+", default=[5, 15, 5], help="Requests/s per phase")
+    parser.add_argument("--phase-seconds", type=float, default=4.0)
+    parser.add_argument("--inference-ms", type=float, default=100, help="Simulated latency at 640px")
+    parser.add_argument("--model", type=pathlib.Path, help="Run a real detection model instead")
+    parser.add_argument("--target", type=float, default=DEFAULT_TARGET_SECONDS, help="Controller latency target")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=960)
+    args = parser.parse_args()
+
+    if args.model is not None:
+        model = load_model(args.model)
+
+        def infer(image: np.ndarray, imgsz: int) -> None:
+            detect_tiles(model, image, imgsz=imgsz)
+
+        for imgsz in (416, 480, 640):
+            infer(np.zeros((args.height, args.width, 3), dtype=np.uint8), imgsz)  # warm up each size
+    else:
+
+        def infer(image: np.ndarray, imgsz: int) -> None:
+            time.sleep(args.inference_ms / 1000 * (imgsz / DEFAULT_IMGSZ) ** 2)
+
+    controller = ResolutionController(args.target)
+    results = {"fixed 640": run(None, infer, args), "adaptive": run(controller, infer, args)}
+
+    print(f"Phases: {' -> '.join(f'{rate:g}/s' for rate in args.rates)} for {args.phase_seconds:g}s each")
+    print(f"{'mode':<10} {'phase':>5} {'rate':>6} {'p50':>8} {'p95':>8} {'max':>8}")
+    for mode, latencies in results.items():
+        for phase, (rate, values) in enumerate(zip(args.rates, latencies)):
+            print(
+                f"{mode:<10} {phase:5} {rate:5g}/s {percentile(values, 0.5) * 1000:6.0f}ms "
+                f"{percentile(values, 0.95) * 1000:6.0f}ms {max(values) * 1000:6.0f}ms"
+            )
+    stats = controller.stats
+    chosen = ", ".join(f"{imgsz}: {count}" for imgsz, count in sorted(stats.chosen.items()))
+    print(f"adaptive imgsz chosen: {chosen}; max pending {stats.max_pending}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Compare the fast/full model cascade with the full model alone.
+
+Runs every image through the full model and through the cascade, and
+reports the escalation rate, latency per image and how often the cascade's
+tiles match the full model's (same codes in reading order).
+
+    python -m benchmarks.bench_cascade --fast ../model/runs/distill/weights/best.pt
+    python -m benchmarks.bench_cascade --fast fast.pt --model best.pt --images ../test-images
+"""
+
+import argparse
+import pathlib
+import time
+
+import cv2
+
+from src.tile_detection.cascade import DEFAULT_CONFIDENCE_THRESHOLD, CascadeModel
+from src.tile_detection.detection import detect_tiles, load_model
+
+TEST_IMAGES = pathlib.Path(__file__).resolve().parents[2] / "test-images"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fast", type=pathlib.Path, required=True, help="Fast model weights")
+    parser.add_argument("--model", type=pathlib.Path, help="Full model (default: MODEL_PATH or best.pt)")
+    parser.add_argument("--images", type=pathlib.Path, default=TEST_IMAGES)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_CONFIDENCE_THRESHOLD)
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the images")
+    args = parser.parse_args()
+
+    cascade = load_model(args.model, args.fast)
+    assert isinstance(cascade, CascadeModel)
+    cascade.confidence_threshold = args.threshold
+    full = cascade.full
+
+    paths = sorted(p for p in args.images.iterdir() if p.suffix.lower() in {".jpg", ".jpeg", ".png", ".webp"})
+    images = [image for image in (cv2.imread(str(p)) for p in paths) if image is not None]
+    # Warm both models up so the first image doesn't pay for lazy initialization
+    detect_tiles(cascade.fast, images[0])
+    detect_tiles(full, images[0])
+
+    full_seconds = cascade_seconds = 0.0
+    agree = 0
+    for _ in range(args.repeat):
+        for image in images:
+            start = time.perf_counter()
+            expected = detect_tiles(full, image)
+            full_seconds += time.perf_counter() - start
+
+            start = time.perf_counter()
+            tiles = detect_tiles(cascade, image)
+            cascade_seconds += time.perf_counter() - start
+
+            agree += [t.code for t in tiles] == [t.code for t in expected]
+
+    runs = len(images) * args.repeat
+    stats = cascade.stats
+    print(f"Images: {len(images)} x {args.repeat}, confidence threshold {args.threshold}")
+    print(f"full model   {full_seconds / runs * 1000:7.1f} ms/image")
+    print(f"cascade      {cascade_seconds / runs * 1000:7.1f} ms/image")
+    print(f"escalated    {stats.escalation_rate:7.1%}")
+    print(f"saved        {(full_seconds - cascade_seconds) / runs * 1000:7.1f} ms/image (measured)")
+    if stats.saved_seconds is not None:
+        print(f"             {stats.saved_seconds / stats.images * 1000:7.1f} ms/image (as /api/stats reports it)")
+    print(f"agreement    {agree / runs:7.1%} of images read the same as the full model")
+
+
+if __name__ == "__main__":
+    main()
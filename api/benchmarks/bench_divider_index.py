@@ -0,0 +1,96 @@
+"""Compare the precomputed divider index with mahjong's HandDivider.
+
+Checks that both produce identical decompositions for every hand in a
+generated corpus (random standard hands, with and without open melds, plus
+all-pairs hands) and reports the speedup.
+
+    python -m benchmarks.bench_divider_index --hands 20000
+"""
+
+import argparse
+import random
+import time
+
+from mahjong.hand_calculating.divider import HandDivider
+from mahjong.meld import Meld
+
+from src.hand_calculation.divider_index import IndexedHandDivider, load_index
+
+SETS = [[s + i, s + i + 1, s + i + 2] for s in (0, 9, 18) for i in range(7)] + [[t] * 3 for t in range(34)]
+
+
+def _meld(block: list[int]) -> Meld:
+    meld_type = Meld.PON if block[0] == block[1] else Meld.CHI
+    return Meld(meld_type=meld_type, tiles=[t * 4 for t in block], opened=True)
+
+
+def random_hand(rng: random.Random) -> tuple[list[int], list[Meld]]:
+    while True:
+        counts = [0] * 34
+        pair = rng.randrange(34)
+        counts[pair] += 2
+        blocks = [rng.choice(SETS) for _ in range(4)]
+        for block in blocks:
+            for tile in block:
+                counts[tile] += 1
+        if max(counts) <= 4:
+            break
+
+    melds = [_meld(block) for block in blocks[: rng.choice([0, 0, 0, 1, 2])]]
+    return counts, melds
+
+
+def seven_pairs(rng: random.Random) -> tuple[list[int], list[Meld]]:
+    counts = [0] * 34
+    for tile in rng.sample(range(34), 7):
+        counts[tile] = 2
+    return counts, []
+
+
+def build_corpus(size: int, seed: int) -> list[tuple[list[int], list[Meld]]]:
+    rng = random.Random(seed)
+    corpus = [random_hand(rng) for _ in range(size)]
+    corpus += [seven_pairs(rng) for _ in range(size // 20)]
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hands", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    index = load_index()
+    if index is None:
+        raise SystemExit("Index not built; run: python -m src.hand_calculation.divider_index")
+
+    corpus = build_corpus(args.hands, args.seed)
+    library = HandDivider()
+    indexed = IndexedHandDivider(index)
+
+    start = time.perf_counter()
+    expected = [library.divide_hand(counts, melds) for counts, melds in corpus]
+    library_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [indexed.divide_hand(counts, melds) for counts, melds in corpus]
+    indexed_seconds = time.perf_counter() - start
+
+    mismatches = [i for i, (a, b) in enumerate(zip(expected, actual)) if a != b]
+    for i in mismatches[:5]:
+        counts, melds = corpus[i]
+        print(f"MISMATCH {counts} melds={[m.tiles_34 for m in melds]}")
+        print(f"  library: {expected[i]}")
+        print(f"  indexed: {actual[i]}")
+
+    n = len(corpus)
+    print(f"Hands:    {n} ({len(mismatches)} mismatches)")
+    print(f"Library:  {library_seconds / n * 1e6:8.1f} us/hand")
+    print(f"Indexed:  {indexed_seconds / n * 1e6:8.1f} us/hand")
+    print(f"Speedup:  {library_seconds / indexed_seconds:8.1f}x")
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Throughput of game log ingestion: parsing alone, then parsing and scoring.
+
+Writes `--games` synthetic gzipped mjlog files with `--wins` random
+riichi wins each. Times reading them back with `iter_wins` on one core,
+then `score_logs` (parse, score and write Parquet) at each worker count.
+Reports wins per second.
+
+    python -m benchmarks.bench_log_scoring --games 2000 --workers 1 2 4
+"""
+
+import argparse
+import gzip
+import pathlib
+import random
+import tempfile
+import time
+
+from src.game_logs import ParseStats, discover_logs, iter_wins, score_logs
+
+
+def random_hand(rng: random.Random) -> tuple[list[int], int]:
+    """A closed 14-tile hand in 136 format (four sets and a pair) and its winning tile."""
+    counts = [0] * 34
+    groups: list[list[int]] = []
+    while len(groups) < 4:
+        if rng.random() < 0.7:
+            suit, start = rng.randrange(3), rng.randrange(7)
+            group = [suit * 9 + start + i for i in range(3)]
+        else:
+            group = [rng.randrange(34)] * 3
+        if all(counts[t] + group.count(t) <= 4 for t in group):
+            for t in group:
+                counts[t] += 1
+            groups.append(group)
+    pair = rng.choice([t for t in range(34) if counts[t] <= 2])
+    counts[pair] += 2
+    tiles = [t for group in groups for t in group] + [pair, pair]
+    used = [0] * 34
+    hand = []
+    for t in tiles:
+        hand.append(t * 4 + used[t])
+        used[t] += 1
+    return hand, rng.choice(hand)
+
+
+def write_logs(directory: pathlib.Path, games: int, wins: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    for game in range(games):
+        elements = ['<mjloggm ver="2.3"><GO type="169" lobby="0"/>']
+        for round_index in range(wins):
+            hand, machi = random_hand(rng)
+            winner, loser = rng.randrange(4), rng.randrange(4)
+            elements.append(f'<INIT seed="{round_index},0,0,0,0,{rng.randrange(136)}" oya="{round_index % 4}"/>')
+            elements.append(f'<REACH who="{winner}" step="2"/>')
+            elements.append(
+                f'<AGARI ba="0,0" hai="{",".join(map(str, sorted(hand)))}" machi="{machi}" ten="30,1000,0" '
+                f'yaku="1,1" doraHai="{rng.randrange(136)}" who="{winner}" fromWho="{loser}"/>'
+            )
+        elements.append("</mjloggm>")
+        with gzip.open(directory / f"{game:06d}.mjlog.gz", "wt") as f:
+            f.write("".join(elements))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--wins", type=int, default=10, help="Wins per game")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = pathlib.Path(tmp)
+        log_dir = tmp_path / "logs"
+        log_dir.mkdir()
+        write_logs(log_dir, args.games, args.wins)
+        paths = discover_logs([str(log_dir)])
+
+        start = time.perf_counter()
+        stats = ParseStats()
+        wins = sum(1 for _ in iter_wins(paths, stats))
+        elapsed = time.perf_counter() - start
+        print(f"{args.games} games, {wins} wins ({sum(stats.skipped.values())} skipped)")
+        print(f"{'parse only':<12} {wins / elapsed:10.0f} wins/s")
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            scored = sum(task.scoring.scored for task in score_logs(paths, tmp_path / f"out-{workers}", workers))
+            elapsed = time.perf_counter() - start
+            print(f"{f'{workers} worker(s)':<12} {scored / elapsed:10.0f} wins/s")
+
+
+if __name__ == "__main__":
+    main()
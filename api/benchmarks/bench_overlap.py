@@ -0,0 +1,75 @@
+"""Time class-agnostic overlap suppression on a synthetic full-table image.
+
+Lays out rows of tiles (hands, discards, melds), duplicates a share of them
+with a jittered box of another class, and compares the sort-and-sweep pair
+search against comparing all pairs.
+
+    python -m benchmarks.bench_overlap --tiles 400
+"""
+
+import argparse
+import itertools
+import random
+import time
+
+from src.tile import DetectedTile
+from src.tile_detection.overlap import iou, overlapping_pairs, suppress_overlaps
+
+CODES = [f"{n}{suit}" for suit in "mps" for n in range(1, 10)] + [f"{n}z" for n in range(1, 8)]
+TILE_W, TILE_H = 40, 56
+
+
+def table_tiles(count: int, duplicate_rate: float, rng: random.Random) -> tuple[list[DetectedTile], int]:
+    tiles = []
+    duplicates = 0
+    per_row = 24
+    for i in range(count):
+        row, col = divmod(i, per_row)
+        x, y = 20 + col * (TILE_W + 2), 20 + row * (TILE_H + 30)
+        tiles.append(DetectedTile(rng.choice(CODES), rng.uniform(0.5, 1.0), (x, y, x + TILE_W, y + TILE_H)))
+        if rng.random() < duplicate_rate:
+            dx, dy = rng.randint(-3, 3), rng.randint(-3, 3)
+            bbox = (x + dx, y + dy, x + TILE_W + dx, y + TILE_H + dy)
+            tiles.append(DetectedTile(rng.choice(CODES), rng.uniform(0.3, 0.9), bbox))
+            duplicates += 1
+    rng.shuffle(tiles)
+    return tiles, duplicates
+
+
+def all_pairs(boxes, threshold):
+    return [(i, j) for i, j in itertools.combinations(range(len(boxes)), 2) if iou(boxes[i], boxes[j]) > threshold]
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tiles", type=int, default=400, help="Physical tiles on the table")
+    parser.add_argument("--duplicates", type=float, default=0.1, help="Share of tiles detected twice")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    tiles, duplicates = table_tiles(args.tiles, args.duplicates, random.Random(args.seed))
+    boxes = [t.bbox for t in tiles]
+
+    assert sorted(overlapping_pairs(boxes)) == all_pairs(boxes, 0.5)
+    kept = suppress_overlaps(tiles)
+
+    sweep = _time(lambda: overlapping_pairs(boxes), args.repeat)
+    brute = _time(lambda: all_pairs(boxes, 0.5), max(1, args.repeat // 10))
+    full = _time(lambda: suppress_overlaps(tiles), args.repeat)
+
+    print(f"Boxes:             {len(tiles)} ({duplicates} duplicates, {len(tiles) - len(kept)} suppressed)")
+    print(f"All-pairs search:  {brute * 1000:.2f} ms")
+    print(f"Sweep search:      {sweep * 1000:.2f} ms ({brute / sweep:.1f}x)")
+    print(f"suppress_overlaps: {full * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
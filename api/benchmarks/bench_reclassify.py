@@ -0,0 +1,110 @@
+"""Benchmark the crop re-classifier: batching cost and detection accuracy.
+
+Times classifying N tile crops in one batched call against one call per
+crop. With `--data`, also runs the detector over a labeled YOLO split with
+and without the re-classifier and compares precision, recall, exact hands
+and the stage's latency against its budget.
+
+    python -m benchmarks.bench_reclassify --classifier crops.pt
+    python -m benchmarks.bench_reclassify --classifier crops.pt --data path/to/data.yaml
+"""
+
+import argparse
+import pathlib
+import statistics
+import time
+from functools import partial
+
+import cv2
+import numpy as np
+from ultralytics import YOLO
+
+from src.tile_detection.detection import load_model, postprocess_tiles, predict_tiles
+from src.tile_detection.evaluation import ClassMetrics, load_dataset, match_tiles, read_labels
+from src.tile_detection.reclassify import CLASSIFIER_IMGSZ, DEFAULT_BUDGET_SECONDS, CropReclassifier
+
+
+def batching(classifier: YOLO, repeat: int) -> None:
+    rng = np.random.default_rng(0)
+    print(f"{'crops':>5} {'batched':>9} {'one by one':>11}")
+    for count in (1, 4, 8, 16):
+        shapes = [(int(rng.integers(50, 90)), int(rng.integers(35, 65)), 3) for _ in range(count)]
+        crops = [rng.integers(0, 255, shape, dtype=np.uint8) for shape in shapes]
+        classifier(crops, imgsz=CLASSIFIER_IMGSZ, verbose=False)
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            classifier(crops, imgsz=CLASSIFIER_IMGSZ, verbose=False)
+        batched = (time.perf_counter() - start) / repeat
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for crop in crops:
+                classifier([crop], imgsz=CLASSIFIER_IMGSZ, verbose=False)
+        single = (time.perf_counter() - start) / repeat
+
+        print(f"{count:5} {batched * 1000:7.1f}ms {single * 1000:9.1f}ms")
+
+
+def accuracy(classifier: YOLO, args: argparse.Namespace) -> None:
+    images, names = load_dataset(args.data, args.split)
+    model = load_model(args.model)
+    reclassifier = CropReclassifier(classifier, args.threshold, args.budget)
+    reclassifier.warm_up()
+
+    totals = {"detector": {}, "re-classified": {}}
+    exact = {"detector": 0, "re-classified": 0}
+    stage_ms = []
+    for labeled in images:
+        image = cv2.imread(str(labeled.image_path))
+        if image is None:
+            continue
+        height, width = image.shape[:2]
+        truth = read_labels(labeled.label_path, names, width, height)
+        raw = predict_tiles(model, image)
+
+        start = time.perf_counter()
+        refined = postprocess_tiles(raw, partial(reclassifier.refine, image))
+        stage_ms.append((time.perf_counter() - start) * 1000)
+
+        for name, tiles in (("detector", postprocess_tiles(raw)), ("re-classified", refined)):
+            match_tiles(tiles, truth, totals[name])
+            exact[name] += sorted(t.code for t in tiles) == sorted(t.code for t in truth)
+
+    print(f"\nDataset: {len(images)} images from {args.data} ({args.split}), threshold {args.threshold}")
+    print(f"{'pipeline':<14} {'precision':>9} {'recall':>7} {'exact':>6}")
+    for name, per_class in totals.items():
+        metrics = ClassMetrics(
+            true_positives=sum(m.true_positives for m in per_class.values()),
+            false_positives=sum(m.false_positives for m in per_class.values()),
+            false_negatives=sum(m.false_negatives for m in per_class.values()),
+        )
+        print(f"{name:<14} {metrics.precision:9.1%} {metrics.recall:7.1%} {exact[name] / len(images):6.1%}")
+
+    stats = reclassifier.stats
+    print(
+        f"stage: median {statistics.median(stage_ms):.1f} ms, max {max(stage_ms):.1f} ms "
+        f"(budget {args.budget * 1000:.0f} ms for the classifier), "
+        f"{stats.crops} crops, {stats.changed} codes changed, {stats.over_budget} left over budget"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--classifier", default="yolov8n-cls.yaml", help="Classifier weights (untrained by default)")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--data", type=pathlib.Path, help="YOLO data.yaml to compare detection accuracy on")
+    parser.add_argument("--split", default="val")
+    parser.add_argument("--model", type=pathlib.Path, help="Detector weights (default: MODEL_PATH or best.pt)")
+    parser.add_argument("--threshold", type=float, default=0.6)
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_SECONDS, help="Seconds per image")
+    args = parser.parse_args()
+
+    classifier = YOLO(args.classifier)
+    batching(classifier, args.repeat)
+    if args.data is not None:
+        accuracy(classifier, args)
+
+
+if __name__ == "__main__":
+    main()
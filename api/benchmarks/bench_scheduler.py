@@ -0,0 +1,94 @@
+"""Latency of table clients while one client floods the detection model.
+
+One client uploads `--flood` photos at once while three others send a
+photo every `--interval-ms`. Inference is stood in for by a sleep. The
+model is shared first through a plain lock, which serves waiters in
+roughly arrival order, then through the scheduler with the flood sent as
+interactive traffic from one client (fair queuing alone) and as bulk
+(priority as well). Reports the other clients' latency and the flood's
+completion time.
+
+    python -m benchmarks.bench_scheduler --flood 100
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from contextlib import AbstractContextManager
+
+from src.tile_detection.scheduler import InferenceScheduler
+
+
+def percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(p * len(ordered)), len(ordered) - 1)]
+
+
+def run(slot, args: argparse.Namespace) -> tuple[list[float], float]:
+    """Latencies of the table clients and the flood's total time; `slot(client)` guards the model."""
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def detect(client: str) -> float:
+        start = time.perf_counter()
+        with slot(client):
+            time.sleep(args.inference_ms / 1000)
+        return time.perf_counter() - start
+
+    def table_client(name: str) -> None:
+        for _ in range(args.requests):
+            latency = detect(name)
+            with lock:
+                latencies.append(latency)
+            time.sleep(args.interval_ms / 1000)
+
+    flood_start = time.perf_counter()
+    flood = [threading.Thread(target=detect, args=("uploader",)) for _ in range(args.flood)]
+    for thread in flood:
+        thread.start()
+    time.sleep(0.01)  # the flood is queued first
+    tables = [threading.Thread(target=table_client, args=(f"table-{i}",)) for i in range(3)]
+    for thread in tables:
+        thread.start()
+    for thread in flood:
+        thread.join()
+    flood_seconds = time.perf_counter() - flood_start
+    for thread in tables:
+        thread.join()
+    return latencies, flood_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flood", type=int, default=100, help="Photos the uploader sends at once")
+    parser.add_argument("--requests", type=int, default=10, help="Photos per table client")
+    parser.add_argument("--interval-ms", type=float, default=200)
+    parser.add_argument("--inference-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    model_lock = threading.Lock()
+    fair = InferenceScheduler()
+    prioritized = InferenceScheduler()
+
+    def locked(client: str) -> AbstractContextManager:
+        return model_lock
+
+    def fair_slot(client: str) -> AbstractContextManager:
+        return fair.slot(client)
+
+    def priority_slot(client: str) -> AbstractContextManager:
+        return prioritized.slot(client, "bulk" if client == "uploader" else "interactive")
+
+    print(f"Flood of {args.flood} photos, 3 table clients x {args.requests}, {args.inference_ms:g} ms inference")
+    print(f"{'model access':<22} {'p50':>8} {'p95':>8} {'max':>8} {'flood done':>11}")
+    for name, slot in (("lock", locked), ("scheduler, fair", fair_slot), ("scheduler, bulk", priority_slot)):
+        latencies, flood_seconds = run(slot, args)
+        print(
+            f"{name:<22} {statistics.median(latencies) * 1000:6.0f}ms {percentile(latencies, 0.95) * 1000:6.0f}ms "
+            f"{max(latencies) * 1000:6.0f}ms {flood_seconds:10.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Tail latency of detection requests while hands are scored inline or in the scoring pool.
+
+One event loop serves a steady stream of detection requests, with inference
+stood in for by a sleep off the loop like torch releasing the GIL, while
+clients submit bursts of hand evaluations (a session album scored at once).
+Inline scoring runs each evaluation on the loop and holds up every detection
+that is ready to resume; the pool keeps the loop free. Reports detection
+latency percentiles and evaluation throughput for both.
+
+    python -m benchmarks.bench_scoring_pool --workers 2 --burst 200
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from src.hand_calculation.pool import ScoringPool
+from src.hand_calculation.schemas import HandEvaluationRequest
+
+HANDS = [
+    ["2m", "3m", "4m", "3p", "4p", "5p", "6s", "7s", "8s", "2p", "2p", "5m", "6m", "7m"],
+    ["1m", "1m", "1m", "2m", "3m", "4m", "5m", "5m", "6m", "7m", "8m", "9m", "9m", "9m"],
+    ["1m", "1m", "2m", "2m", "3m", "3m", "1p", "1p", "2p", "2p", "3p", "3p", "5s", "5s"],
+    ["1m", "1m", "1m", "2m", "2m", "2m", "3m", "3m", "3m", "4p", "4p", "4p", "5s", "5s"],
+]
+
+
+def request(tiles: list[str], rng: random.Random) -> HandEvaluationRequest:
+    return HandEvaluationRequest(
+        tiles=tiles,
+        win_tile_index=13,
+        is_tsumo=rng.random() < 0.5,
+        seat_wind=rng.choice(["east", "south", "west", "north"]),
+        round_wind="east",
+        is_riichi=True,
+        dora_count=rng.randint(0, 3),
+    )
+
+
+def percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(p * len(ordered)), len(ordered) - 1)]
+
+
+async def run(pool: ScoringPool, args: argparse.Namespace) -> tuple[list[float], int, float]:
+    rng = random.Random(args.seed)
+    detect_latencies: list[float] = []
+    evaluated = 0
+
+    async def detect():
+        start = time.perf_counter()
+        await asyncio.to_thread(time.sleep, args.inference_ms / 1000)
+        detect_latencies.append(time.perf_counter() - start)
+
+    async def evaluate():
+        nonlocal evaluated
+        await pool.evaluate(request(rng.choice(HANDS), rng))
+        evaluated += 1
+
+    async def detect_clients():
+        tasks = []
+        for _ in range(int(args.seconds * args.detect_rate)):
+            tasks.append(asyncio.create_task(detect()))
+            await asyncio.sleep(rng.expovariate(args.detect_rate))
+        await asyncio.gather(*tasks)
+
+    async def evaluate_clients():
+        tasks = []
+        deadline = time.perf_counter() + args.seconds
+        while time.perf_counter() < deadline:
+            tasks.extend(asyncio.create_task(evaluate()) for _ in range(args.burst))
+            await asyncio.sleep(args.burst_interval)
+        await asyncio.gather(*tasks)
+
+    start = time.perf_counter()
+    await asyncio.gather(detect_clients(), evaluate_clients())
+    return detect_latencies, evaluated, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--detect-rate", type=float, default=20.0, help="Detection requests per second")
+    parser.add_argument("--inference-ms", type=float, default=40.0)
+    parser.add_argument("--burst", type=int, default=200, help="Evaluations submitted together")
+    parser.add_argument("--burst-interval", type=float, default=0.5, help="Seconds between bursts")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        f"{args.detect_rate:.0f} detections/s ({args.inference_ms:.0f} ms inference), "
+        f"{args.burst} evaluations every {args.burst_interval}s, {args.seconds}s"
+    )
+    print(f"{'scoring':<10} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7} {'hands/s':>8}")
+    for name, workers in (("inline", 0), (f"pool x{args.workers}", args.workers)):
+        pool = ScoringPool(workers, timeout=30.0)
+        try:
+            latencies, evaluated, seconds = asyncio.run(run(pool, args))
+        finally:
+            pool.close()
+        ms = [latency * 1000 for latency in latencies]
+        print(
+            f"{name:<10} {statistics.median(ms):6.1f}ms {percentile(ms, 0.95):6.1f}ms "
+            f"{percentile(ms, 0.99):6.1f}ms {max(ms):6.1f}ms {evaluated / seconds:8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Throughput of the win odds simulator.
+
+Plays the same draw sequences through `simulate_batch` and through a
+Python loop over every draw, after timing a 1-shanten plan built with
+cold and then warm caches: waits per hand shape, and `tsumo_points`,
+where `evaluate_hand` runs.
+
+    python -m benchmarks.bench_simulation --simulations 20000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.simulation.schemas import SimulationRequest
+from src.simulation.simulator import NO_STATE, Plan, _waits, build_plan, simulate_batch, tsumo_points
+
+ONE_SHANTEN = ["1m", "2m", "3m", "4p", "5p", "6p", "7s", "8s", "2m", "3m", "6z", "1z", "1z"]
+
+
+def loop_simulate(plan: Plan, size: int, rng: np.random.Generator) -> tuple[int, int]:
+    """The same game as `simulate_batch`, one shuffle and one draw at a time."""
+    unseen = np.repeat(np.arange(34), plan.wall).tolist()
+    improve = plan.improve.tolist()
+    points = plan.points.tolist()
+    wins = total = 0
+    for _ in range(size):
+        rng.shuffle(unseen)
+        state = plan.initial_state
+        for tile in unseen[: plan.draws]:
+            if state == NO_STATE:
+                state = improve[tile]
+            elif points[state][tile]:
+                wins += 1
+                total += points[state][tile]
+                break
+    return wins, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--simulations", type=int, default=20000)
+    parser.add_argument("--draws", type=int, default=12)
+    args = parser.parse_args()
+
+    request = SimulationRequest(
+        tiles=ONE_SHANTEN, seat_wind="south", round_wind="east", is_riichi=True, draws=args.draws
+    )
+    tsumo_points.cache_clear()
+    _waits.cache_clear()
+    started = time.perf_counter()
+    plan = build_plan(request)
+    cold = time.perf_counter() - started
+    started = time.perf_counter()
+    build_plan(request)
+    warm = time.perf_counter() - started
+    print(f"{'plan, cold cache':<20} {cold * 1000:8.2f} ms")
+    print(f"{'plan, warm cache':<20} {warm * 1000:8.2f} ms  {tsumo_points.cache_info()}")
+
+    for name, simulate in (("vectorized", simulate_batch), ("per-draw loop", loop_simulate)):
+        started = time.perf_counter()
+        result = simulate(plan, args.simulations, np.random.default_rng(0))
+        seconds = time.perf_counter() - started
+        wins = result.wins.sum() if name == "vectorized" else result[0]
+        print(
+            f"{name:<20} {seconds * 1000:8.2f} ms  {args.simulations / seconds:10.0f} sims/s"
+            f"  win rate {wins / args.simulations:.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Cost of tile code validation on hand evaluation requests.
+
+Times `HandEvaluationRequest.model_validate` on a JSON-like payload with
+the tile checks and with them stripped off, then how long rejecting bad
+hands takes next to scoring a good one with `evaluate_hand`, which is the
+work a bad request used to reach before failing.
+
+    python -m benchmarks.bench_tile_validation --number 20000
+"""
+
+import argparse
+import timeit
+
+from pydantic import Field, ValidationError
+
+from src.hand_calculation.calculation import evaluate_hand
+from src.hand_calculation.schemas import HandEvaluationRequest, check_tiles
+
+HAND = ["1m", "2m", "3m", "4p", "0p", "6p", "7s", "8s", "9s", "2m", "3m", "4m", "1z", "1z"]
+PAYLOAD = {
+    "tiles": HAND,
+    "win_tile_index": 13,
+    "is_tsumo": False,
+    "seat_wind": "east",
+    "round_wind": "east",
+    "is_riichi": True,
+    "melds": [],
+    "dora_count": 1,
+}
+BAD_HANDS = {
+    "unknown code": HAND[:13] + ["8z"],
+    "fifth copy": ["1z"] * 5 + HAND[5:],
+    "second red five": ["0p"] + HAND[1:],
+}
+
+
+class UncheckedRequest(HandEvaluationRequest):
+    tiles: list[str] = Field(min_length=14, max_length=14)
+
+
+def per_call_us(statement, number: int) -> float:
+    return min(timeit.repeat(statement, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20000, help="Calls per timing")
+    args = parser.parse_args()
+
+    def reject(tiles: list[str]) -> None:
+        try:
+            HandEvaluationRequest.model_validate({**PAYLOAD, "tiles": tiles})
+        except ValidationError:
+            pass
+        else:
+            raise AssertionError("accepted a bad hand")
+
+    request = HandEvaluationRequest.model_validate(PAYLOAD)
+    evaluate_hand(request)
+    rows = [
+        ("check_tiles alone", per_call_us(lambda: check_tiles(HAND), args.number)),
+        ("validate, unchecked", per_call_us(lambda: UncheckedRequest.model_validate(PAYLOAD), args.number)),
+        ("validate, checked", per_call_us(lambda: HandEvaluationRequest.model_validate(PAYLOAD), args.number)),
+        *((f"reject {name}", per_call_us(lambda t=tiles: reject(t), args.number)) for name, tiles in BAD_HANDS.items()),
+        ("evaluate_hand", per_call_us(lambda: evaluate_hand(request), max(args.number // 20, 1))),
+    ]
+    for name, us in rows:
+        print(f"{name:<24} {us:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
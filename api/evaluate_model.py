@@ -0,0 +1,63 @@
+import argparse
+import os
+import pathlib
+import sys
+
+from src.tile_detection.evaluation import evaluate_model
+
+API_ROOT = pathlib.Path(__file__).parent
+DEFAULT_DATA = API_ROOT.parent / "model" / "data" / "data.yaml"
+DEFAULT_CACHE = API_ROOT / ".eval_cache"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Evaluate detect_tiles against a labeled YOLO dataset."
+    )
+    parser.add_argument("--data", type=pathlib.Path, default=DEFAULT_DATA, help="Dataset data.yaml")
+    parser.add_argument("--split", default="val", help="Dataset split to evaluate")
+    parser.add_argument("--model", type=pathlib.Path, help="Model weights (defaults to best.pt)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--iou", type=float, default=0.5, help="IoU threshold for a match")
+    parser.add_argument("--imgsz", type=int, help="Model input size (defaults to the model's)")
+    parser.add_argument("--cache-dir", type=pathlib.Path, default=DEFAULT_CACHE, help="Prediction cache")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-run inference")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if not args.data.exists():
+        print(f"Error: Dataset not found at {args.data}")
+        sys.exit(1)
+
+    report = evaluate_model(
+        args.data,
+        model_path=args.model,
+        split=args.split,
+        workers=args.workers,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        iou_threshold=args.iou,
+        imgsz=args.imgsz,
+    )
+
+    print(f"{'class':<6} {'precision':>9} {'recall':>7} {'tp':>5} {'fp':>5} {'fn':>5}")
+    for code in sorted(report.per_class):
+        m = report.per_class[code]
+        print(
+            f"{code:<6} {m.precision:>9.3f} {m.recall:>7.3f} "
+            f"{m.true_positives:>5} {m.false_positives:>5} {m.false_negatives:>5}"
+        )
+
+    print()
+    print(f"Images:            {report.images} ({report.cached_images} from cache)")
+    if report.unreadable:
+        print(f"Unreadable:        {report.unreadable} (skipped)")
+    print(f"Hand exact match:  {report.hand_exact_match_rate:.1%}")
+    print(f"Model throughput:  {report.images_per_second:.1f} images/s per worker")
+    print(f"Run throughput:    {report.wall_images_per_second:.1f} images/s ({report.wall_seconds:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import pathlib
+import sys
+
+from src.storage import DetectionStore, export_corrections, resolve_store_path
+
+API_ROOT = pathlib.Path(__file__).parent
+DEFAULT_DATA = API_ROOT.parent / "model" / "data" / "data.yaml"
+DEFAULT_OUTPUT = API_ROOT.parent / "model" / "data" / "corrections"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Export hand editor corrections as YOLO training data."
+    )
+    parser.add_argument("--store", type=pathlib.Path, help="SQLite store (defaults to STORE_PATH or api/data)")
+    parser.add_argument("--data", type=pathlib.Path, default=DEFAULT_DATA, help="Base dataset data.yaml")
+    parser.add_argument("-o", "--output", type=pathlib.Path, default=DEFAULT_OUTPUT, help="Output directory")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    store_path = resolve_store_path(args.store)
+    if not store_path.exists():
+        print(f"Error: Store not found at {store_path}")
+        sys.exit(1)
+    if not args.data.exists():
+        print(f"Error: Dataset not found at {args.data}")
+        sys.exit(1)
+
+    store = DetectionStore(store_path)
+    try:
+        count = export_corrections(store, args.data, args.output)
+    finally:
+        store.close()
+
+    print(f"Exported {count} corrected images to {args.output}")
+    print(f"Train with: python main.py --data {args.output / 'data.yaml'}")
+
+
+if __name__ == "__main__":
+    main()
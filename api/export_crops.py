@@ -0,0 +1,35 @@
+import argparse
+import pathlib
+import sys
+
+from src.storage import export_crop_dataset
+
+API_ROOT = pathlib.Path(__file__).parent
+DEFAULT_DATA = API_ROOT.parent / "model" / "data" / "data.yaml"
+DEFAULT_OUTPUT = API_ROOT.parent / "model" / "data" / "crops"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Export labeled tile crops as a classification dataset for the re-classifier."
+    )
+    parser.add_argument("--data", type=pathlib.Path, default=DEFAULT_DATA, help="Detection dataset data.yaml")
+    parser.add_argument("-o", "--output", type=pathlib.Path, default=DEFAULT_OUTPUT, help="Output directory")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if not args.data.exists():
+        print(f"Error: Dataset not found at {args.data}")
+        sys.exit(1)
+
+    count = export_crop_dataset(args.data, args.output)
+    print(f"Exported {count} crops to {args.output}")
+    print(f"Train with: yolo classify train data={args.output} model=yolov8n-cls.pt imgsz=64")
+    print("Serve with: CLASSIFIER_PATH=runs/classify/train/weights/best.pt")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,151 @@
+import hashlib
+import math
+import os
+import time
 from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import Annotated, BinaryIO, Literal
 
+import numpy as np
 import uvicorn
-from fastapi import APIRouter, FastAPI, HTTPException, UploadFile
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, FastAPI, Form, Header, HTTPException, Query, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
+from src.game_session import (
+    WINDS,
+    CreateSessionRequest,
+    LedgerEntry,
+    LedgerEntryResponse,
+    Session,
+    SessionDrawRequest,
+    SessionHandResponse,
+    SessionLedgerResponse,
+    SessionStateResponse,
+    SessionStore,
+    SessionWinRequest,
+)
+from src.hand_assembly import PhotoEvaluationResponse, Wind, assemble_hand
 from src.hand_calculation import (
     HandEvaluationRequest,
     HandEvaluationResponse,
-    evaluate_hand,
+    ScoringError,
+    ScoringPool,
+    resolve_scoring_workers,
+)
+from src.jobs import (
+    MAX_JOB_IMAGES,
+    EvaluationJobRequest,
+    JobItem,
+    JobResponse,
+    JobRunner,
+    JobState,
+    JobStore,
+    resolve_job_workers,
+    resolve_jobs_dir,
+    stream_results,
+)
+from src.simulation import (
+    ShantenTooHigh,
+    SimulationPool,
+    SimulationRequest,
+    SimulationResponse,
+    resolve_simulation_workers,
+)
+from src.storage import (
+    ActiveLearningExporter,
+    CorrectionRequest,
+    CorrectionResponse,
+    DetectionStore,
+    resolve_active_learning_dir,
+    resolve_image_budget,
+    resolve_store_path,
 )
+from src.single_flight import SingleFlight
+from src.thread_config import apply_thread_config, load_thread_config, resolve_thread_config_path
+from src.tile import DetectedTile
 from src.tile_detection import (
+    CascadeModel,
+    DeadlineExceeded,
     DetectedTileResponse,
+    InferenceScheduler,
+    ModelRegistry,
+    ModelStatusResponse,
+    ModelSwitcher,
+    Priority,
+    ResolutionController,
+    ServingModel,
+    ShadowEvaluator,
+    ShadowRequest,
+    TileAlternative,
     TileDetectionResponse,
+    TileLayoutResponse,
+    analyze_layout,
     decode_image,
     detect_tiles,
     load_model,
+    load_reclassifier,
+    load_serving_model,
+    resolve_classifier_path,
+    resolve_fast_model_path,
+    resolve_latency_target,
+    resolve_registry_dir,
+    warm_up,
 )
 
+# Allowed upload types and the suffix their images are stored under
 ALLOWED_CONTENT_TYPES = {
-    "image/jpeg",
-    "image/png",
-    "image/webp",
-    "image/bmp",
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/bmp": ".bmp",
 }
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    app.state.model = load_model()
+    # Thread counts from tune_threads.py, set before the model spins up its thread pools
+    apply_thread_config(load_thread_config(resolve_thread_config_path()))
+    fast_model_path = resolve_fast_model_path()
+    registry = ModelRegistry(resolve_registry_dir())
+    app.state.models = ModelSwitcher(
+        registry,
+        load_serving_model(registry, fast_model_path),
+        load=lambda path: load_model(path, fast_model_path),
+    )
+    app.state.shadow = None
+    app.state.reclassifier = load_reclassifier(resolve_classifier_path())
+    app.state.scheduler = InferenceScheduler()
+    app.state.resolution = ResolutionController(resolve_latency_target())
+    app.state.detect_flight = SingleFlight()
+    app.state.evaluate_flight = SingleFlight()
+    app.state.scoring = ScoringPool(resolve_scoring_workers())
+    app.state.simulation = SimulationPool(resolve_simulation_workers())
+    app.state.sessions = SessionStore()
+    app.state.store = DetectionStore(resolve_store_path(), image_budget_bytes=resolve_image_budget())
+    names = app.state.models.current.model.names
+    app.state.active_learning = ActiveLearningExporter(
+        resolve_active_learning_dir(), [names[i] for i in sorted(names)]
+    )
+    app.state.jobs = JobRunner(
+        JobStore(resolve_jobs_dir()),
+        {"detect": _detect_job_item, "evaluate": _evaluate_job_item},
+        workers=resolve_job_workers(),
+        # Detection items wait while interactive requests are queued for the model
+        busy=lambda kind: kind == "detect" and app.state.scheduler.waiting("interactive") > 0,
+    )
+    app.state.jobs.start()
     yield
+    await app.state.jobs.close()
+    app.state.jobs.store.close()
+    if app.state.shadow is not None:
+        app.state.shadow.close()
+    app.state.active_learning.close()
+    app.state.store.close()
+    app.state.scoring.close()
+    app.state.simulation.close()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -38,8 +153,8 @@ app = FastAPI(lifespan=lifespan)
 # API router with /api prefix
 api_router = APIRouter(prefix="/api")
 
-@api_router.post("/detect", response_model=TileDetectionResponse)
-async def detect(file: UploadFile) -> TileDetectionResponse:
+async def _read_image(file: UploadFile):
+    """Returns the raw upload bytes and the decoded image."""
     if file.content_type not in ALLOWED_CONTENT_TYPES:
         raise HTTPException(
             status_code=415,
@@ -50,12 +165,128 @@ async def detect(file: UploadFile) -> TileDetectionResponse:
     image_bytes = await file.read()
 
     try:
-        image = decode_image(image_bytes)
+        return image_bytes, decode_image(image_bytes)
     except ValueError:
         raise HTTPException(status_code=400, detail="Failed to decode image")
 
-    tiles = detect_tiles(app.state.model, image)
 
+@dataclass(frozen=True)
+class DetectionRun:
+    tiles: list[DetectedTile]
+    imgsz: int  # picked from the backlog when the model became free
+    model_version: str
+    seconds: float  # inference only, without waiting for the model
+    queue_seconds: float
+
+
+def _run_detection(
+    serving: ServingModel, image: np.ndarray, rectify: bool, imgsz: int
+) -> tuple[list[DetectedTile], float]:
+    """Inference on a thread once the scheduler granted the model. Returns the tiles and seconds taken."""
+    # Only model calls at imgsz feed the latency estimate; the rest doesn't scale with it
+    inference: list[float] = []
+    start = time.perf_counter()
+    tiles = detect_tiles(
+        serving.model,
+        image,
+        rectify=rectify,
+        reclassifier=app.state.reclassifier,
+        imgsz=imgsz,
+        on_inference=inference.append,
+    )
+    seconds = time.perf_counter() - start
+    app.state.resolution.record(imgsz, sum(inference))
+    return tiles, seconds
+
+
+async def _schedule_detection(
+    image: np.ndarray, rectify: bool, client: str, priority: Priority, deadline: float | None
+) -> DetectionRun:
+    resolution: ResolutionController = app.state.resolution
+    # Taken on arrival: a model switch while this waits doesn't change which model it runs on
+    serving: ServingModel = app.state.models.current
+    # The predictor keeps per-call state on the model, so inference runs one image at a time.
+    # Waiting happens on the event loop; a thread is only taken once the model is ours.
+    with resolution.pending():
+        async with app.state.scheduler.aslot(client, priority, deadline) as grant:
+            imgsz = resolution.choose(image.shape)
+            tiles, seconds = await run_in_threadpool(_run_detection, serving, image, rectify, imgsz)
+    return DetectionRun(tiles, imgsz, serving.version, seconds, grant.queue_seconds)
+
+
+async def _detect(
+    image_hash: str,
+    image: np.ndarray,
+    rectify: bool,
+    client: str,
+    priority: Priority = "interactive",
+    deadline_ms: int | None = None,
+) -> DetectionRun:
+    """Detect off the event loop; concurrent uploads of the same image share one inference.
+
+    The request waits for the model in the scheduler as `client` in the
+    `priority` class, and gets a 503 if it can't start within `deadline_ms`.
+    Only requests of the same priority share an inference, and one whose
+    shared inference was dropped for another request's deadline tries again
+    under its own.
+    """
+    deadline = time.monotonic() + deadline_ms / 1000 if deadline_ms is not None else None
+    while True:
+        try:
+            return await app.state.detect_flight.do(
+                (image_hash, rectify, priority),
+                lambda: _schedule_detection(image, rectify, client, priority, deadline),
+            )
+        except DeadlineExceeded as e:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise HTTPException(status_code=503, detail=str(e))
+
+
+async def _client_id(request: Request, x_client_id: Annotated[str | None, Header()] = None) -> str:
+    """Identity the scheduler shares the model fairly between: X-Client-Id, else the peer address."""
+    if x_client_id:
+        return x_client_id
+    return request.client.host if request.client else "anonymous"
+
+
+def _store_detection(
+    suffix: str,
+    image_bytes: bytes,
+    image_hash: str,
+    tiles: list[DetectedTile],
+    session_id: str | None,
+    detection_id: str | None = None,
+) -> tuple[str, str]:
+    """Queue the detection for storage and active learning. Returns (detection_id, image_hash)."""
+    detection_id = app.state.store.record_detection(
+        image_hash,
+        tiles,
+        session_id=session_id,
+        image_bytes=image_bytes,
+        image_suffix=suffix,
+        detection_id=detection_id,
+    )
+    app.state.active_learning.submit(image_bytes, suffix, tiles)
+    return detection_id, image_hash
+
+
+async def _evaluate(request: HandEvaluationRequest) -> HandEvaluationResponse:
+    """Score a hand in the scoring pool, off the event loop; identical concurrent hands share one result."""
+    try:
+        return await app.state.evaluate_flight.do(
+            request.canonical_key(), lambda: app.state.scoring.evaluate(request)
+        )
+    except ScoringError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+def _detection_response(
+    tiles: list[DetectedTile],
+    detection_id: str | None = None,
+    image_hash: str | None = None,
+    run: DetectionRun | None = None,
+) -> TileDetectionResponse:
+    layout = analyze_layout(tiles)
     response_tiles = [
         DetectedTileResponse(
             code=tile.code,
@@ -66,17 +297,445 @@ async def detect(file: UploadFile) -> TileDetectionResponse:
             is_back=tile.is_back,
             suit=tile.suit.value if tile.suit else None,
             number=tile.number,
-            is_rotated=tile.is_rotated,
+            is_rotated=is_rotated,
+            alternatives=[
+                TileAlternative(code=code, confidence=confidence)
+                for code, confidence in tile.alternatives
+            ],
         )
-        for tile in tiles
+        for tile, is_rotated in zip(tiles, layout.rotated)
     ]
 
-    return TileDetectionResponse(tiles=response_tiles, count=len(response_tiles))
+    return TileDetectionResponse(
+        tiles=response_tiles,
+        count=len(response_tiles),
+        layout=TileLayoutResponse(angle=math.degrees(layout.angle), rows=layout.rows),
+        detection_id=detection_id,
+        image_hash=image_hash,
+        imgsz=run.imgsz if run else None,
+        model_version=run.model_version if run else None,
+        queue_seconds=run.queue_seconds if run else None,
+        inference_seconds=run.seconds if run else None,
+    )
+
+
+@api_router.post("/detect", response_model=TileDetectionResponse)
+async def detect(
+    file: UploadFile,
+    client: Annotated[str, Depends(_client_id)],
+    session_id: str | None = None,
+    rectify: bool = False,
+    priority: Priority = "interactive",
+    deadline_ms: Annotated[int | None, Query(gt=0)] = None,
+) -> TileDetectionResponse:
+    """Detect tiles; `rectify` warps tilted table photos to a top-down view first.
+
+    Bulk uploads should pass `priority=bulk` so camera captures go first.
+    With `deadline_ms`, a request still waiting for the model after that
+    long is dropped with a 503.
+    """
+    image_bytes, image = await _read_image(file)
+    image_hash = hashlib.sha256(image_bytes).hexdigest()
+    run = await _detect(image_hash, image, rectify, client, priority, deadline_ms)
+    if app.state.shadow is not None:
+        app.state.shadow.submit(image, run.tiles, run.seconds, rectify=rectify, imgsz=run.imgsz)
+    stored = _store_detection(ALLOWED_CONTENT_TYPES[file.content_type], image_bytes, image_hash, run.tiles, session_id)
+    return _detection_response(run.tiles, *stored, run=run)
+
+
+@api_router.post("/detections/{detection_id}/corrections", response_model=CorrectionResponse)
+async def correct_detection(detection_id: str, request: CorrectionRequest) -> CorrectionResponse:
+    """Store the hand editor's corrected labels for a detection."""
+    store: DetectionStore = app.state.store
+    # The detection may still be waiting in the write queue
+    await run_in_threadpool(store.flush, detection_id)
+    detection = store.get_detection(detection_id)
+    if detection is None:
+        raise HTTPException(status_code=404, detail=f"Detection not found: {detection_id}")
+
+    tiles = [DetectedTile(code=t.code, confidence=1.0, bbox=t.bbox) for t in request.tiles]
+    correction_id = store.record_correction(detection_id, tiles)
+    image_path = store.image_path(detection.image_hash, detection.image_suffix)
+    # Past the image budget, or with image storage off, only the labels are kept
+    if image_path.exists():
+        app.state.active_learning.submit(image_path, image_path.suffix, tiles, corrected=True)
+    return CorrectionResponse(correction_id=correction_id, detection_id=detection_id)
 
 
 @api_router.post("/hand/evaluate", response_model=HandEvaluationResponse)
-async def hand_evaluate(request: HandEvaluationRequest) -> HandEvaluationResponse:
-    return evaluate_hand(request)
+async def hand_evaluate(
+    request: HandEvaluationRequest, detection_id: str | None = None, session_id: str | None = None
+) -> HandEvaluationResponse:
+    evaluation = await _evaluate(request)
+    app.state.store.record_evaluation(request, evaluation, detection_id=detection_id, session_id=session_id)
+    return evaluation
+
+
+@api_router.post("/hand/simulate", response_model=SimulationResponse)
+async def hand_simulate(request: SimulationRequest) -> SimulationResponse:
+    """Self-draw win odds and expected points over the remaining draws, within `time_budget_ms`."""
+    try:
+        return await app.state.simulation.simulate(request)
+    except ShantenTooHigh as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@api_router.post("/hand/evaluate-photo", response_model=PhotoEvaluationResponse)
+async def hand_evaluate_photo(
+    file: UploadFile,
+    client: Annotated[str, Depends(_client_id)],
+    is_tsumo: Annotated[bool, Form()] = False,
+    seat_wind: Annotated[Wind, Form()] = "east",
+    round_wind: Annotated[Wind, Form()] = "east",
+    is_riichi: Annotated[bool, Form()] = False,
+    dora_count: Annotated[int, Form(ge=0)] = 0,
+    rectify: Annotated[bool, Form()] = False,
+) -> PhotoEvaluationResponse:
+    """Detect, assemble and score a hand from one photo in a single round trip."""
+    image_bytes, image = await _read_image(file)
+    image_hash = hashlib.sha256(image_bytes).hexdigest()
+    run = await _detect(image_hash, image, rectify, client)
+    tiles = run.tiles
+    detection_id, image_hash = _store_detection(
+        ALLOWED_CONTENT_TYPES[file.content_type], image_bytes, image_hash, tiles, None
+    )
+    detection = _detection_response(tiles, detection_id, image_hash, run)
+
+    try:
+        request = assemble_hand(tiles, is_tsumo, seat_wind, round_wind, is_riichi, dora_count)
+    except ValueError as e:
+        return PhotoEvaluationResponse(detection=detection, request=None, evaluation=None, error=str(e))
+
+    evaluation = await _evaluate(request)
+    app.state.store.record_evaluation(request, evaluation, detection_id=detection_id)
+    return PhotoEvaluationResponse(
+        detection=detection,
+        request=request,
+        evaluation=evaluation,
+        error=None,
+    )
+
+
+def _get_session(session_id: str) -> Session:
+    try:
+        return app.state.sessions.get(session_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
+
+
+def _session_response(session: Session) -> SessionStateResponse:
+    state = session.state
+    return SessionStateResponse(
+        id=session.id,
+        players=session.players,
+        length=session.length,
+        scores=state.scores,
+        round_wind=WINDS[state.round_wind],
+        round_number=state.round_number,
+        dealer=state.dealer,
+        honba=state.honba,
+        riichi_sticks=state.riichi_sticks,
+        hands_played=state.hands_played,
+        finished=state.finished,
+    )
+
+
+def _entry_response(entry: LedgerEntry) -> LedgerEntryResponse:
+    return LedgerEntryResponse(
+        sequence=entry.sequence,
+        kind=entry.kind,
+        round_wind=WINDS[entry.round_wind],
+        round_number=entry.dealer + 1,
+        honba=entry.honba,
+        deltas=list(entry.deltas),
+        winner=entry.winner,
+        loser=entry.loser,
+        riichi=list(entry.riichi),
+        tenpai=list(entry.tenpai),
+    )
+
+
+@api_router.post("/sessions", response_model=SessionStateResponse)
+async def create_session(request: CreateSessionRequest) -> SessionStateResponse:
+    session = app.state.sessions.create(request.players, request.length)
+    return _session_response(session)
+
+
+@api_router.get("/sessions/{session_id}", response_model=SessionStateResponse)
+async def get_session(session_id: str) -> SessionStateResponse:
+    return _session_response(_get_session(session_id))
+
+
+@api_router.get("/sessions/{session_id}/ledger", response_model=SessionLedgerResponse)
+async def get_session_ledger(session_id: str, since: int = 0) -> SessionLedgerResponse:
+    session = _get_session(session_id)
+    return SessionLedgerResponse(
+        entries=[_entry_response(entry) for entry in session.entries_since(since)],
+        snapshot_sequence=session.snapshot_sequence,
+    )
+
+
+@api_router.post("/sessions/{session_id}/win", response_model=SessionHandResponse)
+async def session_win(session_id: str, request: SessionWinRequest) -> SessionHandResponse:
+    """Score a won hand and apply it to the session's running totals."""
+    session = _get_session(session_id)
+    # Winds come from this snapshot; the win is only recorded if nothing landed in between
+    state, sequence = app.state.sessions.snapshot(session_id)
+    hand = request.hand.model_copy(
+        update={
+            "is_tsumo": request.loser is None,
+            "seat_wind": state.seat_wind(request.winner),
+            "round_wind": WINDS[state.round_wind],
+        }
+    )
+    evaluation = await _evaluate(hand)
+    app.state.store.record_evaluation(hand, evaluation, session_id=session_id)
+    if evaluation.error or evaluation.cost is None:
+        return SessionHandResponse(
+            session=_session_response(session), entry=None, evaluation=evaluation, error=evaluation.error
+        )
+
+    try:
+        entry = app.state.sessions.record_win(
+            session_id,
+            request.winner,
+            request.loser,
+            evaluation.cost,
+            set(request.riichi),
+            expected_sequence=sequence,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return SessionHandResponse(
+        session=_session_response(session), entry=_entry_response(entry), evaluation=evaluation, error=None
+    )
+
+
+@api_router.post("/sessions/{session_id}/draw", response_model=SessionHandResponse)
+async def session_draw(session_id: str, request: SessionDrawRequest) -> SessionHandResponse:
+    """Record an exhaustive draw with the tenpai players' payments."""
+    session = _get_session(session_id)
+    try:
+        entry = app.state.sessions.record_draw(session_id, set(request.tenpai), set(request.riichi))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return SessionHandResponse(
+        session=_session_response(session), entry=_entry_response(entry), evaluation=None, error=None
+    )
+
+
+def _cascade_stats() -> dict | None:
+    model = app.state.models.current.model
+    if not isinstance(model, CascadeModel):
+        return None
+    stats = model.stats
+    return {
+        **asdict(stats),
+        "escalation_rate": stats.escalation_rate,
+        "saved_seconds": stats.saved_seconds,
+    }
+
+
+def _shadow_stats() -> dict | None:
+    shadow: ShadowEvaluator | None = app.state.shadow
+    if shadow is None:
+        return None
+    stats = shadow.stats
+    return {
+        "version": shadow.version,
+        **asdict(stats),
+        "exact_rate": stats.exact_rate,
+        "tile_precision": stats.tiles.precision,
+        "tile_recall": stats.tiles.recall,
+        "latency_ratio": stats.latency_ratio,
+    }
+
+
+async def _detect_job_item(item: JobItem) -> str:
+    path = app.state.jobs.store.image_path(item)
+    image_bytes = await run_in_threadpool(path.read_bytes)
+    image = decode_image(image_bytes)
+    image_hash = hashlib.sha256(image_bytes).hexdigest()
+    # Each job is its own client, so concurrent jobs take turns with each other too
+    run = await _detect(image_hash, image, False, f"job:{item.job_id}", "bulk")
+    # A retried item overwrites the detection its earlier attempt stored
+    stored = _store_detection(path.suffix, image_bytes, image_hash, run.tiles, None, item.record_id)
+    return _detection_response(run.tiles, *stored, run=run).model_dump_json()
+
+
+async def _evaluate_job_item(item: JobItem) -> str:
+    request = HandEvaluationRequest.model_validate_json(item.payload)
+    evaluation = await _evaluate(request)
+    app.state.store.record_evaluation(request, evaluation, evaluation_id=item.record_id)
+    return evaluation.model_dump_json()
+
+
+def _job_response(state: JobState) -> JobResponse:
+    return JobResponse(
+        id=state.id,
+        kind=state.kind,
+        status=state.status,
+        total=state.total,
+        completed=state.completed,
+        failed=state.failed,
+        created_at=state.created_at,
+    )
+
+
+async def _submit_job(kind: str, payloads: list[str], images: list[BinaryIO] | None = None) -> JobResponse:
+    store: JobStore = app.state.jobs.store
+    job_id = await run_in_threadpool(store.create_job, kind, payloads, images)
+    app.state.jobs.submitted()
+    return _job_response(await run_in_threadpool(store.get_job, job_id))
+
+
+@api_router.post("/jobs/detect", response_model=JobResponse, status_code=202)
+async def submit_detection_job(files: list[UploadFile]) -> JobResponse:
+    """Queue photos for detection in the background; stream results from /jobs/{job_id}/results."""
+    if len(files) > MAX_JOB_IMAGES:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_JOB_IMAGES} images per job")
+    for file in files:
+        if file.content_type not in ALLOWED_CONTENT_TYPES:
+            raise HTTPException(status_code=415, detail=f"Unsupported media type: {file.content_type}")
+    names = [f"{i}{ALLOWED_CONTENT_TYPES[file.content_type]}" for i, file in enumerate(files)]
+    # Copied from the spooled uploads to the job's directory a chunk at a time
+    return await _submit_job("detect", names, [file.file for file in files])
+
+
+@api_router.post("/jobs/evaluate", response_model=JobResponse, status_code=202)
+async def submit_evaluation_job(request: EvaluationJobRequest) -> JobResponse:
+    """Queue hands for scoring in the background; stream results from /jobs/{job_id}/results."""
+    return await _submit_job("evaluate", [hand.model_dump_json() for hand in request.requests])
+
+
+async def _get_job(job_id: str) -> JobState:
+    state = await run_in_threadpool(app.state.jobs.store.get_job, job_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return state
+
+
+@api_router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str) -> JobResponse:
+    return _job_response(await _get_job(job_id))
+
+
+@api_router.get("/jobs/{job_id}/results")
+async def job_results(
+    job_id: str,
+    after: int = 0,
+    format: Literal["ndjson", "sse"] = "ndjson",
+    last_event_id: Annotated[int | None, Header()] = None,
+) -> StreamingResponse:
+    """Stream finished items as NDJSON lines or Server-Sent Events until the job is done.
+
+    Each item carries its `seq`; reconnect with `after` (or Last-Event-ID) set
+    to the last one received to resume.
+    """
+    await _get_job(job_id)
+    sse = format == "sse"
+    after = last_event_id if sse and last_event_id is not None else after
+    return StreamingResponse(
+        stream_results(app.state.jobs, job_id, after, sse),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+    )
+
+
+@api_router.get("/stats")
+async def stats():
+    """Counters of every serving stage: coalescing, scoring, simulation, store, scheduler, cascade, jobs and more."""
+    return {
+        "coalescing": {
+            "detect": asdict(app.state.detect_flight.stats),
+            "evaluate": asdict(app.state.evaluate_flight.stats),
+        },
+        "scoring": asdict(app.state.scoring.stats),
+        "simulation": asdict(app.state.simulation.stats),
+        "store": asdict(app.state.store.stats),
+        "scheduler": asdict(app.state.scheduler.stats),
+        "resolution": asdict(app.state.resolution.stats),
+        "cascade": _cascade_stats(),
+        "reclassifier": asdict(app.state.reclassifier.stats) if app.state.reclassifier else None,
+        "shadow": _shadow_stats(),
+        "jobs": {**asdict(app.state.jobs.stats), "pending": app.state.jobs.store.pending_count()},
+    }
+
+
+def _require_admin(x_admin_token: Annotated[str | None, Header()] = None) -> None:
+    """Admin endpoints stay closed unless ADMIN_TOKEN is set, and then need it in X-Admin-Token."""
+    token = os.environ.get("ADMIN_TOKEN")
+    if not token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set ADMIN_TOKEN to enable them")
+    if x_admin_token != token:
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+admin_router = APIRouter(prefix="/admin", dependencies=[Depends(_require_admin)])
+
+
+def _model_status() -> ModelStatusResponse:
+    switcher: ModelSwitcher = app.state.models
+    status = switcher.status
+    shadow: ShadowEvaluator | None = app.state.shadow
+    return ModelStatusResponse(
+        versions=switcher.registry.versions(),
+        active=status.active,
+        loading=status.loading,
+        error=status.error,
+        shadow=shadow.version if shadow else None,
+        shadow_sample_rate=shadow.sample_rate if shadow else None,
+    )
+
+
+@admin_router.get("/models", response_model=ModelStatusResponse)
+async def model_status() -> ModelStatusResponse:
+    return _model_status()
+
+
+@admin_router.post("/models/{version}/activate", response_model=ModelStatusResponse, status_code=202)
+async def activate_model(version: str) -> ModelStatusResponse:
+    """Load `version` in the background; requests switch to it once it is warm."""
+    try:
+        app.state.models.activate(version)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Model version not found: {version}")
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return _model_status()
+
+
+def _load_shadow(request: ShadowRequest) -> ShadowEvaluator:
+    model = app.state.models.load(app.state.models.registry.path(request.version))
+    warm_up(model)
+    # Refine like the live path, so the reclassifier doesn't show up as disagreement
+    reclassifier = load_reclassifier(resolve_classifier_path())
+    return ShadowEvaluator(request.version, model, request.sample_rate, reclassifier=reclassifier)
+
+
+@admin_router.put("/shadow", response_model=ModelStatusResponse)
+async def start_shadow(request: ShadowRequest) -> ModelStatusResponse:
+    """Run a sampled share of /api/detect traffic through a candidate version as well."""
+    try:
+        shadow = await run_in_threadpool(_load_shadow, request)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Model version not found: {request.version}")
+    previous, app.state.shadow = app.state.shadow, shadow
+    if previous is not None:
+        previous.close()
+    return _model_status()
+
+
+@admin_router.delete("/shadow", response_model=ModelStatusResponse)
+async def stop_shadow() -> ModelStatusResponse:
+    previous, app.state.shadow = app.state.shadow, None
+    if previous is not None:
+        previous.close()
+    return _model_status()
+
+
+api_router.include_router(admin_router)
 
 
 @api_router.get("/up")
@@ -100,4 +759,5 @@ if static_dir.exists():
         return FileResponse(static_dir / "index.html")
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    thread_config = load_thread_config(resolve_thread_config_path())
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, workers=thread_config.workers if thread_config else 1)
@@ -0,0 +1,79 @@
+import argparse
+import dataclasses
+import os
+import pathlib
+import sys
+import time
+
+from src.game_logs import ParseStats, ScoredWin, ScoringStats, discover_logs, score_logs
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Score the winning hands in Tenhou game logs (mjlog or JSON) and report score mismatches."
+    )
+    parser.add_argument("inputs", nargs="+", help="Log files or directories, optionally gzipped")
+    parser.add_argument("-o", "--output", type=pathlib.Path, required=True, help="Parquet output directory")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--show", type=int, default=20, help="Disagreements to print")
+    return parser.parse_args()
+
+
+def _accumulate(total, part) -> None:
+    for field in dataclasses.fields(total):
+        setattr(total, field.name, getattr(total, field.name) + getattr(part, field.name))
+
+
+def _describe(result: ScoredWin) -> str:
+    win = result.win
+    request = win.request
+    melds = " ".join("".join(meld.tiles) for meld in request.melds)
+    ours = result.error or f"{result.han} han {result.fu} fu {result.points}"
+    return (
+        f"  {win.source} game {win.game} round {win.round}: {''.join(request.tiles)} "
+        f"win {request.tiles[request.win_tile_index]}{f' melds {melds}' if melds else ''} "
+        f"{'tsumo' if request.is_tsumo else 'ron'}, dora {request.dora_count}\n"
+        f"    logged {win.han} han {win.fu} fu {win.points}, ours {ours}"
+    )
+
+
+def main():
+    args = parse_args()
+
+    paths = discover_logs(args.inputs)
+    if not paths:
+        print("Error: No log files found")
+        sys.exit(1)
+    if args.output.exists() and any(args.output.glob("*.parquet")):
+        print(f"Error: {args.output} already holds results")
+        sys.exit(1)
+
+    print(f"Scoring {len(paths)} log files with {args.workers} worker(s)")
+
+    start = time.perf_counter()
+    parse = ParseStats()
+    scoring = ScoringStats()
+    files = 0
+    shown = 0
+    for task in score_logs(paths, args.output, args.workers):
+        files += task.files
+        _accumulate(parse, task.parse)
+        _accumulate(scoring, task.scoring)
+        for result in task.disagreements[: max(args.show - shown, 0)]:
+            print(_describe(result))
+            shown += 1
+        elapsed = time.perf_counter() - start
+        print(f"  {files}/{len(paths)} files, {scoring.scored} wins ({scoring.scored / elapsed:.0f} wins/s)")
+
+    elapsed = time.perf_counter() - start
+    print(f"\nDone: {parse.games} games, {parse.wins} wins in {elapsed:.1f}s")
+    for reason, count in parse.skipped.most_common():
+        print(f"  skipped ({reason}): {count}")
+    print(f"  agreed: {scoring.agreed}")
+    print(f"  disagreed: {scoring.disagreed} ({scoring.errors} not scorable by us)")
+    print(f"  not compared (situational yaku): {scoring.situational}")
+    print(f"Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+from src.game_logs.parsing import LoggedWin, ParseStats, UnsupportedHand, discover_logs, iter_wins
+from src.game_logs.scoring import ParquetWriter, ScoredWin, ScoringStats, TaskResult, score_logs, score_wins
+
+__all__ = [
+    "discover_logs",
+    "iter_wins",
+    "score_logs",
+    "score_wins",
+    "LoggedWin",
+    "ParquetWriter",
+    "ParseStats",
+    "ScoredWin",
+    "ScoringStats",
+    "TaskResult",
+    "UnsupportedHand",
+]
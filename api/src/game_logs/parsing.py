@@ -0,0 +1,452 @@
+"""Streaming readers for Tenhou game logs that yield each winning hand.
+
+Two formats are read: mjlog XML, one game per file, and tenhou.net/6 JSON,
+one game per file or one per line (JSON Lines). Both can be gzipped. XML
+is parsed incrementally and each element is dropped once handled. JSON Lines
+files are read a line at a time. Memory stays flat however large the
+archive is.
+
+Wins the request format can't express are counted in `ParseStats.skipped`
+and not yielded: three-player games, games without open tanyao, and hands
+with a kan. Wins that carry a situational yaku (ippatsu, haitei, ...) are
+yielded but tagged, since their logged score can't be reproduced.
+
+A JSON game that can't be read, or the damaged rest of a truncated or
+corrupt file, counts once under `skipped["malformed"]` and reading goes
+on with the next game or file.
+"""
+
+import gzip
+import json
+import pathlib
+import re
+import xml.etree.ElementTree as ET
+import zlib
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import IO
+
+from src.game_session import WINDS
+from src.hand_calculation.schemas import HandEvaluationRequest, MeldInfo
+from src.tile import code_from_34, dora_from_indicator
+
+LOG_SUFFIXES = {".mjlog", ".xml", ".json", ".jsonl"}
+
+# 136-format indices of the red fives
+RED_FIVES_136 = {16: "0m", 52: "0p", 88: "0s"}
+
+# GO type flags
+TYPE_NO_RED_FIVES = 0x02
+TYPE_NO_OPEN_TANYAO = 0x04
+TYPE_THREE_PLAYER = 0x10
+
+# Tenhou yaku ids that depend on how the hand was won rather than its tiles
+SITUATIONAL_YAKU_IDS = {
+    2: "ippatsu",
+    3: "chankan",
+    4: "rinshan kaihou",
+    5: "haitei",
+    6: "houtei",
+    21: "double riichi",
+    36: "renhou",
+    37: "tenhou",
+    38: "chiihou",
+}
+SITUATIONAL_YAKU_NAMES = {
+    "一発": "ippatsu",
+    "槍槓": "chankan",
+    "嶺上開花": "rinshan kaihou",
+    "海底摸月": "haitei",
+    "河底撈魚": "houtei",
+    "両立直": "double riichi",
+    "人和": "renhou",
+    "天和": "tenhou",
+    "地和": "chiihou",
+}
+YAKUMAN_HAN = 13
+
+# tenhou.net/6 score strings: "30符3飜3900点", "満貫2000-4000点", "役満16000点∀"
+_JSON_FU_HAN = re.compile(r"(\d+)符(\d+)飜")
+_JSON_POINTS = re.compile(r"(\d+)(?:-(\d+))?点(∀)?$")
+_JSON_YAKU = re.compile(r"^(.+)\((?:(\d+)飜|(役満))\)$")
+_JSON_CALL = re.compile(r"[cpmak]")
+
+
+class UnsupportedHand(ValueError):
+    """The win can't be expressed as a HandEvaluationRequest."""
+
+
+@dataclass(frozen=True)
+class LoggedWin:
+    source: str
+    game: int  # position of the game within its source file
+    round: int  # 0 is East 1, 4 is South 1
+    honba: int
+    winner: int
+    loser: int | None  # None for tsumo
+    dealer: int
+    request: HandEvaluationRequest
+    han: int  # as logged
+    fu: int | None  # not logged for limit hands in JSON logs
+    points: int  # hand value without honba or riichi sticks
+    situational: tuple[str, ...] = ()
+
+
+@dataclass
+class ParseStats:
+    files: int = 0
+    games: int = 0
+    wins: int = 0
+    # reason -> wins not yielded; a malformed game or file counts once
+    skipped: Counter = field(default_factory=Counter)
+
+
+def discover_logs(inputs: Iterable[str]) -> list[pathlib.Path]:
+    """Log files among `inputs`, walking directories; gzipped files keep their inner suffix."""
+    found: set[pathlib.Path] = set()
+    for entry in inputs:
+        path = pathlib.Path(entry)
+        candidates = path.rglob("*") if path.is_dir() else [path]
+        for candidate in candidates:
+            suffixes = candidate.suffixes[-2:]
+            suffix = suffixes[0] if suffixes[-1:] == [".gz"] and len(suffixes) == 2 else candidate.suffix
+            if candidate.is_file() and suffix.lower() in LOG_SUFFIXES:
+                found.add(candidate.resolve())
+    return sorted(found)
+
+
+def _open(path: pathlib.Path) -> IO[bytes]:
+    return gzip.open(path, "rb") if path.suffix == ".gz" else path.open("rb")
+
+
+def _is_json(path: pathlib.Path) -> bool:
+    suffix = path.with_suffix("").suffix if path.suffix == ".gz" else path.suffix
+    return suffix.lower() in (".json", ".jsonl")
+
+
+def iter_wins(paths: Iterable[pathlib.Path], stats: ParseStats | None = None) -> Iterator[LoggedWin]:
+    """Winning hands from every log in `paths`, in file order."""
+    stats = stats if stats is not None else ParseStats()
+    for path in paths:
+        stats.files += 1
+        try:
+            with _open(path) as f:
+                yield from (_iter_json_wins if _is_json(path) else _iter_mjlog_wins)(f, str(path), stats)
+        except (ET.ParseError, EOFError, gzip.BadGzipFile, zlib.error, UnicodeDecodeError, ValueError, TypeError):
+            # Wins read before the damage were already yielded
+            stats.skipped["malformed"] += 1
+
+
+def _tile_code_136(tile: int, red_fives: bool) -> str:
+    if red_fives and tile in RED_FIVES_136:
+        return RED_FIVES_136[tile]
+    return code_from_34(tile // 4)
+
+
+def _index_34(code: str) -> int:
+    number = int(code[0]) or 5
+    return "mpsz".index(code[1]) * 9 + number - 1
+
+
+def _count_dora(codes: list[str], indicators: Iterable[int]) -> int:
+    """Dora and ura dora among `codes`; red fives are counted by the calculator instead."""
+    counts = Counter(_index_34(code) for code in codes)
+    return sum(counts[dora_from_indicator(indicator)] for indicator in indicators)
+
+
+def _decode_meld(m: int, red_fives: bool) -> MeldInfo:
+    """A Tenhou meld bit field as a chi or pon."""
+    if m & 0x4:
+        base, _ = divmod(m >> 10, 3)
+        first = base // 7 * 9 + base % 7
+        offsets = ((m >> 3) & 3, (m >> 5) & 3, (m >> 7) & 3)
+        tiles = [(first + i) * 4 + offset for i, offset in enumerate(offsets)]
+        return MeldInfo(type="chi", tiles=[_tile_code_136(t, red_fives) for t in tiles])
+    if m & 0x8:
+        kind, _ = divmod(m >> 9, 3)
+        unused = (m >> 5) & 3
+        tiles = [kind * 4 + i for i in range(4) if i != unused]
+        return MeldInfo(type="pon", tiles=[_tile_code_136(t, red_fives) for t in tiles])
+    raise UnsupportedHand("kan")
+
+
+def _ints(value: str | None) -> list[int]:
+    return [int(v) for v in value.split(",")] if value else []
+
+
+def _build_request(
+    closed: list[str],
+    win_tile: str,
+    melds: list[MeldInfo],
+    is_tsumo: bool,
+    seat: int,
+    round_index: int,
+    is_riichi: bool,
+    indicators: list[int],
+) -> HandEvaluationRequest:
+    tiles = closed + [code for meld in melds for code in meld.tiles]
+    if len(tiles) != 14:
+        raise ValueError(f"Expected 14 tiles, got {len(tiles)}")
+    return HandEvaluationRequest(
+        tiles=tiles,
+        win_tile_index=closed.index(win_tile),
+        is_tsumo=is_tsumo,
+        seat_wind=WINDS[seat],
+        round_wind=WINDS[round_index // 4 % 4],
+        is_riichi=is_riichi,
+        melds=melds,
+        dora_count=_count_dora(tiles, indicators),
+    )
+
+
+def _iter_mjlog_wins(f: IO[bytes], source: str, stats: ParseStats) -> Iterator[LoggedWin]:
+    stats.games += 1
+    red_fives = True
+    skip_reason = None
+    round_index = honba = dealer = 0
+    riichi: set[int] = set()
+    root = None
+    for event, element in ET.iterparse(f, events=("start", "end")):
+        if root is None:
+            root = element
+        if event == "start" or element is root:
+            continue
+        tag = element.tag
+        if tag == "GO":
+            game_type = int(element.get("type", 0))
+            if game_type & TYPE_THREE_PLAYER:
+                skip_reason = "three player"
+            elif game_type & TYPE_NO_OPEN_TANYAO:
+                skip_reason = "rules"
+            red_fives = not game_type & TYPE_NO_RED_FIVES
+        elif tag == "INIT":
+            round_index, honba = _ints(element.get("seed"))[:2]
+            dealer = int(element.get("oya"))
+            riichi = set()
+        elif tag == "REACH" and element.get("step") == "2":
+            riichi.add(int(element.get("who")))
+        elif tag == "AGARI":
+            stats.wins += 1
+            try:
+                if skip_reason:
+                    raise UnsupportedHand(skip_reason)
+                win = _mjlog_win(element, source, round_index, honba, dealer, riichi, red_fives)
+            except UnsupportedHand as e:
+                stats.skipped[str(e)] += 1
+            except (ValueError, TypeError, KeyError, IndexError):
+                stats.skipped["malformed"] += 1
+            else:
+                yield win
+        root.clear()  # drop handled elements so long logs don't accumulate
+
+
+def _mjlog_win(
+    element: ET.Element,
+    source: str,
+    round_index: int,
+    honba: int,
+    dealer: int,
+    riichi: set[int],
+    red_fives: bool,
+) -> LoggedWin:
+    winner = int(element.get("who"))
+    loser = int(element.get("fromWho"))
+    is_tsumo = loser == winner
+    closed_136 = _ints(element.get("hai"))
+    melds = [_decode_meld(m, red_fives) for m in _ints(element.get("m"))]
+    closed = [_tile_code_136(t, red_fives) for t in closed_136]
+    win_tile = _tile_code_136(int(element.get("machi")), red_fives)
+
+    indicators = [t // 4 for t in _ints(element.get("doraHai")) + _ints(element.get("doraHaiUra"))]
+    request = _build_request(
+        closed, win_tile, melds, is_tsumo, (winner - dealer) % 4, round_index, winner in riichi, indicators
+    )
+
+    fu, points, _ = _ints(element.get("ten"))
+    yaku = _ints(element.get("yaku"))
+    yakuman = _ints(element.get("yakuman"))
+    yaku_ids = yaku[::2] + yakuman
+    return LoggedWin(
+        source=source,
+        game=0,
+        round=round_index,
+        honba=honba,
+        winner=winner,
+        loser=None if is_tsumo else loser,
+        dealer=dealer,
+        request=request,
+        han=sum(yaku[1::2]) + YAKUMAN_HAN * len(yakuman),
+        fu=fu,
+        points=points,
+        situational=tuple(SITUATIONAL_YAKU_IDS[i] for i in yaku_ids if i in SITUATIONAL_YAKU_IDS),
+    )
+
+
+def _iter_json_wins(f: IO[bytes], source: str, stats: ParseStats) -> Iterator[LoggedWin]:
+    # A single game may be pretty-printed over many lines; JSON Lines hold one game per line
+    first = f.readline()
+    rest = f.readline()
+    if rest and not rest.strip().startswith(b"{"):
+        documents: Iterable[bytes] = [first + rest + f.read()]
+    else:
+        documents = (line for line in (first, rest, *f) if line.strip())
+    for game, document in enumerate(documents):
+        stats.games += 1
+        try:
+            parsed = json.loads(document)
+        except ValueError:  # JSONDecodeError and undecodable bytes
+            stats.skipped["malformed"] += 1
+            continue
+        yield from _json_game_wins(parsed, source, game, stats)
+
+
+def _json_tile_code(tile: int) -> str:
+    if tile > 50:
+        return f"0{'mps'[tile - 51]}"
+    return f"{tile % 10}{'mpsz'[tile // 10 - 1]}"
+
+
+def _json_call_tiles(call: str) -> tuple[str, int, list[int]]:
+    """(kind, called tile, all tiles) of a tenhou.net/6 call string such as "c275226"."""
+    position = _JSON_CALL.search(call).start()
+    kind = call[position]
+    digits = call[:position] + call[position + 1 :]
+    tiles = [int(digits[i : i + 2]) for i in range(0, len(digits), 2)]
+    return kind, int(call[position + 1 : position + 3]), tiles
+
+
+def _json_game_wins(game: dict, source: str, game_index: int, stats: ParseStats) -> Iterator[LoggedWin]:
+    try:
+        disp = game.get("rule", {}).get("disp", "")
+        players = len([name for name in game.get("name", [None] * 4) if name != ""])
+        log = game["log"]
+    except (AttributeError, TypeError, KeyError):
+        stats.skipped["malformed"] += 1
+        return
+    for kyoku in log:
+        try:
+            result = kyoku[-1]
+            if result[0] != "和了":
+                continue
+            # Double ron lists a delta and detail pair per winner
+            details = result[2::2]
+        except (TypeError, KeyError, IndexError):
+            stats.skipped["malformed"] += 1
+            continue
+        stats.wins += len(details)
+        if "三" in disp or players == 3:
+            stats.skipped["three player"] += len(details)
+            continue
+        if "喰" not in disp and disp:
+            stats.skipped["rules"] += len(details)
+            continue
+        for detail in details:
+            try:
+                win = _json_win(kyoku, detail, source, game_index)
+            except UnsupportedHand as e:
+                stats.skipped[str(e)] += 1
+            except (ValueError, TypeError, KeyError, IndexError, AttributeError):
+                stats.skipped["malformed"] += 1
+            else:
+                yield win
+
+
+def _last_discard(discards: list, draws: list) -> int:
+    last = discards[-1]
+    if isinstance(last, str):
+        if "r" not in last:
+            raise UnsupportedHand("chankan")
+        last = int(last[1:])
+    return draws[-1] if last == 60 else last
+
+
+def _replay_hand(start: list[int], draws: list, discards: list) -> tuple[list[int], list[str], bool]:
+    """A player's closed tiles, melds and riichi at the end of the round."""
+    hand = list(start)
+    melds: list[tuple[str, list[int]]] = []
+    riichi = False
+    for i, draw in enumerate(draws):
+        if isinstance(draw, str):
+            kind, called, tiles = _json_call_tiles(draw)
+            if kind not in "cp":
+                raise UnsupportedHand("kan")
+            tiles.remove(called)
+            for tile in tiles:
+                hand.remove(tile)
+            melds.append(("chi" if kind == "c" else "pon", [called, *tiles]))
+        else:
+            hand.append(draw)
+        if i >= len(discards):
+            break
+        discard = discards[i]
+        if isinstance(discard, str):
+            if "r" not in discard:
+                raise UnsupportedHand("kan")
+            riichi = True
+            discard = int(discard[1:])
+        hand.remove(draw if discard == 60 else discard)
+    return hand, melds, riichi
+
+
+def _json_score(text: str, is_tsumo: bool) -> tuple[int | None, int]:
+    """(fu, points) from a score string; tsumo payments are "non-dealer-dealer" or "each∀"."""
+    fu_han = _JSON_FU_HAN.search(text)
+    match = _JSON_POINTS.search(text)
+    first, second, each = int(match.group(1)), match.group(2), match.group(3)
+    if second is not None:
+        points = 2 * first + int(second)
+    elif each or is_tsumo:
+        points = 3 * first
+    else:
+        points = first
+    return (int(fu_han.group(1)) if fu_han else None), points
+
+
+def _json_win(kyoku: list, detail: list, source: str, game_index: int) -> LoggedWin:
+    (round_index, honba, _), _, dora, ura = kyoku[:4]
+    winner, loser, _, score, *yaku = detail
+    is_tsumo = winner == loser
+    start, draws, discards = kyoku[4 + 3 * winner : 7 + 3 * winner]
+
+    closed, calls, riichi = _replay_hand(start, draws, discards)
+    if is_tsumo:
+        win_tile = draws[-1]
+    else:
+        loser_draws, loser_discards = kyoku[5 + 3 * loser : 7 + 3 * loser]
+        win_tile = _last_discard(loser_discards, loser_draws)
+        closed.append(win_tile)
+    if isinstance(win_tile, str):
+        raise UnsupportedHand("kan")
+
+    dealer = round_index % 4
+    codes = [_json_tile_code(t) for t in closed]
+    melds = [MeldInfo(type=kind, tiles=[_json_tile_code(t) for t in tiles]) for kind, tiles in calls]
+    indicators = [_index_34(_json_tile_code(t)) for t in dora + (ura if riichi else [])]
+    request = _build_request(
+        codes, _json_tile_code(win_tile), melds, is_tsumo, (winner - dealer) % 4, round_index, riichi, indicators
+    )
+
+    han = 0
+    situational = []
+    for entry in yaku:
+        match = _JSON_YAKU.match(entry)
+        name = match.group(1)
+        han += YAKUMAN_HAN if match.group(3) else int(match.group(2))
+        if name in SITUATIONAL_YAKU_NAMES:
+            situational.append(SITUATIONAL_YAKU_NAMES[name])
+    fu, points = _json_score(score, is_tsumo)
+    return LoggedWin(
+        source=source,
+        game=game_index,
+        round=round_index,
+        honba=honba,
+        winner=winner,
+        loser=None if is_tsumo else loser,
+        dealer=dealer,
+        request=request,
+        han=han,
+        fu=fu,
+        points=points,
+        situational=tuple(situational),
+    )
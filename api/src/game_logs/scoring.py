@@ -0,0 +1,229 @@
+"""Bulk scoring of logged wins and comparison with the logged score."""
+
+import pathlib
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import get_context
+
+from src.game_logs.parsing import LoggedWin, ParseStats, iter_wins
+from src.game_session import win_payments
+from src.hand_calculation.calculation import evaluate_hand
+from src.hand_calculation.schemas import HandEvaluationRequest
+
+# Log files per pool task; each task writes its own Parquet part
+DEFAULT_FILES_PER_TASK = 64
+# Tasks queued per worker ahead of the one running, so results stream instead of piling up
+TASKS_AHEAD_PER_WORKER = 2
+DEFAULT_ROWS_PER_PART = 100_000
+
+# han, fu, points, yaku names, error
+Score = tuple[int | None, int | None, int | None, tuple[str, ...], str | None]
+
+
+@dataclass(frozen=True)
+class ScoredWin:
+    win: LoggedWin
+    han: int | None
+    fu: int | None
+    points: int | None  # what the winner receives without honba, as in LoggedWin.points
+    yaku: tuple[str, ...]
+    error: str | None
+
+    @property
+    def agrees(self) -> bool:
+        return self.error is None and self.points == self.win.points and self.han == self.win.han
+
+    @property
+    def disagrees(self) -> bool:
+        """Scored differently from the log, leaving out wins whose situational yaku we can't express."""
+        return not self.agrees and not self.win.situational
+
+
+@dataclass
+class ScoringStats:
+    scored: int = 0
+    agreed: int = 0
+    disagreed: int = 0
+    situational: int = 0  # wins with yaku the request can't express, not compared
+    errors: int = 0  # disagreements the calculator rejected outright, e.g. no yaku
+
+
+def score_request(request: HandEvaluationRequest, winner: int, loser: int | None, dealer: int) -> Score:
+    result = evaluate_hand(request)
+    if result.error is not None:
+        return None, None, None, (), result.error
+    points = win_payments(winner, loser, dealer, result.cost, honba=0)[winner]
+    return result.han, result.fu, points, tuple(y.name for y in result.yaku), None
+
+
+def score_wins(wins: Iterable[LoggedWin], stats: ScoringStats | None = None) -> Iterator[ScoredWin]:
+    """Score each win as it arrives."""
+    stats = stats if stats is not None else ScoringStats()
+    for win in wins:
+        result = ScoredWin(win, *score_request(win.request, win.winner, win.loser, win.dealer))
+        stats.scored += 1
+        if win.situational:
+            stats.situational += 1
+        elif result.agrees:
+            stats.agreed += 1
+        else:
+            stats.disagreed += 1
+            stats.errors += result.error is not None
+        yield result
+
+
+COLUMNS = {
+    "source": "String",
+    "game": "Int32",
+    "round": "Int8",
+    "honba": "Int8",
+    "winner": "Int8",
+    "loser": "Int8",
+    "dealer": "Int8",
+    "tiles": "String",
+    "win_tile": "String",
+    "melds": "String",
+    "is_tsumo": "Boolean",
+    "is_riichi": "Boolean",
+    "dora_count": "Int8",
+    "logged_han": "Int16",
+    "logged_fu": "Int16",
+    "logged_points": "Int32",
+    "situational": "String",
+    "han": "Int16",
+    "fu": "Int16",
+    "points": "Int32",
+    "yaku": "String",
+    "error": "String",
+    "agrees": "Boolean",
+}
+
+
+def _row(result: ScoredWin) -> tuple:
+    win = result.win
+    request = win.request
+    return (
+        win.source,
+        win.game,
+        win.round,
+        win.honba,
+        win.winner,
+        win.loser,
+        win.dealer,
+        "".join(request.tiles),
+        request.tiles[request.win_tile_index],
+        " ".join(f"{meld.type}:{''.join(meld.tiles)}" for meld in request.melds),
+        request.is_tsumo,
+        request.is_riichi,
+        request.dora_count,
+        win.han,
+        win.fu,
+        win.points,
+        ",".join(win.situational),
+        result.han,
+        result.fu,
+        result.points,
+        ",".join(result.yaku),
+        result.error,
+        result.agrees,
+    )
+
+
+class ParquetWriter:
+    """Scored wins as Parquet part files in `path`, flushed every `rows_per_part` rows.
+
+    Parts are written to a temporary name and renamed once complete, so
+    readers (`pl.scan_parquet(path / "*.parquet")`) never see half a part.
+    Writers sharing a directory need distinct prefixes.
+    """
+
+    def __init__(self, path: pathlib.Path, prefix: str = "part", rows_per_part: int = DEFAULT_ROWS_PER_PART):
+        self.path = path
+        self.prefix = prefix
+        self.rows_per_part = rows_per_part
+        self.rows_written = 0
+
+    def __enter__(self) -> "ParquetWriter":
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._rows: list[tuple] = []
+        self._next_part = 0
+        return self
+
+    def write(self, result: ScoredWin) -> None:
+        self._rows.append(_row(result))
+        if len(self._rows) >= self.rows_per_part:
+            self._flush()
+
+    def _flush(self) -> None:
+        import polars as pl
+
+        if not self._rows:
+            return
+
+        schema = {name: getattr(pl, dtype) for name, dtype in COLUMNS.items()}
+        frame = pl.DataFrame(self._rows, schema=schema, orient="row")
+        part_path = self.path / f"{self.prefix}-{self._next_part:05d}.parquet"
+        tmp_path = part_path.with_suffix(".tmp")
+        frame.write_parquet(tmp_path)
+        tmp_path.rename(part_path)
+
+        self.rows_written += len(self._rows)
+        self._next_part += 1
+        self._rows = []
+
+    def __exit__(self, *exc_info) -> None:
+        self._flush()
+
+
+@dataclass
+class TaskResult:
+    files: int
+    parse: ParseStats
+    scoring: ScoringStats
+    disagreements: list[ScoredWin]
+
+
+def _score_files(paths: list[pathlib.Path], output: pathlib.Path, prefix: str) -> TaskResult:
+    parse = ParseStats()
+    scoring = ScoringStats()
+    disagreements = []
+    with ParquetWriter(output, prefix) as writer:
+        for result in score_wins(iter_wins(paths, parse), scoring):
+            writer.write(result)
+            if result.disagrees:
+                disagreements.append(result)
+    return TaskResult(len(paths), parse, scoring, disagreements)
+
+
+def score_logs(
+    paths: list[pathlib.Path],
+    output: pathlib.Path,
+    workers: int = 1,
+    files_per_task: int = DEFAULT_FILES_PER_TASK,
+) -> Iterator[TaskResult]:
+    """Parse and score every log into Parquet parts under `output`, yielding per batch of files.
+
+    Each task reads, scores and writes its own batch of files, so parsing
+    and I/O scale with the workers as well as scoring; only the counts and
+    the few disagreeing wins come back to this process. A bounded number of
+    tasks is queued ahead, and results are yielded in file order.
+    """
+    tasks = (
+        (paths[i : i + files_per_task], output, f"part-{i // files_per_task:06d}")
+        for i in range(0, len(paths), files_per_task)
+    )
+    if workers <= 1:
+        for task in tasks:
+            yield _score_files(*task)
+        return
+
+    pending: deque[Future] = deque()
+    with ProcessPoolExecutor(workers, mp_context=get_context("spawn")) as executor:
+        for task in tasks:
+            pending.append(executor.submit(_score_files, *task))
+            if len(pending) > workers * TASKS_AHEAD_PER_WORKER:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
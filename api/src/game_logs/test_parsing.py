@@ -0,0 +1,211 @@
+import gzip
+import json
+
+import pytest
+
+from src.game_logs.parsing import (
+    ParseStats,
+    UnsupportedHand,
+    _decode_meld,
+    discover_logs,
+    iter_wins,
+)
+
+# Riichi ron for seat 1 in East 1: red 5p, two ura dora on the 1z pair
+MJLOG = (
+    '<mjloggm ver="2.3"><GO type="169" lobby="0"/><UN n0="a" n1="b" n2="c" n3="d"/>'
+    '<INIT seed="0,1,0,1,2,40" ten="250,250,250,250" oya="0"/>'
+    '<REACH who="1" step="1"/><REACH who="1" step="2"/>'
+    '<AGARI ba="1,1" hai="0,4,8,48,52,56,96,100,104,5,9,12,108,109" machi="12" ten="40,8000,1" '
+    'yaku="1,1,53,2,54,1" doraHai="40" doraHaiUra="120" who="1" fromWho="2"/>'
+    "</mjloggm>"
+)
+
+EMPTY_PLAYER = [[], [], []]
+# East 1: the dealer tsumos after riichi
+TSUMO_KYOKU = [
+    [0, 0, 0],
+    [25000] * 4,
+    [21],
+    [],
+    [11, 12, 13, 24, 25, 26, 37, 38, 39, 12, 13, 41, 47],
+    [41, 14],
+    ["r47"],
+    *EMPTY_PLAYER,
+    *EMPTY_PLAYER,
+    *EMPTY_PLAYER,
+    ["和了", [3000, -1000, -1000, -1000], [0, 0, 0, "30符2飜1000点∀", "立直(1飜)", "門前清自摸和(1飜)"]],
+]
+# East 2: seat 2 pons haku and rons seat 3's 9p; the 2p dora is in hand
+PON_KYOKU = [
+    [1, 0, 0],
+    [25000] * 4,
+    [21],
+    [],
+    *EMPTY_PLAYER,
+    *EMPTY_PLAYER,
+    [45, 45, 22, 23, 24, 32, 33, 34, 16, 17, 18, 29, 47],
+    ["p454545"],
+    [47],
+    [],
+    [11],
+    [29],
+    ["和了", [0, 0, 2000, -2000], [2, 3, 2, "30符2飜2000点", "白(1飜)", "ドラ(1飜)"]],
+]
+KAN_KYOKU = [
+    [2, 0, 0],
+    [25000] * 4,
+    [21],
+    [],
+    [11, 11, 11, 24, 25, 26, 37, 38, 39, 12, 13, 41, 47],
+    ["m11111111", 14],
+    [0, 47],
+    *EMPTY_PLAYER,
+    *EMPTY_PLAYER,
+    *EMPTY_PLAYER,
+    ["和了", [3000, -1000, -1000, -1000], [0, 0, 0, "30符1飜1000点∀", "嶺上開花(1飜)"]],
+]
+DRAW_KYOKU = [[3, 0, 0], [25000] * 4, [21], [], *EMPTY_PLAYER * 4, ["流局", [0, 0, 0, 0]]]
+
+
+def _game(*kyokus, disp="般南喰赤") -> dict:
+    return {"name": ["a", "b", "c", "d"], "rule": {"disp": disp, "aka": 1}, "log": list(kyokus)}
+
+
+class TestMjlog:
+    def test_reads_win(self, tmp_path):
+        path = tmp_path / "game.mjlog"
+        path.write_text(MJLOG)
+
+        stats = ParseStats()
+        [win] = iter_wins([path], stats)
+
+        assert (win.round, win.honba, win.winner, win.loser, win.dealer) == (0, 1, 1, 2, 0)
+        request = win.request
+        assert request.tiles[request.win_tile_index] == "4m"
+        assert "0p" in request.tiles
+        assert (request.seat_wind, request.round_wind) == ("south", "east")
+        assert request.is_riichi and not request.is_tsumo
+        assert request.dora_count == 2  # ura dora; the red five is counted by the calculator
+        assert (win.han, win.fu, win.points) == (4, 40, 8000)
+        assert stats.wins == 1 and stats.games == 1
+
+    def test_gzipped(self, tmp_path):
+        path = tmp_path / "game.mjlog.gz"
+        path.write_bytes(gzip.compress(MJLOG.encode()))
+
+        assert discover_logs([str(tmp_path)]) == [path.resolve()]
+        assert len(list(iter_wins([path]))) == 1
+
+    def test_truncated_file_is_counted_and_skipped(self, tmp_path):
+        truncated = tmp_path / "a.mjlog"
+        truncated.write_text(MJLOG[: len(MJLOG) // 2])
+        whole = tmp_path / "b.mjlog"
+        whole.write_text(MJLOG)
+
+        stats = ParseStats()
+        wins = list(iter_wins([truncated, whole], stats))
+
+        assert len(wins) == 1
+        assert stats.files == 2
+        assert stats.skipped["malformed"] == 1
+
+    def test_three_player_games_are_skipped(self, tmp_path):
+        path = tmp_path / "game.mjlog"
+        path.write_text(MJLOG.replace('type="169"', 'type="185"'))
+
+        stats = ParseStats()
+        assert list(iter_wins([path], stats)) == []
+        assert stats.skipped == {"three player": 1}
+
+    def test_situational_yaku_are_tagged(self, tmp_path):
+        path = tmp_path / "game.mjlog"
+        path.write_text(MJLOG.replace('yaku="1,1,', 'yaku="1,1,2,1,'))
+
+        [win] = iter_wins([path])
+        assert win.situational == ("ippatsu",)
+
+
+class TestDecodeMeld:
+    def test_chi_with_red_five(self):
+        # 3s4s5s called from the left, using the red 5s (136 index 88)
+        base = 2 * 7 + 2
+        m = (base * 3 + 0) << 10 | 0 << 7 | 1 << 5 | 2 << 3 | 0x4 | 3
+        meld = _decode_meld(m, red_fives=True)
+        assert meld.type == "chi"
+        assert meld.tiles == ["3s", "4s", "0s"]
+
+    def test_pon(self):
+        m = (31 * 3 + 1) << 9 | 3 << 5 | 0x8 | 1
+        meld = _decode_meld(m, red_fives=True)
+        assert meld.type == "pon"
+        assert meld.tiles == ["5z", "5z", "5z"]
+
+    def test_kan_is_unsupported(self):
+        with pytest.raises(UnsupportedHand):
+            _decode_meld(31 * 4 << 8 | 1, red_fives=True)
+
+
+class TestTenhouJson:
+    def test_tsumo_and_called_pon(self, tmp_path):
+        path = tmp_path / "game.json"
+        path.write_text(json.dumps(_game(TSUMO_KYOKU, PON_KYOKU, DRAW_KYOKU), ensure_ascii=False, indent=2))
+
+        tsumo, ron = iter_wins([path])
+
+        assert tsumo.loser is None and tsumo.dealer == 0
+        assert tsumo.request.is_riichi and tsumo.request.is_tsumo
+        assert tsumo.request.tiles[tsumo.request.win_tile_index] == "4m"
+        assert (tsumo.han, tsumo.fu, tsumo.points) == (2, 30, 3000)
+
+        assert (ron.winner, ron.loser, ron.dealer) == (2, 3, 1)
+        assert [(meld.type, meld.tiles) for meld in ron.request.melds] == [("pon", ["5z", "5z", "5z"])]
+        assert ron.request.tiles[ron.request.win_tile_index] == "9p"
+        assert ron.request.seat_wind == "south"
+        assert ron.request.dora_count == 1
+        assert (ron.han, ron.fu, ron.points) == (2, 30, 2000)
+
+    def test_json_lines_and_skips(self, tmp_path):
+        path = tmp_path / "games.jsonl"
+        games = [_game(TSUMO_KYOKU, KAN_KYOKU), _game(TSUMO_KYOKU, disp="般南赤")]
+        path.write_text("".join(json.dumps(game, ensure_ascii=False) + "\n" for game in games))
+
+        stats = ParseStats()
+        wins = list(iter_wins([path], stats))
+
+        assert [win.game for win in wins] == [0]
+        assert stats.games == 2 and stats.wins == 3
+        assert stats.skipped == {"kan": 1, "rules": 1}
+
+    def test_malformed_games_are_counted_and_skipped(self, tmp_path):
+        path = tmp_path / "games.jsonl"
+        good = json.dumps(_game(TSUMO_KYOKU), ensure_ascii=False)
+        path.write_text(f"{good}\n{{\"log\": [\n{{\"name\": []}}\n{good}\n")
+
+        stats = ParseStats()
+        wins = list(iter_wins([path], stats))
+
+        assert [win.game for win in wins] == [0, 3]
+        assert stats.skipped == {"malformed": 2}
+
+    def test_double_ron(self, tmp_path):
+        kyoku = [*PON_KYOKU[:-1]]
+        # Seat 1, the dealer, also waits on 9p with a concealed chun triplet
+        kyoku[7:10] = [[47, 47, 47, 11, 12, 13, 14, 15, 16, 37, 38, 39, 29], [41], [41]]
+        kyoku.append(
+            [
+                "和了",
+                [0, 2000, 0, -2000],
+                [1, 3, 1, "40符1飜2000点", "中(1飜)"],
+                *PON_KYOKU[-1][1:],
+            ]
+        )
+        path = tmp_path / "game.json"
+        path.write_text(json.dumps(_game(kyoku), ensure_ascii=False))
+
+        dealer_win, other_win = iter_wins([path])
+
+        assert (dealer_win.winner, dealer_win.loser) == (1, 3)
+        assert dealer_win.request.seat_wind == "east"
+        assert (dealer_win.han, dealer_win.fu, dealer_win.points) == (1, 40, 2000)
+        assert other_win.winner == 2
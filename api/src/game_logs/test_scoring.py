@@ -0,0 +1,70 @@
+import json
+
+import polars as pl
+
+from src.game_logs.parsing import iter_wins
+from src.game_logs.scoring import ParquetWriter, ScoringStats, score_logs, score_wins
+from src.game_logs.test_parsing import MJLOG, PON_KYOKU, TSUMO_KYOKU, _game
+
+
+def _write_logs(tmp_path):
+    mjlog = tmp_path / "a.mjlog"
+    mjlog.write_text(MJLOG)
+    # The same riichi hand logged as worth 1000 less, and with ippatsu
+    wrong = tmp_path / "b.mjlog"
+    wrong.write_text(MJLOG.replace('ten="40,8000,1"', 'ten="40,7000,1"'))
+    ippatsu = tmp_path / "c.mjlog"
+    ippatsu.write_text(MJLOG.replace('yaku="1,1,', 'yaku="1,1,2,1,'))
+    games = tmp_path / "d.jsonl"
+    games.write_text(json.dumps(_game(TSUMO_KYOKU, PON_KYOKU), ensure_ascii=False) + "\n")
+    return [mjlog, wrong, ippatsu, games]
+
+
+def test_score_wins_compares_with_the_log(tmp_path):
+    stats = ScoringStats()
+    results = list(score_wins(iter_wins(_write_logs(tmp_path)), stats))
+
+    assert [(r.han, r.fu, r.points) for r in results] == [(4, 40, 8000)] * 3 + [(2, 30, 3000), (2, 30, 2000)]
+    assert [r.disagrees for r in results] == [False, True, False, False, False]
+    # Ippatsu isn't part of the request, so the third can't match and isn't counted against us
+    assert not results[2].agrees
+    assert stats == ScoringStats(scored=5, agreed=3, disagreed=1, situational=1, errors=0)
+
+
+def test_hand_without_yaku_is_a_disagreement(tmp_path):
+    path = tmp_path / "a.mjlog"
+    # Not in riichi, so only the dora are left
+    path.write_text(MJLOG.replace('<REACH who="1" step="2"/>', ""))
+
+    stats = ScoringStats()
+    [result] = score_wins(iter_wins([path]), stats)
+
+    assert result.error is not None and result.disagrees
+    assert stats.errors == 1
+
+
+def test_parquet_writer_flushes_parts(tmp_path):
+    results = list(score_wins(iter_wins(_write_logs(tmp_path))))
+    output = tmp_path / "out"
+
+    with ParquetWriter(output, rows_per_part=2) as writer:
+        for result in results:
+            writer.write(result)
+
+    assert sorted(p.name for p in output.iterdir()) == [f"part-0000{i}.parquet" for i in range(3)]
+    frame = pl.read_parquet(output / "*.parquet")
+    assert frame.height == 5
+    assert frame["points"].to_list() == [8000, 8000, 8000, 3000, 2000]
+    assert frame["logged_points"].to_list() == [8000, 7000, 8000, 3000, 2000]
+    assert frame["melds"].to_list()[-1] == "pon:5z5z5z"
+
+
+def test_score_logs_in_worker_processes(tmp_path):
+    output = tmp_path / "out"
+    tasks = list(score_logs(_write_logs(tmp_path), output, workers=2, files_per_task=2))
+
+    assert [task.files for task in tasks] == [2, 2]
+    assert sum(task.scoring.scored for task in tasks) == 5
+    [disagreement] = [r for task in tasks for r in task.disagreements]
+    assert disagreement.win.source.endswith("b.mjlog")
+    assert pl.read_parquet(output / "*.parquet").height == 5
@@ -0,0 +1,27 @@
+from src.game_session.schemas import (
+    CreateSessionRequest,
+    LedgerEntryResponse,
+    SessionDrawRequest,
+    SessionHandResponse,
+    SessionLedgerResponse,
+    SessionStateResponse,
+    SessionWinRequest,
+)
+from src.game_session.session import WINDS, LedgerEntry, Session, SessionState, win_payments
+from src.game_session.store import SessionStore
+
+__all__ = [
+    "CreateSessionRequest",
+    "LedgerEntry",
+    "LedgerEntryResponse",
+    "Session",
+    "SessionDrawRequest",
+    "SessionHandResponse",
+    "SessionLedgerResponse",
+    "SessionState",
+    "SessionStateResponse",
+    "SessionStore",
+    "SessionWinRequest",
+    "WINDS",
+    "win_payments",
+]
@@ -0,0 +1,69 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field, model_validator
+
+from src.hand_calculation.schemas import HandEvaluationRequest, HandEvaluationResponse
+
+
+class CreateSessionRequest(BaseModel):
+    players: list[str] = Field(min_length=4, max_length=4)
+    length: Literal["east", "south"] = "south"
+
+
+class SessionWinRequest(BaseModel):
+    winner: int = Field(ge=0, le=3)
+    loser: int | None = Field(default=None, ge=0, le=3)  # None for tsumo
+    riichi: list[int] = Field(default_factory=list)  # seats that declared riichi this hand
+    # Winds and is_tsumo are filled in from the session
+    hand: HandEvaluationRequest
+
+    @model_validator(mode="after")
+    def _riichi_matches_hand(self) -> "SessionWinRequest":
+        if self.hand.is_riichi != (self.winner in self.riichi):
+            raise ValueError("hand.is_riichi must match whether the winner is listed in riichi")
+        return self
+
+
+class SessionDrawRequest(BaseModel):
+    tenpai: list[int] = Field(default_factory=list)
+    riichi: list[int] = Field(default_factory=list)
+
+
+class SessionStateResponse(BaseModel):
+    id: str
+    players: list[str]
+    length: Literal["east", "south"]
+    scores: list[int]
+    round_wind: str
+    round_number: int
+    dealer: int
+    honba: int
+    riichi_sticks: int
+    hands_played: int
+    finished: bool
+
+
+class LedgerEntryResponse(BaseModel):
+    sequence: int
+    kind: Literal["win", "draw"]
+    round_wind: str
+    round_number: int
+    honba: int
+    deltas: list[int]
+    winner: int | None
+    loser: int | None
+    riichi: list[int]
+    tenpai: list[int]
+
+
+class SessionHandResponse(BaseModel):
+    session: SessionStateResponse
+    entry: LedgerEntryResponse | None
+    evaluation: HandEvaluationResponse | None
+    error: str | None
+
+
+class SessionLedgerResponse(BaseModel):
+    entries: list[LedgerEntryResponse]
+    # Entries up to this sequence were compacted and are no longer listed
+    snapshot_sequence: int
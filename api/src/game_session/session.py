@@ -0,0 +1,266 @@
+import copy
+from dataclasses import dataclass, field
+from typing import Literal
+
+from src.hand_calculation.schemas import CostResult
+
+WINDS = ("east", "south", "west", "north")
+
+PLAYER_COUNT = 4
+STARTING_POINTS = 25000
+HONBA_RON_POINTS = 300  # paid by the discarder per honba stick
+HONBA_TSUMO_POINTS = 100  # paid by each other player per honba stick
+RIICHI_STICK_POINTS = 1000
+NOTEN_PENALTY = 3000  # total paid to tenpai players on an exhaustive draw
+
+GameLength = Literal["east", "south"]
+
+# Number of wind rounds in a game of each length
+ROUNDS_BY_LENGTH: dict[str, int] = {"east": 1, "south": 2}
+
+
+@dataclass
+class SessionState:
+    """Running totals and table position of a game."""
+
+    scores: list[int] = field(default_factory=lambda: [STARTING_POINTS] * PLAYER_COUNT)
+    round_wind: int = 0  # index into WINDS
+    dealer: int = 0  # seat of the dealer; seat 0 deals first
+    honba: int = 0
+    riichi_sticks: int = 0
+    hands_played: int = 0
+    finished: bool = False
+
+    @property
+    def round_number(self) -> int:
+        return self.dealer + 1
+
+    def seat_wind(self, seat: int) -> str:
+        return WINDS[(seat - self.dealer) % PLAYER_COUNT]
+
+
+@dataclass(frozen=True)
+class LedgerEntry:
+    """One recorded hand: the point movement and the table position after it.
+
+    Entries are self-contained, so applying one never needs earlier entries.
+    """
+
+    sequence: int
+    kind: Literal["win", "draw"]
+    round_wind: int  # table position the hand was played at
+    dealer: int
+    honba: int
+    deltas: tuple[int, ...]  # point change per seat, riichi deposits included
+    next_round_wind: int
+    next_dealer: int
+    next_honba: int
+    next_riichi_sticks: int
+    finished: bool
+    winner: int | None = None
+    loser: int | None = None  # None on tsumo
+    riichi: tuple[int, ...] = ()
+    tenpai: tuple[int, ...] = ()
+
+
+def apply_entry(state: SessionState, entry: LedgerEntry) -> None:
+    """Fold one ledger entry into the running state in place."""
+    for seat, delta in enumerate(entry.deltas):
+        state.scores[seat] += delta
+    state.round_wind = entry.next_round_wind
+    state.dealer = entry.next_dealer
+    state.honba = entry.next_honba
+    state.riichi_sticks = entry.next_riichi_sticks
+    state.hands_played += 1
+    state.finished = entry.finished
+
+
+def win_payments(
+    winner: int, loser: int | None, dealer: int, cost: CostResult, honba: int
+) -> list[int]:
+    """Point change per seat for a win, honba included and riichi sticks excluded.
+
+    For ron `cost.main` is paid by the discarder. For tsumo the dealer pays
+    `cost.main` and everyone else `cost.additional` (both are `main` when the
+    dealer wins), as returned by the mahjong library.
+    """
+    deltas = [0] * PLAYER_COUNT
+    if loser is not None:
+        payment = cost.main + HONBA_RON_POINTS * honba
+        deltas[loser] -= payment
+        deltas[winner] += payment
+        return deltas
+
+    for seat in range(PLAYER_COUNT):
+        if seat == winner:
+            continue
+        payment = (cost.main if seat == dealer else cost.additional) + HONBA_TSUMO_POINTS * honba
+        deltas[seat] -= payment
+        deltas[winner] += payment
+    return deltas
+
+
+def _validate_seats(seats: set[int], state: SessionState) -> None:
+    if state.finished:
+        raise ValueError("Session is finished")
+    for seat in seats:
+        if not 0 <= seat < PLAYER_COUNT:
+            raise ValueError(f"Invalid seat: {seat}")
+
+
+def _next_position(state: SessionState, dealer_keeps: bool, rounds: int) -> tuple[int, int, bool]:
+    """(round wind, dealer, finished) after a hand."""
+    if dealer_keeps:
+        return state.round_wind, state.dealer, False
+    dealer = (state.dealer + 1) % PLAYER_COUNT
+    round_wind = state.round_wind + (dealer == 0)
+    return round_wind, dealer, round_wind >= rounds
+
+
+def _deposit_riichi(deltas: list[int], riichi: set[int]) -> None:
+    for seat in riichi:
+        deltas[seat] -= RIICHI_STICK_POINTS
+
+
+def score_win(
+    state: SessionState,
+    sequence: int,
+    winner: int,
+    loser: int | None,
+    cost: CostResult,
+    riichi: set[int],
+    rounds: int,
+) -> LedgerEntry:
+    """Ledger entry for a won hand. The winner also collects every riichi stick on the table."""
+    _validate_seats({winner, *riichi} | ({loser} if loser is not None else set()), state)
+    if loser == winner:
+        raise ValueError("Winner and discarder must be different seats")
+
+    deltas = win_payments(winner, loser, state.dealer, cost, state.honba)
+    _deposit_riichi(deltas, riichi)
+    deltas[winner] += RIICHI_STICK_POINTS * (state.riichi_sticks + len(riichi))
+
+    dealer_keeps = winner == state.dealer
+    round_wind, dealer, finished = _next_position(state, dealer_keeps, rounds)
+    return LedgerEntry(
+        sequence=sequence,
+        kind="win",
+        round_wind=state.round_wind,
+        dealer=state.dealer,
+        honba=state.honba,
+        deltas=tuple(deltas),
+        next_round_wind=round_wind,
+        next_dealer=dealer,
+        next_honba=state.honba + 1 if dealer_keeps else 0,
+        next_riichi_sticks=0,
+        finished=finished or _has_busted(state, deltas),
+        winner=winner,
+        loser=loser,
+        riichi=tuple(sorted(riichi)),
+    )
+
+
+def score_draw(
+    state: SessionState,
+    sequence: int,
+    tenpai: set[int],
+    riichi: set[int],
+    rounds: int,
+) -> LedgerEntry:
+    """Ledger entry for an exhaustive draw. Riichi sticks stay on the table."""
+    _validate_seats(tenpai | riichi, state)
+    if not riichi <= tenpai:
+        raise ValueError("Players in riichi must be tenpai")
+
+    deltas = [0] * PLAYER_COUNT
+    if 0 < len(tenpai) < PLAYER_COUNT:
+        receive = NOTEN_PENALTY // len(tenpai)
+        pay = NOTEN_PENALTY // (PLAYER_COUNT - len(tenpai))
+        for seat in range(PLAYER_COUNT):
+            deltas[seat] = receive if seat in tenpai else -pay
+    _deposit_riichi(deltas, riichi)
+
+    round_wind, dealer, finished = _next_position(state, state.dealer in tenpai, rounds)
+    return LedgerEntry(
+        sequence=sequence,
+        kind="draw",
+        round_wind=state.round_wind,
+        dealer=state.dealer,
+        honba=state.honba,
+        deltas=tuple(deltas),
+        next_round_wind=round_wind,
+        next_dealer=dealer,
+        next_honba=state.honba + 1,
+        next_riichi_sticks=state.riichi_sticks + len(riichi),
+        finished=finished or _has_busted(state, deltas),
+        tenpai=tuple(sorted(tenpai)),
+        riichi=tuple(sorted(riichi)),
+    )
+
+
+def _has_busted(state: SessionState, deltas: list[int]) -> bool:
+    return any(score + delta < 0 for score, delta in zip(state.scores, deltas))
+
+
+class Session:
+    """A game's state plus the append-only ledger of hands since the last snapshot.
+
+    `state` is kept current by folding each new entry into it, so recording a
+    hand costs the same no matter how long the session is. `compact` moves the
+    snapshot forward and drops the entries it covers.
+    """
+
+    def __init__(self, session_id: str, players: list[str], length: GameLength = "south"):
+        if len(players) != PLAYER_COUNT:
+            raise ValueError(f"Expected {PLAYER_COUNT} players, got {len(players)}")
+        self.id = session_id
+        self.players = list(players)
+        self.length = length
+        self.state = SessionState()
+        self.snapshot = SessionState()
+        self.snapshot_sequence = 0  # number of entries folded into the snapshot
+        self.ledger: list[LedgerEntry] = []
+
+    @property
+    def rounds(self) -> int:
+        return ROUNDS_BY_LENGTH[self.length]
+
+    @property
+    def next_sequence(self) -> int:
+        return self.snapshot_sequence + len(self.ledger) + 1
+
+    def record_win(
+        self, winner: int, loser: int | None, cost: CostResult, riichi: set[int] = frozenset()
+    ) -> LedgerEntry:
+        entry = score_win(self.state, self.next_sequence, winner, loser, cost, set(riichi), self.rounds)
+        self.append(entry)
+        return entry
+
+    def record_draw(self, tenpai: set[int], riichi: set[int] = frozenset()) -> LedgerEntry:
+        entry = score_draw(self.state, self.next_sequence, set(tenpai), set(riichi), self.rounds)
+        self.append(entry)
+        return entry
+
+    def append(self, entry: LedgerEntry) -> None:
+        if entry.sequence != self.next_sequence:
+            raise ValueError(f"Expected ledger entry {self.next_sequence}, got {entry.sequence}")
+        self.ledger.append(entry)
+        apply_entry(self.state, entry)
+
+    def entries_since(self, sequence: int) -> list[LedgerEntry]:
+        """Ledger entries after `sequence` that haven't been compacted away."""
+        start = max(sequence - self.snapshot_sequence, 0)
+        return self.ledger[start:]
+
+    def compact(self) -> None:
+        """Fold the whole ledger into the snapshot."""
+        self.snapshot = copy.deepcopy(self.state)
+        self.snapshot_sequence += len(self.ledger)
+        self.ledger = []
+
+    def replay(self) -> SessionState:
+        """Rebuild the state from the snapshot and ledger, for verification."""
+        state = copy.deepcopy(self.snapshot)
+        for entry in self.ledger:
+            apply_entry(state, entry)
+        return state
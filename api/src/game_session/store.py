@@ -0,0 +1,111 @@
+import copy
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+
+from src.game_session.session import GameLength, LedgerEntry, Session, SessionState
+from src.hand_calculation.schemas import CostResult
+
+# Ledger length at which a session is compacted into its snapshot
+DEFAULT_COMPACT_AFTER = 256
+DEFAULT_MAX_SESSIONS = 10_000
+DEFAULT_IDLE_TTL = 24 * 60 * 60.0  # seconds without a read or write before a session is dropped
+
+
+class SessionStore:
+    """In-process session store.
+
+    Every operation holds one lock for a constant amount of work. Ledgers
+    longer than `compact_after` entries are folded into the session's
+    snapshot so memory stays bounded for long sessions. Sessions unused for
+    `idle_ttl` seconds are dropped, and past `max_sessions` the least
+    recently used one makes room for a new one.
+    """
+
+    def __init__(
+        self,
+        compact_after: int = DEFAULT_COMPACT_AFTER,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        idle_ttl: float = DEFAULT_IDLE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.compact_after = compact_after
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.clock = clock
+        self.evicted = 0
+        # Least recently used first, with the time each session was last used
+        self._sessions: OrderedDict[str, tuple[Session, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, players: list[str], length: GameLength = "south") -> Session:
+        session = Session(uuid.uuid4().hex, players, length)
+        with self._lock:
+            now = self.clock()
+            self._evict_idle(now)
+            while len(self._sessions) >= self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+            self._sessions[session.id] = (session, now)
+        return session
+
+    def get(self, session_id: str) -> Session:
+        """Raises KeyError for unknown or expired sessions."""
+        with self._lock:
+            return self._use(session_id)
+
+    def _use(self, session_id: str) -> Session:
+        """Look up a session and mark it used; call with the lock held."""
+        now = self.clock()
+        self._evict_idle(now)
+        session, _ = self._sessions[session_id]
+        self._sessions[session_id] = (session, now)
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def _evict_idle(self, now: float) -> None:
+        while self._sessions:
+            _, last_used = next(iter(self._sessions.values()))
+            if now - last_used < self.idle_ttl:
+                return
+            self._sessions.popitem(last=False)
+            self.evicted += 1
+
+    def record_win(
+        self,
+        session_id: str,
+        winner: int,
+        loser: int | None,
+        cost: CostResult,
+        riichi: set[int] = frozenset(),
+        expected_sequence: int | None = None,
+    ) -> LedgerEntry:
+        """Raises ValueError if `expected_sequence` is given and the ledger has moved past it."""
+        with self._lock:
+            session = self._use(session_id)
+            if expected_sequence is not None and session.next_sequence - 1 != expected_sequence:
+                raise ValueError("Session changed while the hand was being scored")
+            entry = session.record_win(winner, loser, cost, riichi)
+            self._maybe_compact(session)
+            return entry
+
+    def record_draw(
+        self, session_id: str, tenpai: set[int], riichi: set[int] = frozenset()
+    ) -> LedgerEntry:
+        with self._lock:
+            session = self._use(session_id)
+            entry = session.record_draw(tenpai, riichi)
+            self._maybe_compact(session)
+            return entry
+
+    def snapshot(self, session_id: str) -> tuple[SessionState, int]:
+        """A consistent copy of the session's current state and its ledger sequence."""
+        with self._lock:
+            session = self._use(session_id)
+            return copy.deepcopy(session.state), session.next_sequence - 1
+
+    def _maybe_compact(self, session: Session) -> None:
+        if len(session.ledger) > self.compact_after:
+            session.compact()
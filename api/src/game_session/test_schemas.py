@@ -0,0 +1,23 @@
+import pytest
+from pydantic import ValidationError
+
+from src.game_session.schemas import SessionWinRequest
+
+HAND = {
+    "tiles": ["1m", "2m", "3m", "4p", "5p", "6p", "7s", "8s", "9s", "2m", "3m", "4m", "1z", "1z"],
+    "win_tile_index": 13,
+    "is_tsumo": False,
+    "seat_wind": "east",
+    "round_wind": "east",
+}
+
+
+def test_riichi_winner_matches_hand():
+    request = SessionWinRequest(winner=1, loser=2, riichi=[1, 3], hand={**HAND, "is_riichi": True})
+    assert request.hand.is_riichi
+
+
+@pytest.mark.parametrize("is_riichi, riichi", [(True, []), (False, [1])])
+def test_riichi_mismatch_is_rejected(is_riichi, riichi):
+    with pytest.raises(ValidationError, match="is_riichi"):
+        SessionWinRequest(winner=1, loser=2, riichi=riichi, hand={**HAND, "is_riichi": is_riichi})
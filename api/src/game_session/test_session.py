@@ -0,0 +1,120 @@
+import pytest
+
+from src.game_session.session import Session, win_payments
+from src.hand_calculation.schemas import CostResult
+
+PLAYERS = ["A", "B", "C", "D"]
+
+
+def _session(length="south") -> Session:
+    return Session("s1", PLAYERS, length)
+
+
+class TestWinPayments:
+    def test_ron_with_honba(self):
+        deltas = win_payments(1, 2, 0, CostResult(main=3900, additional=0), honba=2)
+        assert deltas == [0, 4500, -4500, 0]
+
+    def test_non_dealer_tsumo(self):
+        deltas = win_payments(1, None, 0, CostResult(main=2000, additional=1000), honba=1)
+        assert deltas == [-2100, 4300, -1100, -1100]
+
+    def test_dealer_tsumo(self):
+        deltas = win_payments(0, None, 0, CostResult(main=4000, additional=4000), honba=0)
+        assert deltas == [12000, -4000, -4000, -4000]
+
+
+class TestSession:
+    def test_non_dealer_win_rotates_dealer(self):
+        session = _session()
+        entry = session.record_win(1, 2, CostResult(main=3900, additional=0))
+
+        assert entry.deltas == (0, 3900, -3900, 0)
+        assert session.state.scores == [25000, 28900, 21100, 25000]
+        assert session.state.dealer == 1
+        assert session.state.honba == 0
+        assert session.state.seat_wind(1) == "east"
+
+    def test_dealer_win_adds_honba(self):
+        session = _session()
+        session.record_win(0, 3, CostResult(main=2900, additional=0))
+
+        assert session.state.dealer == 0
+        assert session.state.honba == 1
+
+    def test_riichi_sticks_carry_over_draw_to_winner(self):
+        session = _session()
+        draw = session.record_draw({0, 2}, riichi={2})
+
+        assert draw.deltas == (1500, -1500, 500, -1500)
+        assert session.state.riichi_sticks == 1
+        assert session.state.honba == 1
+        assert session.state.dealer == 0  # dealer was tenpai
+
+        session.record_win(1, 0, CostResult(main=1000, additional=0), riichi={1})
+
+        # 1000 + 300 honba from the dealer, plus both sticks back (own deposit included)
+        assert session.state.scores == [25000 + 1500 - 1300, 25000 - 1500 + 1300 + 1000, 25500, 23500]
+        assert session.state.riichi_sticks == 0
+        assert session.state.honba == 0
+        assert sum(session.state.scores) == 100000
+
+    def test_dealer_noten_rotates(self):
+        session = _session()
+        session.record_draw({1})
+        assert session.state.scores == [24000, 28000, 24000, 24000]
+        assert session.state.dealer == 1
+
+    def test_riichi_requires_tenpai(self):
+        with pytest.raises(ValueError, match="must be tenpai"):
+            _session().record_draw({0}, riichi={1})
+
+    def test_east_game_finishes_after_fourth_dealer(self):
+        session = _session("east")
+        for _ in range(3):
+            session.record_draw(set())
+        assert not session.state.finished
+
+        session.record_draw(set())
+
+        assert session.state.finished
+        with pytest.raises(ValueError, match="finished"):
+            session.record_draw(set())
+
+    def test_south_round_follows_east(self):
+        session = _session()
+        for _ in range(4):
+            session.record_draw(set())
+        assert session.state.round_wind == 1
+        assert session.state.round_number == 1
+
+    def test_busting_player_finishes_game(self):
+        session = _session()
+        session.record_win(0, 1, CostResult(main=48000, additional=0))
+        assert session.state.finished
+
+    def test_winner_cannot_be_discarder(self):
+        with pytest.raises(ValueError, match="different seats"):
+            _session().record_win(1, 1, CostResult(main=1000, additional=0))
+
+    def test_compaction_preserves_state(self):
+        session = _session()
+        for seat in range(3):
+            session.record_win(seat, (seat + 1) % 4, CostResult(main=2000, additional=0))
+        state_before = session.state
+
+        session.compact()
+        session.record_draw({0})
+
+        assert session.ledger[0].sequence == 4
+        assert session.snapshot_sequence == 3
+        assert session.replay() == session.state
+        assert session.state is state_before
+        assert [e.sequence for e in session.entries_since(2)] == [4]
+
+    def test_replay_matches_incremental_state(self):
+        session = _session()
+        session.record_draw({0, 1}, riichi={0})
+        session.record_win(2, None, CostResult(main=2000, additional=1000))
+        session.record_win(3, 0, CostResult(main=8000, additional=0), riichi={3})
+        assert session.replay() == session.state
@@ -0,0 +1,76 @@
+import pytest
+
+from src.game_session.store import SessionStore
+from src.hand_calculation.schemas import CostResult
+
+
+class TestSessionStore:
+    def test_create_and_get(self):
+        store = SessionStore()
+        session = store.create(["A", "B", "C", "D"], "east")
+        assert store.get(session.id) is session
+
+    def test_unknown_session_raises(self):
+        with pytest.raises(KeyError):
+            SessionStore().get("missing")
+
+    def test_compacts_long_ledgers(self):
+        store = SessionStore(compact_after=4)
+        session = store.create(["A", "B", "C", "D"])
+
+        for _ in range(5):
+            store.record_win(session.id, 0, 1, CostResult(main=1000, additional=0))
+
+        assert session.ledger == []
+        assert session.snapshot_sequence == 5
+        assert session.state.hands_played == 5
+        assert session.state.honba == 5
+
+    def test_snapshot_is_a_copy(self):
+        store = SessionStore()
+        session = store.create(["A", "B", "C", "D"])
+        store.record_draw(session.id, {0})
+
+        state, sequence = store.snapshot(session.id)
+        store.record_draw(session.id, {0})
+
+        assert sequence == 1
+        assert state.honba == 1
+        assert session.state.honba == 2
+
+    def test_win_rejected_when_session_moved_on(self):
+        store = SessionStore()
+        session = store.create(["A", "B", "C", "D"])
+        _, sequence = store.snapshot(session.id)
+        store.record_win(session.id, 0, 1, CostResult(main=1000, additional=0), expected_sequence=sequence)
+
+        with pytest.raises(ValueError):
+            store.record_win(session.id, 0, 1, CostResult(main=1000, additional=0), expected_sequence=sequence)
+        assert session.state.hands_played == 1
+
+    def test_idle_sessions_expire(self):
+        now = [0.0]
+        store = SessionStore(idle_ttl=60, clock=lambda: now[0])
+        idle = store.create(["A", "B", "C", "D"])
+        active = store.create(["A", "B", "C", "D"])
+
+        now[0] = 50
+        store.get(active.id)
+        now[0] = 70
+
+        with pytest.raises(KeyError):
+            store.get(idle.id)
+        assert store.get(active.id) is active
+        assert store.evicted == 1
+
+    def test_least_recently_used_makes_room(self):
+        store = SessionStore(max_sessions=2)
+        first = store.create(["A", "B", "C", "D"])
+        second = store.create(["A", "B", "C", "D"])
+        store.record_draw(first.id, {0})
+
+        store.create(["A", "B", "C", "D"])
+
+        assert store.get(first.id) is first
+        with pytest.raises(KeyError):
+            store.get(second.id)
@@ -0,0 +1,9 @@
+from src.hand_assembly.assembly import Wind, assemble_hand, infer_melds
+from src.hand_assembly.schemas import PhotoEvaluationResponse
+
+__all__ = [
+    "assemble_hand",
+    "infer_melds",
+    "PhotoEvaluationResponse",
+    "Wind",
+]
@@ -0,0 +1,132 @@
+from typing import Literal
+
+from src.hand_calculation.schemas import HandEvaluationRequest, MeldInfo
+from src.tile import DetectedTile
+from src.tile_detection.decoding import decode_tiles
+from src.tile_detection.layout import Layout, analyze_layout
+
+Wind = Literal["east", "south", "west", "north"]
+
+HAND_SIZE = 14
+
+
+def _normalize(code: str) -> str:
+    """Red fives (0m/0p/0s) become their regular equivalent (5m/5p/5s)."""
+    return "5" + code[1:] if code.startswith("0") else code
+
+
+def _is_pon(a: str, b: str, c: str) -> bool:
+    return _normalize(a) == _normalize(b) == _normalize(c)
+
+
+def _is_chi(a: str, b: str, c: str) -> bool:
+    suits = {a[-1], b[-1], c[-1]}
+    if len(suits) != 1 or "z" in suits:
+        return False
+    nums = sorted(int(_normalize(code)[:-1]) for code in (a, b, c))
+    return nums[1] == nums[0] + 1 and nums[2] == nums[1] + 1
+
+
+def infer_melds(hand: list[str], rotated_indices: set[int]) -> tuple[list[MeldInfo], set[int]]:
+    """Infer called melds from the positions of rotated tiles.
+
+    Mirrors the hand editor's inference: each rotated tile marks the called
+    tile of one meld, and the first valid pon or chi among the 3-tile windows
+    containing it is taken, left to right, without overlap.
+
+    Returns the melds and the hand indices they use. Raises ValueError when a
+    rotated tile can't be part of any meld.
+    """
+    used: set[int] = set()
+    melds: list[MeldInfo] = []
+
+    for rotated in sorted(rotated_indices):
+        if rotated in used:
+            continue
+
+        for a, b, c in (
+            (rotated - 2, rotated - 1, rotated),
+            (rotated - 1, rotated, rotated + 1),
+            (rotated, rotated + 1, rotated + 2),
+        ):
+            if a < 0 or c >= len(hand) or used & {a, b, c}:
+                continue
+
+            tiles = [hand[a], hand[b], hand[c]]
+            if _is_pon(*tiles):
+                melds.append(MeldInfo(type="pon", tiles=tiles))
+            elif _is_chi(*tiles):
+                melds.append(MeldInfo(type="chi", tiles=tiles))
+            else:
+                continue
+            used |= {a, b, c}
+            break
+        else:
+            raise ValueError(f"No valid meld found for tile at position {rotated + 1}")
+
+    return melds, used
+
+
+def group_by_gaps(tiles: list[DetectedTile], layout: Layout | None = None) -> list[list[int]]:
+    """Groups of tile indices separated by wide gaps, row by row in reading order."""
+    layout = layout or analyze_layout(tiles)
+    return [group for row in layout.rows for group in row]
+
+
+def find_win_tile_index(tiles: list[DetectedTile], meld_indices: set[int], layout: Layout | None = None) -> int:
+    """Locate the winning tile in a row of 14 tiles.
+
+    Players usually set the winning tile apart from the hand, so the last
+    isolated, upright tile outside any meld is taken. Without one, the
+    rightmost concealed tile is used.
+    """
+    layout = layout or analyze_layout(tiles)
+    for group in reversed(group_by_gaps(tiles, layout)):
+        if len(group) == 1 and group[0] not in meld_indices and not layout.rotated[group[0]]:
+            return group[0]
+
+    concealed = [i for i in range(len(tiles)) if i not in meld_indices]
+    return concealed[-1]
+
+
+def select_hand_tiles(tiles: list[DetectedTile]) -> list[DetectedTile]:
+    """Keep the 14 most confident face-up tiles, in display order."""
+    face_tiles = [t for t in tiles if not t.is_back]
+    if len(face_tiles) < HAND_SIZE:
+        raise ValueError(f"Expected {HAND_SIZE} tiles, detected {len(face_tiles)}")
+
+    top = {id(t) for t in sorted(face_tiles, key=lambda t: t.confidence, reverse=True)[:HAND_SIZE]}
+    return [t for t in face_tiles if id(t) in top]
+
+
+def assemble_hand(
+    tiles: list[DetectedTile],
+    is_tsumo: bool,
+    seat_wind: Wind,
+    round_wind: Wind,
+    is_riichi: bool,
+    dora_count: int = 0,
+) -> HandEvaluationRequest:
+    """Build an evaluation request from sorted detections.
+
+    Raises ValueError when the detections don't form a 14-tile hand.
+    """
+    hand_tiles = decode_tiles(select_hand_tiles(tiles), require_complete=True)
+    codes = [t.code for t in hand_tiles]
+    # Sideways tiles relative to the row, so a tilted photo doesn't read as all rotated
+    layout = analyze_layout(hand_tiles)
+    rotated = {i for i, r in enumerate(layout.rotated) if r}
+
+    melds, meld_indices = infer_melds(codes, rotated)
+    win_tile_index = find_win_tile_index(hand_tiles, meld_indices, layout)
+
+    return HandEvaluationRequest(
+        tiles=codes,
+        win_tile_index=win_tile_index,
+        is_tsumo=is_tsumo,
+        seat_wind=seat_wind,
+        round_wind=round_wind,
+        is_riichi=is_riichi and not melds,
+        melds=melds,
+        dora_count=dora_count,
+    )
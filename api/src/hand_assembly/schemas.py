@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+from src.hand_calculation.schemas import HandEvaluationRequest, HandEvaluationResponse
+from src.tile_detection.schemas import TileDetectionResponse
+
+
+class PhotoEvaluationResponse(BaseModel):
+    detection: TileDetectionResponse
+    request: HandEvaluationRequest | None
+    evaluation: HandEvaluationResponse | None
+    error: str | None
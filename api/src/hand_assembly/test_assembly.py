@@ -0,0 +1,109 @@
+import pytest
+
+from src.hand_assembly.assembly import (
+    assemble_hand,
+    find_win_tile_index,
+    group_by_gaps,
+    infer_melds,
+    select_hand_tiles,
+)
+from src.tile import DetectedTile
+
+TILE_W = 40
+TILE_H = 60
+
+
+def _row(codes: list[str], gaps_before: dict[int, int] | None = None, rotated: set[int] = frozenset()):
+    """Lay tiles out left to right, with optional extra gaps and sideways tiles."""
+    gaps_before = gaps_before or {}
+    tiles = []
+    x = 0
+    for i, code in enumerate(codes):
+        x += gaps_before.get(i, 2)
+        if i in rotated:
+            bbox = (x, 20, x + TILE_H, 20 + TILE_W)
+            x += TILE_H
+        else:
+            bbox = (x, 0, x + TILE_W, TILE_H)
+            x += TILE_W
+        tiles.append(DetectedTile(code=code, confidence=0.9, bbox=bbox))
+    return tiles
+
+
+CLOSED_HAND = ["2m", "3m", "4m", "5p", "6p", "7p", "2s", "3s", "4s", "1z", "1z", "1z", "9m", "9m"]
+
+
+class TestInferMelds:
+    def test_no_rotated_tiles(self):
+        assert infer_melds(CLOSED_HAND, set()) == ([], set())
+
+    def test_pon_from_rotated_tile(self):
+        hand = ["1z", "1z", "1z", "2m"]
+        melds, used = infer_melds(hand, {0})
+        assert [(m.type, m.tiles) for m in melds] == [("pon", ["1z", "1z", "1z"])]
+        assert used == {0, 1, 2}
+
+    def test_chi_with_red_five(self):
+        hand = ["9m", "4p", "0p", "6p"]
+        melds, used = infer_melds(hand, {3})
+        assert [(m.type, m.tiles) for m in melds] == [("chi", ["4p", "0p", "6p"])]
+        assert used == {1, 2, 3}
+
+    def test_honors_cannot_chi(self):
+        with pytest.raises(ValueError, match="position 2"):
+            infer_melds(["1z", "2z", "3z"], {1})
+
+    def test_melds_do_not_overlap(self):
+        hand = ["1m", "2m", "3m", "4m", "5m", "6m"]
+        melds, _ = infer_melds(hand, {0, 3})
+        assert [m.tiles for m in melds] == [["1m", "2m", "3m"], ["4m", "5m", "6m"]]
+
+
+class TestGroupByGaps:
+    def test_splits_on_wide_gap(self):
+        tiles = _row(["1m", "2m", "3m", "4m"], gaps_before={3: 30})
+        assert group_by_gaps(tiles) == [[0, 1, 2], [3]]
+
+    def test_tight_row_is_one_group(self):
+        assert group_by_gaps(_row(["1m", "2m", "3m"])) == [[0, 1, 2]]
+
+
+class TestFindWinTileIndex:
+    def test_isolated_tile_is_win_tile(self):
+        tiles = _row(CLOSED_HAND, gaps_before={5: 30, 6: 30})
+        assert find_win_tile_index(tiles, set()) == 5
+
+    def test_defaults_to_rightmost_concealed_tile(self):
+        tiles = _row(CLOSED_HAND)
+        assert find_win_tile_index(tiles, {11, 12, 13}) == 10
+
+
+class TestSelectHandTiles:
+    def test_drops_backs_and_least_confident(self):
+        tiles = _row(CLOSED_HAND + ["0z", "5s"])
+        tiles[-1] = DetectedTile(code="5s", confidence=0.1, bbox=tiles[-1].bbox)
+        selected = select_hand_tiles(tiles)
+        assert [t.code for t in selected] == CLOSED_HAND
+
+    def test_too_few_tiles_raises(self):
+        with pytest.raises(ValueError, match="Expected 14 tiles, detected 13"):
+            select_hand_tiles(_row(CLOSED_HAND[:13]))
+
+
+class TestAssembleHand:
+    def test_closed_hand_with_separated_win_tile(self):
+        tiles = _row(CLOSED_HAND, gaps_before={13: 30})
+        request = assemble_hand(tiles, False, "east", "east", True)
+        assert request.tiles == CLOSED_HAND
+        assert request.win_tile_index == 13
+        assert request.melds == []
+        assert request.is_riichi is True
+
+    def test_open_hand_drops_riichi(self):
+        codes = ["2m", "3m", "4m", "5p", "6p", "7p", "2s", "3s", "4s", "9m", "9m", "1z", "1z", "1z"]
+        tiles = _row(codes, gaps_before={11: 30}, rotated={11})
+        request = assemble_hand(tiles, False, "east", "east", True, dora_count=1)
+        assert [(m.type, m.tiles) for m in request.melds] == [("pon", ["1z", "1z", "1z"])]
+        assert request.win_tile_index == 10
+        assert request.is_riichi is False
+        assert request.dora_count == 1
@@ -1,8 +1,13 @@
 from src.hand_calculation.calculation import evaluate_hand
+from src.hand_calculation.pool import ScoringError, ScoringPool, ScoringTimeout, resolve_scoring_workers
 from src.hand_calculation.schemas import HandEvaluationRequest, HandEvaluationResponse
 
 __all__ = [
     "evaluate_hand",
+    "resolve_scoring_workers",
+    "ScoringError",
+    "ScoringPool",
+    "ScoringTimeout",
     "HandEvaluationRequest",
     "HandEvaluationResponse",
 ]
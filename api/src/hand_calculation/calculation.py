@@ -1,9 +1,12 @@
+import functools
+
 from mahjong.constants import EAST, NORTH, SOUTH, WEST
 from mahjong.hand_calculating.hand import HandCalculator
 from mahjong.hand_calculating.hand_config import HandConfig, OptionalRules
 from mahjong.hand_calculating.scores import ScoresCalculator
 from mahjong.meld import Meld
 
+from src.hand_calculation.divider_index import IndexedHandDivider, load_index
 from src.hand_calculation.schemas import (
     CostResult,
     HandEvaluationRequest,
@@ -75,6 +78,8 @@ MELD_TYPE_MAP = {
 }
 
 _calculator = HandCalculator()
+# Decompositions come from the precomputed index when it has been built
+_calculator.divider = IndexedHandDivider(load_index())
 
 
 def _build_melds(meld_infos: list[MeldInfo]) -> list[Meld]:
@@ -91,6 +96,18 @@ def _build_melds(meld_infos: list[MeldInfo]) -> list[Meld]:
     return melds
 
 
+@functools.cache
+def _hand_config(is_tsumo: bool, is_riichi: bool, player_wind: int, round_wind: int) -> HandConfig:
+    """Configs are shared: building one sets up the whole yaku table, a large part of an evaluation."""
+    return HandConfig(
+        is_tsumo=is_tsumo,
+        is_riichi=is_riichi,
+        player_wind=player_wind,
+        round_wind=round_wind,
+        options=OptionalRules(has_aka_dora=True, has_open_tanyao=True),
+    )
+
+
 def evaluate_hand(request: HandEvaluationRequest) -> HandEvaluationResponse:
     """Evaluate a mahjong hand and return han, fu, yaku, and cost."""
     tiles_136 = tile_codes_to_136(request.tiles)
@@ -99,12 +116,11 @@ def evaluate_hand(request: HandEvaluationRequest) -> HandEvaluationResponse:
     melds = _build_melds(request.melds)
     is_open_hand = len(melds) > 0
 
-    config = HandConfig(
-        is_tsumo=request.is_tsumo,
-        is_riichi=request.is_riichi if not is_open_hand else False,
-        player_wind=WIND_MAP[request.seat_wind],
-        round_wind=WIND_MAP[request.round_wind],
-        options=OptionalRules(has_aka_dora=True, has_open_tanyao=True),
+    config = _hand_config(
+        request.is_tsumo,
+        request.is_riichi and not is_open_hand,
+        WIND_MAP[request.seat_wind],
+        WIND_MAP[request.round_wind],
     )
 
     result = _calculator.estimate_hand_value(
@@ -0,0 +1,205 @@
+"""Precomputed hand decompositions, looked up instead of searched.
+
+A hand's decompositions factor by suit: each suit's tiles must split into
+sets (plus at most one pair) on their own, and honors can only form pairs
+and triplets. The generator enumerates every suit shape that decomposes,
+keyed by its 9 tile counts in base 5, and writes the decompositions to
+memory-mapped .npy arrays. IndexedHandDivider combines the per-suit entries
+into the same output as mahjong's HandDivider.
+
+Build the index with:
+
+    python -m src.hand_calculation.divider_index
+"""
+
+import itertools
+import pathlib
+from collections import defaultdict
+from collections.abc import Collection, Sequence
+from functools import lru_cache
+
+import numpy as np
+from mahjong.hand_calculating.divider import HandDivider
+from mahjong.meld import Meld
+
+DEFAULT_INDEX_DIR = pathlib.Path(__file__).parent / "data" / "divider_index"
+
+# Block codes within a suit: kind * 9 + start tile (0-8)
+SEQUENCE, TRIPLET, PAIR = 0, 1, 2
+MAX_BLOCKS = 5  # 4 sets and a pair
+EMPTY_SLOT = 255
+
+_SUIT_BASES = (0, 9, 18)
+_HONOR_BASE = 27
+
+
+def suit_key(counts: Sequence[int]) -> int:
+    """Compact base-5 hash of a suit's 9 tile counts."""
+    key = 0
+    for count in reversed(counts):
+        key = key * 5 + count
+    return key
+
+
+def build_suit_table() -> dict[int, list[tuple[int, ...]]]:
+    """Enumerate every suit shape made of up to 4 sets and at most one pair."""
+    sets = [SEQUENCE * 9 + start for start in range(7)] + [TRIPLET * 9 + start for start in range(9)]
+    table: dict[int, list[tuple[int, ...]]] = defaultdict(list)
+
+    for n in range(5):
+        for combo in itertools.combinations_with_replacement(sets, n):
+            counts = [0] * 9
+            for code in combo:
+                kind, start = divmod(code, 9)
+                if kind == SEQUENCE:
+                    for offset in range(3):
+                        counts[start + offset] += 1
+                else:
+                    counts[start] += 3
+            if max(counts) > 4:
+                continue
+
+            table[suit_key(counts)].append(combo)
+            for pair in range(9):
+                if counts[pair] + 2 <= 4:
+                    with_pair = counts.copy()
+                    with_pair[pair] += 2
+                    table[suit_key(with_pair)].append((PAIR * 9 + pair, *combo))
+
+    return dict(table)
+
+
+def write_index(index_dir: pathlib.Path = DEFAULT_INDEX_DIR) -> int:
+    """Generate the index files. Returns the number of suit shapes stored."""
+    table = build_suit_table()
+    keys = np.array(sorted(table), dtype=np.uint32)
+
+    offsets = np.zeros(len(keys) + 1, dtype=np.uint32)
+    rows: list[list[int]] = []
+    for i, key in enumerate(keys):
+        for blocks in table[int(key)]:
+            rows.append(list(blocks) + [EMPTY_SLOT] * (MAX_BLOCKS - len(blocks)))
+        offsets[i + 1] = len(rows)
+
+    index_dir.mkdir(parents=True, exist_ok=True)
+    np.save(index_dir / "keys.npy", keys)
+    np.save(index_dir / "offsets.npy", offsets)
+    np.save(index_dir / "blocks.npy", np.array(rows, dtype=np.uint8))
+    return len(keys)
+
+
+class DividerIndex:
+    """Memory-mapped suit shape → decompositions lookup."""
+
+    def __init__(self, index_dir: pathlib.Path = DEFAULT_INDEX_DIR):
+        self.keys = np.load(index_dir / "keys.npy", mmap_mode="r")
+        self.offsets = np.load(index_dir / "offsets.npy", mmap_mode="r")
+        self.blocks = np.load(index_dir / "blocks.npy", mmap_mode="r")
+        self.lookup = lru_cache(maxsize=4096)(self._lookup)
+
+    def _lookup(self, key: int) -> tuple[tuple[int, ...], ...]:
+        pos = int(np.searchsorted(self.keys, key))
+        if pos == len(self.keys) or int(self.keys[pos]) != key:
+            return ()
+        rows = self.blocks[self.offsets[pos] : self.offsets[pos + 1]]
+        return tuple(tuple(int(code) for code in row if code != EMPTY_SLOT) for row in rows)
+
+
+def load_index(index_dir: pathlib.Path = DEFAULT_INDEX_DIR) -> DividerIndex | None:
+    """Open the index, or None when it hasn't been generated."""
+    if not (index_dir / "keys.npy").exists():
+        return None
+    return DividerIndex(index_dir)
+
+
+def _block_tiles(code: int, base: int) -> list[int]:
+    kind, start = divmod(code, 9)
+    tile = base + start
+    if kind == SEQUENCE:
+        return [tile, tile + 1, tile + 2]
+    if kind == TRIPLET:
+        return [tile, tile, tile]
+    return [tile, tile]
+
+
+class IndexedHandDivider(HandDivider):
+    """HandDivider that answers from the precomputed index.
+
+    Output matches HandDivider.divide_hand exactly, including block order.
+    Falls back to the library's search when no index is loaded.
+    """
+
+    def __init__(self, index: DividerIndex | None):
+        super().__init__()
+        self.index = index
+
+    def divide_hand(
+        self,
+        tiles_34: Sequence[int],
+        melds: Collection[Meld] | None = None,
+        use_cache: bool = False,
+    ) -> list[list[list[int]]]:
+        if self.index is None:
+            return super().divide_hand(tiles_34, melds, use_cache)
+
+        melds = melds or []
+        closed = list(tiles_34)
+        for meld in melds:
+            for tile in meld.tiles_34:
+                closed[tile] -= 1
+        if any(count < 0 or count > 4 for count in closed):
+            return super().divide_hand(tiles_34, melds, use_cache)
+
+        hands = self._standard_hands(closed, melds)
+
+        # Seven pairs, counted the way the library does (honor pairs must be exactly 2)
+        pair_tiles = [
+            i for i, count in enumerate(closed) if count >= 2 and (i < _HONOR_BASE or count == 2)
+        ]
+        if len(pair_tiles) == 7:
+            hands.append([[i, i] for i in pair_tiles])
+
+        return sorted(hands)
+
+    def _standard_hands(self, closed: list[int], melds: Collection[Meld]) -> list[list[list[int]]]:
+        assert self.index is not None
+
+        honor_pair: list[list[int]] = []
+        honor_sets: list[list[int]] = []
+        for tile in range(_HONOR_BASE, 34):
+            if closed[tile] == 2:
+                honor_pair.append([tile, tile])
+            elif closed[tile] == 3:
+                honor_sets.append([tile, tile, tile])
+            elif closed[tile]:
+                return []
+
+        man, pin, sou = (self.index.lookup(suit_key(closed[base : base + 9])) for base in _SUIT_BASES)
+        if not (man and pin and sou):
+            return []
+
+        hands = []
+        for man_blocks, pin_blocks, sou_blocks in itertools.product(man, pin, sou):
+            pairs = list(honor_pair)
+            sets: dict[int, list[list[int]]] = {}
+            for base, blocks in ((0, man_blocks), (9, pin_blocks), (18, sou_blocks)):
+                sets[base] = []
+                for code in blocks:
+                    target = pairs if code // 9 == PAIR else sets[base]
+                    target.append(_block_tiles(code, base))
+            if len(pairs) != 1:
+                continue
+
+            # Same assembly order as the library so its stable sorts give identical output
+            hand = [*pairs, *sets[18], *sets[0], *sets[9], *honor_sets, *(m.tiles_34 for m in melds)]
+            if len(hand) != 5:
+                continue
+            hand = sorted(hand, key=lambda block: block[0])
+            hands.append(sorted(hand, key=lambda block: (block[0], block[1])))
+
+        return hands
+
+
+if __name__ == "__main__":
+    count = write_index()
+    print(f"Wrote {count} suit shapes to {DEFAULT_INDEX_DIR}")
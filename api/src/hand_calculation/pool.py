@@ -0,0 +1,136 @@
+import asyncio
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing import get_context
+
+from src.hand_calculation.calculation import evaluate_hand
+from src.hand_calculation.schemas import HandEvaluationRequest, HandEvaluationResponse
+
+DEFAULT_WORKERS = 2
+DEFAULT_TIMEOUT = 2.0
+# Evaluations admitted per worker; further callers wait for a slot
+DEFAULT_PENDING_PER_WORKER = 4
+
+# Scored once in each new worker so the calculator and divider index are warm before real work
+_WARM_UP_REQUEST = HandEvaluationRequest(
+    tiles=["1m", "2m", "3m", "4p", "5p", "6p", "7s", "8s", "9s", "2m", "3m", "4m", "1z", "1z"],
+    win_tile_index=13,
+    is_tsumo=True,
+    seat_wind="east",
+    round_wind="east",
+    is_riichi=True,
+)
+
+
+class ScoringError(Exception):
+    pass
+
+
+class ScoringTimeout(ScoringError, TimeoutError):
+    pass
+
+
+def resolve_scoring_workers(workers: int | None = None) -> int:
+    """Worker count: explicit value, then SCORING_WORKERS, then DEFAULT_WORKERS capped at the CPU count.
+
+    Zero evaluates inline on the calling thread.
+    """
+    if workers is not None:
+        return workers
+    env_workers = os.environ.get("SCORING_WORKERS")
+    if env_workers:
+        return int(env_workers)
+    return min(DEFAULT_WORKERS, os.cpu_count() or 1)
+
+
+def _init_worker() -> None:
+    evaluate_hand(_WARM_UP_REQUEST)
+
+
+def _ready() -> None:
+    pass
+
+
+@dataclass
+class ScoringPoolStats:
+    evaluated: int = 0
+    timeouts: int = 0
+    retried: int = 0  # calls resubmitted after their pool was recycled under them
+    recycled: int = 0
+
+
+class ScoringPool:
+    """Hand evaluation in worker processes, off the event loop and the API's GIL.
+
+    Each worker imports the calculator once and warms it up. At most
+    `max_pending` evaluations are in flight; the rest wait on a semaphore.
+    A call that runs past `timeout` raises ScoringTimeout, and since a
+    running evaluation can't be interrupted, the pool is replaced and the
+    old workers are killed. Calls that were running on the killed pool are
+    retried once on the new one, then fail with ScoringError. With `workers=0` evaluation runs inline.
+    """
+
+    def __init__(self, workers: int, timeout: float = DEFAULT_TIMEOUT, max_pending: int | None = None):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_pending = max_pending or max(workers, 1) * DEFAULT_PENDING_PER_WORKER
+        self.stats = ScoringPoolStats()
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._warming: list[Future] = []
+        self._executor = self._start() if workers > 0 else None
+
+    def _start(self) -> ProcessPoolExecutor:
+        executor = ProcessPoolExecutor(self.workers, mp_context=get_context("spawn"), initializer=_init_worker)
+        # Workers are spawned on demand; start them all now rather than on the first requests
+        self._warming = [executor.submit(_ready) for _ in range(self.workers)]
+        return executor
+
+    def _recycle(self, executor: ProcessPoolExecutor) -> None:
+        if executor is not self._executor:
+            return  # another call already replaced it
+        self._executor = self._start()
+        self.stats.recycled += 1
+        # ProcessPoolExecutor has no public way to stop a running task
+        for process in list(executor._processes.values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _submit(self, request: HandEvaluationRequest) -> HandEvaluationResponse:
+        executor = self._executor
+        assert executor is not None
+        # Worker start-up doesn't count against the timeout
+        await asyncio.wait([asyncio.wrap_future(f) for f in self._warming])
+        try:
+            future = asyncio.wrap_future(executor.submit(evaluate_hand, request))
+            return await asyncio.wait_for(future, self.timeout)
+        except TimeoutError:
+            self.stats.timeouts += 1
+            self._recycle(executor)
+            raise ScoringTimeout(f"Hand evaluation took longer than {self.timeout}s") from None
+        except BrokenProcessPool:
+            # Killed by another call's timeout, or a worker crashed
+            self._recycle(executor)
+            raise
+
+    async def evaluate(self, request: HandEvaluationRequest) -> HandEvaluationResponse:
+        if self._executor is None:
+            result = evaluate_hand(request)
+        else:
+            async with self._slots:
+                try:
+                    result = await self._submit(request)
+                except BrokenProcessPool:
+                    self.stats.retried += 1
+                    try:
+                        result = await self._submit(request)
+                    except BrokenProcessPool as e:
+                        raise ScoringError("Scoring workers are unavailable") from e
+        self.stats.evaluated += 1
+        return result
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
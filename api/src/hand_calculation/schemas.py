@@ -1,15 +1,47 @@
-from typing import Literal
+from typing import Annotated, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import AfterValidator, BaseModel, Field
+from pydantic_core import PydanticCustomError
+
+from src.tile import CODE_TO_34, MAX_COPIES, RED_FIVES
+
+
+def check_tiles(tiles: list[str]) -> list[str]:
+    """Reject unknown codes, a fifth copy of a tile or a second red five, in one pass.
+
+    Runs during request validation, so a bad hand is a 422 naming the
+    offending tile rather than an error from inside the calculator.
+    """
+    counts = [0] * 34
+    reds: set[str] = set()
+    for position, code in enumerate(tiles):
+        index = CODE_TO_34.get(code)
+        if index is None:
+            raise PydanticCustomError(
+                "tile_code", "Unknown tile code {code!r} at position {position}", {"code": code, "position": position}
+            )
+        counts[index] += 1
+        if counts[index] > MAX_COPIES:
+            raise PydanticCustomError(
+                "tile_count", "More than {limit} copies of {code}", {"code": code, "limit": MAX_COPIES}
+            )
+        if code in RED_FIVES:
+            if code in reds:
+                raise PydanticCustomError("tile_count", "More than one red five {code}", {"code": code, "limit": 1})
+            reds.add(code)
+    return tiles
+
+
+TileCodes = Annotated[list[str], AfterValidator(check_tiles)]
 
 
 class MeldInfo(BaseModel):
     type: Literal["chi", "pon"]
-    tiles: list[str] = Field(min_length=3, max_length=3)
+    tiles: TileCodes = Field(min_length=3, max_length=3)
 
 
 class HandEvaluationRequest(BaseModel):
-    tiles: list[str] = Field(min_length=14, max_length=14)
+    tiles: TileCodes = Field(min_length=14, max_length=14)
     win_tile_index: int = Field(ge=0, le=13)
     is_tsumo: bool
     seat_wind: Literal["east", "south", "west", "north"]
@@ -18,6 +50,19 @@ class HandEvaluationRequest(BaseModel):
     melds: list[MeldInfo] = Field(default_factory=list)
     dora_count: int = Field(default=0, ge=0)
 
+    def canonical_key(self) -> tuple:
+        """Equal for requests that score the same: tile order only matters for the winning tile."""
+        return (
+            tuple(sorted(self.tiles)),
+            self.tiles[self.win_tile_index],
+            self.is_tsumo,
+            self.seat_wind,
+            self.round_wind,
+            self.is_riichi,
+            tuple(sorted((meld.type, tuple(sorted(meld.tiles))) for meld in self.melds)),
+            self.dora_count,
+        )
+
 
 class YakuResult(BaseModel):
     name: str
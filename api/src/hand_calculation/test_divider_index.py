@@ -0,0 +1,72 @@
+import pytest
+from mahjong.hand_calculating.divider import HandDivider
+from mahjong.meld import Meld
+from mahjong.tile import TilesConverter
+
+from src.hand_calculation.divider_index import (
+    IndexedHandDivider,
+    build_suit_table,
+    load_index,
+    suit_key,
+    write_index,
+)
+
+
+@pytest.fixture(scope="module")
+def indexed_divider(tmp_path_factory):
+    index_dir = tmp_path_factory.mktemp("divider_index")
+    write_index(index_dir)
+    return IndexedHandDivider(load_index(index_dir))
+
+
+def _hand(man="", pin="", sou="", honors=""):
+    return TilesConverter.string_to_34_array(man=man, pin=pin, sou=sou, honors=honors)
+
+
+def _meld(meld_type, **tiles):
+    return Meld(meld_type=meld_type, tiles=TilesConverter.string_to_136_array(**tiles), opened=True)
+
+
+class TestSuitTable:
+    def test_suit_key_is_base_5(self):
+        assert suit_key([1, 0, 0, 0, 0, 0, 0, 0, 0]) == 1
+        assert suit_key([0, 2, 0, 0, 0, 0, 0, 0, 0]) == 10
+
+    def test_empty_suit_has_one_empty_decomposition(self):
+        assert build_suit_table()[0] == [()]
+
+    def test_multiple_decompositions_for_one_shape(self):
+        # 111222333 is three triplets or three identical sequences
+        assert len(build_suit_table()[suit_key([3, 3, 3, 0, 0, 0, 0, 0, 0])]) == 2
+
+
+class TestIndexedHandDivider:
+    @pytest.mark.parametrize(
+        "tiles_34",
+        [
+            _hand(man="234567", sou="23455", honors="777"),
+            _hand(man="11122233388899"),
+            _hand(man="11223344556677"),  # ryanpeikou and chiitoitsu
+            _hand(man="1133", pin="5577", sou="99", honors="1122"),  # chiitoitsu only
+            _hand(man="19", pin="19", sou="19", honors="12345677"),  # kokushi has no blocks
+            _hand(man="123", pin="456", sou="789", honors="11123"),  # not a winning hand
+        ],
+    )
+    def test_matches_library(self, indexed_divider, tiles_34):
+        assert indexed_divider.divide_hand(tiles_34) == HandDivider().divide_hand(tiles_34)
+
+    def test_matches_library_with_melds(self, indexed_divider):
+        tiles_34 = _hand(pin="234777888999", honors="22")
+        melds = [_meld(Meld.CHI, pin="789"), _meld(Meld.CHI, pin="234")]
+
+        result = indexed_divider.divide_hand(tiles_34, melds)
+
+        assert result == HandDivider().divide_hand(tiles_34, melds)
+        assert result == [[[10, 11, 12], [15, 16, 17], [15, 16, 17], [15, 16, 17], [28, 28]]]
+
+    def test_falls_back_without_index(self):
+        tiles_34 = _hand(man="11122233388899")
+        assert IndexedHandDivider(None).divide_hand(tiles_34) == HandDivider().divide_hand(tiles_34)
+
+    def test_missing_index_loads_as_none(self, tmp_path):
+        assert load_index(tmp_path) is None
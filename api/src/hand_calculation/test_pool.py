@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from src.hand_calculation.calculation import evaluate_hand
+from src.hand_calculation.pool import ScoringPool, ScoringTimeout, resolve_scoring_workers
+from src.hand_calculation.schemas import HandEvaluationRequest
+
+REQUEST = HandEvaluationRequest(
+    tiles=["2m", "3m", "4m", "3p", "4p", "5p", "6s", "7s", "8s", "2p", "2p", "5m", "6m", "7m"],
+    win_tile_index=13,
+    is_tsumo=False,
+    seat_wind="south",
+    round_wind="east",
+    is_riichi=True,
+)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    # Created outside a running loop, like the app's lifespan does before serving
+    pool = ScoringPool(workers=1, timeout=30.0, max_pending=2)
+    yield pool
+    pool.close()
+
+
+def test_inline_pool_matches_evaluate_hand():
+    pool = ScoringPool(workers=0)
+    assert asyncio.run(pool.evaluate(REQUEST)) == evaluate_hand(REQUEST)
+    assert pool.stats.evaluated == 1
+
+
+def test_worker_result_matches_evaluate_hand(pool):
+    assert asyncio.run(pool.evaluate(REQUEST)) == evaluate_hand(REQUEST)
+
+
+def test_concurrent_calls_beyond_max_pending_all_complete(pool):
+    async def run():
+        return await asyncio.gather(*(pool.evaluate(REQUEST) for _ in range(6)))
+
+    results = asyncio.run(run())
+    assert all(result == evaluate_hand(REQUEST) for result in results)
+
+
+def test_timeout_recycles_pool(pool):
+    recycled = pool.stats.recycled
+    pool.timeout = 1e-6
+    try:
+        with pytest.raises(ScoringTimeout):
+            asyncio.run(pool.evaluate(REQUEST))
+    finally:
+        pool.timeout = 30.0
+
+    assert pool.stats.recycled == recycled + 1
+    assert pool.stats.timeouts >= 1
+    assert asyncio.run(pool.evaluate(REQUEST)) == evaluate_hand(REQUEST)
+
+
+def test_resolve_scoring_workers(monkeypatch):
+    monkeypatch.setenv("SCORING_WORKERS", "3")
+    assert resolve_scoring_workers() == 3
+    assert resolve_scoring_workers(0) == 0
+    monkeypatch.delenv("SCORING_WORKERS")
+    assert resolve_scoring_workers() >= 1
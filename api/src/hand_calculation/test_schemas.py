@@ -1,12 +1,14 @@
 import pytest
 from pydantic import ValidationError
 
-from src.hand_calculation.schemas import HandEvaluationRequest
+from src.hand_calculation.schemas import HandEvaluationRequest, MeldInfo
+
+HAND = ["1m", "2m", "3m", "4p", "5p", "6p", "7s", "8s", "9s", "2m", "3m", "4m", "1z", "1z"]
 
 
 def test_valid_request():
     req = HandEvaluationRequest(
-        tiles=["1m"] * 14,
+        tiles=HAND,
         win_tile_index=0,
         is_tsumo=False,
         seat_wind="east",
@@ -20,7 +22,7 @@ def test_valid_request():
 def test_too_few_tiles():
     with pytest.raises(ValidationError):
         HandEvaluationRequest(
-            tiles=["1m"] * 13,
+            tiles=HAND[:13],
             win_tile_index=0,
             is_tsumo=False,
             seat_wind="east",
@@ -32,7 +34,7 @@ def test_too_few_tiles():
 def test_too_many_tiles():
     with pytest.raises(ValidationError):
         HandEvaluationRequest(
-            tiles=["1m"] * 15,
+            tiles=HAND + ["5z"],
             win_tile_index=0,
             is_tsumo=False,
             seat_wind="east",
@@ -44,7 +46,7 @@ def test_too_many_tiles():
 def test_win_tile_index_out_of_range():
     with pytest.raises(ValidationError):
         HandEvaluationRequest(
-            tiles=["1m"] * 14,
+            tiles=HAND,
             win_tile_index=14,
             is_tsumo=False,
             seat_wind="east",
@@ -56,10 +58,78 @@ def test_win_tile_index_out_of_range():
 def test_invalid_wind():
     with pytest.raises(ValidationError):
         HandEvaluationRequest(
-            tiles=["1m"] * 14,
+            tiles=HAND,
             win_tile_index=0,
             is_tsumo=False,
             seat_wind="northeast",
             round_wind="east",
             is_riichi=False,
         )
+
+
+def _hand(tiles: list[str], win_tile_index: int = 13) -> HandEvaluationRequest:
+    return HandEvaluationRequest(
+        tiles=tiles,
+        win_tile_index=win_tile_index,
+        is_tsumo=False,
+        seat_wind="east",
+        round_wind="east",
+        is_riichi=True,
+    )
+
+
+def test_canonical_key_ignores_tile_order():
+    tiles = ["2m", "3m", "4m", "3p", "4p", "5p", "6s", "7s", "8s", "2p", "2p", "5m", "6m", "7m"]
+    reordered = tiles[:13][::-1] + tiles[13:]
+    assert _hand(tiles).canonical_key() == _hand(reordered).canonical_key()
+
+
+def test_canonical_key_depends_on_winning_tile():
+    tiles = ["2m", "3m", "4m", "3p", "4p", "5p", "6s", "7s", "8s", "2p", "2p", "5m", "6m", "7m"]
+    assert _hand(tiles).canonical_key() != _hand(tiles, win_tile_index=0).canonical_key()
+
+
+def _tile_error(tiles: list[str]) -> dict:
+    with pytest.raises(ValidationError) as exc_info:
+        _hand(tiles)
+    [error] = exc_info.value.errors()
+    assert error["loc"] == ("tiles",)
+    return error
+
+
+def test_unknown_tile_code():
+    error = _tile_error(HAND[:5] + ["5x"] + HAND[6:])
+    assert error["type"] == "tile_code"
+    assert error["ctx"] == {"code": "5x", "position": 5}
+
+
+def test_tile_backs_are_not_hand_tiles():
+    assert _tile_error(HAND[:13] + ["0z"])["type"] == "tile_code"
+
+
+def test_fifth_copy_is_rejected():
+    error = _tile_error(["1m"] * 5 + HAND[5:])
+    assert error["type"] == "tile_count"
+    assert error["ctx"]["code"] == "1m"
+
+
+def test_red_five_counts_towards_its_tile():
+    tiles = ["5p", "5p", "5p", "5p", "0p"] + HAND[5:]
+    assert _tile_error(tiles)["type"] == "tile_count"
+
+
+def test_second_red_five_is_rejected():
+    tiles = ["0m", "0m"] + HAND[2:]
+    error = _tile_error(tiles)
+    assert error["type"] == "tile_count"
+    assert error["ctx"] == {"code": "0m", "limit": 1}
+
+
+def test_red_fives_of_different_suits():
+    assert _hand(["0m", "0p", "0s"] + HAND[3:]).tiles[:3] == ["0m", "0p", "0s"]
+
+
+def test_meld_tiles_are_checked():
+    with pytest.raises(ValidationError) as exc_info:
+        MeldInfo(type="pon", tiles=["1m", "1m", "m1"])
+    assert exc_info.value.errors()[0]["type"] == "tile_code"
@@ -0,0 +1,20 @@
+from src.jobs.runner import JobRunner, JobRunnerStats, resolve_job_workers
+from src.jobs.schemas import MAX_JOB_EVALUATIONS, MAX_JOB_IMAGES, EvaluationJobRequest, JobResponse
+from src.jobs.store import JobItem, JobResult, JobState, JobStore, resolve_jobs_dir
+from src.jobs.stream import stream_results
+
+__all__ = [
+    "EvaluationJobRequest",
+    "MAX_JOB_EVALUATIONS",
+    "MAX_JOB_IMAGES",
+    "JobItem",
+    "JobResponse",
+    "JobResult",
+    "JobRunner",
+    "JobRunnerStats",
+    "JobState",
+    "JobStore",
+    "resolve_job_workers",
+    "resolve_jobs_dir",
+    "stream_results",
+]
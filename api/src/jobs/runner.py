@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import os
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from src.jobs.store import JobItem, JobStore
+
+logger = logging.getLogger(__name__)
+
+# How long a worker waits before looking again when interactive requests hold back every queued kind
+BUSY_BACKOFF_SECONDS = 0.05
+# Upper bound on how long an idle worker sleeps between queue checks
+IDLE_POLL_SECONDS = 1.0
+
+# Runs one item and returns its result as JSON; raising records the error on the item
+Handler = Callable[[JobItem], Awaitable[str]]
+
+
+def resolve_job_workers(workers: int | None = None) -> int:
+    """Explicit count, else JOB_WORKERS, else one."""
+    if workers is not None:
+        return workers
+    return int(os.environ.get("JOB_WORKERS", 1))
+
+
+@dataclass
+class JobRunnerStats:
+    processed: int = 0
+    failed: int = 0
+    deferred: int = 0  # times a worker yielded to interactive traffic
+
+
+class JobRunner:
+    """Works through the job queue with a bounded number of asyncio workers.
+
+    Jobs are background work: a worker leaves items of a kind queued while
+    `busy(kind)` is true, so interactive requests always go first, and
+    takes items of other kinds meanwhile. Streams
+    wait on `wait_for_progress` to learn about newly finished items. Only
+    the process holding the store's queue claims items; workers elsewhere
+    stand by to take it over.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        handlers: dict[str, Handler],
+        workers: int = 1,
+        busy: Callable[[str], bool] = lambda kind: False,
+    ):
+        self.store = store
+        self.handlers = handlers
+        self.workers = workers
+        self.busy = busy
+        self.stats = JobRunnerStats()
+        self._submitted = asyncio.Event()
+        self._progress = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    def submitted(self) -> None:
+        """Wake idle workers after a job was queued."""
+        self._submitted.set()
+
+    async def wait_for_progress(self, timeout: float) -> None:
+        """Return when any item finishes, or after `timeout` seconds."""
+        try:
+            await asyncio.wait_for(self._progress.wait(), timeout)
+        except TimeoutError:
+            pass
+
+    def _notify_progress(self) -> None:
+        self._progress.set()
+        self._progress = asyncio.Event()
+
+    async def _work(self) -> None:
+        while True:
+            # Another process may hold the queue; keep trying so this one takes over if it exits
+            if not self.store.owner and not await asyncio.to_thread(self.store.acquire):
+                await asyncio.sleep(IDLE_POLL_SECONDS)
+                continue
+
+            deferred = [kind for kind in self.handlers if self.busy(kind)]
+            self._submitted.clear()
+            item = await asyncio.to_thread(self.store.claim, deferred)
+            if item is None and deferred:
+                # Items of the deferred kinds may be waiting; look again soon
+                self.stats.deferred += 1
+                await asyncio.sleep(BUSY_BACKOFF_SECONDS)
+                continue
+            if item is None:
+                await asyncio.to_thread(self.store.prune)
+                try:
+                    await asyncio.wait_for(self._submitted.wait(), IDLE_POLL_SECONDS)
+                except TimeoutError:
+                    pass
+                continue
+
+            try:
+                result = await self.handlers[item.kind](item)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.debug("Job %s item %d failed", item.job_id, item.position, exc_info=True)
+                await asyncio.to_thread(self.store.finish, item, error=str(e) or type(e).__name__)
+                self.stats.failed += 1
+            else:
+                await asyncio.to_thread(self.store.finish, item, result)
+            self.stats.processed += 1
+            self._notify_progress()
+
+    async def close(self) -> None:
+        """Stop the workers; items they were running are retried when the store is reopened."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
@@ -0,0 +1,25 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from src.hand_calculation.schemas import HandEvaluationRequest
+
+MAX_JOB_EVALUATIONS = 10_000
+MAX_JOB_IMAGES = 500
+
+JobKind = Literal["detect", "evaluate"]
+JobStatus = Literal["queued", "running", "done"]
+
+
+class EvaluationJobRequest(BaseModel):
+    requests: list[HandEvaluationRequest] = Field(min_length=1, max_length=MAX_JOB_EVALUATIONS)
+
+
+class JobResponse(BaseModel):
+    id: str
+    kind: JobKind
+    status: JobStatus
+    total: int
+    completed: int  # including failed items
+    failed: int
+    created_at: float
@@ -0,0 +1,270 @@
+import contextlib
+import json
+import os
+import pathlib
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Collection
+from dataclasses import dataclass
+from typing import BinaryIO
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, so the queue is assumed to have a single process
+    fcntl = None
+
+DEFAULT_JOBS_DIR = pathlib.Path(__file__).resolve().parents[2] / "data" / "jobs"
+# Finished jobs and their results are deleted this long after their last item
+DEFAULT_RETENTION_SECONDS = 7 * 24 * 60 * 60.0
+# Minimum time between two retention sweeps
+PRUNE_INTERVAL_SECONDS = 60.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id TEXT NOT NULL REFERENCES jobs(id),
+    position INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    PRIMARY KEY (job_id, position)
+);
+CREATE TABLE IF NOT EXISTS job_results (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL REFERENCES jobs(id),
+    position INTEGER NOT NULL,
+    result TEXT,
+    error TEXT,
+    finished_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_job_items_status ON job_items(status);
+CREATE INDEX IF NOT EXISTS idx_job_results_job ON job_results(job_id, seq);
+"""
+
+# Item states; running items are put back to pending when a process takes over the queue
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+
+
+def resolve_jobs_dir(jobs_dir: pathlib.Path | None = None) -> pathlib.Path:
+    """Job queue location: explicit path, then JOBS_DIR, then api/data/jobs."""
+    if jobs_dir is not None:
+        return jobs_dir
+    env_dir = os.environ.get("JOBS_DIR")
+    return pathlib.Path(env_dir) if env_dir else DEFAULT_JOBS_DIR
+
+
+@dataclass(frozen=True)
+class JobItem:
+    job_id: str
+    position: int
+    kind: str
+    # Request JSON for evaluations, the stored image's file name for detections
+    payload: str
+
+    @property
+    def record_id(self) -> str:
+        """Stable id for what the item stores, so a retried item replaces its rows."""
+        return uuid.uuid5(uuid.NAMESPACE_URL, f"job:{self.job_id}/{self.position}").hex
+
+
+@dataclass(frozen=True)
+class JobResult:
+    seq: int  # completion order across the job; resume a stream after it
+    position: int
+    result: str | None  # JSON
+    error: str | None
+
+    def to_json(self) -> str:
+        result = json.loads(self.result) if self.result is not None else None
+        return json.dumps({"seq": self.seq, "position": self.position, "result": result, "error": self.error})
+
+
+@dataclass(frozen=True)
+class JobState:
+    id: str
+    kind: str
+    total: int
+    completed: int
+    failed: int
+    created_at: float
+
+    @property
+    def status(self) -> str:
+        if self.completed == self.total:
+            return "done"
+        return "running" if self.completed else "queued"
+
+
+class JobStore:
+    """File-backed job queue: a SQLite database plus uploaded images on disk.
+
+    Items are claimed in submission order, one job after another. Several
+    processes, such as uvicorn workers, may share a queue, but only the one
+    holding its lock file claims items; the others accept jobs and serve
+    results, and take over if the holder exits. Claims that were running
+    when the previous holder stopped go back to the queue on takeover, so a
+    restart resumes every unfinished job. Finished jobs are deleted
+    `retention_seconds` after their last item.
+    """
+
+    def __init__(self, jobs_dir: pathlib.Path, retention_seconds: float = DEFAULT_RETENTION_SECONDS):
+        self.image_dir = jobs_dir / "images"
+        self.image_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = jobs_dir / "jobs.sqlite3"
+        self.retention_seconds = retention_seconds
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._lock = threading.Lock()
+        self._lock_file = open(jobs_dir / "runner.lock", "a")
+        self._owner = False
+        self._pruned_at = float("-inf")
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+        self.acquire()
+
+    @property
+    def owner(self) -> bool:
+        """Whether this process holds the queue and claims its items."""
+        return self._owner
+
+    def acquire(self) -> bool:
+        """Take the queue if no other process holds it, requeueing what its last holder left running."""
+        with self._lock:
+            if self._owner:
+                return True
+            if fcntl is not None:
+                try:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return False
+            with self._conn:
+                self._conn.execute("UPDATE job_items SET status = ? WHERE status = ?", (PENDING, RUNNING))
+            self._owner = True
+            return True
+
+    def create_job(
+        self, kind: str, payloads: list[str], images: list[bytes | BinaryIO] | None = None
+    ) -> str:
+        """Queue a job of `payloads`; with `images`, payload i is the file name image i is saved under.
+
+        Images given as open files are copied to disk in chunks, never read whole.
+        """
+        job_id = uuid.uuid4().hex
+        for name, image in zip(payloads, images or []):
+            path = self.image_dir / job_id / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(image, bytes):
+                path.write_bytes(image)
+            else:
+                with path.open("wb") as f:
+                    shutil.copyfileobj(image, f)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, total, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, kind, len(payloads), time.time()),
+            )
+            self._conn.executemany(
+                "INSERT INTO job_items VALUES (?, ?, ?, ?)",
+                [(job_id, i, payload, PENDING) for i, payload in enumerate(payloads)],
+            )
+        return job_id
+
+    def claim(self, skip_kinds: Collection[str] = ()) -> JobItem | None:
+        """Mark the oldest pending item running and return it; None when the queue is empty or not ours.
+
+        Items of `skip_kinds` stay queued.
+        """
+        if not self._owner:
+            return None
+        skip = ", ".join("?" * len(skip_kinds))
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute(
+                "SELECT i.job_id, i.position, j.kind, i.payload FROM job_items i JOIN jobs j ON j.id = i.job_id "
+                f"WHERE i.status = ? AND j.kind NOT IN ({skip}) ORDER BY j.created_at, i.position LIMIT 1",
+                (PENDING, *skip_kinds),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE job_items SET status = ? WHERE job_id = ? AND position = ?", (RUNNING, row[0], row[1])
+            )
+        return JobItem(*row)
+
+    def finish(self, item: JobItem, result: str | None = None, error: str | None = None) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE job_items SET status = ? WHERE job_id = ? AND position = ?", (DONE, item.job_id, item.position)
+            )
+            self._conn.execute(
+                "INSERT INTO job_results (job_id, position, result, error, finished_at) VALUES (?, ?, ?, ?, ?)",
+                (item.job_id, item.position, result, error, time.time()),
+            )
+        if item.kind == "detect":
+            path = self.image_path(item)
+            path.unlink(missing_ok=True)
+            with contextlib.suppress(OSError):
+                path.parent.rmdir()  # once the job's last image is gone
+
+    def prune(self) -> int:
+        """Delete jobs finished over `retention_seconds` ago, at most once per PRUNE_INTERVAL_SECONDS.
+
+        Returns how many jobs were deleted.
+        """
+        now = time.monotonic()
+        if now - self._pruned_at < PRUNE_INTERVAL_SECONDS:
+            return 0
+        self._pruned_at = now
+        cutoff = time.time() - self.retention_seconds
+        with self._lock, self._conn:
+            job_ids = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT j.id FROM jobs j JOIN job_results r ON r.job_id = j.id GROUP BY j.id "
+                    "HAVING COUNT(r.seq) >= j.total AND MAX(r.finished_at) < ?",
+                    (cutoff,),
+                )
+            ]
+            for table, column in (("job_results", "job_id"), ("job_items", "job_id"), ("jobs", "id")):
+                self._conn.executemany(f"DELETE FROM {table} WHERE {column} = ?", [(job_id,) for job_id in job_ids])
+        for job_id in job_ids:
+            shutil.rmtree(self.image_dir / job_id, ignore_errors=True)
+        return len(job_ids)
+
+    def image_path(self, item: JobItem) -> pathlib.Path:
+        return self.image_dir / item.job_id / item.payload
+
+    def get_job(self, job_id: str) -> JobState | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT j.id, j.kind, j.total, COUNT(r.seq), COUNT(r.error), j.created_at FROM jobs j "
+                "LEFT JOIN job_results r ON r.job_id = j.id WHERE j.id = ? GROUP BY j.id",
+                (job_id,),
+            ).fetchone()
+        return JobState(*row) if row else None
+
+    def results(self, job_id: str, after: int = 0) -> list[JobResult]:
+        """Finished items of a job in completion order, from after the `after` seq."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, position, result, error FROM job_results WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after),
+            ).fetchall()
+        return [JobResult(*row) for row in rows]
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM job_items WHERE status != ?", (DONE,)).fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+        self._lock_file.close()  # releases the queue
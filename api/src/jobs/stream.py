@@ -0,0 +1,40 @@
+"""Job results as a stream of NDJSON lines or Server-Sent Events.
+
+Each line or event carries one finished item, in completion order, with
+its `seq`; a client that reconnects passes the last seq it saw (`after`,
+or the Last-Event-ID header for SSE) to continue where it left off. The
+stream ends once every item of the job has been sent.
+"""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from dataclasses import asdict
+
+from src.jobs.runner import JobRunner
+from src.jobs.store import JobResult
+
+# Longest wait for a finished item before the queue is checked again
+STREAM_POLL_SECONDS = 1.0
+
+
+def _sse(result: JobResult) -> str:
+    return f"id: {result.seq}\nevent: result\ndata: {result.to_json()}\n\n"
+
+
+async def stream_results(runner: JobRunner, job_id: str, after: int = 0, sse: bool = False) -> AsyncIterator[str]:
+    store = runner.store
+    while True:
+        # Read the state first: if it says done, the results read after it include every item
+        state = await asyncio.to_thread(store.get_job, job_id)
+        results = await asyncio.to_thread(store.results, job_id, after)
+        for result in results:
+            yield _sse(result) if sse else result.to_json() + "\n"
+            after = result.seq
+        if state is None or state.status == "done":
+            break
+        if not results:
+            await runner.wait_for_progress(STREAM_POLL_SECONDS)
+
+    if sse and state is not None:
+        yield f"event: done\ndata: {json.dumps({**asdict(state), 'status': state.status})}\n\n"
@@ -0,0 +1,113 @@
+import asyncio
+import json
+
+from src.jobs.runner import JobRunner
+from src.jobs.store import JobItem, JobStore
+from src.jobs.stream import stream_results
+
+
+async def _double(item: JobItem) -> str:
+    await asyncio.sleep(0.001)
+    value = json.loads(item.payload)["value"]
+    if value < 0:
+        raise ValueError("negative")
+    return json.dumps({"double": value * 2})
+
+
+def _payloads(*values: int) -> list[str]:
+    return [json.dumps({"value": value}) for value in values]
+
+
+async def _run_job(store: JobStore, runner: JobRunner, payloads: list[str], sse: bool = False) -> list[str]:
+    runner.start()
+    job_id = store.create_job("evaluate", payloads)
+    runner.submitted()
+    chunks = [chunk async for chunk in stream_results(runner, job_id, sse=sse)]
+    await runner.close()
+    return chunks
+
+
+def test_streams_every_result_as_ndjson(tmp_path):
+    store = JobStore(tmp_path)
+    runner = JobRunner(store, {"evaluate": _double}, workers=2)
+    lines = asyncio.run(_run_job(store, runner, _payloads(1, 2, -1)))
+    store.close()
+
+    results = sorted((json.loads(line) for line in lines), key=lambda r: r["position"])
+    assert [r["result"] for r in results] == [{"double": 2}, {"double": 4}, None]
+    assert results[2]["error"] == "negative"
+    assert (runner.stats.processed, runner.stats.failed) == (3, 1)
+
+
+def test_streams_server_sent_events(tmp_path):
+    store = JobStore(tmp_path)
+    runner = JobRunner(store, {"evaluate": _double})
+    events = asyncio.run(_run_job(store, runner, _payloads(1, 2), sse=True))
+    store.close()
+
+    names = [line for event in events for line in event.split("\n") if line.startswith("event: ")]
+    assert names == ["event: result", "event: result", "event: done"]
+    assert events[0].startswith("id: ")
+    assert json.loads(events[-1].split("data: ")[1])["status"] == "done"
+
+
+def test_waits_while_busy(tmp_path):
+    store = JobStore(tmp_path)
+    busy = [True]
+
+    async def run():
+        runner = JobRunner(store, {"evaluate": _double}, busy=lambda kind: busy[0])
+        runner.start()
+        job_id = store.create_job("evaluate", _payloads(1))
+        runner.submitted()
+        await asyncio.sleep(0.2)
+        assert store.get_job(job_id).completed == 0
+        busy[0] = False
+        await asyncio.sleep(0.2)
+        await runner.close()
+        return runner, store.get_job(job_id)
+
+    runner, state = asyncio.run(run())
+    store.close()
+    assert state.status == "done"
+    assert runner.stats.deferred > 0
+
+
+def test_resumes_unfinished_job_after_restart(tmp_path):
+    store = JobStore(tmp_path)
+    job_id = store.create_job("evaluate", _payloads(1, 2))
+    store.claim()  # running when the process stopped
+    store.close()
+
+    store = JobStore(tmp_path)
+    runner = JobRunner(store, {"evaluate": _double})
+
+    async def run():
+        runner.start()
+        lines = [line async for line in stream_results(runner, job_id)]
+        await runner.close()
+        return lines
+
+    lines = asyncio.run(run())
+    store.close()
+    assert sorted(json.loads(line)["position"] for line in lines) == [0, 1]
+
+
+def test_busy_is_decided_per_item(tmp_path):
+    store = JobStore(tmp_path)
+
+    async def run():
+        runner = JobRunner(
+            store, {"evaluate": _double, "detect": _double}, busy=lambda kind: kind == "detect"
+        )
+        runner.start()
+        detect = store.create_job("detect", _payloads(1))
+        evaluate = store.create_job("evaluate", _payloads(2))
+        runner.submitted()
+        await asyncio.sleep(0.2)
+        await runner.close()
+        return store.get_job(detect), store.get_job(evaluate)
+
+    detect, evaluate = asyncio.run(run())
+    store.close()
+    assert (detect.status, evaluate.status) == ("queued", "done")
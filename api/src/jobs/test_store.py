@@ -0,0 +1,120 @@
+import io
+import json
+
+import pytest
+
+from src.jobs.store import DEFAULT_JOBS_DIR, JobItem, JobStore, resolve_jobs_dir
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(tmp_path)
+    yield store
+    store.close()
+
+
+def test_claims_items_in_submission_order(store):
+    first = store.create_job("evaluate", ['{"a": 1}', '{"a": 2}'])
+    second = store.create_job("evaluate", ['{"a": 3}'])
+
+    claimed = [store.claim() for _ in range(3)]
+    assert [(item.job_id, item.position) for item in claimed] == [(first, 0), (first, 1), (second, 0)]
+    assert store.claim() is None
+
+
+def test_job_state_and_results(store):
+    job_id = store.create_job("evaluate", ["{}", "{}"])
+    assert store.get_job(job_id).status == "queued"
+
+    item = store.claim()
+    store.finish(item, result='{"han": 2}')
+    state = store.get_job(job_id)
+    assert (state.status, state.completed, state.failed) == ("running", 1, 0)
+
+    store.finish(store.claim(), error="boom")
+    state = store.get_job(job_id)
+    assert (state.status, state.completed, state.failed) == ("done", 2, 1)
+
+    results = store.results(job_id)
+    assert [r.position for r in results] == [0, 1]
+    assert json.loads(results[0].to_json()) == {"seq": results[0].seq, "position": 0, "result": {"han": 2}, "error": None}
+    assert store.results(job_id, after=results[0].seq) == results[1:]
+
+
+def test_unknown_job(store):
+    assert store.get_job("missing") is None
+
+
+def test_detection_images_are_kept_until_finished(store):
+    job_id = store.create_job("detect", ["0.jpg"], [b"jpeg"])
+    item = store.claim()
+    assert store.image_path(item).read_bytes() == b"jpeg"
+    store.finish(item, result="{}")
+    assert not store.image_path(item).exists()
+
+
+def test_detection_images_are_streamed_from_files(store):
+    store.create_job("detect", ["0.jpg"], [io.BytesIO(b"jpeg" * 100_000)])
+    assert store.image_path(store.claim()).read_bytes() == b"jpeg" * 100_000
+
+
+def test_running_items_resume_after_restart(tmp_path):
+    store = JobStore(tmp_path)
+    job_id = store.create_job("evaluate", ["{}", "{}"])
+    store.finish(store.claim(), result="{}")
+    interrupted = store.claim()
+    assert store.pending_count() == 1
+    store.close()
+
+    reopened = JobStore(tmp_path)
+    item = reopened.claim()
+    assert (item.job_id, item.position) == (job_id, interrupted.position)
+    assert reopened.get_job(job_id).completed == 1
+    reopened.close()
+
+
+def test_only_the_queue_holder_claims(tmp_path):
+    first = JobStore(tmp_path)
+    job_id = first.create_job("evaluate", ["{}", "{}"])
+    running = first.claim()
+
+    second = JobStore(tmp_path)
+    assert (first.owner, second.owner) == (True, False)
+    assert second.claim() is None
+    # Joining the queue doesn't requeue what the holder is still running
+    assert first.claim().position == 1 - running.position
+
+    first.close()
+    assert second.acquire()
+    assert second.claim().position == running.position
+    assert second.get_job(job_id).total == 2
+    second.close()
+
+
+def test_finished_jobs_are_pruned(tmp_path):
+    store = JobStore(tmp_path, retention_seconds=0)
+    finished = store.create_job("detect", ["0.jpg"], [b"jpeg"])
+    unfinished = store.create_job("evaluate", ["{}", "{}"])
+    store.finish(store.claim(), result="{}")
+    store.finish(store.claim(), result="{}")
+
+    assert store.prune() == 1
+    assert store.get_job(finished) is None
+    assert not (store.image_dir / finished).exists()
+    assert store.get_job(unfinished).completed == 1
+    store.close()
+
+
+def test_record_id_is_stable_per_item(store):
+    store.create_job("evaluate", ["{}", "{}"])
+    first, second = store.claim(), store.claim()
+    assert first.record_id == JobItem(first.job_id, first.position, "evaluate", "{}").record_id
+    assert first.record_id != second.record_id
+
+
+def test_resolve_jobs_dir(monkeypatch, tmp_path):
+    monkeypatch.delenv("JOBS_DIR", raising=False)
+    assert resolve_jobs_dir() == DEFAULT_JOBS_DIR
+    monkeypatch.setenv("JOBS_DIR", str(tmp_path))
+    assert resolve_jobs_dir() == tmp_path
+    assert resolve_jobs_dir(tmp_path / "x") == tmp_path / "x"
@@ -0,0 +1,16 @@
+from src.simulation.pool import SimulationPool, SimulationPoolStats, resolve_simulation_workers
+from src.simulation.schemas import SimulationRequest, SimulationResponse, WinningTileOdds
+from src.simulation.simulator import ShantenTooHigh, build_plan, run_batches, simulate_batch
+
+__all__ = [
+    "build_plan",
+    "resolve_simulation_workers",
+    "run_batches",
+    "ShantenTooHigh",
+    "simulate_batch",
+    "SimulationPool",
+    "SimulationPoolStats",
+    "SimulationRequest",
+    "SimulationResponse",
+    "WinningTileOdds",
+]
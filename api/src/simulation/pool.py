@@ -0,0 +1,87 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import get_context
+
+import numpy as np
+
+from src.simulation.schemas import SimulationRequest, SimulationResponse
+from src.simulation.simulator import Plan, ShantenTooHigh, Tally, build_plan, run_batches, summarize
+
+DEFAULT_WORKERS = 2
+# Simulation time left after planning never drops below this, though queueing for a worker still counts
+MIN_RUN_SECONDS = 0.005
+
+
+def resolve_simulation_workers(workers: int | None = None) -> int:
+    """Worker count: explicit value, then SIMULATION_WORKERS, then DEFAULT_WORKERS capped at the CPU count.
+
+    Zero simulates inline: planning on the calling thread, batches on a worker thread.
+    """
+    if workers is not None:
+        return workers
+    env_workers = os.environ.get("SIMULATION_WORKERS")
+    if env_workers:
+        return int(env_workers)
+    return min(DEFAULT_WORKERS, os.cpu_count() or 1)
+
+
+@dataclass
+class SimulationPoolStats:
+    requests: int = 0
+    simulations: int = 0
+    rejected: int = 0  # hands too far from tenpai
+    seconds: float = 0.0
+
+
+class SimulationPool:
+    """Win odds simulations spread over worker processes.
+
+    The plan is built in a worker, where the `evaluate_hand` cache stays
+    warm across requests, then every worker simulates batches with its own seed
+    until the request's deadline and the tallies are summed; a worker that
+    only gets to the batches after the deadline adds nothing. With `workers=0` the plan is built on the calling thread, since
+    `evaluate_hand` shares one calculator and is not thread-safe, and the
+    batches, which only use the plan, run on a thread.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.stats = SimulationPoolStats()
+        self._executor = (
+            ProcessPoolExecutor(workers, mp_context=get_context("spawn")) if workers > 0 else None
+        )
+
+    async def _plan(self, request: SimulationRequest) -> Plan:
+        if self._executor is None:
+            return build_plan(request)
+        return await asyncio.wrap_future(self._executor.submit(build_plan, request))
+
+    async def _run(self, function, *args):
+        if self._executor is None:
+            return await asyncio.to_thread(function, *args)
+        return await asyncio.wrap_future(self._executor.submit(function, *args))
+
+    async def simulate(self, request: SimulationRequest) -> SimulationResponse:
+        """Raises ShantenTooHigh for hands more than one tile from tenpai."""
+        started = time.monotonic()
+        self.stats.requests += 1
+        try:
+            plan = await self._plan(request)
+        except ShantenTooHigh:
+            self.stats.rejected += 1
+            raise
+        deadline = max(started + request.time_budget_ms / 1000, time.monotonic() + MIN_RUN_SECONDS)
+        seeds = np.random.SeedSequence().spawn(max(self.workers, 1))
+        tallies = await asyncio.gather(*(self._run(run_batches, plan, deadline, seed) for seed in seeds))
+        tally = sum(tallies, Tally.empty())
+        self.stats.simulations += tally.simulations
+        self.stats.seconds += time.monotonic() - started
+        return summarize(plan, tally)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
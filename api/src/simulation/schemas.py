@@ -0,0 +1,48 @@
+from collections import Counter
+from typing import Literal
+
+from pydantic import BaseModel, Field, model_validator
+
+from src.hand_calculation.schemas import MeldInfo, TileCodes, check_tiles
+
+MAX_DRAWS = 18  # a player's draws from a full wall
+DEFAULT_TIME_BUDGET_MS = 200
+MAX_TIME_BUDGET_MS = 5000
+
+
+class SimulationRequest(BaseModel):
+    # The hand between turns, meld tiles included as in HandEvaluationRequest
+    tiles: TileCodes = Field(min_length=13, max_length=13)
+    melds: list[MeldInfo] = Field(default_factory=list, max_length=4)
+    seat_wind: Literal["east", "south", "west", "north"]
+    round_wind: Literal["east", "south", "west", "north"]
+    # Declare riichi on reaching tenpai; ignored for open hands
+    is_riichi: bool = False
+    dora_indicators: TileCodes = Field(default_factory=list, max_length=10)
+    # Other tiles out of the wall: discards, other players' melds
+    visible: TileCodes = Field(default_factory=list, max_length=123)
+    draws: int = Field(ge=1, le=MAX_DRAWS)
+    time_budget_ms: int = Field(default=DEFAULT_TIME_BUDGET_MS, ge=10, le=MAX_TIME_BUDGET_MS)
+
+    @model_validator(mode="after")
+    def _consistent_tiles(self) -> "SimulationRequest":
+        check_tiles(self.tiles + self.visible + self.dora_indicators)
+        meld_tiles = Counter(code for meld in self.melds for code in meld.tiles)
+        if meld_tiles - Counter(self.tiles):
+            raise ValueError("Meld tiles must be part of the hand")
+        return self
+
+
+class WinningTileOdds(BaseModel):
+    tile: str
+    probability: float
+    average_points: float
+
+
+class SimulationResponse(BaseModel):
+    shanten: int
+    simulations: int
+    win_probability: float
+    # Points won per simulation, zero when the hand doesn't win
+    expected_points: float
+    tiles: list[WinningTileOdds]
@@ -0,0 +1,328 @@
+"""Monte Carlo odds of winning a tenpai or 1-shanten hand by self-draw.
+
+The unseen tiles form a 34-count wall. A batch of simulations draws a
+random sequence of `draws` tiles from it per row with NumPy, then finds
+each row's outcome with array operations over the whole batch: no Python
+code runs per draw.
+
+What to do with each draw is worked out up front in a `Plan`. A tenpai
+hand wins on the first draw among its waits. A 1-shanten hand first
+waits for a draw that reaches tenpai, discarding whichever tile leaves the
+most valuable waits, and then for one of the new waits. Other draws are
+discarded straight away. Win values come from `evaluate_hand`, cached
+per hand and winning tile. Ron is not modelled, so the odds are a lower
+bound on a real table.
+"""
+
+import functools
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.game_session import win_payments
+from src.hand_calculation.calculation import evaluate_hand
+from src.hand_calculation.schemas import HandEvaluationRequest, MeldInfo
+from src.simulation.schemas import SimulationRequest, SimulationResponse, WinningTileOdds
+from src.tile import CODE_TO_34, MAX_COPIES, RED_FIVES, code_from_34, dora_from_indicator
+
+# Terminals and honors, one each plus a pair, for kokushi
+_KOKUSHI = (0, 8, 9, 17, 18, 26, 27, 28, 29, 30, 31, 32, 33)
+NO_STATE = -1
+BATCH_SIZE = 2048
+
+
+class ShantenTooHigh(ValueError):
+    """The hand is two or more tiles from tenpai."""
+
+
+def counts_of(codes: list[str]) -> list[int]:
+    counts = [0] * 34
+    for code in codes:
+        counts[CODE_TO_34[code]] += 1
+    return counts
+
+
+@functools.cache
+def _splits_into_sets(suit: tuple[int, ...]) -> bool:
+    """Whether one suit's 9 counts split into runs and triplets."""
+    first = next((i for i, count in enumerate(suit) if count), None)
+    if first is None:
+        return True
+    rest = list(suit)
+    if suit[first] >= 3:
+        rest[first] -= 3
+        if _splits_into_sets(tuple(rest)):
+            return True
+        rest[first] += 3
+    if first <= 6 and suit[first + 1] and suit[first + 2]:
+        for i in range(first, first + 3):
+            rest[i] -= 1
+        return _splits_into_sets(tuple(rest))
+    return False
+
+
+@functools.cache
+def _splits_with_pair(suit: tuple[int, ...]) -> bool:
+    for i, count in enumerate(suit):
+        if count >= 2 and _splits_into_sets(suit[:i] + (count - 2,) + suit[i + 1 :]):
+            return True
+    return False
+
+
+def is_complete(counts: list[int], closed: bool) -> bool:
+    """Whether the concealed tiles (3n + 2 of them) form a winning shape."""
+    pairs = 0
+    for base in (0, 9, 18):
+        suit = tuple(counts[base : base + 9])
+        remainder = sum(suit) % 3
+        if remainder == 1:
+            break
+        if not (_splits_with_pair(suit) if remainder == 2 else _splits_into_sets(suit)):
+            break
+        pairs += remainder == 2
+    else:
+        honors = counts[27:]
+        if all(count in (0, 2, 3) for count in honors) and pairs + honors.count(2) == 1:
+            return True
+    if not closed or sum(counts) != 14:
+        return False
+    if counts.count(2) == 7:
+        return True
+    return all(counts[i] for i in _KOKUSHI) and sum(counts[i] for i in _KOKUSHI) == 14
+
+
+def _candidates(counts: list[int], closed: bool) -> list[int]:
+    """Tiles that could complete or improve the hand: within two of a held suit tile, or a held honor."""
+    near = set(_KOKUSHI) if closed else set()
+    for tile, count in enumerate(counts):
+        if not count:
+            continue
+        if tile >= 27:
+            near.add(tile)
+        else:
+            base = tile // 9 * 9
+            near.update(range(max(tile - 2, base), min(tile + 3, base + 9)))
+    return sorted(near)
+
+
+@functools.lru_cache(maxsize=65536)
+def _waits(counts: tuple[int, ...], closed: bool) -> tuple[int, ...]:
+    hand = list(counts)
+    waits = []
+    for tile in _candidates(hand, closed):
+        if hand[tile] < MAX_COPIES:
+            hand[tile] += 1
+            if is_complete(hand, closed):
+                waits.append(tile)
+            hand[tile] -= 1
+    return tuple(waits)
+
+
+def waits_of(counts: list[int], closed: bool) -> list[int]:
+    """Tiles that complete a tenpai hand's concealed part; empty when not tenpai."""
+    return list(_waits(tuple(counts), closed))
+
+
+@functools.lru_cache(maxsize=16384)
+def tsumo_points(
+    tiles: tuple[str, ...],
+    win_tile: str,
+    melds: tuple[tuple[str, tuple[str, ...]], ...],
+    seat_wind: str,
+    round_wind: str,
+    is_riichi: bool,
+    dora_tiles: tuple[int, ...],
+) -> int:
+    """What the hand collects for a self-drawn win on `win_tile`, or 0 without a yaku."""
+    codes = [*tiles, win_tile]
+    counts = counts_of(codes)
+    request = HandEvaluationRequest(
+        tiles=codes,
+        win_tile_index=len(tiles),
+        is_tsumo=True,
+        seat_wind=seat_wind,
+        round_wind=round_wind,
+        is_riichi=is_riichi,
+        melds=[MeldInfo(type=kind, tiles=list(meld_tiles)) for kind, meld_tiles in melds],
+        dora_count=sum(counts[tile] for tile in dora_tiles),
+    )
+    result = evaluate_hand(request)
+    if result.error is not None:
+        return 0
+    dealer = 0 if seat_wind == "east" else 1
+    return win_payments(0, None, dealer, result.cost, honba=0)[0]
+
+
+@dataclass(frozen=True)
+class Plan:
+    shanten: int
+    wall: np.ndarray  # unseen copies per tile
+    draws: int
+    # State a row starts in; NO_STATE when it has to reach tenpai first
+    initial_state: int
+    improve: np.ndarray  # tile -> tenpai state drawing it leads to, or NO_STATE
+    points: np.ndarray  # (state, tile) -> self-draw value, 0 when not a winning tile
+
+
+@dataclass
+class Tally:
+    simulations: int
+    wins: np.ndarray  # per winning tile
+    points: np.ndarray  # summed per winning tile
+
+    @classmethod
+    def empty(cls) -> "Tally":
+        return cls(0, np.zeros(34, dtype=np.int64), np.zeros(34))
+
+    def __add__(self, other: "Tally") -> "Tally":
+        return Tally(self.simulations + other.simulations, self.wins + other.wins, self.points + other.points)
+
+
+def build_plan(request: SimulationRequest) -> Plan:
+    """Raises ShantenTooHigh for hands more than one tile from tenpai."""
+    concealed = list(request.tiles)
+    meld_codes = [code for meld in request.melds for code in meld.tiles]
+    for code in meld_codes:
+        concealed.remove(code)
+    closed = not request.melds
+    seen = Counter(CODE_TO_34[code] for code in request.tiles + request.visible + request.dora_indicators)
+    wall = np.array([MAX_COPIES - seen[tile] for tile in range(34)], dtype=np.int64)
+    melds = tuple((meld.type, tuple(meld.tiles)) for meld in request.melds)
+    dora_tiles = tuple(dora_from_indicator(CODE_TO_34[code]) for code in request.dora_indicators)
+
+    def state_points(codes: list[str], waits: list[int]) -> np.ndarray:
+        # Sorted so the same hand reached by different draws shares cache entries
+        tiles = tuple(sorted(codes + meld_codes))
+        row = np.zeros(34, dtype=np.int64)
+        for tile in waits:
+            row[tile] = tsumo_points(
+                tiles,
+                code_from_34(tile),
+                melds,
+                request.seat_wind,
+                request.round_wind,
+                request.is_riichi and closed,
+                dora_tiles,
+            )
+        return row
+
+    draws = int(min(request.draws, wall.sum()))
+    counts = counts_of(concealed)
+    improve = np.full(34, NO_STATE, dtype=np.int64)
+    waits = waits_of(counts, closed)
+    if waits:
+        points = state_points(concealed, waits)[np.newaxis]
+        return Plan(0, wall, draws, 0, improve, points)
+
+    rows: list[np.ndarray] = []
+    one_shanten = False
+    for drawn in _candidates(counts, closed):
+        if counts[drawn] == MAX_COPIES:
+            continue
+        counts[drawn] += 1
+        best: tuple[float, np.ndarray] | None = None
+        for discard in range(34):
+            if not counts[discard] or discard == drawn:
+                continue
+            counts[discard] -= 1
+            waits = waits_of(counts, closed)
+            counts[discard] += 1
+            if not waits:
+                continue
+            one_shanten = True
+            if wall[drawn]:
+                row = state_points(_replace(concealed, discard, code_from_34(drawn)), waits)
+                value = float(wall @ row)
+                if best is None or value > best[0]:
+                    best = (value, row)
+        counts[drawn] -= 1
+        # Tenpai without a yaku, or on dead waits, isn't worth stopping at
+        if best is not None and best[0] > 0:
+            improve[drawn] = len(rows)
+            rows.append(best[1])
+
+    if not one_shanten:
+        raise ShantenTooHigh("Only tenpai and 1-shanten hands can be simulated")
+    points = np.stack(rows) if rows else np.zeros((1, 34), dtype=np.int64)
+    return Plan(1, wall, draws, NO_STATE, improve, points)
+
+
+def _replace(codes: list[str], discard: int, drawn: str) -> list[str]:
+    """`codes` with one copy of `discard` swapped for `drawn`, keeping a red five over a plain one."""
+    result = list(codes)
+    candidates = [i for i, code in enumerate(result) if CODE_TO_34[code] == discard]
+    position = max(candidates, key=lambda i: result[i] not in RED_FIVES)
+    result[position] = drawn
+    return result
+
+
+def simulate_batch(plan: Plan, size: int, rng: np.random.Generator) -> Tally:
+    """Play out `size` random draw sequences at once."""
+    if plan.draws == 0:
+        return Tally(size, np.zeros(34, dtype=np.int64), np.zeros(34))
+    unseen = np.repeat(np.arange(34, dtype=np.int64), plan.wall)
+    # A random key per wall tile; the `draws` smallest keys in order are the draw sequence,
+    # so only those get sorted rather than shuffling the whole wall
+    keys = rng.random((size, len(unseen)), dtype=np.float32)
+    drawn = np.argpartition(keys, plan.draws - 1, axis=1)[:, : plan.draws]
+    order = np.take_along_axis(keys, drawn, axis=1).argsort(axis=1)
+    sequences = unseen[np.take_along_axis(drawn, order, axis=1)]
+    steps = np.arange(plan.draws)
+    rows = np.arange(size)
+
+    if plan.initial_state != NO_STATE:
+        states = np.full(size, plan.initial_state)
+        ready_at = np.full(size, -1)
+    else:
+        reached = plan.improve[sequences]
+        hit = reached >= 0
+        ready = hit.any(axis=1)
+        ready_at = np.where(ready, hit.argmax(axis=1), plan.draws)
+        states = np.where(ready, reached[rows, np.minimum(ready_at, plan.draws - 1)], 0)
+
+    points = plan.points[states[:, np.newaxis], sequences]
+    winning = (points > 0) & (steps > ready_at[:, np.newaxis])
+    won = np.flatnonzero(winning.any(axis=1))
+    at = winning[won].argmax(axis=1)
+    tiles = sequences[won, at]
+    return Tally(
+        size,
+        np.bincount(tiles, minlength=34),
+        np.bincount(tiles, weights=points[won, at], minlength=34).astype(float),
+    )
+
+
+def run_batches(plan: Plan, deadline: float, seed: np.random.SeedSequence | int | None = None) -> Tally:
+    """Simulate batches until the `time.monotonic()` deadline, finishing at least one if any time is left.
+
+    The deadline is absolute so time spent queued for a worker comes out of
+    the budget; the monotonic clock is system-wide, so it holds across processes.
+    """
+    if time.monotonic() >= deadline:
+        return Tally.empty()
+    rng = np.random.default_rng(seed)
+    tally = simulate_batch(plan, BATCH_SIZE, rng)
+    while time.monotonic() < deadline:
+        tally += simulate_batch(plan, BATCH_SIZE, rng)
+    return tally
+
+
+def summarize(plan: Plan, tally: Tally) -> SimulationResponse:
+    total = max(tally.simulations, 1)
+    return SimulationResponse(
+        shanten=plan.shanten,
+        simulations=tally.simulations,
+        win_probability=float(tally.wins.sum()) / total,
+        expected_points=float(tally.points.sum()) / total,
+        tiles=[
+            WinningTileOdds(
+                tile=code_from_34(tile),
+                probability=float(tally.wins[tile]) / total,
+                average_points=float(tally.points[tile] / tally.wins[tile]),
+            )
+            for tile in np.argsort(-tally.wins, kind="stable")
+            if tally.wins[tile]
+        ],
+    )
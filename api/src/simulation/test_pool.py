@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.simulation import pool as pool_module
+from src.simulation.pool import SimulationPool, resolve_simulation_workers
+from src.simulation.simulator import ShantenTooHigh
+from src.simulation.test_simulator import _request
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = SimulationPool(workers=1)
+    yield pool
+    pool.close()
+
+
+def test_inline_pool():
+    pool = SimulationPool(workers=0)
+    result = asyncio.run(pool.simulate(_request(time_budget_ms=20)))
+
+    assert result.shanten == 0 and result.win_probability > 0
+    assert pool.stats.requests == 1
+    assert pool.stats.simulations == result.simulations
+
+
+def test_inline_pool_plans_on_the_calling_thread(monkeypatch):
+    threads = []
+    plan = pool_module.build_plan
+
+    def recording_plan(request):
+        threads.append(threading.get_ident())
+        return plan(request)
+
+    monkeypatch.setattr(pool_module, "build_plan", recording_plan)
+    asyncio.run(SimulationPool(workers=0).simulate(_request(time_budget_ms=20)))
+
+    assert threads == [threading.get_ident()]
+
+
+def test_batches_get_the_request_deadline(monkeypatch):
+    deadlines = []
+    run_batches = pool_module.run_batches
+
+    def recording_run_batches(plan, deadline, seed):
+        deadlines.append(deadline)
+        return run_batches(plan, deadline, seed)
+
+    monkeypatch.setattr(pool_module, "run_batches", recording_run_batches)
+    before = time.monotonic()
+    asyncio.run(SimulationPool(workers=0).simulate(_request(time_budget_ms=20)))
+
+    # Absolute, so waiting for the worker thread comes out of the budget instead of adding to it
+    [deadline] = deadlines
+    assert before < deadline <= time.monotonic()
+
+
+def test_workers_share_the_time_budget(pool):
+    result = asyncio.run(pool.simulate(_request(time_budget_ms=50)))
+
+    assert {odds.tile for odds in result.tiles} == {"1m", "4m"}
+    assert result.simulations >= 2048
+
+
+def test_two_shanten_is_rejected(pool):
+    tiles = ["1m", "4m", "7m", "1p", "4p", "7p", "1s", "4s", "7s", "2z", "3z", "5z", "6z"]
+    rejected = pool.stats.rejected
+    with pytest.raises(ShantenTooHigh):
+        asyncio.run(pool.simulate(_request(tiles)))
+    assert pool.stats.rejected == rejected + 1
+
+
+def test_resolve_simulation_workers(monkeypatch):
+    monkeypatch.setenv("SIMULATION_WORKERS", "3")
+    assert resolve_simulation_workers() == 3
+    assert resolve_simulation_workers(0) == 0
+    monkeypatch.delenv("SIMULATION_WORKERS")
+    assert resolve_simulation_workers() >= 1
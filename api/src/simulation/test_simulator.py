@@ -0,0 +1,132 @@
+import math
+import time
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from src.simulation.schemas import SimulationRequest
+from src.simulation.simulator import (
+    ShantenTooHigh,
+    build_plan,
+    counts_of,
+    is_complete,
+    run_batches,
+    simulate_batch,
+    summarize,
+    waits_of,
+)
+
+# Waits on 1m-4m: riichi tsumo, plus iipeikou on 1m
+TENPAI = ["1m", "2m", "3m", "4p", "5p", "6p", "7s", "8s", "9s", "2m", "3m", "1z", "1z"]
+# One from tenpai: 6s or 9s completes 7s8s, 1m or 4m the 2m3m
+ONE_SHANTEN = ["1m", "2m", "3m", "4p", "5p", "6p", "7s", "8s", "2m", "3m", "6z", "1z", "1z"]
+
+
+def _request(tiles=TENPAI, **kwargs) -> SimulationRequest:
+    return SimulationRequest(
+        **{"tiles": tiles, "seat_wind": "south", "round_wind": "east", "is_riichi": True, "draws": 12, **kwargs}
+    )
+
+
+def _miss_all(outs: int, unseen: int, draws: int) -> float:
+    return math.comb(unseen - outs, draws) / math.comb(unseen, draws)
+
+
+class TestShape:
+    def test_regular_hand(self):
+        assert is_complete(counts_of(TENPAI + ["4m"]), closed=True)
+        assert not is_complete(counts_of(TENPAI + ["5m"]), closed=True)
+
+    def test_seven_pairs_and_kokushi_only_when_closed(self):
+        pairs = counts_of(["1m", "1m", "4m", "4m", "2p", "2p", "9p", "9p", "5s", "5s", "1z", "1z", "7z", "7z"])
+        assert is_complete(pairs, closed=True)
+        assert not is_complete(pairs, closed=False)
+        kokushi = counts_of(["1m", "9m", "1p", "9p", "1s", "9s", "1z", "2z", "3z", "4z", "5z", "6z", "7z", "7z"])
+        assert is_complete(kokushi, closed=True)
+
+    def test_waits(self):
+        assert waits_of(counts_of(TENPAI), closed=True) == [0, 3]
+        assert waits_of(counts_of(ONE_SHANTEN), closed=True) == []
+
+
+class TestPlan:
+    def test_tenpai_values_each_wait(self):
+        plan = build_plan(_request())
+
+        assert plan.shanten == 0
+        assert plan.wall.sum() == 136 - 13
+        assert plan.points[0, 3] == 2000  # 4m: riichi tsumo, 1300-700 for a non-dealer
+        assert plan.points[0, 0] == 4000  # 1m adds iipeikou, 2000-1000
+        assert np.count_nonzero(plan.points) == 2
+
+    def test_one_shanten_reaches_tenpai_on_useful_draws(self):
+        plan = build_plan(_request(ONE_SHANTEN))
+
+        assert plan.shanten == 1
+        assert sorted(np.flatnonzero(plan.improve >= 0)) == [0, 3, 23, 26]
+
+    def test_two_shanten_is_rejected(self):
+        tiles = ["1m", "4m", "7m", "1p", "4p", "7p", "1s", "4s", "7s", "2z", "3z", "5z", "6z"]
+        with pytest.raises(ShantenTooHigh):
+            build_plan(_request(tiles))
+
+    def test_visible_tiles_leave_the_wall(self):
+        plan = build_plan(_request(visible=["4m"] * 4, dora_indicators=["9p"]))
+
+        assert plan.wall[3] == 0
+        assert plan.wall.sum() == 136 - 13 - 5
+
+
+class TestSimulation:
+    def test_tenpai_odds_match_the_exact_value(self):
+        plan = build_plan(_request())
+        tally = simulate_batch(plan, 50_000, np.random.default_rng(0))
+        result = summarize(plan, tally)
+
+        # 3 1m and 4 4m left among 123 unseen tiles
+        expected = 1 - _miss_all(7, 123, 12)
+        assert result.win_probability == pytest.approx(expected, abs=0.01)
+        assert [odds.tile for odds in result.tiles] == ["4m", "1m"]
+        assert result.tiles[0].average_points == 2000
+        assert result.expected_points == pytest.approx(
+            result.tiles[0].probability * 2000 + result.tiles[1].probability * 4000
+        )
+
+    def test_one_shanten_wins_less_often_than_tenpai(self):
+        tenpai = summarize(plan := build_plan(_request()), simulate_batch(plan, 20_000, np.random.default_rng(0)))
+        plan = build_plan(_request(ONE_SHANTEN))
+        one_shanten = summarize(plan, simulate_batch(plan, 20_000, np.random.default_rng(0)))
+
+        assert 0 < one_shanten.win_probability < tenpai.win_probability
+
+    def test_hand_without_yaku_never_scores(self):
+        tiles = ["1m", "2m", "3m", "4p", "5p", "6p", "7s", "8s", "9s", "2m", "3m", "5z", "5z"]
+        request = _request(tiles, melds=[{"type": "chi", "tiles": ["1m", "2m", "3m"]}])
+        plan = build_plan(request)
+
+        result = summarize(plan, simulate_batch(plan, 1000, np.random.default_rng(0)))
+        assert result.win_probability == 0 and result.expected_points == 0
+
+    def test_dead_wait_never_wins(self):
+        plan = build_plan(_request(visible=["4m"] * 4, draws=18))
+
+        result = summarize(plan, run_batches(plan, time.monotonic() + 0.001, seed=1))
+        assert result.simulations > 0
+        assert {odds.tile for odds in result.tiles} == {"1m"}
+
+    def test_passed_deadline_runs_nothing(self):
+        plan = build_plan(_request())
+
+        assert run_batches(plan, time.monotonic() - 1.0, seed=1).simulations == 0
+
+
+class TestRequest:
+    def test_meld_tiles_must_be_in_hand(self):
+        with pytest.raises(ValidationError, match="Meld tiles"):
+            _request(melds=[{"type": "pon", "tiles": ["7z", "7z", "7z"]}])
+
+    def test_fifth_copy_across_hand_and_table(self):
+        with pytest.raises(ValidationError) as e:
+            _request(visible=["1z", "1z", "1z"])
+        assert e.value.errors()[0]["type"] == "tile_count"
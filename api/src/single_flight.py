@@ -0,0 +1,48 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+
+
+@dataclass
+class SingleFlightStats:
+    calls: int = 0
+    executed: int = 0
+    coalesced: int = 0  # calls that shared an in-flight computation instead of starting one
+
+
+class SingleFlight[T]:
+    """Deduplicates concurrent calls with the same key into one computation.
+
+    The first caller for a key starts `compute` as a task; callers that
+    arrive while it runs await the same task and get the same result or
+    exception. The task is shielded, so a caller that is cancelled (a client
+    disconnecting) doesn't cancel it for the others. Results aren't cached:
+    once the task finishes the next call computes again.
+    """
+
+    def __init__(self):
+        self.stats = SingleFlightStats()
+        self._tasks: dict[Hashable, asyncio.Task[T]] = {}
+
+    async def do(self, key: Hashable, compute: Callable[[], Awaitable[T]]) -> T:
+        self.stats.calls += 1
+        task = self._tasks.get(key)
+        if task is None:
+            self.stats.executed += 1
+            task = asyncio.ensure_future(compute())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.stats.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task[T]) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Every caller may have been cancelled; don't leave the exception unretrieved
+        if not task.cancelled():
+            task.exception()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
@@ -0,0 +1,25 @@
+from src.storage.active_learning import (
+    ActiveLearningExporter,
+    ActiveLearningStats,
+    dhash,
+    resolve_active_learning_dir,
+)
+from src.storage.schemas import CorrectedTile, CorrectionRequest, CorrectionResponse
+from src.storage.store import DetectionStore, DetectionStoreStats, resolve_image_budget, resolve_store_path
+from src.storage.training import export_corrections, export_crop_dataset
+
+__all__ = [
+    "ActiveLearningExporter",
+    "ActiveLearningStats",
+    "CorrectedTile",
+    "CorrectionRequest",
+    "CorrectionResponse",
+    "DetectionStore",
+    "DetectionStoreStats",
+    "dhash",
+    "export_corrections",
+    "export_crop_dataset",
+    "resolve_active_learning_dir",
+    "resolve_image_budget",
+    "resolve_store_path",
+]
@@ -0,0 +1,229 @@
+import hashlib
+import logging
+import os
+import pathlib
+import queue
+import threading
+from dataclasses import dataclass, field
+
+import cv2
+import numpy as np
+
+from src.storage.training import yolo_label_lines
+from src.tile import DetectedTile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ACTIVE_LEARNING_DIR = pathlib.Path(__file__).resolve().parents[2] / "data" / "active_learning"
+
+DEFAULT_CONFIDENCE_THRESHOLD = 0.5
+DEFAULT_BUDGET_BYTES = 1 << 30  # 1 GiB
+DEFAULT_QUEUE_SIZE = 32
+# Images whose 64-bit difference hashes differ in at most this many bits are duplicates
+DEFAULT_MAX_HASH_DISTANCE = 6
+
+
+def dhash(image: np.ndarray) -> int:
+    """64-bit difference hash: sign of the horizontal gradient on a 9x8 thumbnail."""
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    thumb = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (thumb[:, 1:] > thumb[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def resolve_active_learning_dir(output_dir: pathlib.Path | None = None) -> pathlib.Path:
+    """Output location: explicit path, then ACTIVE_LEARNING_DIR, then api/data/active_learning."""
+    if output_dir is not None:
+        return output_dir
+    env_dir = os.environ.get("ACTIVE_LEARNING_DIR")
+    return pathlib.Path(env_dir) if env_dir else DEFAULT_ACTIVE_LEARNING_DIR
+
+
+@dataclass(frozen=True)
+class _Sample:
+    image: bytes | pathlib.Path  # raw upload, or a stored image to read in the worker
+    suffix: str
+    tiles: list[DetectedTile]
+    corrected: bool
+
+
+@dataclass
+class ActiveLearningStats:
+    submitted: int = 0
+    dropped: int = 0  # queue full
+    written: int = 0
+    relabeled: int = 0  # corrections replacing the labels of an identical exported image
+    duplicates: int = 0
+    over_budget: int = 0
+    errors: int = 0
+    bytes_used: int = 0
+    by_reason: dict[str, int] = field(default_factory=dict)
+
+
+class ActiveLearningExporter:
+    """Background stage that collects hard examples as a YOLO dataset.
+
+    A detection is kept when any tile is below `confidence_threshold`, and
+    every hand editor correction is kept. Samples go through a bounded queue
+    that drops when full, so callers never block. The worker deduplicates by
+    perceptual hash, stops adding images once `budget_bytes` is used, and
+    writes `images/<hash>` and `labels/<hash>.txt` under `output_dir`. A
+    correction of a byte-identical exported image replaces its labels; a
+    correction of a merely similar one is exported as a new image, since a
+    photo of the same table may show a different hand.
+    """
+
+    def __init__(
+        self,
+        output_dir: pathlib.Path,
+        names: list[str],
+        confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+        budget_bytes: int = DEFAULT_BUDGET_BYTES,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        max_hash_distance: int = DEFAULT_MAX_HASH_DISTANCE,
+    ):
+        self.images_dir = output_dir / "images"
+        self.labels_dir = output_dir / "labels"
+        self.images_dir.mkdir(parents=True, exist_ok=True)
+        self.labels_dir.mkdir(parents=True, exist_ok=True)
+        self.names = names
+        self.confidence_threshold = confidence_threshold
+        self.budget_bytes = budget_bytes
+        self.max_hash_distance = max_hash_distance
+        self.stats = ActiveLearningStats()
+
+        # Perceptual hash → image stem, and content digest → image stem, of everything
+        # already exported, including earlier runs; the worker fills them in before its first sample
+        self._stems: dict[int, str] = {}
+        self._digests: dict[str, str] = {}
+        self._hashes = np.zeros(0, dtype=np.uint64)
+
+        self._queue: queue.Queue[_Sample | None] = queue.Queue(maxsize=queue_size)
+        self._worker = threading.Thread(target=self._run, name="active-learning-export", daemon=True)
+        self._worker.start()
+
+    def sample_reason(self, tiles: list[DetectedTile], corrected: bool) -> str | None:
+        if corrected:
+            return "corrected"
+        if any(tile.confidence < self.confidence_threshold for tile in tiles):
+            return "low_confidence"
+        return None
+
+    def submit(
+        self,
+        image: bytes | pathlib.Path,
+        suffix: str,
+        tiles: list[DetectedTile],
+        corrected: bool = False,
+    ) -> bool:
+        """Queue a sample if it qualifies. Never blocks; returns whether it was queued."""
+        reason = self.sample_reason(tiles, corrected)
+        if reason is None:
+            return False
+
+        self.stats.submitted += 1
+        try:
+            self._queue.put_nowait(_Sample(image, suffix, tiles, corrected))
+        except queue.Full:
+            self.stats.dropped += 1
+            return False
+        self.stats.by_reason[reason] = self.stats.by_reason.get(reason, 0) + 1
+        return True
+
+    def join(self) -> None:
+        """Block until every queued sample is processed."""
+        self._queue.join()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._worker.join()
+
+    def _load_existing(self) -> None:
+        """Index earlier exports. Hashing every image is slow on a large export, so the worker does it."""
+        for path in self.images_dir.iterdir():
+            try:
+                image_hash = int(path.stem.split("-")[0], 16)
+            except ValueError:
+                continue
+            self._stems.setdefault(image_hash, path.stem)
+            image_bytes = path.read_bytes()
+            self._digests[hashlib.sha256(image_bytes).hexdigest()] = path.stem
+            self.stats.bytes_used += len(image_bytes)
+        for path in self.labels_dir.iterdir():
+            self.stats.bytes_used += path.stat().st_size
+        self._hashes = np.array(list(self._stems), dtype=np.uint64)
+
+    def _run(self) -> None:
+        try:
+            self._load_existing()
+        except OSError:
+            logger.exception("Failed to index earlier active learning exports")
+        while True:
+            sample = self._queue.get()
+            try:
+                if sample is None:
+                    return
+                self._export(sample)
+            except (OSError, cv2.error, ValueError):
+                self.stats.errors += 1
+                logger.exception("Failed to export an active learning sample")
+            finally:
+                self._queue.task_done()
+
+    def _find_duplicate(self, image_hash: int) -> str | None:
+        if not len(self._hashes):
+            return None
+        distances = np.bitwise_count(self._hashes ^ np.uint64(image_hash))
+        nearest = int(np.argmin(distances))
+        if distances[nearest] > self.max_hash_distance:
+            return None
+        return self._stems[int(self._hashes[nearest])]
+
+    def _export(self, sample: _Sample) -> None:
+        image_bytes = sample.image.read_bytes() if isinstance(sample.image, pathlib.Path) else sample.image
+        image = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError("Failed to decode image")
+
+        height, width = image.shape[:2]
+        label_text = "\n".join(
+            yolo_label_lines([(t.code, t.bbox) for t in sample.tiles], self.names, width, height)
+        ) + "\n"
+
+        digest = hashlib.sha256(image_bytes).hexdigest()
+        if sample.corrected and digest in self._digests:
+            self._write_labels(self._digests[digest], label_text)
+            self.stats.relabeled += 1
+            return
+
+        image_hash = dhash(image)
+        if not sample.corrected and self._find_duplicate(image_hash) is not None:
+            self.stats.duplicates += 1
+            return
+
+        if self.stats.bytes_used + len(image_bytes) + len(label_text) > self.budget_bytes:
+            self.stats.over_budget += 1
+            return
+
+        stem = f"{image_hash:016x}"
+        if image_hash in self._stems:
+            # A similar image with the same hash is already exported; keep both
+            stem = f"{stem}-{digest[:12]}"
+        image_path = self.images_dir / f"{stem}{sample.suffix}"
+        tmp = image_path.with_name(image_path.name + ".tmp")
+        tmp.write_bytes(image_bytes)
+        tmp.replace(image_path)
+        self._write_labels(stem, label_text)
+
+        self._digests[digest] = stem
+        if image_hash not in self._stems:
+            self._stems[image_hash] = stem
+        self._hashes = np.append(self._hashes, np.uint64(image_hash))
+        self.stats.bytes_used += len(image_bytes)
+        self.stats.written += 1
+
+    def _write_labels(self, stem: str, label_text: str) -> None:
+        label_path = self.labels_dir / f"{stem}.txt"
+        previous = label_path.stat().st_size if label_path.exists() else 0
+        label_path.write_text(label_text)
+        self.stats.bytes_used += len(label_text) - previous
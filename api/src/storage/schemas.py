@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field, field_validator
+
+from src.tile_detection.decoding import CODE_TO_34
+
+BACK_CODE = "0z"
+
+
+class CorrectedTile(BaseModel):
+    code: str
+    bbox: tuple[int, int, int, int]
+
+    @field_validator("code")
+    @classmethod
+    def _known_code(cls, code: str) -> str:
+        if code not in CODE_TO_34 and code != BACK_CODE:
+            raise ValueError(f"Unknown tile code: {code}")
+        return code
+
+
+class CorrectionRequest(BaseModel):
+    # The full corrected label set for the image, not just the changed tiles
+    tiles: list[CorrectedTile] = Field(max_length=64)
+
+
+class CorrectionResponse(BaseModel):
+    correction_id: str
+    detection_id: str
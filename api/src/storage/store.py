@@ -0,0 +1,458 @@
+import logging
+import os
+import pathlib
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from src.hand_calculation.schemas import HandEvaluationRequest, HandEvaluationResponse
+from src.tile import DetectedTile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_PATH = pathlib.Path(__file__).resolve().parents[2] / "data" / "store.sqlite3"
+
+DEFAULT_BATCH_SIZE = 256
+# How long the writer waits for more writes before committing a partial batch
+DEFAULT_FLUSH_INTERVAL = 0.05
+# Writes waiting for the writer; more are dropped rather than growing the queue
+DEFAULT_MAX_PENDING = 10_000
+# Disk space for uploaded images; the oldest are deleted past it
+DEFAULT_IMAGE_BUDGET_BYTES = 2 << 30  # 2 GiB
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS detections (
+    id TEXT PRIMARY KEY,
+    image_hash TEXT NOT NULL,
+    image_suffix TEXT,
+    session_id TEXT,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS detected_tiles (
+    detection_id TEXT NOT NULL REFERENCES detections(id),
+    position INTEGER NOT NULL,
+    code TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    x1 INTEGER NOT NULL,
+    y1 INTEGER NOT NULL,
+    x2 INTEGER NOT NULL,
+    y2 INTEGER NOT NULL,
+    PRIMARY KEY (detection_id, position)
+);
+CREATE TABLE IF NOT EXISTS corrections (
+    id TEXT PRIMARY KEY,
+    detection_id TEXT NOT NULL REFERENCES detections(id),
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS corrected_tiles (
+    correction_id TEXT NOT NULL REFERENCES corrections(id),
+    position INTEGER NOT NULL,
+    code TEXT NOT NULL,
+    x1 INTEGER NOT NULL,
+    y1 INTEGER NOT NULL,
+    x2 INTEGER NOT NULL,
+    y2 INTEGER NOT NULL,
+    PRIMARY KEY (correction_id, position)
+);
+CREATE TABLE IF NOT EXISTS evaluations (
+    id TEXT PRIMARY KEY,
+    detection_id TEXT REFERENCES detections(id),
+    session_id TEXT,
+    created_at REAL NOT NULL,
+    request TEXT NOT NULL,
+    han INTEGER,
+    fu INTEGER,
+    cost_main INTEGER,
+    cost_additional INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_detections_session ON detections(session_id);
+CREATE INDEX IF NOT EXISTS idx_detections_image_hash ON detections(image_hash);
+CREATE INDEX IF NOT EXISTS idx_detected_tiles_code ON detected_tiles(code);
+CREATE INDEX IF NOT EXISTS idx_corrections_detection ON corrections(detection_id);
+CREATE INDEX IF NOT EXISTS idx_corrected_tiles_code ON corrected_tiles(code);
+CREATE INDEX IF NOT EXISTS idx_evaluations_session ON evaluations(session_id);
+"""
+
+_Statement = tuple[str, tuple]
+
+
+@dataclass(frozen=True)
+class _Write:
+    key: str  # id of the row the write creates, for `flush`
+    statements: list[_Statement]
+    image: tuple[pathlib.Path, bytes] | None = None
+
+
+@dataclass
+class DetectionStoreStats:
+    written: int = 0
+    dropped: int = 0  # queue full
+    failed: int = 0  # rejected by SQLite or the disk, even on their own
+    images_saved: int = 0
+    images_deleted: int = 0  # over the image budget
+    image_bytes: int = 0
+
+
+@dataclass(frozen=True)
+class StoredDetection:
+    id: str
+    image_hash: str
+    image_suffix: str | None
+    session_id: str | None
+    created_at: float
+    tiles: list[DetectedTile]
+
+
+@dataclass(frozen=True)
+class StoredCorrection:
+    id: str
+    detection_id: str
+    image_hash: str
+    image_suffix: str | None
+    tiles: list[DetectedTile]  # confidence is always 1.0
+
+
+@dataclass(frozen=True)
+class StoredEvaluation:
+    id: str
+    detection_id: str | None
+    request: HandEvaluationRequest
+    han: int | None
+    fu: int | None
+    cost_main: int | None
+    cost_additional: int | None
+    error: str | None
+
+
+def resolve_store_path(store_path: pathlib.Path | None = None) -> pathlib.Path:
+    """Database location: explicit path, then STORE_PATH, then api/data/store.sqlite3."""
+    if store_path is not None:
+        return store_path
+    env_path = os.environ.get("STORE_PATH")
+    return pathlib.Path(env_path) if env_path else DEFAULT_STORE_PATH
+
+
+def resolve_image_budget(budget_bytes: int | None = None) -> int:
+    """Image disk budget: explicit value, then STORE_IMAGE_BYTES, then 2 GiB. Zero keeps no images."""
+    if budget_bytes is not None:
+        return budget_bytes
+    env_budget = os.environ.get("STORE_IMAGE_BYTES")
+    return int(env_budget) if env_budget else DEFAULT_IMAGE_BUDGET_BYTES
+
+
+def _connect(db_path: pathlib.Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class DetectionStore:
+    """SQLite store for detections, corrections and evaluations.
+
+    Writes are queued and committed by a background thread in batches, one
+    transaction per batch, so request handlers never wait on disk. If a
+    batch fails, its writes are retried one at a time so one bad write
+    doesn't take the others with it. The queue holds at most `max_pending`
+    writes and drops further ones. Reads go through a separate connection
+    and see every batch committed so far (call `flush` first to include
+    writes still in the queue). Uploaded images are kept under `image_dir`
+    by hash so corrections can be turned into training data, deleting the
+    oldest past `image_budget_bytes`.
+    """
+
+    def __init__(
+        self,
+        db_path: pathlib.Path,
+        image_dir: pathlib.Path | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        image_budget_bytes: int = DEFAULT_IMAGE_BUDGET_BYTES,
+    ):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self.image_dir = image_dir or db_path.parent / "images"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.image_budget_bytes = image_budget_bytes
+        self.stats = DetectionStoreStats()
+
+        # Saved images, oldest first, with their sizes; only the writer thread touches this
+        self._images: OrderedDict[pathlib.Path, int] = OrderedDict()
+        if self.image_dir.exists():
+            existing = [(path.stat(), path) for path in self.image_dir.iterdir() if path.suffix != ".tmp"]
+            for stat, path in sorted(existing, key=lambda item: item[0].st_mtime):
+                self._images[path] = stat.st_size
+                self.stats.image_bytes += stat.st_size
+
+        self._writer_conn = _connect(db_path)
+        self._writer_conn.executescript(SCHEMA)
+        self._reader_conn = _connect(db_path)
+        self._reader_lock = threading.Lock()
+
+        self._queue: queue.Queue[_Write | None] = queue.Queue(maxsize=max_pending)
+        # Keys of queued writes → set once every write for the key is committed or given up on
+        self._pending: dict[str, threading.Event] = {}
+        self._pending_writes: dict[str, int] = {}
+        self._pending_lock = threading.Lock()
+        self._writer = threading.Thread(target=self._write_loop, name="detection-store-writer", daemon=True)
+        self._writer.start()
+
+    # Writes
+
+    def record_detection(
+        self,
+        image_hash: str,
+        tiles: list[DetectedTile],
+        session_id: str | None = None,
+        image_bytes: bytes | None = None,
+        image_suffix: str | None = None,
+        detection_id: str | None = None,
+    ) -> str:
+        """Queue a detection and its tiles. Returns the detection id.
+
+        A given `detection_id` replaces whatever was stored under it, so
+        retried work is stored once.
+        """
+        statements: list[_Statement] = []
+        if detection_id is None:
+            detection_id = uuid.uuid4().hex
+        else:
+            statements.append(("DELETE FROM detected_tiles WHERE detection_id = ?", (detection_id,)))
+        statements.append(
+            (
+                "INSERT OR REPLACE INTO detections (id, image_hash, image_suffix, session_id, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (detection_id, image_hash, image_suffix, session_id, time.time()),
+            )
+        )
+        statements += [
+            (
+                "INSERT INTO detected_tiles VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (detection_id, i, tile.code, tile.confidence, *tile.bbox),
+            )
+            for i, tile in enumerate(tiles)
+        ]
+        image = None
+        if image_bytes is not None and self.image_budget_bytes > 0:
+            image = (self.image_path(image_hash, image_suffix), image_bytes)
+        self._put(_Write(detection_id, statements, image))
+        return detection_id
+
+    def record_correction(self, detection_id: str, tiles: list[DetectedTile]) -> str:
+        """Queue the hand editor's corrected labels for a detection. Returns the correction id."""
+        correction_id = uuid.uuid4().hex
+        statements: list[_Statement] = [
+            (
+                "INSERT INTO corrections (id, detection_id, created_at) VALUES (?, ?, ?)",
+                (correction_id, detection_id, time.time()),
+            )
+        ]
+        statements += [
+            ("INSERT INTO corrected_tiles VALUES (?, ?, ?, ?, ?, ?, ?)", (correction_id, i, tile.code, *tile.bbox))
+            for i, tile in enumerate(tiles)
+        ]
+        self._put(_Write(correction_id, statements))
+        return correction_id
+
+    def record_evaluation(
+        self,
+        request: HandEvaluationRequest,
+        response: HandEvaluationResponse,
+        detection_id: str | None = None,
+        session_id: str | None = None,
+        evaluation_id: str | None = None,
+    ) -> str:
+        """Queue an evaluation result. Returns the evaluation id; a given one replaces its earlier row."""
+        evaluation_id = evaluation_id or uuid.uuid4().hex
+        cost = response.cost
+        params = (
+            evaluation_id,
+            detection_id,
+            session_id,
+            time.time(),
+            request.model_dump_json(),
+            response.han,
+            response.fu,
+            cost.main if cost else None,
+            cost.additional if cost else None,
+            response.error,
+        )
+        statement = "INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        self._put(_Write(evaluation_id, [(statement, params)]))
+        return evaluation_id
+
+    def _put(self, write: _Write) -> None:
+        with self._pending_lock:
+            # A flush may already be waiting on the key's event, so a repeated key shares it
+            self._pending.setdefault(write.key, threading.Event())
+            self._pending_writes[write.key] = self._pending_writes.get(write.key, 0) + 1
+        try:
+            self._queue.put_nowait(write)
+        except queue.Full:
+            self._done(write.key)
+            self.stats.dropped += 1
+            logger.warning("Store write queue is full; dropped a write")
+
+    def _done(self, key: str) -> None:
+        with self._pending_lock:
+            remaining = self._pending_writes.pop(key, 1) - 1
+            if remaining:
+                self._pending_writes[key] = remaining
+                return
+            event = self._pending.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def flush(self, key: str | None = None) -> None:
+        """Block until the writes queued for `key` are committed, or with no key, every queued write."""
+        if key is None:
+            self._queue.join()
+            return
+        with self._pending_lock:
+            event = self._pending.get(key)
+        if event is not None:
+            event.wait()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._writer.join()
+        self._writer_conn.close()
+        self._reader_conn.close()
+
+    def _save_image(self, path: pathlib.Path, image_bytes: bytes) -> None:
+        if path in self._images or path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(image_bytes)
+        tmp.replace(path)
+        self._images[path] = len(image_bytes)
+        self.stats.images_saved += 1
+        self.stats.image_bytes += len(image_bytes)
+        while self.stats.image_bytes > self.image_budget_bytes and len(self._images) > 1:
+            oldest, size = self._images.popitem(last=False)
+            oldest.unlink(missing_ok=True)
+            self.stats.images_deleted += 1
+            self.stats.image_bytes -= size
+
+    def _apply(self, writes: list[_Write]) -> None:
+        """Save the writes' images, then run their statements in one transaction."""
+        for write in writes:
+            if write.image is not None:
+                self._save_image(*write.image)
+        with self._writer_conn:
+            for write in writes:
+                for sql, params in write.statements:
+                    self._writer_conn.execute(sql, params)
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while item is not None and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                batch.append(item)
+
+            writes = [write for write in batch if write is not None]
+            try:
+                self._apply(writes)
+                self.stats.written += len(writes)
+            except (OSError, sqlite3.Error):
+                logger.warning("A batch of %d writes failed; retrying them one at a time", len(writes))
+                for write in writes:
+                    try:
+                        self._apply([write])
+                        self.stats.written += 1
+                    except (OSError, sqlite3.Error):
+                        self.stats.failed += 1
+                        logger.exception("Dropped a write")
+            finally:
+                for write in writes:
+                    self._done(write.key)
+                for _ in batch:
+                    self._queue.task_done()
+
+            if len(writes) < len(batch):
+                return
+
+    # Reads
+
+    def image_path(self, image_hash: str, suffix: str | None) -> pathlib.Path:
+        return self.image_dir / f"{image_hash}{suffix or '.jpg'}"
+
+    def _query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._reader_lock:
+            return self._reader_conn.execute(sql, params).fetchall()
+
+    def _tiles(self, table: str, key: str, owner_id: str) -> list[DetectedTile]:
+        confidence = "confidence" if table == "detected_tiles" else "1.0"
+        rows = self._query(
+            f"SELECT code, {confidence}, x1, y1, x2, y2 FROM {table} WHERE {key} = ? ORDER BY position",
+            (owner_id,),
+        )
+        return [DetectedTile(code=code, confidence=conf, bbox=tuple(bbox)) for code, conf, *bbox in rows]
+
+    def get_detection(self, detection_id: str) -> StoredDetection | None:
+        rows = self._query(
+            "SELECT id, image_hash, image_suffix, session_id, created_at FROM detections WHERE id = ?",
+            (detection_id,),
+        )
+        if not rows:
+            return None
+        return StoredDetection(*rows[0], tiles=self._tiles("detected_tiles", "detection_id", detection_id))
+
+    def detections_for_session(self, session_id: str) -> list[StoredDetection]:
+        rows = self._query(
+            "SELECT id, image_hash, image_suffix, session_id, created_at FROM detections "
+            "WHERE session_id = ? ORDER BY created_at",
+            (session_id,),
+        )
+        return [StoredDetection(*row, tiles=self._tiles("detected_tiles", "detection_id", row[0])) for row in rows]
+
+    def tile_counts(self) -> dict[str, int]:
+        """Detected tiles per code."""
+        return dict(self._query("SELECT code, COUNT(*) FROM detected_tiles GROUP BY code"))
+
+    def detections_with_code(self, code: str, limit: int = 100) -> list[str]:
+        """Ids of the most recent detections containing a tile code."""
+        rows = self._query(
+            "SELECT DISTINCT t.detection_id FROM detected_tiles t JOIN detections d ON d.id = t.detection_id "
+            "WHERE t.code = ? ORDER BY d.created_at DESC LIMIT ?",
+            (code, limit),
+        )
+        return [row[0] for row in rows]
+
+    def evaluations_for_session(self, session_id: str) -> list[StoredEvaluation]:
+        rows = self._query(
+            "SELECT id, detection_id, request, han, fu, cost_main, cost_additional, error FROM evaluations "
+            "WHERE session_id = ? ORDER BY created_at",
+            (session_id,),
+        )
+        return [
+            StoredEvaluation(row[0], row[1], HandEvaluationRequest.model_validate_json(row[2]), *row[3:])
+            for row in rows
+        ]
+
+    def corrections(self) -> Iterator[StoredCorrection]:
+        """Latest correction per detection, oldest first."""
+        rows = self._query(
+            "SELECT c.id, c.detection_id, d.image_hash, d.image_suffix FROM corrections c "
+            "JOIN detections d ON d.id = c.detection_id "
+            "WHERE c.rowid = (SELECT MAX(rowid) FROM corrections WHERE detection_id = c.detection_id) "
+            "ORDER BY c.rowid"
+        )
+        for correction_id, detection_id, image_hash, image_suffix in rows:
+            tiles = self._tiles("corrected_tiles", "correction_id", correction_id)
+            yield StoredCorrection(correction_id, detection_id, image_hash, image_suffix, tiles)
@@ -0,0 +1,119 @@
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+from src.storage.active_learning import ActiveLearningExporter, dhash
+from src.tile import DetectedTile
+
+NAMES = ["1m", "2m"]
+LOW = [DetectedTile(code="1m", confidence=0.3, bbox=(0, 0, 20, 40))]
+HIGH = [DetectedTile(code="1m", confidence=0.9, bbox=(0, 0, 20, 40))]
+
+
+def _png(seed: int) -> bytes:
+    image = np.random.default_rng(seed).integers(0, 255, (100, 200, 3), dtype=np.uint8)
+    return cv2.imencode(".png", image)[1].tobytes()
+
+
+@pytest.fixture
+def exporter(tmp_path):
+    exporter = ActiveLearningExporter(tmp_path, NAMES)
+    yield exporter
+    exporter.close()
+
+
+def test_dhash_ignores_small_changes():
+    image = cv2.imdecode(np.frombuffer(_png(0), np.uint8), cv2.IMREAD_COLOR)
+    brighter = cv2.convertScaleAbs(image, alpha=1.0, beta=10)
+    assert (dhash(image) ^ dhash(brighter)).bit_count() <= 6
+    assert (dhash(image) ^ dhash(np.fliplr(image))).bit_count() > 6
+
+
+class TestActiveLearningExporter:
+    def test_keeps_only_low_confidence_or_corrected(self, exporter, tmp_path):
+        assert not exporter.submit(_png(0), ".png", HIGH)
+        assert exporter.submit(_png(1), ".png", LOW)
+        assert exporter.submit(_png(2), ".png", HIGH, corrected=True)
+        exporter.join()
+
+        assert exporter.stats.written == 2
+        assert len(list((tmp_path / "images").iterdir())) == 2
+        labels = sorted(p.read_text() for p in (tmp_path / "labels").iterdir())
+        assert labels == ["0 0.050000 0.200000 0.100000 0.400000\n"] * 2
+
+    def test_duplicates_skipped_but_corrections_relabel(self, exporter, tmp_path):
+        exporter.submit(_png(1), ".png", LOW)
+        exporter.submit(_png(1), ".png", LOW)
+        exporter.submit(_png(1), ".png", [DetectedTile(code="2m", confidence=1.0, bbox=(0, 0, 20, 40))], True)
+        exporter.join()
+
+        assert exporter.stats.written == 1
+        assert exporter.stats.duplicates == 1
+        assert exporter.stats.relabeled == 1
+        [label] = (tmp_path / "labels").iterdir()
+        assert label.read_text().startswith("1 ")
+
+    def test_correction_of_a_similar_photo_gets_its_own_labels(self, exporter, tmp_path):
+        image = cv2.imdecode(np.frombuffer(_png(1), np.uint8), cv2.IMREAD_COLOR)
+        similar = cv2.imencode(".png", cv2.convertScaleAbs(image, alpha=1.0, beta=10))[1].tobytes()
+        exporter.submit(_png(1), ".png", LOW)
+        exporter.submit(similar, ".png", [DetectedTile(code="2m", confidence=1.0, bbox=(0, 0, 20, 40))], True)
+        exporter.join()
+
+        assert (exporter.stats.written, exporter.stats.relabeled) == (2, 0)
+        labels = sorted(p.read_text()[0] for p in (tmp_path / "labels").iterdir())
+        assert labels == ["0", "1"]
+
+    def test_respects_disk_budget(self, tmp_path):
+        exporter = ActiveLearningExporter(tmp_path, NAMES, budget_bytes=len(_png(1)) + 100)
+        exporter.submit(_png(1), ".png", LOW)
+        exporter.submit(_png(2), ".png", LOW)
+        exporter.close()
+
+        assert exporter.stats.written == 1
+        assert exporter.stats.over_budget == 1
+
+    def test_reads_stored_image_paths(self, exporter, tmp_path):
+        stored = tmp_path / "stored.png"
+        stored.write_bytes(_png(3))
+        exporter.submit(stored, ".png", LOW)
+        exporter.join()
+        assert exporter.stats.written == 1
+
+    def test_drops_when_queue_is_full(self, tmp_path):
+        exporter = ActiveLearningExporter(tmp_path, NAMES, queue_size=1)
+        exporter._queue.put(None)  # stop the worker so the queue stays full
+        exporter._worker.join()
+
+        assert exporter.submit(_png(1), ".png", LOW)
+        assert not exporter.submit(_png(2), ".png", LOW)
+        assert exporter.stats.dropped == 1
+
+    def test_restores_hashes_from_disk(self, tmp_path):
+        first = ActiveLearningExporter(tmp_path, NAMES)
+        first.submit(_png(1), ".png", LOW)
+        first.close()
+
+        second = ActiveLearningExporter(tmp_path, NAMES)
+        second.submit(_png(1), ".png", LOW)
+        second.submit(_png(1), ".png", HIGH, corrected=True)
+        second.close()
+
+        assert second.stats.duplicates == 1
+        assert second.stats.relabeled == 1
+        assert second.stats.bytes_used == first.stats.bytes_used
+
+    def test_earlier_exports_are_indexed_off_the_calling_thread(self, tmp_path, monkeypatch):
+        threads = []
+        load_existing = ActiveLearningExporter._load_existing
+
+        def recording_load(self):
+            threads.append(threading.current_thread().name)
+            load_existing(self)
+
+        monkeypatch.setattr(ActiveLearningExporter, "_load_existing", recording_load)
+        ActiveLearningExporter(tmp_path, NAMES).close()
+
+        assert threads == ["active-learning-export"]
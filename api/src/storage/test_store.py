@@ -0,0 +1,168 @@
+import sqlite3
+import threading
+
+import pytest
+
+from src.hand_calculation.schemas import CostResult, HandEvaluationRequest, HandEvaluationResponse
+from src.storage.store import DetectionStore, _Write
+from src.tile import DetectedTile
+
+TILES = [
+    DetectedTile(code="1m", confidence=0.9, bbox=(0, 0, 10, 20)),
+    DetectedTile(code="5z", confidence=0.8, bbox=(12, 0, 22, 20)),
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DetectionStore(tmp_path / "store.sqlite3")
+    yield store
+    store.close()
+
+
+def _request() -> HandEvaluationRequest:
+    return HandEvaluationRequest(
+        tiles=["1m", "2m", "3m", "4p", "5p", "6p", "7s", "8s", "9s", "2m", "3m", "4m", "1z", "1z"],
+        win_tile_index=13,
+        is_tsumo=False,
+        seat_wind="east",
+        round_wind="east",
+        is_riichi=False,
+    )
+
+
+class TestDetectionStore:
+    def test_uses_wal(self, store):
+        mode = sqlite3.connect(store.db_path).execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+    def test_detection_roundtrip(self, store):
+        detection_id = store.record_detection("abc", TILES, session_id="s1", image_bytes=b"img", image_suffix=".png")
+        store.flush()
+
+        detection = store.get_detection(detection_id)
+        assert detection.image_hash == "abc"
+        assert detection.session_id == "s1"
+        assert detection.tiles == TILES
+        assert store.image_path("abc", ".png").read_bytes() == b"img"
+
+    def test_given_ids_replace_earlier_rows(self, store):
+        store.record_detection("abc", TILES, detection_id="job-item")
+        store.record_detection("abc", TILES[:1], detection_id="job-item")
+        response = HandEvaluationResponse(han=1, fu=30, yaku=[], cost=CostResult(main=1000, additional=0), error=None)
+        store.record_evaluation(_request(), response, session_id="s1", evaluation_id="job-item")
+        store.record_evaluation(_request(), response, session_id="s1", evaluation_id="job-item")
+        store.flush()
+
+        assert store.get_detection("job-item").tiles == TILES[:1]
+        assert store.tile_counts() == {"1m": 1}
+        assert len(store.evaluations_for_session("s1")) == 1
+
+    def test_unknown_detection_is_none(self, store):
+        assert store.get_detection("missing") is None
+
+    def test_session_and_code_queries(self, store):
+        first = store.record_detection("a", TILES, session_id="s1")
+        store.record_detection("b", TILES[:1], session_id="s2")
+        third = store.record_detection("c", TILES[1:], session_id="s1")
+        store.flush()
+
+        assert [d.id for d in store.detections_for_session("s1")] == [first, third]
+        assert set(store.detections_with_code("5z")) == {first, third}
+        assert store.tile_counts() == {"1m": 2, "5z": 2}
+
+    def test_latest_correction_per_detection(self, store):
+        detection_id = store.record_detection("abc", TILES, image_bytes=b"img")
+        store.record_correction(detection_id, [DetectedTile(code="2m", confidence=1.0, bbox=(0, 0, 10, 20))])
+        store.flush()
+        store.record_correction(detection_id, [DetectedTile(code="3m", confidence=1.0, bbox=(0, 0, 10, 20))])
+        store.flush()
+
+        corrections = list(store.corrections())
+
+        assert len(corrections) == 1
+        assert corrections[0].image_hash == "abc"
+        assert [t.code for t in corrections[0].tiles] == ["3m"]
+
+    def test_evaluations_by_session(self, store):
+        response = HandEvaluationResponse(han=1, fu=30, yaku=[], cost=CostResult(main=1000, additional=0), error=None)
+        store.record_evaluation(_request(), response, session_id="s1")
+        store.flush()
+
+        [evaluation] = store.evaluations_for_session("s1")
+        assert evaluation.request == _request()
+        assert evaluation.cost_main == 1000
+
+    def test_writes_are_batched(self, tmp_path):
+        store = DetectionStore(tmp_path / "store.sqlite3", flush_interval=0.5)
+        for i in range(50):
+            store.record_detection(f"hash{i}", TILES)
+        store.close()
+
+        reopened = DetectionStore(tmp_path / "store.sqlite3")
+        assert reopened.tile_counts() == {"1m": 50, "5z": 50}
+        reopened.close()
+
+    def test_failed_write_is_retried_alone(self, tmp_path):
+        store = DetectionStore(tmp_path / "store.sqlite3", flush_interval=0.2)
+        first = store.record_detection("a", TILES)
+        # Missing NOT NULL columns; in the same batch it used to roll back the others
+        store._put(_Write("bad", [("INSERT INTO corrections (id) VALUES (?)", ("bad",))]))
+        last = store.record_detection("b", TILES)
+        store.flush()
+
+        assert store.get_detection(first) is not None and store.get_detection(last) is not None
+        assert (store.stats.written, store.stats.failed) == (2, 1)
+        store.close()
+
+    def test_full_queue_drops_writes(self, tmp_path, monkeypatch):
+        store = DetectionStore(tmp_path / "store.sqlite3", batch_size=1, max_pending=1)
+        release = threading.Event()
+        apply = store._apply
+        monkeypatch.setattr(store, "_apply", lambda writes: (release.wait(), apply(writes)))
+        for i in range(5):
+            store.record_detection(f"hash{i}", TILES)
+
+        # At most one write is being applied and one waits in the queue
+        assert store.stats.dropped >= 3
+        release.set()
+        store.close()
+
+    def test_flush_waits_for_one_write(self, store):
+        detection_id = store.record_detection("abc", TILES)
+        store.flush(detection_id)
+
+        assert store.get_detection(detection_id) is not None
+        store.flush("unknown")  # already committed or never queued: returns at once
+
+    def test_flush_of_a_repeated_key_waits_for_its_last_write(self, tmp_path, monkeypatch):
+        store = DetectionStore(tmp_path / "store.sqlite3", batch_size=1)
+        release = threading.Event()
+        apply = store._apply
+        monkeypatch.setattr(store, "_apply", lambda writes: (release.wait(), apply(writes)))
+        store.record_detection("abc", TILES, detection_id="job-item")
+        waiting = store._pending["job-item"]  # what a flush started now waits on
+        store.record_detection("abc", TILES[:1], detection_id="job-item")
+
+        release.set()
+        assert waiting.wait(timeout=5)
+        assert store.get_detection("job-item").tiles == TILES[:1]
+        store.close()
+
+    def test_oldest_images_go_past_the_budget(self, tmp_path):
+        store = DetectionStore(tmp_path / "store.sqlite3", image_budget_bytes=10)
+        for name in ("a", "b", "c"):
+            store.record_detection(name, TILES, image_bytes=b"12345", image_suffix=".png")
+        store.flush()
+
+        assert not store.image_path("a", ".png").exists()
+        assert store.image_path("b", ".png").exists() and store.image_path("c", ".png").exists()
+        assert (store.stats.images_deleted, store.stats.image_bytes) == (1, 10)
+        store.close()
+
+    def test_zero_budget_keeps_no_images(self, tmp_path):
+        store = DetectionStore(tmp_path / "store.sqlite3", image_budget_bytes=0)
+        store.record_detection("a", TILES, image_bytes=b"img", image_suffix=".png")
+        store.close()
+
+        assert not (tmp_path / "images").exists()
@@ -0,0 +1,58 @@
+import cv2
+import numpy as np
+import yaml
+
+from src.storage.store import DetectionStore
+from src.storage.training import export_corrections, export_crop_dataset, yolo_label_lines
+from src.tile import DetectedTile
+
+
+def test_yolo_label_lines_skips_unknown_codes():
+    lines = yolo_label_lines([("2m", (10, 20, 30, 60)), ("9z", (0, 0, 1, 1))], ["1m", "2m"], 100, 100)
+    assert lines == ["1 0.200000 0.400000 0.200000 0.400000"]
+
+
+def test_export_adds_corrections_to_training_split(tmp_path):
+    for split in ["train", "valid"]:
+        (tmp_path / "base" / split / "images").mkdir(parents=True)
+    base_data = tmp_path / "base" / "data.yaml"
+    base_data.write_text("train: ../train/images\nval: ../valid/images\nnames: ['1m', '2m']\n")
+
+    _, png = cv2.imencode(".png", np.zeros((100, 200, 3), dtype=np.uint8))
+    store = DetectionStore(tmp_path / "store.sqlite3")
+    detection_id = store.record_detection(
+        "abc", [DetectedTile(code="1m", confidence=0.5, bbox=(0, 0, 20, 40))], image_bytes=png.tobytes(), image_suffix=".png"
+    )
+    store.record_detection("no-correction", [])
+    store.flush()
+    store.record_correction(detection_id, [DetectedTile(code="2m", confidence=1.0, bbox=(0, 0, 20, 40))])
+    store.flush()
+
+    count = export_corrections(store, base_data, tmp_path / "out")
+    store.close()
+
+    assert count == 1
+    assert (tmp_path / "out" / "images" / "abc.png").exists()
+    assert (tmp_path / "out" / "labels" / "abc.txt").read_text() == "1 0.050000 0.200000 0.100000 0.400000\n"
+    data = yaml.safe_load((tmp_path / "out" / "data.yaml").read_text())
+    assert data["names"] == ["1m", "2m"]
+    assert data["train"][1] == str((tmp_path / "out" / "images").resolve())
+    assert data["val"] == str((tmp_path / "base" / "valid" / "images").resolve())
+
+
+def test_export_crop_dataset_writes_a_folder_per_code(tmp_path):
+    base_data = tmp_path / "base" / "data.yaml"
+    for split, labels in [("train", "0 0.25 0.5 0.2 0.4\n1 0.75 0.5 0.2 0.4\n"), ("valid", "1 0.5 0.5 0.2 0.4\n")]:
+        (tmp_path / "base" / split / "images").mkdir(parents=True)
+        (tmp_path / "base" / split / "labels").mkdir(parents=True)
+        cv2.imwrite(str(tmp_path / "base" / split / "images" / f"{split}.png"), np.zeros((100, 200, 3), np.uint8))
+        (tmp_path / "base" / split / "labels" / f"{split}.txt").write_text(labels)
+    base_data.write_text("train: ../train/images\nval: ../valid/images\nnames: ['1m', '2m']\n")
+
+    count = export_crop_dataset(base_data, tmp_path / "crops")
+
+    assert count == 3
+    assert (tmp_path / "crops" / "train" / "1m" / "train_0.png").exists()
+    assert (tmp_path / "crops" / "train" / "2m" / "train_1.png").exists()
+    crop = cv2.imread(str(tmp_path / "crops" / "val" / "2m" / "valid_0.png"))
+    assert crop.shape[:2] == (48, 48)  # 40x40 box plus 10% padding on each side
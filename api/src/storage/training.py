@@ -0,0 +1,90 @@
+import pathlib
+import shutil
+
+import cv2
+import yaml
+
+from src.storage.store import DetectionStore
+from src.tile_detection.evaluation import load_dataset, read_labels, resolve_split_dir
+from src.tile_detection.reclassify import crop_tile
+
+
+def yolo_label_lines(
+    codes_and_boxes: list[tuple[str, tuple[int, int, int, int]]],
+    names: list[str],
+    width: int,
+    height: int,
+) -> list[str]:
+    """Normalized YOLO rows; codes missing from `names` are skipped."""
+    class_ids = {name: i for i, name in enumerate(names)}
+    lines = []
+    for code, (x1, y1, x2, y2) in codes_and_boxes:
+        if code not in class_ids:
+            continue
+        cx, cy = (x1 + x2) / 2 / width, (y1 + y2) / 2 / height
+        w, h = (x2 - x1) / width, (y2 - y1) / height
+        lines.append(f"{class_ids[code]} {cx:.6f} {cy:.6f} {w:.6f} {h:.6f}")
+    return lines
+
+
+def export_corrections(store: DetectionStore, base_data: pathlib.Path, output_dir: pathlib.Path) -> int:
+    """Write corrected detections as a YOLO split and a data.yaml that trains on it.
+
+    The generated data.yaml keeps the base dataset's classes and validation
+    split and adds the corrections to its training images, so it can be
+    passed straight to `model/main.py --data`. Returns the number of images
+    exported; corrections whose image wasn't kept are skipped.
+    """
+    config = yaml.safe_load(base_data.read_text())
+    names = config["names"]
+    if isinstance(names, dict):
+        names = [names[i] for i in sorted(names)]
+
+    images_dir = output_dir / "images"
+    labels_dir = output_dir / "labels"
+    images_dir.mkdir(parents=True, exist_ok=True)
+    labels_dir.mkdir(parents=True, exist_ok=True)
+
+    exported = 0
+    for correction in store.corrections():
+        source = store.image_path(correction.image_hash, correction.image_suffix)
+        image = cv2.imread(str(source))
+        if image is None:
+            continue
+
+        height, width = image.shape[:2]
+        lines = yolo_label_lines([(t.code, t.bbox) for t in correction.tiles], names, width, height)
+        shutil.copyfile(source, images_dir / source.name)
+        (labels_dir / f"{source.stem}.txt").write_text("\n".join(lines) + "\n")
+        exported += 1
+
+    data = {
+        "train": [str(resolve_split_dir(base_data, config, "train")), str(images_dir.resolve())],
+        "val": str(resolve_split_dir(base_data, config, "val")),
+        "nc": len(names),
+        "names": names,
+    }
+    (output_dir / "data.yaml").write_text(yaml.safe_dump(data, sort_keys=False))
+    return exported
+
+
+def export_crop_dataset(data_yaml: pathlib.Path, output_dir: pathlib.Path) -> int:
+    """Write every labeled box as `<split>/<code>/<image>_<n>.png` for classifier training.
+
+    The layout is the image-folder format `yolo classify train` reads.
+    Returns the number of crops written.
+    """
+    written = 0
+    for split in ("train", "val"):
+        images, names = load_dataset(data_yaml, split)
+        for labeled in images:
+            image = cv2.imread(str(labeled.image_path))
+            if image is None:
+                continue
+            height, width = image.shape[:2]
+            for n, tile in enumerate(read_labels(labeled.label_path, names, width, height)):
+                class_dir = output_dir / split / tile.code
+                class_dir.mkdir(parents=True, exist_ok=True)
+                cv2.imwrite(str(class_dir / f"{labeled.image_path.stem}_{n}.png"), crop_tile(image, tile.bbox))
+                written += 1
+    return written
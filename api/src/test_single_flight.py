@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from src.single_flight import SingleFlight
+
+
+def _counting(results: list[int], delay: float = 0.01):
+    async def compute():
+        await asyncio.sleep(delay)
+        results.append(len(results))
+        return len(results)
+
+    return compute
+
+
+def test_concurrent_calls_share_one_computation():
+    async def run():
+        flight = SingleFlight()
+        runs: list[int] = []
+        values = await asyncio.gather(*(flight.do("key", _counting(runs)) for _ in range(5)))
+        return flight, runs, values
+
+    flight, runs, values = asyncio.run(run())
+    assert runs == [0]
+    assert values == [1] * 5
+    assert (flight.stats.calls, flight.stats.executed, flight.stats.coalesced) == (5, 1, 4)
+    assert flight.in_flight == 0
+
+
+def test_different_keys_run_separately():
+    async def run():
+        flight = SingleFlight()
+        runs: list[int] = []
+        await asyncio.gather(flight.do("a", _counting(runs)), flight.do("b", _counting(runs)))
+        return flight, runs
+
+    flight, runs = asyncio.run(run())
+    assert len(runs) == 2
+    assert flight.stats.coalesced == 0
+
+
+def test_finished_computation_is_not_cached():
+    async def run():
+        flight = SingleFlight()
+        runs: list[int] = []
+        await flight.do("key", _counting(runs))
+        await flight.do("key", _counting(runs))
+        return runs
+
+    assert asyncio.run(run()) == [0, 1]
+
+
+def test_exception_reaches_every_caller():
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def run():
+        flight = SingleFlight()
+        return await asyncio.gather(*(flight.do("key", failing) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    async def run():
+        flight = SingleFlight()
+        runs: list[int] = []
+        first = asyncio.create_task(flight.do("key", _counting(runs, delay=0.05)))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flight.do("key", _counting(runs)))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second, runs
+
+    value, runs = asyncio.run(run())
+    assert value == 1
+    assert runs == [0]
@@ -0,0 +1,76 @@
+import cv2
+import torch
+
+from src.thread_config import (
+    DEFAULT_THREAD_CONFIG_PATH,
+    Measurement,
+    ThreadConfig,
+    apply_thread_config,
+    best_measurement,
+    candidate_configs,
+    load_thread_config,
+    resolve_thread_config_path,
+    save_thread_config,
+)
+
+
+def test_candidates_never_oversubscribe():
+    configs = candidate_configs(cpus=8, max_workers=4)
+    assert configs
+    assert all(c.workers * c.torch_threads <= 8 for c in configs)
+    assert {c.workers for c in configs} == {1, 2, 3, 4}
+    assert {c.torch_threads for c in configs if c.workers == 1} == {1, 2, 4, 8}
+    assert {c.torch_threads for c in configs if c.workers == 3} == {1, 2}
+    assert {c.opencv_threads for c in configs if c.workers == 2} == {0, 4}
+
+
+def test_single_core_candidates():
+    assert candidate_configs(cpus=1, max_workers=4) == [ThreadConfig(1, 1, 0), ThreadConfig(1, 1, 1)]
+
+
+def test_best_prefers_fewer_threads_when_close():
+    measurements = [
+        Measurement(ThreadConfig(1, 8, 8), 10.0, 0.1),
+        Measurement(ThreadConfig(1, 4, 0), 9.9, 0.1),
+        Measurement(ThreadConfig(2, 4, 0), 12.0, 0.15),
+    ]
+    assert best_measurement(measurements).config == ThreadConfig(2, 4, 0)
+    assert best_measurement(measurements[:2]).config == ThreadConfig(1, 4, 0)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "thread_config.json"
+    assert load_thread_config(path) is None
+    save_thread_config(path, Measurement(ThreadConfig(2, 2, 0), 5.0, 0.2))
+    assert load_thread_config(path) == ThreadConfig(2, 2, 0)
+
+
+def test_apply_sets_thread_counts():
+    torch_threads, opencv_threads = torch.get_num_threads(), cv2.getNumThreads()
+    try:
+        apply_thread_config(ThreadConfig(1, 1, 1))
+        assert torch.get_num_threads() == 1
+        assert cv2.getNumThreads() == 1
+    finally:
+        torch.set_num_threads(torch_threads)
+        cv2.setNumThreads(opencv_threads)
+
+
+def test_apply_none_keeps_defaults():
+    threads = torch.get_num_threads()
+    apply_thread_config(None)
+    assert torch.get_num_threads() == threads
+
+
+class TestResolveThreadConfigPath:
+    def test_explicit_path_wins(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("THREAD_CONFIG_PATH", "/env/threads.json")
+        assert resolve_thread_config_path(tmp_path / "t.json") == tmp_path / "t.json"
+
+    def test_env_var(self, monkeypatch):
+        monkeypatch.setenv("THREAD_CONFIG_PATH", "/env/threads.json")
+        assert str(resolve_thread_config_path()) == "/env/threads.json"
+
+    def test_default(self, monkeypatch):
+        monkeypatch.delenv("THREAD_CONFIG_PATH", raising=False)
+        assert resolve_thread_config_path() == DEFAULT_THREAD_CONFIG_PATH
@@ -1,6 +1,6 @@
 import pytest
 
-from src.tile import DetectedTile, Suit
+from src.tile import CODE_TO_34, DetectedTile, Suit, code_from_34, dora_from_indicator
 
 
 class TestDetectedTileBasic:
@@ -241,3 +241,14 @@ class TestTo136:
     def test_to_136_back_returns_none(self):
         tile = DetectedTile(code="0z", confidence=0.9, bbox=(0, 0, 0, 0))
         assert tile.to_136() is None
+
+
+def test_dora_wraps_within_suits_and_honors():
+    assert dora_from_indicator(0) == 1  # 1m -> 2m
+    assert dora_from_indicator(8) == 0  # 9m -> 1m
+    assert dora_from_indicator(30) == 27  # north -> east
+    assert dora_from_indicator(33) == 31  # chun -> haku
+
+
+def test_code_from_34_round_trips():
+    assert [code_from_34(CODE_TO_34[code]) for code in ("1m", "9p", "0s", "7z")] == ["1m", "9p", "5s", "7z"]
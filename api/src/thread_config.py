@@ -0,0 +1,156 @@
+"""CPU thread topology for inference: server workers, torch and OpenCV threads.
+
+Library defaults give every process a thread per core in both torch and
+OpenCV, so several workers, or torch and OpenCV inside one, oversubscribe
+the cores. `tune_threads.py` measures `detect_tiles` throughput across
+combinations and saves the fastest; the server applies it at startup.
+"""
+
+import json
+import multiprocessing
+import os
+import pathlib
+import queue
+import statistics
+import time
+from dataclasses import asdict, dataclass
+
+import cv2
+import torch
+
+from src.tile_detection.detection import detect_tiles, load_model
+
+DEFAULT_THREAD_CONFIG_PATH = pathlib.Path(__file__).parent.parent / "thread_config.json"
+
+
+def resolve_thread_config_path(config_path: pathlib.Path | None = None) -> pathlib.Path:
+    """Explicit path, else THREAD_CONFIG_PATH, else thread_config.json next to main.py."""
+    if config_path is not None:
+        return config_path
+    return pathlib.Path(os.environ.get("THREAD_CONFIG_PATH", DEFAULT_THREAD_CONFIG_PATH))
+
+
+@dataclass(frozen=True)
+class ThreadConfig:
+    workers: int  # server worker processes
+    torch_threads: int  # intra-op threads per worker
+    opencv_threads: int  # per worker; 0 runs OpenCV single-threaded
+
+
+@dataclass
+class Measurement:
+    config: ThreadConfig
+    images_per_second: float
+    median_seconds: float  # per image, within one worker
+
+
+def load_thread_config(path: pathlib.Path) -> ThreadConfig | None:
+    """The saved configuration, or None when the machine hasn't been tuned."""
+    if not path.exists():
+        return None
+    return ThreadConfig(**json.loads(path.read_text())["config"])
+
+
+def save_thread_config(path: pathlib.Path, best: Measurement) -> None:
+    path.write_text(
+        json.dumps(
+            {
+                "config": asdict(best.config),
+                "images_per_second": best.images_per_second,
+                "cpus": os.cpu_count(),
+            },
+            indent=2,
+        )
+        + "\n"
+    )
+
+
+def apply_thread_config(config: ThreadConfig | None) -> None:
+    """Set this process's torch and OpenCV thread counts; None keeps the library defaults."""
+    if config is None:
+        return
+    torch.set_num_threads(config.torch_threads)
+    cv2.setNumThreads(config.opencv_threads)
+
+
+def _powers_of_two(limit: int) -> list[int]:
+    values = [1]
+    while values[-1] * 2 <= limit:
+        values.append(values[-1] * 2)
+    if values[-1] != limit:
+        values.append(limit)
+    return values
+
+
+def candidate_configs(cpus: int, max_workers: int = 1) -> list[ThreadConfig]:
+    """Combinations that don't put more torch threads across workers than there are cores.
+
+    OpenCV runs between inferences, so it is tried single-threaded and on
+    all of a worker's share of the cores.
+    """
+    configs = []
+    for workers in range(1, min(max_workers, cpus) + 1):
+        share = cpus // workers
+        for torch_threads in _powers_of_two(share):
+            for opencv_threads in sorted({0, share}):
+                configs.append(ThreadConfig(workers, torch_threads, opencv_threads))
+    return configs
+
+
+def _benchmark_worker(config, model_path, image_paths, passes, barrier, results) -> None:
+    apply_thread_config(config)
+    model = load_model(model_path)
+    images = [image for image in (cv2.imread(str(p)) for p in image_paths) if image is not None]
+    detect_tiles(model, images[0])  # lazy predictor setup
+
+    barrier.wait()
+    start = time.monotonic()
+    latencies = []
+    for _ in range(passes):
+        for image in images:
+            image_start = time.monotonic()
+            detect_tiles(model, image)
+            latencies.append(time.monotonic() - image_start)
+    results.put((start, time.monotonic(), latencies))
+
+
+def measure(
+    config: ThreadConfig, model_path: pathlib.Path | None, image_paths: list[pathlib.Path], passes: int
+) -> Measurement:
+    """Run `config.workers` processes detecting every image `passes` times at once."""
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(config.workers)
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=_benchmark_worker, args=(config, model_path, image_paths, passes, barrier, results)
+        )
+        for _ in range(config.workers)
+    ]
+    for process in processes:
+        process.start()
+    runs = []
+    while len(runs) < len(processes):
+        try:
+            runs.append(results.get(timeout=1.0))
+        except queue.Empty:
+            if any(process.exitcode not in (None, 0) for process in processes):
+                for process in processes:
+                    process.terminate()
+                raise RuntimeError(f"A benchmark worker failed for {config}")
+    for process in processes:
+        process.join()
+
+    elapsed = max(end for _, end, _ in runs) - min(start for start, _, _ in runs)
+    latencies = [seconds for _, _, worker_latencies in runs for seconds in worker_latencies]
+    return Measurement(config, len(latencies) / elapsed, statistics.median(latencies))
+
+
+def best_measurement(measurements: list[Measurement]) -> Measurement:
+    """Highest throughput; within 2% of it, the fewest threads."""
+    top = max(m.images_per_second for m in measurements)
+    close = [m for m in measurements if m.images_per_second >= 0.98 * top]
+    return min(
+        close,
+        key=lambda m: (m.config.workers * m.config.torch_threads, m.config.opencv_threads, -m.images_per_second),
+    )
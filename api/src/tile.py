@@ -2,6 +2,31 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
 
+_SUIT_BASE_34 = {"m": 0, "p": 9, "s": 18, "z": 27}
+
+# Every face tile code (1-9 per suit, red fives, 7 honors) → 34-format index
+CODE_TO_34: dict[str, int] = {
+    **{f"{n}{suit}": _SUIT_BASE_34[suit] + n - 1 for suit in "mps" for n in range(1, 10)},
+    **{f"0{suit}": _SUIT_BASE_34[suit] + 4 for suit in "mps"},
+    **{f"{n}z": 27 + n - 1 for n in range(1, 8)},
+}
+RED_FIVES = frozenset({"0m", "0p", "0s"})
+MAX_COPIES = 4
+
+
+def code_from_34(index: int) -> str:
+    """The plain tile code for a 34-format index; red fives come back as 5."""
+    return f"{index % 9 + 1}{'mpsz'[index // 9]}"
+
+
+def dora_from_indicator(indicator: int) -> int:
+    """The 34-format tile a dora indicator points at: the next in its suit, wind or dragon cycle."""
+    if indicator < 27:
+        return indicator // 9 * 9 + (indicator % 9 + 1) % 9
+    if indicator < 31:
+        return 27 + (indicator - 27 + 1) % 4
+    return 31 + (indicator - 31 + 1) % 3
+
 
 class Suit(Enum):
     MAN = "m"
@@ -15,6 +40,8 @@ class DetectedTile:
     code: str  # "1m", "0p" (red 5), "5z", "0z" (back)
     confidence: float
     bbox: tuple[int, int, int, int]
+    # Most likely classes for this box as (code, score), best first
+    alternatives: tuple[tuple[str, float], ...] = ()
 
     @property
     def is_back(self) -> bool:
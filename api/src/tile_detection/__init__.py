@@ -1,11 +1,84 @@
-from src.tile_detection.detection import decode_image, detect_tiles, load_model, sort_tiles
-from src.tile_detection.schemas import DetectedTileResponse, TileDetectionResponse
+from src.tile_detection.cascade import CascadeModel, CascadeStats
+from src.tile_detection.detection import (
+    decode_image,
+    detect_tiles,
+    load_model,
+    resolve_fast_model_path,
+    sort_tiles,
+)
+from src.tile_detection.layout import Layout, analyze_layout
+from src.tile_detection.reclassify import (
+    CropReclassifier,
+    ReclassifierStats,
+    load_reclassifier,
+    resolve_classifier_path,
+)
+from src.tile_detection.registry import (
+    ModelRegistry,
+    ModelSwitcher,
+    ServingModel,
+    SwitchStatus,
+    load_serving_model,
+    resolve_registry_dir,
+    warm_up,
+)
+from src.tile_detection.resolution import (
+    ResolutionController,
+    ResolutionStats,
+    resolve_latency_target,
+)
+from src.tile_detection.scheduler import (
+    DeadlineExceeded,
+    Grant,
+    InferenceScheduler,
+    Priority,
+    SchedulerStats,
+)
+from src.tile_detection.schemas import (
+    DetectedTileResponse,
+    ModelStatusResponse,
+    ShadowRequest,
+    TileAlternative,
+    TileDetectionResponse,
+    TileLayoutResponse,
+)
+from src.tile_detection.shadow import ShadowEvaluator, ShadowStats
 
 __all__ = [
+    "analyze_layout",
+    "CascadeModel",
+    "CascadeStats",
+    "CropReclassifier",
+    "DeadlineExceeded",
     "decode_image",
     "detect_tiles",
+    "Grant",
+    "InferenceScheduler",
+    "Layout",
     "load_model",
+    "load_reclassifier",
+    "load_serving_model",
+    "ModelRegistry",
+    "ModelSwitcher",
+    "Priority",
+    "ReclassifierStats",
+    "ResolutionController",
+    "ResolutionStats",
+    "resolve_classifier_path",
+    "resolve_fast_model_path",
+    "resolve_latency_target",
+    "resolve_registry_dir",
+    "SchedulerStats",
+    "ServingModel",
+    "ShadowEvaluator",
+    "ShadowStats",
     "sort_tiles",
+    "SwitchStatus",
+    "warm_up",
     "DetectedTileResponse",
+    "ModelStatusResponse",
+    "ShadowRequest",
+    "TileAlternative",
     "TileDetectionResponse",
+    "TileLayoutResponse",
 ]
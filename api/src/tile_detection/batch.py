@@ -0,0 +1,360 @@
+import glob
+import itertools
+import json
+import os
+import pathlib
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from multiprocessing import get_context
+from typing import Any
+
+import cv2
+import numpy as np
+from ultralytics import YOLO
+
+from src.thread_config import ThreadConfig, apply_thread_config
+from src.tile import DetectedTile
+from src.tile_detection.detection import decode_image, detect_tiles, load_model
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp", ".bmp"}
+
+BOX_COLOR = (0, 255, 0)
+TEXT_COLOR = (0, 0, 0)
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+FONT_SCALE = 0.5
+FONT_THICKNESS = 1
+
+# Threads decoding images ahead of the model and writing annotations behind it, per worker
+IO_THREADS = 2
+# Images decoded, or waiting on their annotation, beyond the one being inferred
+PREFETCH = 4
+# Images handed to a pool worker at a time; its I/O threads pipeline within a chunk
+CHUNK_SIZE = 16
+
+
+def discover_images(inputs: Iterable[str]) -> list[pathlib.Path]:
+    """Expand directories (recursively) and glob patterns into image paths.
+
+    Results are de-duplicated and sorted so repeated runs see the same order.
+    """
+    found: set[pathlib.Path] = set()
+
+    for entry in inputs:
+        path = pathlib.Path(entry)
+        if path.is_dir():
+            candidates = (p for p in path.rglob("*") if p.is_file())
+        elif path.is_file():
+            candidates = iter([path])
+        else:
+            candidates = (pathlib.Path(p) for p in glob.iglob(entry, recursive=True))
+
+        for candidate in candidates:
+            if candidate.is_file() and candidate.suffix.lower() in IMAGE_SUFFIXES:
+                found.add(candidate.resolve())
+
+    return sorted(found)
+
+
+def annotate_image(image: np.ndarray, tiles: list[DetectedTile]) -> np.ndarray:
+    """Draw bounding boxes and labels for detected tiles onto a copy of the image.
+
+    Boxes and label backgrounds are drawn with one polyline/fill call each;
+    only the text itself is rendered per tile.
+    """
+    annotated = image.copy()
+    if not tiles:
+        return annotated
+
+    labels = [f"{tile.code} {tile.confidence:.0%}" for tile in tiles]
+    text_sizes = [cv2.getTextSize(label, FONT, FONT_SCALE, FONT_THICKNESS)[0] for label in labels]
+
+    boxes = []
+    label_boxes = []
+    for tile, (text_w, text_h) in zip(tiles, text_sizes):
+        x1, y1, x2, y2 = tile.bbox
+        boxes.append(np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2]], dtype=np.int32))
+        label_boxes.append(
+            np.array(
+                [[x1, y1 - text_h - 6], [x1 + text_w, y1 - text_h - 6], [x1 + text_w, y1], [x1, y1]],
+                dtype=np.int32,
+            )
+        )
+
+    cv2.polylines(annotated, boxes, isClosed=True, color=BOX_COLOR, thickness=2)
+    cv2.fillPoly(annotated, label_boxes, color=BOX_COLOR)
+
+    for tile, label in zip(tiles, labels):
+        x1, y1 = tile.bbox[0], tile.bbox[1]
+        cv2.putText(annotated, label, (x1, y1 - 4), FONT, FONT_SCALE, TEXT_COLOR, FONT_THICKNESS)
+
+    return annotated
+
+
+def tile_to_record(tile: DetectedTile) -> dict[str, Any]:
+    return {"code": tile.code, "confidence": tile.confidence, "bbox": list(tile.bbox)}
+
+
+class JsonlSink:
+    """Append-only JSONL result file that can be resumed after interruption."""
+
+    def __init__(self, path: pathlib.Path):
+        self.path = path
+
+    def completed(self) -> set[str]:
+        """Return image paths already written, skipping lines that don't decode."""
+        if not self.path.exists():
+            return set()
+
+        done: set[str] = set()
+        with self.path.open("rb") as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["path"])
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+        return done
+
+    def __enter__(self) -> "JsonlSink":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._cut_torn_line()
+        self._file = self.path.open("a", encoding="utf-8")
+        return self
+
+    def _cut_torn_line(self) -> None:
+        """A crash mid-write leaves a final line without its newline; cut it so appends stay valid."""
+        if not self.path.exists():
+            return
+        with self.path.open("r+b") as f:
+            size = f.seek(0, 2)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+            # Walk back to the last complete line
+            end = size
+            while end > 0:
+                start = max(end - 4096, 0)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b"\n")
+                if newline >= 0:
+                    f.truncate(start + newline + 1)
+                    return
+                end = start
+            f.truncate(0)
+
+    def write(self, record: dict[str, Any]) -> None:
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def __exit__(self, *exc_info) -> None:
+        self._file.close()
+
+
+class ParquetSink:
+    """Directory of Parquet part files, flushed every `rows_per_part` records.
+
+    Parquet files can't be appended to, so results are streamed as numbered
+    parts; resuming reads back every complete part.
+    """
+
+    def __init__(self, path: pathlib.Path, rows_per_part: int = 500):
+        self.path = path
+        self.rows_per_part = rows_per_part
+
+    def completed(self) -> set[str]:
+        import polars as pl
+
+        if not self.path.exists():
+            return set()
+
+        done: set[str] = set()
+        for part in sorted(self.path.glob("part-*.parquet")):
+            done.update(pl.read_parquet(part, columns=["path"])["path"].to_list())
+        return done
+
+    def __enter__(self) -> "ParquetSink":
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._buffer: list[dict[str, Any]] = []
+        self._next_part = len(list(self.path.glob("part-*.parquet")))
+        return self
+
+    def write(self, record: dict[str, Any]) -> None:
+        self._buffer.append(record)
+        if len(self._buffer) >= self.rows_per_part:
+            self._flush()
+
+    def _flush(self) -> None:
+        import polars as pl
+
+        if not self._buffer:
+            return
+
+        rows = [{**record, "tiles": json.dumps(record["tiles"])} for record in self._buffer]
+        part_path = self.path / f"part-{self._next_part:05d}.parquet"
+        tmp_path = part_path.with_suffix(".tmp")
+        pl.DataFrame(rows).write_parquet(tmp_path)
+        tmp_path.rename(part_path)  # only complete parts are visible on resume
+
+        self._next_part += 1
+        self._buffer = []
+
+    def __exit__(self, *exc_info) -> None:
+        self._flush()
+
+
+def open_sink(output: pathlib.Path, output_format: str | None = None) -> JsonlSink | ParquetSink:
+    """Pick a result sink from an explicit format or the output path suffix."""
+    if output_format is None:
+        output_format = "jsonl" if output.suffix == ".jsonl" else "parquet"
+
+    if output_format == "jsonl":
+        return JsonlSink(output)
+    if output_format == "parquet":
+        return ParquetSink(output)
+    raise ValueError(f"Unknown output format: {output_format}")
+
+
+# Per-process state, populated once by _init_worker so each worker keeps one model resident
+_worker_model: YOLO | None = None
+_worker_annotate_dir: pathlib.Path | None = None
+_worker_root: pathlib.Path | None = None
+
+
+def worker_thread_config(workers: int, cpus: int | None = None) -> ThreadConfig | None:
+    """Split the cores between pool workers' torch threads; None leaves a single worker the defaults.
+
+    OpenCV runs single-threaded in the workers since decoding and
+    annotating already run on the I/O threads beside inference.
+    """
+    if workers <= 1:
+        return None
+    cpus = cpus or os.cpu_count() or 1
+    return ThreadConfig(workers, torch_threads=max(cpus // workers, 1), opencv_threads=0)
+
+
+def _init_worker(
+    model_path: pathlib.Path | None,
+    annotate_dir: pathlib.Path | None,
+    root: pathlib.Path,
+    thread_config: ThreadConfig | None = None,
+) -> None:
+    global _worker_model, _worker_annotate_dir, _worker_root
+    apply_thread_config(thread_config)
+    _worker_model = load_model(model_path)
+    _worker_annotate_dir = annotate_dir
+    _worker_root = root
+
+
+def common_root(paths: list[pathlib.Path]) -> pathlib.Path:
+    """Deepest directory containing every path."""
+    if not paths:
+        return pathlib.Path(".")
+    return pathlib.Path(os.path.commonpath([str(p.parent) for p in paths]))
+
+
+def annotated_path(path: pathlib.Path, root: pathlib.Path, annotate_dir: pathlib.Path) -> pathlib.Path:
+    """Where `path`'s annotated copy goes: its location under `root`, mirrored under `annotate_dir`."""
+    relative = path.relative_to(root)
+    return annotate_dir / relative.parent / f"{path.stem}_output{path.suffix}"
+
+
+def _read_image(path: pathlib.Path) -> np.ndarray:
+    return decode_image(path.read_bytes())
+
+
+def _write_annotation(path: pathlib.Path, image: np.ndarray, tiles: list[DetectedTile]) -> None:
+    assert _worker_annotate_dir is not None and _worker_root is not None
+    out_path = annotated_path(path, _worker_root, _worker_annotate_dir)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    cv2.imwrite(str(out_path), annotate_image(image, tiles))
+
+
+def _detect_paths(paths: Iterable[pathlib.Path]) -> Iterator[dict[str, Any]]:
+    """Run the worker's model over `paths` in order, decoding ahead and annotating behind on I/O threads.
+
+    A record is yielded once its annotation is written, so a resumed run
+    never skips an image whose annotated copy is missing.
+    """
+    assert _worker_model is not None
+
+    remaining = iter(paths)
+    with ThreadPoolExecutor(IO_THREADS) as io:
+        decoding: deque[tuple[pathlib.Path, Future[np.ndarray]]] = deque(
+            (path, io.submit(_read_image, path)) for path in itertools.islice(remaining, PREFETCH)
+        )
+        finishing: deque[tuple[dict[str, Any], Future[None] | None]] = deque()
+
+        while decoding:
+            path, decoded = decoding.popleft()
+            for path_ahead in itertools.islice(remaining, 1):
+                decoding.append((path_ahead, io.submit(_read_image, path_ahead)))
+
+            try:
+                image = decoded.result()
+            except (OSError, ValueError) as e:
+                finishing.append(({"path": str(path), "count": 0, "tiles": [], "error": str(e)}, None))
+            else:
+                tiles = detect_tiles(_worker_model, image)
+                record = {
+                    "path": str(path),
+                    "count": len(tiles),
+                    "tiles": [tile_to_record(tile) for tile in tiles],
+                    "error": None,
+                }
+                written = None
+                if _worker_annotate_dir is not None:
+                    written = io.submit(_write_annotation, path, image, tiles)
+                finishing.append((record, written))
+
+            # Hand back what is written; past PREFETCH, wait rather than hold more images
+            while finishing and (finishing[0][1] is None or finishing[0][1].done() or len(finishing) > PREFETCH):
+                record, written = finishing.popleft()
+                if written is not None:
+                    written.result()
+                yield record
+
+        for record, written in finishing:
+            if written is not None:
+                written.result()
+            yield record
+
+
+def _process_chunk(paths: list[pathlib.Path]) -> list[dict[str, Any]]:
+    return list(_detect_paths(paths))
+
+
+def run_batch(
+    paths: list[pathlib.Path],
+    model_path: pathlib.Path | None = None,
+    workers: int = 1,
+    annotate_dir: pathlib.Path | None = None,
+    root: pathlib.Path | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Detect tiles in every image, yielding one record per image as it completes.
+
+    Each worker keeps one model busy while a couple of I/O threads decode
+    the next images and write annotations for the previous ones. With more
+    than one worker, chunks of images are spread over a process pool and
+    the cores are split between the workers' torch threads, so they don't
+    oversubscribe the machine; results then arrive in completion order.
+    Annotated images mirror each path's location under `root`, by default
+    the directory the paths have in common.
+    """
+    if annotate_dir is not None:
+        annotate_dir.mkdir(parents=True, exist_ok=True)
+    if root is None:
+        root = common_root(paths)
+
+    if workers <= 1:
+        _init_worker(model_path, annotate_dir, root)
+        yield from _detect_paths(paths)
+        return
+
+    chunks = [paths[i : i + CHUNK_SIZE] for i in range(0, len(paths), CHUNK_SIZE)]
+    initargs = (model_path, annotate_dir, root, worker_thread_config(workers))
+    ctx = get_context("spawn")  # torch does not survive fork reliably
+    with ctx.Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+        for records in pool.imap_unordered(_process_chunk, chunks):
+            yield from records
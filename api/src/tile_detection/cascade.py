@@ -0,0 +1,91 @@
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+from ultralytics import YOLO
+
+from src.tile import DetectedTile
+from src.tile_detection.overlap import suppress_overlaps
+
+# Every tile of an accepted fast-model result must be at least this confident
+DEFAULT_CONFIDENCE_THRESHOLD = 0.6
+# A hand photo shows 13 or 14 tiles, plus one per kan; other counts go to the full model
+DEFAULT_MIN_TILES = 13
+DEFAULT_MAX_TILES = 18
+
+Predict = Callable[[YOLO, np.ndarray], list[DetectedTile]]
+
+
+@dataclass
+class CascadeStats:
+    images: int = 0
+    escalated: int = 0
+    fast_seconds: float = 0.0
+    full_seconds: float = 0.0  # spent on escalated images only
+
+    @property
+    def escalation_rate(self) -> float:
+        return self.escalated / self.images if self.images else 0.0
+
+    @property
+    def saved_seconds(self) -> float | None:
+        """Full-model time avoided on accepted images, less the fast pass on every image.
+
+        None until an escalation has measured the full model's latency.
+        """
+        if not self.escalated:
+            return None
+        full_latency = self.full_seconds / self.escalated
+        return (self.images - self.escalated) * full_latency - self.fast_seconds
+
+
+class CascadeModel:
+    """A fast model whose results are accepted when confident, else the full model.
+
+    Loaded by `load_model` when a fast model path is configured and passed to
+    `detect_tiles` in place of a YOLO model. `names` are the full model's.
+    """
+
+    def __init__(
+        self,
+        fast: YOLO,
+        full: YOLO,
+        confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+        min_tiles: int = DEFAULT_MIN_TILES,
+        max_tiles: int = DEFAULT_MAX_TILES,
+    ):
+        if fast.names != full.names:
+            raise ValueError("The fast and full models must predict the same classes")
+        self.fast = fast
+        self.full = full
+        self.confidence_threshold = confidence_threshold
+        self.min_tiles = min_tiles
+        self.max_tiles = max_tiles
+        self.stats = CascadeStats()
+
+    @property
+    def names(self) -> dict[int, str]:
+        return self.full.names
+
+    def accepts(self, tiles: list[DetectedTile]) -> bool:
+        # Judged after overlap suppression, so a weak duplicate box doesn't force an escalation
+        kept = suppress_overlaps(tiles)
+        if not self.min_tiles <= len(kept) <= self.max_tiles:
+            return False
+        return all(tile.confidence >= self.confidence_threshold for tile in kept)
+
+    def predict(self, image: np.ndarray, predict: Predict) -> list[DetectedTile]:
+        """Raw tiles from `predict` run on the fast model, or on the full model if rejected."""
+        start = time.perf_counter()
+        tiles = predict(self.fast, image)
+        self.stats.fast_seconds += time.perf_counter() - start
+        self.stats.images += 1
+        if self.accepts(tiles):
+            return tiles
+
+        start = time.perf_counter()
+        tiles = predict(self.full, image)
+        self.stats.full_seconds += time.perf_counter() - start
+        self.stats.escalated += 1
+        return tiles
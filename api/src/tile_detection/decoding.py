@@ -0,0 +1,113 @@
+import heapq
+import math
+from dataclasses import replace
+
+from mahjong.agari import Agari
+
+from src.tile import CODE_TO_34, MAX_COPIES, DetectedTile
+
+# Bit per suit tracking whether that suit's single red five is already used
+RED_FIVE_BITS = {"0m": 1, "0p": 2, "0s": 4}
+
+DEFAULT_BEAM_WIDTH = 64
+
+_agari = Agari()
+
+_State = tuple[tuple[int, ...], int]  # (34-counts, red five bits)
+
+
+def _options(tile: DetectedTile) -> list[tuple[str, float]]:
+    """Candidate codes for a tile with normalized log-probabilities."""
+    candidates = [(code, score) for code, score in tile.alternatives if code in CODE_TO_34 and score > 0]
+    if not candidates:
+        candidates = [(tile.code, max(tile.confidence, 1e-9))]
+    total = sum(score for _, score in candidates)
+    return [(code, math.log(score / total)) for code, score in candidates]
+
+
+def is_valid_tile_set(codes: list[str]) -> bool:
+    """True if no tile appears more than 4 times and no suit has two red fives."""
+    counts = [0] * 34
+    red_bits = 0
+    for code in codes:
+        idx = CODE_TO_34[code]
+        counts[idx] += 1
+        bit = RED_FIVE_BITS.get(code, 0)
+        if counts[idx] > MAX_COPIES or red_bits & bit:
+            return False
+        red_bits |= bit
+    return True
+
+
+def decode_tiles(
+    tiles: list[DetectedTile],
+    require_complete: bool = False,
+    beam_width: int = DEFAULT_BEAM_WIDTH,
+) -> list[DetectedTile]:
+    """Choose the most likely class for every tile such that the set is physically possible.
+
+    Beam search over (34-count, red-five) states: no tile more than 4 times
+    and at most one red five per suit. Paths reaching the same state are
+    merged, keeping the more likely one. With require_complete, a complete
+    hand is preferred when any candidate forms one.
+
+    Back tiles and unknown codes are passed through unchanged. If no valid
+    assignment exists the input is returned as-is.
+    """
+    decodable = [i for i, tile in enumerate(tiles) if tile.code in CODE_TO_34]
+    if not decodable:
+        return list(tiles)
+    if not require_complete and is_valid_tile_set([tiles[i].code for i in decodable]):
+        return list(tiles)
+
+    start: _State = ((0,) * 34, 0)
+    beam: dict[_State, float] = {start: 0.0}
+    # Back-pointers per step: state → (previous state, chosen code)
+    steps: list[dict[_State, tuple[_State, str]]] = []
+
+    for i in decodable:
+        options = _options(tiles[i])
+        expanded: dict[_State, tuple[float, _State, str]] = {}
+
+        for (counts, red_bits), score in beam.items():
+            for code, log_p in options:
+                idx = CODE_TO_34[code]
+                if counts[idx] >= MAX_COPIES:
+                    continue
+                bit = RED_FIVE_BITS.get(code, 0)
+                if red_bits & bit:
+                    continue
+
+                new_counts = counts[:idx] + (counts[idx] + 1,) + counts[idx + 1 :]
+                new_state = (new_counts, red_bits | bit)
+                new_score = score + log_p
+                best = expanded.get(new_state)
+                if best is None or best[0] < new_score:
+                    expanded[new_state] = (new_score, (counts, red_bits), code)
+
+        if not expanded:
+            return list(tiles)
+
+        kept = heapq.nlargest(beam_width, expanded.items(), key=lambda item: item[1][0])
+        beam = {state: score for state, (score, _, _) in kept}
+        steps.append({state: (prev, code) for state, (_, prev, code) in kept})
+
+    ranked = sorted(beam, key=beam.__getitem__, reverse=True)
+    final = ranked[0]
+    if require_complete:
+        final = next((state for state in ranked if _agari.is_agari(list(state[0]))), final)
+
+    chosen: list[str] = []
+    state = final
+    for step in reversed(steps):
+        state, code = step[state]
+        chosen.append(code)
+    chosen.reverse()
+
+    result = list(tiles)
+    for i, code in zip(decodable, chosen):
+        tile = tiles[i]
+        if code != tile.code:
+            score = dict(tile.alternatives).get(code, tile.confidence)
+            result[i] = replace(tile, code=code, confidence=score)
+    return result
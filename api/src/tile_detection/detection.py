@@ -1,19 +1,95 @@
+import os
 import pathlib
+import time
+from collections.abc import Callable
+from functools import partial
 
 import cv2
 import numpy as np
 from ultralytics import YOLO
+from ultralytics.models.yolo.detect import DetectionPredictor
+from ultralytics.utils import nms, ops
 
 from src.tile import DetectedTile
+from src.tile_detection.cascade import CascadeModel
+from src.tile_detection.decoding import decode_tiles
+from src.tile_detection.layout import analyze_layout
+from src.tile_detection.overlap import suppress_overlaps
+from src.tile_detection.reclassify import CropReclassifier
+from src.tile_detection.rectification import (
+    FIRST_PASS_IMGSZ,
+    estimate_rectification,
+    map_tiles_back,
+    rectify_image,
+)
 
 # Patch WindowsPath for models trained on Windows
 pathlib.WindowsPath = pathlib.PosixPath
 
 
-def load_model(model_path: pathlib.Path | None = None) -> YOLO:
-    if model_path is None:
-        model_path = pathlib.Path(__file__).parent.parent.parent / "best.pt"
-    return YOLO(model_path)
+DEFAULT_MODEL_PATH = pathlib.Path(__file__).parent.parent.parent / "best.pt"
+
+
+# Number of class alternatives kept per box
+TOP_K = 3
+
+
+class TopKDetectionPredictor(DetectionPredictor):
+    """Detection predictor that also keeps the per-class scores of every kept box.
+
+    Results get a `class_scores` array of shape (boxes, classes), aligned with
+    `result.boxes`.
+    """
+
+    def postprocess(self, preds, img, orig_imgs, **kwargs):
+        if getattr(self.model, "end2end", False):
+            return super().postprocess(preds, img, orig_imgs, **kwargs)
+
+        raw = preds[0] if isinstance(preds, (list, tuple)) else preds
+        nc = len(self.model.names)
+        output, keep = nms.non_max_suppression(
+            preds,
+            self.args.conf,
+            self.args.iou,
+            self.args.classes,
+            self.args.agnostic_nms,
+            max_det=self.args.max_det,
+            nc=nc,
+            return_idxs=True,
+        )
+
+        if not isinstance(orig_imgs, list):
+            orig_imgs = ops.convert_torch2numpy_batch(orig_imgs)[..., ::-1]
+
+        results = self.construct_results(output, img, orig_imgs)
+        for i, (result, idxs) in enumerate(zip(results, keep)):
+            result.class_scores = raw[i, 4 : 4 + nc, idxs.view(-1).long()].T.cpu().numpy()
+        return results
+
+
+def resolve_model_path(model_path: pathlib.Path | None = None) -> pathlib.Path:
+    """Explicit path, else the MODEL_PATH environment variable, else the bundled best.pt."""
+    if model_path is not None:
+        return model_path
+    return pathlib.Path(os.environ.get("MODEL_PATH", DEFAULT_MODEL_PATH))
+
+
+def resolve_fast_model_path(fast_model_path: pathlib.Path | None = None) -> pathlib.Path | None:
+    """Explicit path, else FAST_MODEL_PATH; None disables the cascade."""
+    if fast_model_path is not None:
+        return fast_model_path
+    env_path = os.environ.get("FAST_MODEL_PATH")
+    return pathlib.Path(env_path) if env_path else None
+
+
+def load_model(
+    model_path: pathlib.Path | None = None, fast_model_path: pathlib.Path | None = None
+) -> YOLO | CascadeModel:
+    """The full model, or a cascade with it behind `fast_model_path` (e.g. the distilled student)."""
+    model = YOLO(resolve_model_path(model_path))
+    if fast_model_path is None:
+        return model
+    return CascadeModel(YOLO(fast_model_path), model)
 
 
 def decode_image(image_bytes: bytes) -> np.ndarray:
@@ -26,23 +102,6 @@ def decode_image(image_bytes: bytes) -> np.ndarray:
     return image
 
 
-def _tiles_are_row_aligned(tiles: list[DetectedTile]) -> bool:
-    """Check if tiles are roughly aligned in a horizontal row.
-
-    Compares the vertical spread of tile centers against typical tile height.
-    If the spread is less than the median tile height, they're in a row.
-    """
-    if len(tiles) <= 1:
-        return True
-
-    centers_y = [(t.bbox[1] + t.bbox[3]) / 2 for t in tiles]
-    heights = [t.bbox[3] - t.bbox[1] for t in tiles]
-    median_height = sorted(heights)[len(heights) // 2]
-
-    y_spread = max(centers_y) - min(centers_y)
-    return y_spread <= median_height
-
-
 _SUIT_ORDER = {"m": 0, "p": 1, "s": 2, "z": 3}
 
 
@@ -59,37 +118,121 @@ def _suit_sort_key(tile: DetectedTile) -> tuple[int, int]:
 def sort_tiles(tiles: list[DetectedTile]) -> list[DetectedTile]:
     """Sort detected tiles for display.
 
-    If tiles are roughly in a horizontal row, sort left-to-right by x-position.
-    Otherwise fall back to suit-based ascending order.
+    Tiles are read row by row along the fitted row direction (see
+    `analyze_layout`). If no two tiles share a row, fall back to suit-based
+    ascending order.
     """
     if len(tiles) <= 1:
         return list(tiles)
 
-    if _tiles_are_row_aligned(tiles):
-        return sorted(tiles, key=lambda t: t.bbox[0])
+    layout = analyze_layout(tiles)
+    if layout.is_scattered:
+        return sorted(tiles, key=_suit_sort_key)
+
+    return [tiles[i] for i in layout.order]
 
-    return sorted(tiles, key=_suit_sort_key)
 
+def predict_tiles(
+    model: YOLO,
+    image: np.ndarray,
+    imgsz: int | None = None,
+    on_inference: Callable[[float], None] | None = None,
+) -> list[DetectedTile]:
+    """Run the model and convert raw boxes to tiles, without any post-processing.
 
-def detect_tiles(model: YOLO, image: np.ndarray) -> list[DetectedTile]:
-    results = model(image)
+    `imgsz` overrides the model's input size for this call. `on_inference`
+    is called with the seconds spent in the model call itself.
+    """
+    kwargs = {"imgsz": imgsz} if imgsz is not None else {}
+    start = time.perf_counter()
+    results = model(image, predictor=TopKDetectionPredictor, **kwargs)
+    if on_inference is not None:
+        on_inference(time.perf_counter() - start)
     tiles = []
 
     for result in results:
         if len(result.boxes) == 0:
             continue
 
-        for box in result.boxes:
+        class_scores = getattr(result, "class_scores", None)
+
+        for i, box in enumerate(result.boxes):
             cls_id = int(box.cls[0])
             code = result.names[cls_id]
             confidence = float(box.conf[0])
             x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
 
+            alternatives: tuple[tuple[str, float], ...] = ()
+            if isinstance(class_scores, np.ndarray):
+                scores = class_scores[i]
+                top = np.argsort(scores)[::-1][:TOP_K]
+                alternatives = tuple((result.names[int(j)], float(scores[j])) for j in top)
+
             tile = DetectedTile(
                 code=code,
                 confidence=confidence,
                 bbox=(x1, y1, x2, y2),
+                alternatives=alternatives,
             )
             tiles.append(tile)
 
-    return sort_tiles(tiles)
+    return tiles
+
+
+def predict_tiles_rectified(
+    model: YOLO,
+    image: np.ndarray,
+    imgsz: int | None = None,
+    on_inference: Callable[[float], None] | None = None,
+) -> list[DetectedTile]:
+    """Detect on a top-down view of a tilted table photo; boxes are in original coordinates.
+
+    A quick pass at FIRST_PASS_IMGSZ locates the tiles, their sizes give a
+    homography (see `estimate_rectification`), and the final pass runs on the
+    warped copy of the already decoded image. Photos that look top-down
+    already skip the warp and cost one extra low-resolution pass. `imgsz`
+    and `on_inference` apply to the final pass.
+    """
+    first_pass = suppress_overlaps(predict_tiles(model, image, imgsz=FIRST_PASS_IMGSZ))
+    height, width = image.shape[:2]
+    rectification = estimate_rectification(first_pass, (width, height))
+    if rectification is None:
+        return predict_tiles(model, image, imgsz, on_inference)
+    warped = rectify_image(image, rectification)
+    return map_tiles_back(predict_tiles(model, warped, imgsz, on_inference), rectification)
+
+
+def postprocess_tiles(
+    tiles: list[DetectedTile],
+    refine: Callable[[list[DetectedTile]], list[DetectedTile]] | None = None,
+) -> list[DetectedTile]:
+    """Post-processing applied to raw model output before it is returned.
+
+    `refine`, if given, runs on the deduplicated tiles before decoding.
+    """
+    tiles = suppress_overlaps(tiles)
+    if refine is not None:
+        tiles = refine(tiles)
+    return sort_tiles(decode_tiles(tiles))
+
+
+def detect_tiles(
+    model: YOLO | CascadeModel,
+    image: np.ndarray,
+    rectify: bool = False,
+    reclassifier: CropReclassifier | None = None,
+    imgsz: int | None = None,
+    on_inference: Callable[[float], None] | None = None,
+) -> list[DetectedTile]:
+    """Detect, post-process and sort tiles.
+
+    `rectify` detects on a top-down warp of the photo; a `reclassifier`
+    refines uncertain tiles from crops of `image` before decoding. `imgsz`
+    overrides the model's input size, for both models of a cascade, and
+    `on_inference` is called with the seconds of every model call made at it.
+    """
+    predict = partial(
+        predict_tiles_rectified if rectify else predict_tiles, imgsz=imgsz, on_inference=on_inference
+    )
+    raw = model.predict(image, predict) if isinstance(model, CascadeModel) else predict(model, image)
+    return postprocess_tiles(raw, partial(reclassifier.refine, image) if reclassifier else None)
@@ -0,0 +1,336 @@
+import hashlib
+import json
+import pathlib
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+
+import cv2
+import yaml
+from ultralytics import YOLO
+
+from src.tile import DetectedTile
+from src.tile_detection.detection import (
+    TOP_K,
+    load_model,
+    postprocess_tiles,
+    predict_tiles,
+    resolve_model_path,
+    sort_tiles,
+)
+from src.tile_detection.overlap import iou
+
+
+@dataclass(frozen=True)
+class LabeledImage:
+    image_path: pathlib.Path
+    label_path: pathlib.Path
+
+
+@dataclass
+class ClassMetrics:
+    true_positives: int = 0
+    false_positives: int = 0
+    false_negatives: int = 0
+
+    @property
+    def precision(self) -> float:
+        predicted = self.true_positives + self.false_positives
+        return self.true_positives / predicted if predicted else 0.0
+
+    @property
+    def recall(self) -> float:
+        actual = self.true_positives + self.false_negatives
+        return self.true_positives / actual if actual else 0.0
+
+
+@dataclass
+class EvaluationReport:
+    per_class: dict[str, ClassMetrics] = field(default_factory=dict)
+    images: int = 0
+    exact_hands: int = 0
+    cached_images: int = 0
+    unreadable: int = 0  # images that failed to decode and were left out
+    inference_seconds: float = 0.0  # summed model time, measured when not cached
+    wall_seconds: float = 0.0
+
+    @property
+    def hand_exact_match_rate(self) -> float:
+        return self.exact_hands / self.images if self.images else 0.0
+
+    @property
+    def images_per_second(self) -> float:
+        """Single-core model throughput."""
+        return self.images / self.inference_seconds if self.inference_seconds else 0.0
+
+    @property
+    def wall_images_per_second(self) -> float:
+        """End-to-end throughput of this run, including cache hits and parallelism."""
+        return self.images / self.wall_seconds if self.wall_seconds else 0.0
+
+
+def resolve_split_dir(data_yaml: pathlib.Path, config: dict, split: str) -> pathlib.Path:
+    entry = config.get(split)
+    if entry is None:
+        raise ValueError(f"Split '{split}' not found in {data_yaml}")
+
+    root = pathlib.Path(config.get("path") or data_yaml.parent)
+    if not root.is_absolute():
+        root = data_yaml.parent / root
+
+    # Roboflow exports use paths relative to the yaml file's parent ("../valid/images")
+    candidates = [root / entry, data_yaml.parent / entry, data_yaml.parent / str(entry).removeprefix("../")]
+    for candidate in candidates:
+        if candidate.exists():
+            return candidate.resolve()
+    raise ValueError(f"Image directory for split '{split}' not found: {entry}")
+
+
+def load_dataset(data_yaml: pathlib.Path, split: str = "val") -> tuple[list[LabeledImage], list[str]]:
+    """Read a YOLO-format dataset description.
+
+    Returns the labeled images of the split and the class names indexed by class id.
+    """
+    config = yaml.safe_load(data_yaml.read_text())
+    names = config["names"]
+    if isinstance(names, dict):
+        names = [names[i] for i in sorted(names)]
+
+    image_dir = resolve_split_dir(data_yaml, config, split)
+    label_dir = image_dir.parent / "labels" if image_dir.name == "images" else image_dir
+
+    images = []
+    for image_path in sorted(image_dir.iterdir()):
+        if image_path.suffix.lower() not in {".jpg", ".jpeg", ".png", ".webp", ".bmp"}:
+            continue
+        images.append(LabeledImage(image_path, label_dir / f"{image_path.stem}.txt"))
+
+    return images, names
+
+
+def read_labels(label_path: pathlib.Path, names: list[str], width: int, height: int) -> list[DetectedTile]:
+    """Convert normalized YOLO label rows into ground-truth tiles."""
+    if not label_path.exists():
+        return []
+
+    tiles = []
+    for line in label_path.read_text().splitlines():
+        parts = line.split()
+        if len(parts) < 5:
+            continue
+        cls_id = int(parts[0])
+        cx, cy, w, h = (float(v) for v in parts[1:5])
+        bbox = (
+            int((cx - w / 2) * width),
+            int((cy - h / 2) * height),
+            int((cx + w / 2) * width),
+            int((cy + h / 2) * height),
+        )
+        tiles.append(DetectedTile(code=names[cls_id], confidence=1.0, bbox=bbox))
+    return tiles
+
+
+def match_tiles(
+    predicted: list[DetectedTile],
+    truth: list[DetectedTile],
+    per_class: dict[str, ClassMetrics],
+    iou_threshold: float = 0.5,
+) -> None:
+    """Greedily match predictions to ground truth (most confident first) and tally per class."""
+    unmatched = list(truth)
+
+    for tile in sorted(predicted, key=lambda t: t.confidence, reverse=True):
+        best, best_iou = None, iou_threshold
+        for candidate in unmatched:
+            if candidate.code != tile.code:
+                continue
+            overlap = iou(tile.bbox, candidate.bbox)
+            if overlap >= best_iou:
+                best, best_iou = candidate, overlap
+
+        metrics = per_class.setdefault(tile.code, ClassMetrics())
+        if best is None:
+            metrics.false_positives += 1
+        else:
+            metrics.true_positives += 1
+            unmatched.remove(best)
+
+    for tile in unmatched:
+        per_class.setdefault(tile.code, ClassMetrics()).false_negatives += 1
+
+
+def file_hash(path: pathlib.Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class Prediction:
+    tiles: list[DetectedTile]
+    seconds: float
+    size: tuple[int, int]  # (width, height) of the evaluated image
+
+
+# Bump when the cached entry format changes, so older caches are ignored
+CACHE_FORMAT = 2
+
+
+def cache_key(model_hash: str, imgsz: int | None = None) -> str:
+    """Model hash plus the predictor settings that shape its raw output."""
+    settings = f"{model_hash}:imgsz={imgsz}:top_k={TOP_K}:format={CACHE_FORMAT}"
+    return hashlib.sha256(settings.encode()).hexdigest()[:16]
+
+
+class PredictionCache:
+    """Raw model output per image, stored in one JSONL file per model and predictor settings.
+
+    Only `predict_tiles` output is cached, alternatives included, so
+    post-processing changes are picked up without re-running inference.
+    """
+
+    def __init__(self, cache_dir: pathlib.Path, model_hash: str, imgsz: int | None = None):
+        self.path = cache_dir / f"{cache_key(model_hash, imgsz)}.jsonl"
+        self.entries: dict[str, dict] = {}
+        if self.path.exists():
+            for line in self.path.read_text().splitlines():
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.entries[entry["image_hash"]] = entry
+
+    def get(self, image_hash: str) -> Prediction | None:
+        entry = self.entries.get(image_hash)
+        if entry is None:
+            return None
+        tiles = [
+            DetectedTile(
+                code=t["code"],
+                confidence=t["confidence"],
+                bbox=tuple(t["bbox"]),
+                alternatives=tuple((code, score) for code, score in t["alternatives"]),
+            )
+            for t in entry["tiles"]
+        ]
+        return Prediction(tiles, entry["seconds"], tuple(entry["size"]))
+
+    def put(self, image_hash: str, prediction: Prediction) -> None:
+        tiles = prediction.tiles
+        entry = {
+            "image_hash": image_hash,
+            "seconds": prediction.seconds,
+            "size": list(prediction.size),
+            "tiles": [
+                {
+                    "code": t.code,
+                    "confidence": t.confidence,
+                    "bbox": list(t.bbox),
+                    "alternatives": [list(alternative) for alternative in t.alternatives],
+                }
+                for t in tiles
+            ],
+        }
+        self.entries[image_hash] = entry
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+_worker_model: YOLO | None = None
+_worker_imgsz: int | None = None
+
+
+def _init_worker(model_path: pathlib.Path, imgsz: int | None = None) -> None:
+    global _worker_model, _worker_imgsz
+    _worker_model = load_model(model_path)
+    _worker_imgsz = imgsz
+
+
+def _predict_worker(image_path: pathlib.Path) -> tuple[pathlib.Path, Prediction | None]:
+    """The image's prediction, or None if it can't be decoded."""
+    assert _worker_model is not None
+    image = cv2.imread(str(image_path))
+    if image is None:
+        return image_path, None
+    start = time.perf_counter()
+    tiles = predict_tiles(_worker_model, image, imgsz=_worker_imgsz)
+    seconds = time.perf_counter() - start
+    return image_path, Prediction(tiles, seconds, (image.shape[1], image.shape[0]))
+
+
+def _predict_all(
+    paths: list[pathlib.Path], model_path: pathlib.Path, workers: int, imgsz: int | None = None
+) -> Iterator[tuple[pathlib.Path, Prediction | None]]:
+    if not paths:
+        return
+    if workers <= 1:
+        _init_worker(model_path, imgsz)
+        yield from map(_predict_worker, paths)
+        return
+
+    ctx = get_context("spawn")
+    with ctx.Pool(workers, initializer=_init_worker, initargs=(model_path, imgsz)) as pool:
+        yield from pool.imap_unordered(_predict_worker, paths)
+
+
+def evaluate_model(
+    data_yaml: pathlib.Path,
+    model_path: pathlib.Path | None = None,
+    split: str = "val",
+    workers: int = 1,
+    cache_dir: pathlib.Path | None = None,
+    iou_threshold: float = 0.5,
+    imgsz: int | None = None,
+) -> EvaluationReport:
+    """Score the production detection path against a labeled YOLO dataset.
+
+    Inference runs through `predict_tiles` and every result then goes through
+    `postprocess_tiles`, exactly as `detect_tiles` does in the API. `imgsz`
+    overrides the model's input size. Images that fail to decode are counted
+    in `unreadable` and left out.
+    """
+    model_path = resolve_model_path(model_path)
+    images, names = load_dataset(data_yaml, split)
+    report = EvaluationReport()
+    start = time.perf_counter()
+
+    cache = PredictionCache(cache_dir, file_hash(model_path), imgsz) if cache_dir else None
+    image_hashes = {item.image_path: file_hash(item.image_path) for item in images}
+
+    predictions: dict[pathlib.Path, Prediction] = {}
+    pending = []
+    for item in images:
+        cached = cache.get(image_hashes[item.image_path]) if cache else None
+        if cached is None:
+            pending.append(item.image_path)
+            continue
+        predictions[item.image_path] = cached
+        report.cached_images += 1
+
+    for image_path, prediction in _predict_all(pending, model_path, workers, imgsz):
+        if prediction is None:
+            report.unreadable += 1
+            continue
+        predictions[image_path] = prediction
+        if cache:
+            cache.put(image_hashes[image_path], prediction)
+
+    for item in images:
+        prediction = predictions.get(item.image_path)
+        if prediction is None:
+            continue
+        truth = read_labels(item.label_path, names, *prediction.size)
+        predicted = postprocess_tiles(prediction.tiles)
+
+        report.inference_seconds += prediction.seconds
+        match_tiles(predicted, truth, report.per_class, iou_threshold)
+        report.images += 1
+        if [t.code for t in predicted] == [t.code for t in sort_tiles(truth)]:
+            report.exact_hands += 1
+
+    report.wall_seconds = time.perf_counter() - start
+    return report
@@ -0,0 +1,142 @@
+import math
+from dataclasses import dataclass
+
+from src.tile import DetectedTile
+
+# Rows are assumed to be within this many degrees of horizontal
+MAX_TILT_DEGREES = 15.0
+# Neighbors further apart than this many median tile widths don't vote on the angle
+NEIGHBOR_RANGE = 2.5
+# Centers further apart across the row than this fraction of the tile height start a new row
+ROW_GAP_RATIO = 0.5
+# A gap wider than this fraction of the median tile width starts a new group in a row
+GROUP_GAP_RATIO = 0.5
+
+
+@dataclass(frozen=True)
+class Layout:
+    """Tiles arranged into rows and groups, as indices into the analyzed list.
+
+    `rows` runs top to bottom, each row is a list of groups left to right,
+    and each group lists tile indices left to right. `angle` is the fitted
+    row orientation in radians (positive when rows slope down to the right).
+    """
+
+    angle: float
+    rows: list[list[list[int]]]
+    rotated: list[bool]  # per tile: lying sideways relative to its row
+
+    @property
+    def order(self) -> list[int]:
+        return [i for row in self.rows for group in row for i in group]
+
+    @property
+    def is_scattered(self) -> bool:
+        """No two tiles share a row, so the layout says nothing about order."""
+        return all(len(row) == 1 and len(row[0]) == 1 for row in self.rows)
+
+
+def _median(values: list[float]) -> float:
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2]
+
+
+def fit_row_angle(tiles: list[DetectedTile]) -> float:
+    """Dominant row orientation from each tile's nearest right-hand neighbor.
+
+    Tiles are swept in x order and only neighbors within NEIGHBOR_RANGE tile
+    widths are considered, so crowded scenes stay near-linear. Neighbor
+    directions steeper than MAX_TILT_DEGREES (tiles in another row) are
+    ignored and the median of the rest is returned.
+    """
+    if len(tiles) < 2:
+        return 0.0
+
+    centers = sorted(((t.bbox[0] + t.bbox[2]) / 2, (t.bbox[1] + t.bbox[3]) / 2) for t in tiles)
+    reach = NEIGHBOR_RANGE * _median([min(t.bbox[2] - t.bbox[0], t.bbox[3] - t.bbox[1]) for t in tiles])
+    max_tilt = math.radians(MAX_TILT_DEGREES)
+
+    angles = []
+    for i, (x, y) in enumerate(centers):
+        best = None
+        for j in range(i + 1, len(centers)):
+            nx, ny = centers[j]
+            dx = nx - x
+            if dx > reach:
+                break
+            angle = math.atan2(ny - y, dx)
+            distance = math.hypot(dx, ny - y)
+            if abs(angle) <= max_tilt and distance <= reach and (best is None or distance < best[0]):
+                best = (distance, angle)
+        if best is not None:
+            angles.append(best[1])
+
+    return _median(angles) if angles else 0.0
+
+
+def _deskewed_size(bbox: tuple[int, int, int, int], angle: float) -> tuple[float, float]:
+    """Approximate width and height of the tile itself, undoing the axis-aligned bbox growth."""
+    w, h = bbox[2] - bbox[0], bbox[3] - bbox[1]
+    cos, sin = math.cos(angle), abs(math.sin(angle))
+    det = cos * cos - sin * sin
+    if det <= 0.1:
+        return w, h
+    return (w * cos - h * sin) / det, (h * cos - w * sin) / det
+
+
+def _split_by_gaps(indices: list[int], starts: list[float], ends: list[float], max_gap: float) -> list[list[int]]:
+    """Split an already ordered run wherever the gap to the previous item exceeds max_gap."""
+    groups = [[indices[0]]]
+    reach = ends[indices[0]]
+    for i in indices[1:]:
+        if starts[i] - reach > max_gap:
+            groups.append([])
+        groups[-1].append(i)
+        reach = max(reach, ends[i])
+    return groups
+
+
+def analyze_layout(tiles: list[DetectedTile]) -> Layout:
+    """Cluster tiles into rows and gap-separated groups along the fitted row direction.
+
+    After fitting the angle, tile centers are rotated into the row frame,
+    sorted once by their cross-row coordinate to cut rows at large gaps and
+    once per row along it to cut groups, so the clustering is linear after
+    sorting.
+    """
+    if not tiles:
+        return Layout(angle=0.0, rows=[], rotated=[])
+
+    angle = fit_row_angle(tiles)
+    cos, sin = math.cos(angle), math.sin(angle)
+
+    along, across, sizes = [], [], []
+    for tile in tiles:
+        x1, y1, x2, y2 = tile.bbox
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        along.append(cx * cos + cy * sin)
+        across.append(-cx * sin + cy * cos)
+        sizes.append(_deskewed_size(tile.bbox, angle))
+
+    rotated = [width > height for width, height in sizes]
+    # Measure rows and gaps on upright tiles so sideways ones don't skew the medians
+    upright = [size for size, r in zip(sizes, rotated) if not r] or sizes
+    tile_width = _median([w for w, _ in upright])
+    tile_height = _median([h for _, h in upright])
+
+    by_across = sorted(range(len(tiles)), key=across.__getitem__)
+    rows = [[by_across[0]]]
+    for prev, i in zip(by_across, by_across[1:]):
+        if across[i] - across[prev] > ROW_GAP_RATIO * tile_height:
+            rows.append([])
+        rows[-1].append(i)
+
+    half_along = [w / 2 for w, _ in sizes]
+    starts = [along[i] - half_along[i] for i in range(len(tiles))]
+    ends = [along[i] + half_along[i] for i in range(len(tiles))]
+    grouped = [
+        _split_by_gaps(sorted(row, key=along.__getitem__), starts, ends, GROUP_GAP_RATIO * tile_width)
+        for row in rows
+    ]
+
+    return Layout(angle=angle, rows=grouped, rotated=rotated)
@@ -0,0 +1,100 @@
+import heapq
+from dataclasses import replace
+
+from src.tile import DetectedTile
+
+# Boxes overlapping more than this are taken to be the same physical tile
+DEFAULT_IOU_THRESHOLD = 0.5
+
+# Alternatives kept per tile after merging in a suppressed box's classes
+MAX_ALTERNATIVES = 3
+
+BBox = tuple[int, int, int, int]
+
+
+def iou(a: BBox, b: BBox) -> float:
+    ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+    ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0, ix2 - ix1) * max(0, iy2 - iy1)
+    if inter == 0:
+        return 0.0
+    area_a = (a[2] - a[0]) * (a[3] - a[1])
+    area_b = (b[2] - b[0]) * (b[3] - b[1])
+    return inter / (area_a + area_b - inter)
+
+
+def overlapping_pairs(boxes: list[BBox], iou_threshold: float = DEFAULT_IOU_THRESHOLD) -> list[tuple[int, int]]:
+    """Index pairs of boxes whose IoU exceeds the threshold.
+
+    Sort-and-sweep along x: boxes are visited by left edge and only compared
+    with the still-open boxes whose x-range reaches it, kept in a heap by
+    right edge so closed boxes leave in O(log n). A row of tiles costs
+    O(n log n) instead of the O(n^2) of comparing all pairs. Boxes that
+    share an x-range, such as k tiles stacked in one column, all stay open
+    together and still cost O(k^2) comparisons among themselves.
+    """
+    order = sorted(range(len(boxes)), key=lambda i: boxes[i][0])
+    active: list[tuple[int, int]] = []  # (x2, index) heap
+    pairs = []
+
+    for i in order:
+        x1, y1, _, y2 = boxes[i]
+        while active and active[0][0] <= x1:
+            heapq.heappop(active)
+        for _, j in active:
+            other = boxes[j]
+            if other[1] >= y2 or other[3] <= y1:
+                continue
+            if iou(boxes[i], other) > iou_threshold:
+                pairs.append((j, i) if j < i else (i, j))
+        heapq.heappush(active, (boxes[i][2], i))
+
+    return pairs
+
+
+def _merge_alternatives(kept: DetectedTile, suppressed: list[DetectedTile]) -> DetectedTile:
+    """Keep the best score per class across the boxes that were merged into `kept`."""
+    if not suppressed:
+        return kept
+
+    scores = dict(kept.alternatives) or {kept.code: kept.confidence}
+    for tile in suppressed:
+        for code, score in tile.alternatives or ((tile.code, tile.confidence),):
+            scores[code] = max(scores.get(code, 0.0), score)
+    best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:MAX_ALTERNATIVES]
+    return replace(kept, alternatives=tuple(best))
+
+
+def suppress_overlaps(
+    tiles: list[DetectedTile], iou_threshold: float = DEFAULT_IOU_THRESHOLD
+) -> list[DetectedTile]:
+    """Class-agnostic suppression of boxes that cover the same physical tile.
+
+    The model's NMS runs per class, so one tile can come back as two boxes
+    with different codes. Of every overlapping group the most confident box
+    is kept, and the other boxes' classes are merged into its alternatives
+    for the decoder. Input order is preserved. Overlaps come from the sweep
+    in `overlapping_pairs`, which is O(n log n) for rows of tiles but
+    quadratic among boxes stacked in one column.
+    """
+    if len(tiles) <= 1:
+        return list(tiles)
+
+    neighbors: dict[int, list[int]] = {}
+    for a, b in overlapping_pairs([t.bbox for t in tiles], iou_threshold):
+        neighbors.setdefault(a, []).append(b)
+        neighbors.setdefault(b, []).append(a)
+    if not neighbors:
+        return list(tiles)
+
+    # Greedy NMS over the overlap graph, most confident first
+    kept: set[int] = set()
+    suppressed_by: dict[int, list[DetectedTile]] = {}
+    for i in sorted(range(len(tiles)), key=lambda i: tiles[i].confidence, reverse=True):
+        winner = next((j for j in neighbors.get(i, ()) if j in kept), None)
+        if winner is None:
+            kept.add(i)
+        else:
+            suppressed_by.setdefault(winner, []).append(tiles[i])
+
+    return [_merge_alternatives(tiles[i], suppressed_by.get(i, [])) for i in range(len(tiles)) if i in kept]
@@ -0,0 +1,154 @@
+"""Second-stage classification of uncertain tiles from full-resolution crops.
+
+The detector sees the whole photo at 640px, where red and regular fives or
+2p and 3p differ by a few pixels. Boxes below a confidence threshold are cut
+from the original decoded image, classified together in one batch by a small
+classification model, and their codes and alternatives are blended with the
+detector's before decoding.
+
+Train the classifier on crops of the detection dataset:
+
+    python export_crops.py -o crops/
+    yolo classify train data=crops/ model=yolov8n-cls.pt imgsz=64
+"""
+
+import os
+import pathlib
+import time
+from dataclasses import dataclass, replace
+
+import numpy as np
+from ultralytics import YOLO
+
+from src.tile import DetectedTile
+from src.tile_detection.decoding import CODE_TO_34
+
+DEFAULT_CONFIDENCE_THRESHOLD = 0.6
+DEFAULT_BUDGET_SECONDS = 0.05
+CLASSIFIER_IMGSZ = 64
+# Crops are widened by this fraction of the box on each side so edges aren't cut off
+CROP_PADDING = 0.1
+# Weight of the classifier against the detector when blending class scores
+CLASSIFIER_WEIGHT = 0.7
+# Smoothing of the per-crop latency estimate that sizes batches to the budget
+LATENCY_SMOOTHING = 0.2
+MAX_ALTERNATIVES = 3
+
+
+def resolve_classifier_path(classifier_path: pathlib.Path | None = None) -> pathlib.Path | None:
+    """Explicit path, else CLASSIFIER_PATH; None disables re-classification."""
+    if classifier_path is not None:
+        return classifier_path
+    env_path = os.environ.get("CLASSIFIER_PATH")
+    return pathlib.Path(env_path) if env_path else None
+
+
+def crop_tile(image: np.ndarray, bbox: tuple[int, int, int, int], padding: float = CROP_PADDING) -> np.ndarray:
+    height, width = image.shape[:2]
+    x1, y1, x2, y2 = bbox
+    pad_x, pad_y = round((x2 - x1) * padding), round((y2 - y1) * padding)
+    x1, y1 = max(x1 - pad_x, 0), max(y1 - pad_y, 0)
+    x2, y2 = min(x2 + pad_x, width), min(y2 + pad_y, height)
+    return image[y1:y2, x1:x2]
+
+
+@dataclass
+class ReclassifierStats:
+    images: int = 0
+    crops: int = 0
+    changed: int = 0  # tiles whose code the classifier changed
+    over_budget: int = 0  # uncertain tiles left to the detector to stay within the budget
+    seconds: float = 0.0
+
+
+class CropReclassifier:
+    """Refines low-confidence tiles with one batched classifier call per image.
+
+    The batch is capped so that it fits `budget_seconds`, going by a running
+    estimate of the time per crop; the least confident tiles go first.
+    """
+
+    def __init__(
+        self,
+        classifier: YOLO,
+        confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+        budget_seconds: float = DEFAULT_BUDGET_SECONDS,
+    ):
+        self.classifier = classifier
+        self.confidence_threshold = confidence_threshold
+        self.budget_seconds = budget_seconds
+        self.seconds_per_crop: float | None = None
+        self.stats = ReclassifierStats()
+
+    def max_crops(self) -> int | None:
+        """Largest batch expected to fit the budget; None before any timing."""
+        if self.seconds_per_crop is None:
+            return None
+        return max(int(self.budget_seconds / self.seconds_per_crop), 1)
+
+    def warm_up(self, batch: int = 8) -> None:
+        """Run a blank batch so the first real image has a latency estimate to size against."""
+        crops = [np.zeros((64, 48, 3), dtype=np.uint8)] * batch
+        self.classifier(crops, imgsz=CLASSIFIER_IMGSZ, verbose=False)  # lazy model setup
+        start = time.perf_counter()
+        self.classifier(crops, imgsz=CLASSIFIER_IMGSZ, verbose=False)
+        self.seconds_per_crop = (time.perf_counter() - start) / batch
+
+    def _blend(self, tile: DetectedTile, probs: np.ndarray) -> DetectedTile:
+        names = self.classifier.names
+        scores = {code: (1 - CLASSIFIER_WEIGHT) * score for code, score in tile.alternatives}
+        if not scores:
+            scores[tile.code] = (1 - CLASSIFIER_WEIGHT) * tile.confidence
+        for i in np.argsort(probs)[::-1][:MAX_ALTERNATIVES]:
+            code = names[int(i)]
+            if code in CODE_TO_34 or code == "0z":
+                scores[code] = scores.get(code, 0.0) + CLASSIFIER_WEIGHT * float(probs[i])
+
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:MAX_ALTERNATIVES]
+        code, confidence = best[0]
+        return replace(tile, code=code, confidence=confidence, alternatives=tuple(best))
+
+    def refine(self, image: np.ndarray, tiles: list[DetectedTile]) -> list[DetectedTile]:
+        uncertain = sorted(
+            (i for i, tile in enumerate(tiles) if tile.confidence < self.confidence_threshold),
+            key=lambda i: tiles[i].confidence,
+        )
+        self.stats.images += 1
+        if not uncertain:
+            return list(tiles)
+
+        selected = uncertain[: self.max_crops()]  # slicing to None keeps them all
+        self.stats.over_budget += len(uncertain) - len(selected)
+        # A box outside the frame crops to nothing, which the classifier rejects; leave it to the detector
+        cropped = [(i, crop_tile(image, tiles[i].bbox)) for i in selected]
+        cropped = [(i, crop) for i, crop in cropped if crop.size]
+        if not cropped:
+            return list(tiles)
+        selected = [i for i, _ in cropped]
+        crops = [crop for _, crop in cropped]
+
+        start = time.perf_counter()
+        results = self.classifier(crops, imgsz=CLASSIFIER_IMGSZ, verbose=False)
+        elapsed = time.perf_counter() - start
+        per_crop = elapsed / len(crops)
+        self.seconds_per_crop = (
+            per_crop
+            if self.seconds_per_crop is None
+            else LATENCY_SMOOTHING * per_crop + (1 - LATENCY_SMOOTHING) * self.seconds_per_crop
+        )
+        self.stats.crops += len(crops)
+        self.stats.seconds += elapsed
+
+        refined = list(tiles)
+        for i, result in zip(selected, results):
+            refined[i] = self._blend(tiles[i], result.probs.data.cpu().numpy())
+            self.stats.changed += refined[i].code != tiles[i].code
+        return refined
+
+
+def load_reclassifier(classifier_path: pathlib.Path | None) -> CropReclassifier | None:
+    if classifier_path is None:
+        return None
+    reclassifier = CropReclassifier(YOLO(classifier_path))
+    reclassifier.warm_up()
+    return reclassifier
@@ -0,0 +1,133 @@
+import math
+from dataclasses import dataclass, replace
+
+import cv2
+import numpy as np
+
+from src.tile import DetectedTile
+
+# Input size of the quick pass used to find the tiles before rectifying
+FIRST_PASS_IMGSZ = 320
+# Fewer tiles than this give no reliable estimate of the table plane
+MIN_TILES = 6
+# Skip rectification when the nearest tiles are less than this much wider than the farthest
+MIN_SCALE_RATIO = 1.15
+# Long over short side of a tile seen from above, used to recover the foreshortened height
+TILE_ASPECT = 1.35
+# Rectified images are capped at this many times the longer side of the original
+MAX_OUTPUT_SCALE = 1.5
+
+
+@dataclass(frozen=True)
+class Rectification:
+    homography: np.ndarray  # original → rectified pixel coordinates
+    size: tuple[int, int]  # (width, height) of the rectified image
+    source_size: tuple[int, int]  # (width, height) of the original image
+
+
+def _fit_width_by_y(tiles: list[DetectedTile]) -> tuple[float, float]:
+    """Least-squares fit of tile width (short side) as a linear function of center y."""
+    ys = np.array([(t.bbox[1] + t.bbox[3]) / 2 for t in tiles])
+    widths = np.array([min(t.bbox[2] - t.bbox[0], t.bbox[3] - t.bbox[1]) for t in tiles], dtype=float)
+    slope, intercept = np.polyfit(ys, widths, 1)
+    return float(intercept), float(slope)
+
+
+def _box_corners(bbox: tuple[int, int, int, int]) -> list[tuple[int, int]]:
+    x1, y1, x2, y2 = bbox
+    return [(x1, y1), (x2, y1), (x2, y2), (x1, y2)]
+
+
+def _trapezoid_to_rectangle(source: np.ndarray, width: float, height: float) -> np.ndarray:
+    target = np.array([[0, 0], [width, 0], [width, height], [0, height]], dtype=np.float32)
+    return cv2.getPerspectiveTransform(source, target)
+
+
+def estimate_rectification(tiles: list[DetectedTile], image_size: tuple[int, int]) -> Rectification | None:
+    """Homography that makes tiles the same size, from first-pass boxes.
+
+    With the phone tilted towards the table, tile size shrinks linearly with
+    distance up the image. The fitted width at the top and bottom of the tile
+    area defines a trapezoid that contains every tile; it is mapped to a
+    rectangle, and the rectangle's height is then chosen so the tiles come
+    out with TILE_ASPECT, since widths alone can't tell how much the table is
+    foreshortened. Returns None when the photo is close enough to top-down,
+    or there are too few tiles to tell.
+    """
+    tiles = [t for t in tiles if t.bbox[2] > t.bbox[0] and t.bbox[3] > t.bbox[1]]
+    if len(tiles) < MIN_TILES:
+        return None
+
+    intercept, slope = _fit_width_by_y(tiles)
+    margin = max(t.bbox[3] - t.bbox[1] for t in tiles) / 2
+    y_top = max(min(t.bbox[1] for t in tiles) - margin, 0.0)
+    y_bottom = min(max(t.bbox[3] for t in tiles) + margin, float(image_size[1]))
+
+    width_top = intercept + slope * y_top
+    width_bottom = intercept + slope * y_bottom
+    if width_top <= 0 or width_bottom <= 0 or width_bottom / width_top < MIN_SCALE_RATIO:
+        return None
+
+    # Trapezoid half-width in tile widths, wide enough to contain every tile
+    center_x = float(np.median([(t.bbox[0] + t.bbox[2]) / 2 for t in tiles]))
+    reach = max(
+        max(abs(t.bbox[0] - center_x), abs(t.bbox[2] - center_x)) / (intercept + slope * (t.bbox[1] + t.bbox[3]) / 2)
+        for t in tiles
+    )
+    reach += 0.5
+
+    source = np.array(
+        [
+            [center_x - reach * width_top, y_top],
+            [center_x + reach * width_top, y_top],
+            [center_x + reach * width_bottom, y_bottom],
+            [center_x - reach * width_bottom, y_bottom],
+        ],
+        dtype=np.float32,
+    )
+
+    # Tiles end up width_bottom wide everywhere; start from a square pixel grid at the bottom
+    out_w = 2 * reach * width_bottom
+    out_h = width_bottom / slope * math.log(width_bottom / width_top)
+    homography = _trapezoid_to_rectangle(source, out_w, out_h)
+
+    # Stretch vertically until the median tile has the expected aspect ratio
+    corners = np.array([_box_corners(t.bbox) for t in tiles], dtype=np.float32).reshape(-1, 1, 2)
+    rectified = cv2.perspectiveTransform(corners, homography).reshape(-1, 4, 2)
+    # Horizontal lines stay horizontal, so edge lengths (not the bbox of the warped box) give the size
+    widths = (rectified[:, 1, 0] - rectified[:, 0, 0] + rectified[:, 2, 0] - rectified[:, 3, 0]) / 2
+    heights = (rectified[:, 3, 1] - rectified[:, 0, 1] + rectified[:, 2, 1] - rectified[:, 1, 1]) / 2
+    upright = heights >= widths
+    if upright.any():
+        out_h *= TILE_ASPECT / float(np.median(heights[upright] / widths[upright]))
+
+    scale = min(1.0, MAX_OUTPUT_SCALE * max(image_size) / max(out_w, out_h))
+    out_w, out_h = out_w * scale, out_h * scale
+    homography = _trapezoid_to_rectangle(source, out_w, out_h)
+    return Rectification(homography, (max(int(round(out_w)), 1), max(int(round(out_h)), 1)), image_size)
+
+
+def rectify_image(image: np.ndarray, rectification: Rectification) -> np.ndarray:
+    return cv2.warpPerspective(image, rectification.homography, rectification.size, flags=cv2.INTER_LINEAR)
+
+
+def map_tiles_back(tiles: list[DetectedTile], rectification: Rectification) -> list[DetectedTile]:
+    """Convert boxes found in the rectified image to boxes in the original image.
+
+    The rectified image reaches past the photo's edges, so boxes are clipped
+    to the original frame and those left with no area are dropped.
+    """
+    if not tiles:
+        return []
+
+    corners = np.array([_box_corners(t.bbox) for t in tiles], dtype=np.float32).reshape(-1, 1, 2)
+    original = cv2.perspectiveTransform(corners, np.linalg.inv(rectification.homography)).reshape(-1, 4, 2)
+    width, height = rectification.source_size
+
+    mapped = []
+    for tile, points in zip(tiles, original):
+        x1, y1 = np.clip(np.round(points.min(axis=0)), 0, (width, height)).astype(int)
+        x2, y2 = np.clip(np.round(points.max(axis=0)), 0, (width, height)).astype(int)
+        if x2 > x1 and y2 > y1:
+            mapped.append(replace(tile, bbox=(int(x1), int(y1), int(x2), int(y2))))
+    return mapped
@@ -0,0 +1,153 @@
+"""Versioned detection weights that can be switched without a restart.
+
+The registry is a directory of `<version>.pt` files plus an ACTIVE file
+naming the version to serve, so a restart keeps the last activation. A new
+version is loaded and warmed up on a background thread and then replaces
+the serving model in one assignment; detections that already picked up the
+old `ServingModel` finish on it.
+"""
+
+import os
+import pathlib
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+from ultralytics import YOLO
+
+from src.tile_detection.cascade import CascadeModel
+from src.tile_detection.detection import detect_tiles, load_model, resolve_model_path
+
+DEFAULT_REGISTRY_DIR = pathlib.Path(__file__).parent.parent.parent / "models"
+WEIGHTS_SUFFIX = ".pt"
+ACTIVE_FILE = "ACTIVE"
+WARM_UP_SHAPE = (640, 640, 3)
+
+
+def resolve_registry_dir(registry_dir: pathlib.Path | None = None) -> pathlib.Path:
+    """Explicit path, else MODEL_REGISTRY_DIR, else api/models."""
+    if registry_dir is not None:
+        return registry_dir
+    return pathlib.Path(os.environ.get("MODEL_REGISTRY_DIR", DEFAULT_REGISTRY_DIR))
+
+
+class ModelRegistry:
+    def __init__(self, directory: pathlib.Path):
+        self.directory = directory
+
+    def versions(self) -> list[str]:
+        if not self.directory.is_dir():
+            return []
+        return sorted(p.stem for p in self.directory.glob(f"*{WEIGHTS_SUFFIX}"))
+
+    def path(self, version: str) -> pathlib.Path:
+        """Weights of `version`; KeyError if the registry doesn't have it."""
+        path = self.directory / f"{version}{WEIGHTS_SUFFIX}"
+        # Versions are file stems, so anything with a separator can't name one
+        if pathlib.Path(version).name != version or not path.is_file():
+            raise KeyError(version)
+        return path
+
+    def active_version(self) -> str | None:
+        active = self.directory / ACTIVE_FILE
+        if not active.is_file():
+            return None
+        return active.read_text().strip() or None
+
+    def set_active(self, version: str) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        pending = self.directory / f"{ACTIVE_FILE}.tmp"
+        pending.write_text(version + "\n")
+        pending.replace(self.directory / ACTIVE_FILE)
+
+
+@dataclass(frozen=True)
+class ServingModel:
+    version: str
+    model: YOLO | CascadeModel
+
+
+def warm_up(model: YOLO | CascadeModel) -> None:
+    """One blank detection, so the first request doesn't pay for predictor setup."""
+    detect_tiles(model, np.zeros(WARM_UP_SHAPE, dtype=np.uint8))
+
+
+def load_serving_model(registry: ModelRegistry, fast_model_path: pathlib.Path | None = None) -> ServingModel:
+    """The registry's active version, else the MODEL_PATH/best.pt weights named by their stem; warmed up."""
+    version = registry.active_version()
+    if version is not None and version in registry.versions():
+        serving = ServingModel(version, load_model(registry.path(version), fast_model_path))
+    else:
+        serving = ServingModel(resolve_model_path().stem, load_model(fast_model_path=fast_model_path))
+    warm_up(serving.model)
+    return serving
+
+
+@dataclass(frozen=True)
+class SwitchStatus:
+    active: str
+    loading: str | None
+    # Why the last activation failed, if it did
+    error: str | None
+
+
+class ModelSwitcher:
+    """Serves one model version and activates others in the background.
+
+    `activate` raises KeyError for versions the registry doesn't have and
+    RuntimeError while another version is still loading. A version whose
+    classes differ from the serving model's is refused, since stored
+    detections and exported labels are indexed by class.
+    """
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        serving: ServingModel,
+        load: Callable[[pathlib.Path], YOLO | CascadeModel] = load_model,
+    ):
+        self.registry = registry
+        self.load = load
+        self._serving = serving
+        self._loading: str | None = None
+        self._error: str | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> ServingModel:
+        return self._serving
+
+    @property
+    def status(self) -> SwitchStatus:
+        return SwitchStatus(self._serving.version, self._loading, self._error)
+
+    def activate(self, version: str) -> None:
+        path = self.registry.path(version)
+        with self._lock:
+            if self._loading is not None:
+                raise RuntimeError(f"Version {self._loading} is still loading")
+            self._loading = version
+            self._error = None
+            self._thread = threading.Thread(target=self._switch, args=(version, path), daemon=True)
+            self._thread.start()
+
+    def _switch(self, version: str, path: pathlib.Path) -> None:
+        try:
+            model = self.load(path)
+            if model.names != self._serving.model.names:
+                raise ValueError(f"Version {version} predicts different classes than {self._serving.version}")
+            warm_up(model)
+            self._serving = ServingModel(version, model)
+            self.registry.set_active(version)
+        except Exception as e:
+            self._error = f"{version}: {e}"
+        finally:
+            with self._lock:
+                self._loading = None
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Block until the current background activation, if any, has finished."""
+        if self._thread is not None:
+            self._thread.join(timeout)
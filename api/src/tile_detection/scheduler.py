@@ -0,0 +1,215 @@
+"""Admission to the detection model: priority classes, per-client fairness, deadlines.
+
+The model runs one image at a time. When it frees up, the next request is
+the first of the highest waiting priority class, and within a class the one
+with the smallest start-time fair queuing tag: each client's requests are
+spaced 1/weight apart in virtual time, so a client with a hundred queued
+uploads gets every other turn against a client with one, not the next
+hundred. Requests whose deadline passes while queued are dropped instead
+of being run too late to matter.
+
+Async callers wait in `aslot` on a future, so a queued request holds no
+thread; `slot` blocks the calling thread instead.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Literal
+
+Priority = Literal["interactive", "bulk"]
+# Highest first
+PRIORITIES: tuple[Priority, ...] = ("interactive", "bulk")
+# Finish tags older than the virtual clock no longer matter; prune them past this many clients
+MAX_TRACKED_CLIENTS = 1024
+
+
+class DeadlineExceeded(Exception):
+    """The request's deadline passed before the model was free."""
+
+
+@dataclass(frozen=True)
+class Grant:
+    queue_seconds: float
+
+
+@dataclass
+class SchedulerStats:
+    granted: dict[str, int] = field(default_factory=lambda: dict.fromkeys(PRIORITIES, 0))
+    dropped: dict[str, int] = field(default_factory=lambda: dict.fromkeys(PRIORITIES, 0))
+    queue_seconds: dict[str, float] = field(default_factory=lambda: dict.fromkeys(PRIORITIES, 0.0))
+    max_waiting: int = 0
+
+
+@dataclass
+class _Waiter:
+    priority: Priority
+    start_tag: float
+    deadline: float | None
+    enqueued: float
+    wake: Callable[[], None]  # called from whichever thread grants or drops the request
+    granted: bool = False
+    abandoned: bool = False
+
+
+class InferenceScheduler:
+    """Hands out the model to one request at a time; use `slot` or `aslot` around each inference.
+
+    `deadline` is a `clock()` time. `client_weights` gives some clients a
+    larger share of their class; everyone else has weight 1.
+    """
+
+    def __init__(
+        self,
+        client_weights: dict[str, float] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.client_weights = client_weights or {}
+        self.clock = clock
+        self.stats = SchedulerStats()
+        self._busy = False
+        self._queue: list[tuple[int, float, int, _Waiter]] = []
+        self._waiting = 0
+        self._waiting_by_priority = dict.fromkeys(PRIORITIES, 0)
+        self._virtual_time = dict.fromkeys(PRIORITIES, 0.0)
+        self._finish_tags: dict[tuple[Priority, str], float] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def waiting(self, priority: Priority | None = None) -> int:
+        """Requests queued for the model, of one priority class or in all of them."""
+        return self._waiting if priority is None else self._waiting_by_priority[priority]
+
+    def _dequeued(self, waiter: _Waiter) -> None:
+        self._waiting -= 1
+        self._waiting_by_priority[waiter.priority] -= 1
+
+    def _enqueue(
+        self, client: str, priority: Priority, deadline: float | None, now: float, wake: Callable[[], None]
+    ) -> _Waiter:
+        key = (priority, client)
+        start = max(self._virtual_time[priority], self._finish_tags.get(key, 0.0))
+        self._finish_tags[key] = start + 1.0 / self.client_weights.get(client, 1.0)
+        waiter = _Waiter(priority, start, deadline, now, wake)
+        heapq.heappush(self._queue, (PRIORITIES.index(priority), start, next(self._seq), waiter))
+        self._waiting += 1
+        self._waiting_by_priority[priority] += 1
+        self.stats.max_waiting = max(self.stats.max_waiting, self._waiting)
+        return waiter
+
+    def _admit(
+        self, client: str, priority: Priority, deadline: float | None, wake: Callable[[], None]
+    ) -> Grant | _Waiter:
+        """A grant if the model is free, else the queued waiter that `wake` is called for."""
+        with self._lock:
+            now = self.clock()
+            if deadline is not None and now >= deadline:
+                self.stats.dropped[priority] += 1
+                raise DeadlineExceeded("Deadline passed before the request was queued")
+            if not self._busy and not self._waiting:
+                self._busy = True
+                self.stats.granted[priority] += 1
+                return Grant(0.0)
+            return self._enqueue(client, priority, deadline, now, wake)
+
+    def _timeout(self, deadline: float | None) -> float | None:
+        return None if deadline is None else max(deadline - self.clock(), 0.0)
+
+    def _granted(self, waiter: _Waiter) -> Grant:
+        """The waiter's grant once it was woken or timed out; raises DeadlineExceeded if it has none."""
+        with self._lock:
+            # The grant can land between the wait timing out and taking the lock
+            if waiter.granted:
+                queued = self.clock() - waiter.enqueued
+                self.stats.queue_seconds[waiter.priority] += queued
+                return Grant(queued)
+            if not waiter.abandoned:
+                waiter.abandoned = True
+                self._dequeued(waiter)
+            self.stats.dropped[waiter.priority] += 1
+        raise DeadlineExceeded("Deadline passed while waiting for the model")
+
+    def _acquire(self, client: str, priority: Priority, deadline: float | None) -> Grant:
+        event = threading.Event()
+        admitted = self._admit(client, priority, deadline, event.set)
+        if isinstance(admitted, Grant):
+            return admitted
+        event.wait(self._timeout(deadline))
+        return self._granted(admitted)
+
+    async def _acquire_async(self, client: str, priority: Priority, deadline: float | None) -> Grant:
+        loop = asyncio.get_running_loop()
+        woken = loop.create_future()
+
+        def wake() -> None:
+            loop.call_soon_threadsafe(lambda: woken.done() or woken.set_result(None))
+
+        admitted = self._admit(client, priority, deadline, wake)
+        if isinstance(admitted, Grant):
+            return admitted
+        try:
+            await asyncio.wait_for(woken, self._timeout(deadline))
+        except TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            # Gone before its turn: leave the queue, or pass the turn on if it was just granted
+            with self._lock:
+                granted = admitted.granted
+                if not granted and not admitted.abandoned:
+                    admitted.abandoned = True
+                    self._dequeued(admitted)
+            if granted:
+                self._release()
+            raise
+        return self._granted(admitted)
+
+    def _release(self) -> None:
+        with self._lock:
+            now = self.clock()
+            while self._queue:
+                _, start, _, waiter = heapq.heappop(self._queue)
+                if waiter.abandoned:
+                    continue
+                self._dequeued(waiter)
+                if waiter.deadline is not None and now >= waiter.deadline:
+                    # Wake it to raise DeadlineExceeded rather than run late
+                    waiter.abandoned = True
+                    waiter.wake()
+                    continue
+                self._virtual_time[waiter.priority] = start
+                self.stats.granted[waiter.priority] += 1
+                waiter.granted = True
+                waiter.wake()
+                break
+            else:
+                self._busy = False
+
+            if len(self._finish_tags) > MAX_TRACKED_CLIENTS:
+                self._finish_tags = {
+                    key: tag for key, tag in self._finish_tags.items() if tag > self._virtual_time[key[0]]
+                }
+
+    @contextmanager
+    def slot(self, client: str, priority: Priority = "interactive", deadline: float | None = None) -> Iterator[Grant]:
+        """Wait for the model; raises DeadlineExceeded if `deadline` passes first."""
+        grant = self._acquire(client, priority, deadline)
+        try:
+            yield grant
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def aslot(
+        self, client: str, priority: Priority = "interactive", deadline: float | None = None
+    ) -> AsyncIterator[Grant]:
+        """`slot` for the event loop: waits without holding a thread."""
+        grant = await self._acquire_async(client, priority, deadline)
+        try:
+            yield grant
+        finally:
+            self._release()
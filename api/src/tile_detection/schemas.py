@@ -1,4 +1,9 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+
+class TileAlternative(BaseModel):
+    code: str
+    confidence: float
 
 
 class DetectedTileResponse(BaseModel):
@@ -11,8 +16,40 @@ class DetectedTileResponse(BaseModel):
     suit: str | None
     number: int | None
     is_rotated: bool
+    alternatives: list[TileAlternative] = Field(default_factory=list)
+
+
+class TileLayoutResponse(BaseModel):
+    angle: float  # fitted row orientation in degrees
+    # Rows top to bottom, groups left to right, as indices into `tiles`
+    rows: list[list[list[int]]]
 
 
 class TileDetectionResponse(BaseModel):
     tiles: list[DetectedTileResponse]
     count: int
+    layout: TileLayoutResponse | None = None
+    # Set when the detection was stored; pass detection_id back with corrections
+    detection_id: str | None = None
+    image_hash: str | None = None
+    # Inference input size chosen for this request under the current load
+    imgsz: int | None = None
+    model_version: str | None = None
+    # Time spent waiting for the model, separately from running it
+    queue_seconds: float | None = None
+    inference_seconds: float | None = None
+
+
+class ModelStatusResponse(BaseModel):
+    versions: list[str]  # weights in the model registry
+    active: str
+    loading: str | None  # version being loaded and warmed up
+    error: str | None  # why the last activation failed
+    shadow: str | None  # candidate version under shadow evaluation
+    shadow_sample_rate: float | None
+
+
+class ShadowRequest(BaseModel):
+    version: str
+    # Share of /api/detect requests also run through the candidate
+    sample_rate: float = Field(default=0.1, ge=0.0, le=1.0)
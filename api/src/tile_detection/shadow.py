@@ -0,0 +1,125 @@
+"""Shadow evaluation of a candidate model on sampled live traffic.
+
+A sampled share of detections is run again through the candidate on a
+single background thread after the live response is ready. The candidate's
+tiles, refined by the same classifier weights as the live path, are
+matched against the live model's (same code, IoU >= 0.5), so
+`agreement` reads as precision and recall with the live model as the
+reference. When the candidate is still busy with the previous sample the
+new one is dropped rather than queued, so shadowing never builds a backlog.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+from ultralytics import YOLO
+
+from src.tile import DetectedTile
+from src.tile_detection.cascade import CascadeModel
+from src.tile_detection.detection import detect_tiles
+from src.tile_detection.evaluation import ClassMetrics, match_tiles
+from src.tile_detection.reclassify import CropReclassifier
+
+
+@dataclass
+class ShadowStats:
+    sampled: int = 0
+    completed: int = 0
+    dropped: int = 0  # sampled while the candidate was busy
+    failed: int = 0
+    exact: int = 0  # same codes in the same reading order as the live model
+    tiles: ClassMetrics = field(default_factory=ClassMetrics)
+    live_seconds: float = 0.0  # live inference time of the completed samples
+    shadow_seconds: float = 0.0
+
+    @property
+    def exact_rate(self) -> float:
+        return self.exact / self.completed if self.completed else 0.0
+
+    @property
+    def latency_ratio(self) -> float | None:
+        """Candidate time over live time on the same images; below 1 is faster."""
+        if not self.live_seconds:
+            return None
+        return self.shadow_seconds / self.live_seconds
+
+
+class ShadowEvaluator:
+    def __init__(
+        self,
+        version: str,
+        model: YOLO | CascadeModel,
+        sample_rate: float,
+        rng: random.Random | None = None,
+        reclassifier: CropReclassifier | None = None,
+    ):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.version = version
+        self.model = model
+        self.sample_rate = sample_rate
+        # Its own instance: the classifier's predictor isn't safe to share with the live thread
+        self.reclassifier = reclassifier
+        self.stats = ShadowStats()
+        self._rng = rng or random.Random()
+        self._busy = False
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow")
+
+    def submit(
+        self,
+        image: np.ndarray,
+        live: list[DetectedTile],
+        live_seconds: float,
+        rectify: bool = False,
+        imgsz: int | None = None,
+    ) -> bool:
+        """Sample the detection for the candidate; True if it was queued."""
+        if self._rng.random() >= self.sample_rate:
+            return False
+        with self._lock:
+            self.stats.sampled += 1
+            if self._busy:
+                self.stats.dropped += 1
+                return False
+            self._busy = True
+        self._executor.submit(self._run, image, live, live_seconds, rectify, imgsz)
+        return True
+
+    def _run(
+        self, image: np.ndarray, live: list[DetectedTile], live_seconds: float, rectify: bool, imgsz: int | None
+    ) -> None:
+        try:
+            start = time.perf_counter()
+            tiles = detect_tiles(
+                self.model, image, rectify=rectify, reclassifier=self.reclassifier, imgsz=imgsz
+            )
+            elapsed = time.perf_counter() - start
+        except Exception:
+            with self._lock:
+                self.stats.failed += 1
+                self._busy = False
+            return
+
+        per_class: dict[str, ClassMetrics] = {}
+        match_tiles(tiles, live, per_class)
+        with self._lock:
+            self.stats.completed += 1
+            self.stats.exact += [t.code for t in tiles] == [t.code for t in live]
+            self.stats.tiles.true_positives += sum(m.true_positives for m in per_class.values())
+            self.stats.tiles.false_positives += sum(m.false_positives for m in per_class.values())
+            self.stats.tiles.false_negatives += sum(m.false_negatives for m in per_class.values())
+            self.stats.live_seconds += live_seconds
+            self.stats.shadow_seconds += elapsed
+            self._busy = False
+
+    def wait(self) -> None:
+        """Block until the sample being evaluated, if any, has finished."""
+        self._executor.submit(lambda: None).result()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,180 @@
+import json
+from unittest.mock import MagicMock
+
+import cv2
+import numpy as np
+import pytest
+
+from src.tile import DetectedTile
+from src.tile_detection import batch
+from src.tile_detection.batch import (
+    JsonlSink,
+    ParquetSink,
+    annotate_image,
+    discover_images,
+    open_sink,
+    run_batch,
+    worker_thread_config,
+)
+
+
+def _write_image(path):
+    image = np.zeros((20, 20, 3), dtype=np.uint8)
+    cv2.imwrite(str(path), image)
+    return path
+
+
+class TestDiscoverImages:
+    def test_walks_directories_recursively(self, tmp_path):
+        (tmp_path / "nested").mkdir()
+        a = _write_image(tmp_path / "a.jpg")
+        b = _write_image(tmp_path / "nested" / "b.png")
+        (tmp_path / "notes.txt").write_text("not an image")
+
+        assert discover_images([str(tmp_path)]) == sorted([a.resolve(), b.resolve()])
+
+    def test_expands_glob_patterns(self, tmp_path):
+        a = _write_image(tmp_path / "a.jpg")
+        _write_image(tmp_path / "b.png")
+
+        assert discover_images([str(tmp_path / "*.jpg")]) == [a.resolve()]
+
+    def test_deduplicates_overlapping_inputs(self, tmp_path):
+        a = _write_image(tmp_path / "a.jpg")
+
+        assert discover_images([str(tmp_path), str(a)]) == [a.resolve()]
+
+
+class TestAnnotateImage:
+    def test_draws_boxes_on_copy(self):
+        image = np.zeros((100, 100, 3), dtype=np.uint8)
+        tile = DetectedTile(code="1m", confidence=0.9, bbox=(20, 40, 60, 90))
+
+        annotated = annotate_image(image, [tile])
+
+        assert annotated.shape == image.shape
+        assert annotated.any()
+        assert not image.any()
+
+    def test_no_tiles_returns_unchanged_copy(self):
+        image = np.zeros((10, 10, 3), dtype=np.uint8)
+        assert np.array_equal(annotate_image(image, []), image)
+
+
+class TestJsonlSink:
+    def test_resume_reads_completed_paths(self, tmp_path):
+        output = tmp_path / "results.jsonl"
+        with JsonlSink(output) as sink:
+            sink.write({"path": "a.jpg", "tiles": []})
+            sink.write({"path": "b.jpg", "tiles": []})
+
+        assert JsonlSink(output).completed() == {"a.jpg", "b.jpg"}
+
+    def test_partial_trailing_line_is_truncated(self, tmp_path):
+        output = tmp_path / "results.jsonl"
+        contents = json.dumps({"path": "a.jpg"}) + "\n" + '{"path": "b.j'
+        output.write_text(contents)
+
+        assert JsonlSink(output).completed() == {"a.jpg"}
+        assert output.read_text() == contents  # reading leaves the file alone
+
+        with JsonlSink(output) as sink:
+            sink.write({"path": "c.jpg"})
+        lines = output.read_text().splitlines()
+        assert [json.loads(line)["path"] for line in lines] == ["a.jpg", "c.jpg"]
+
+    def test_bad_line_keeps_the_records_after_it(self, tmp_path):
+        output = tmp_path / "results.jsonl"
+        output.write_text(json.dumps({"path": "a.jpg"}) + "\nnot json\n" + json.dumps({"path": "b.jpg"}) + "\n")
+
+        assert JsonlSink(output).completed() == {"a.jpg", "b.jpg"}
+        with JsonlSink(output) as sink:
+            sink.write({"path": "c.jpg"})
+        assert len(output.read_text().splitlines()) == 4
+
+    def test_missing_file_has_nothing_completed(self, tmp_path):
+        assert JsonlSink(tmp_path / "missing.jsonl").completed() == set()
+
+
+class TestParquetSink:
+    def test_roundtrip_across_parts(self, tmp_path):
+        output = tmp_path / "results"
+        with ParquetSink(output, rows_per_part=2) as sink:
+            for name in ["a.jpg", "b.jpg", "c.jpg"]:
+                sink.write({"path": name, "count": 0, "tiles": [], "error": None})
+
+        assert len(list(output.glob("part-*.parquet"))) == 2
+        assert ParquetSink(output).completed() == {"a.jpg", "b.jpg", "c.jpg"}
+
+
+class TestOpenSink:
+    def test_format_from_suffix(self, tmp_path):
+        assert isinstance(open_sink(tmp_path / "out.jsonl"), JsonlSink)
+        assert isinstance(open_sink(tmp_path / "out"), ParquetSink)
+
+    def test_unknown_format_raises(self, tmp_path):
+        with pytest.raises(ValueError, match="Unknown output format"):
+            open_sink(tmp_path / "out", "csv")
+
+
+class TestRunBatch:
+    def _mock_model(self):
+        box = MagicMock()
+        box.cls = [0]
+        box.conf = [0.9]
+        box.xyxy = [MagicMock()]
+        box.xyxy[0].tolist.return_value = [1, 2, 10, 18]
+        result = MagicMock()
+        result.boxes = [box]
+        result.names = {0: "3p"}
+        model = MagicMock()
+        model.return_value = [result]
+        return model
+
+    def test_inline_run_yields_records(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(batch, "load_model", lambda path: self._mock_model())
+        image = _write_image(tmp_path / "a.png")
+        broken = tmp_path / "broken.jpg"
+        broken.write_bytes(b"not an image")
+
+        records = list(run_batch([image, broken], annotate_dir=tmp_path / "annotated"))
+
+        assert records[0]["count"] == 1
+        assert records[0]["tiles"] == [{"code": "3p", "confidence": 0.9, "bbox": [1, 2, 10, 18]}]
+        assert records[0]["error"] is None
+        assert records[1]["error"] == "Failed to decode image"
+        assert (tmp_path / "annotated" / "a_output.png").exists()
+
+    def test_annotations_mirror_subdirectories(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(batch, "load_model", lambda path: self._mock_model())
+        (tmp_path / "in" / "x").mkdir(parents=True)
+        (tmp_path / "in" / "y").mkdir()
+        images = [_write_image(tmp_path / "in" / sub / "a.png") for sub in ("x", "y")]
+
+        list(run_batch(images, annotate_dir=tmp_path / "annotated"))
+
+        assert (tmp_path / "annotated" / "x" / "a_output.png").exists()
+        assert (tmp_path / "annotated" / "y" / "a_output.png").exists()
+
+    def test_records_keep_input_order_past_the_prefetch_window(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(batch, "load_model", lambda path: self._mock_model())
+        images = [_write_image(tmp_path / f"{i:02d}.png") for i in range(batch.PREFETCH * 3)]
+        images.insert(5, tmp_path / "missing.png")
+
+        records = list(run_batch(images, annotate_dir=tmp_path / "annotated"))
+
+        assert [record["path"] for record in records] == [str(path) for path in images]
+        assert records[5]["error"] is not None
+        assert len(list((tmp_path / "annotated").glob("*_output.png"))) == batch.PREFETCH * 3
+
+
+class TestWorkerThreadConfig:
+    def test_single_worker_keeps_library_defaults(self):
+        assert worker_thread_config(1, cpus=8) is None
+
+    def test_cores_are_split_between_workers(self):
+        config = worker_thread_config(3, cpus=8)
+        assert (config.workers, config.torch_threads, config.opencv_threads) == (3, 2, 0)
+
+    def test_every_worker_gets_a_thread(self):
+        assert worker_thread_config(16, cpus=4).torch_threads == 1
@@ -0,0 +1,99 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.tile import DetectedTile
+from src.tile_detection.cascade import CascadeModel
+from src.tile_detection.detection import detect_tiles
+
+NAMES = {0: "1m", 1: "2m"}
+IMAGE = np.zeros((100, 800, 3), dtype=np.uint8)
+
+
+def _row(count: int, confidence: float = 0.9) -> list[DetectedTile]:
+    return [DetectedTile("1m", confidence, (10 + i * 42, 20, 50 + i * 42, 76)) for i in range(count)]
+
+
+def _models() -> tuple[MagicMock, MagicMock]:
+    fast, full = MagicMock(), MagicMock()
+    fast.names = full.names = NAMES
+    return fast, full
+
+
+def _predict(results: dict):
+    calls = []
+
+    def predict(model, image):
+        calls.append(model)
+        return results[model]
+
+    return predict, calls
+
+
+def test_confident_plausible_result_is_accepted():
+    fast, full = _models()
+    cascade = CascadeModel(fast, full)
+    predict, calls = _predict({fast: _row(14), full: _row(14)})
+
+    assert cascade.predict(IMAGE, predict) == _row(14)
+    assert calls == [fast]
+    assert cascade.stats.images == 1
+    assert cascade.stats.escalated == 0
+
+
+def test_low_confidence_escalates_to_full_model():
+    fast, full = _models()
+    cascade = CascadeModel(fast, full, confidence_threshold=0.6)
+    uncertain = _row(13) + [DetectedTile("2m", 0.4, (600, 20, 640, 76))]
+    predict, calls = _predict({fast: uncertain, full: _row(14, 0.95)})
+
+    assert cascade.predict(IMAGE, predict) == _row(14, 0.95)
+    assert calls == [fast, full]
+    assert cascade.stats.escalation_rate == 1.0
+
+
+def test_implausible_tile_count_escalates():
+    fast, full = _models()
+    cascade = CascadeModel(fast, full)
+    predict, calls = _predict({fast: _row(9), full: _row(14)})
+
+    cascade.predict(IMAGE, predict)
+    assert calls == [fast, full]
+
+
+def test_weak_duplicate_box_does_not_escalate():
+    fast, full = _models()
+    cascade = CascadeModel(fast, full)
+    tiles = _row(14) + [DetectedTile("2m", 0.2, (11, 21, 51, 77))]
+    predict, calls = _predict({fast: tiles, full: _row(14)})
+
+    cascade.predict(IMAGE, predict)
+    assert calls == [fast]
+
+
+def test_saved_seconds_needs_a_measured_escalation():
+    fast, full = _models()
+    cascade = CascadeModel(fast, full)
+    assert cascade.stats.saved_seconds is None
+
+    cascade.stats.images, cascade.stats.escalated = 10, 2
+    cascade.stats.fast_seconds, cascade.stats.full_seconds = 0.5, 0.4
+    assert cascade.stats.saved_seconds == pytest.approx(8 * 0.2 - 0.5)
+
+
+def test_mismatched_classes_are_rejected():
+    fast, full = _models()
+    fast.names = {0: "1m"}
+    with pytest.raises(ValueError):
+        CascadeModel(fast, full)
+
+
+def test_detect_tiles_runs_cascade():
+    fast, full = _models()
+    cascade = CascadeModel(fast, full)
+    cascade.predict = MagicMock(return_value=_row(14))
+
+    tiles = detect_tiles(cascade, IMAGE)
+    assert len(tiles) == 14
+    cascade.predict.assert_called_once()
@@ -0,0 +1,68 @@
+from src.tile import DetectedTile
+from src.tile_detection.decoding import CODE_TO_34, decode_tiles
+
+
+def _tile(code: str, alternatives=(), x: int = 0) -> DetectedTile:
+    confidence = alternatives[0][1] if alternatives else 0.9
+    return DetectedTile(code=code, confidence=confidence, bbox=(x, 0, x + 10, 20), alternatives=alternatives)
+
+
+class TestCodeTable:
+    def test_has_37_face_codes(self):
+        assert len(CODE_TO_34) == 37
+
+    def test_red_fives_share_index_with_fives(self):
+        assert CODE_TO_34["0p"] == CODE_TO_34["5p"] == 13
+
+
+class TestDecodeTiles:
+    def test_keeps_argmax_when_valid(self):
+        tiles = [_tile("2s", (("2s", 0.8), ("3s", 0.6))), _tile("7z")]
+        assert decode_tiles(tiles) == tiles
+
+    def test_fifth_copy_switches_to_alternative(self):
+        tiles = [_tile("2s", x=i * 10) for i in range(4)]
+        tiles.append(_tile("2s", (("2s", 0.5), ("3s", 0.4)), x=40))
+
+        decoded = decode_tiles(tiles)
+
+        assert [t.code for t in decoded] == ["2s", "2s", "2s", "2s", "3s"]
+        assert decoded[4].confidence == 0.4
+        assert decoded[4].bbox == tiles[4].bbox
+
+    def test_switches_least_confident_copy(self):
+        tiles = [_tile("2s", (("2s", 0.9), ("3s", 0.1))) for _ in range(4)]
+        tiles.insert(2, _tile("2s", (("2s", 0.5), ("3s", 0.45))))
+
+        decoded = decode_tiles(tiles)
+
+        assert [t.code for t in decoded] == ["2s", "2s", "3s", "2s", "2s"]
+
+    def test_one_red_five_per_suit(self):
+        tiles = [
+            _tile("0p", (("0p", 0.9), ("5p", 0.1))),
+            _tile("0p", (("0p", 0.6), ("5p", 0.4))),
+        ]
+        assert [t.code for t in decode_tiles(tiles)] == ["0p", "5p"]
+
+    def test_red_five_counts_towards_five_limit(self):
+        tiles = [_tile("5m") for _ in range(4)]
+        tiles.append(_tile("0m", (("0m", 0.7), ("6m", 0.3))))
+        assert decode_tiles(tiles)[-1].code == "6m"
+
+    def test_back_tiles_pass_through(self):
+        tiles = [_tile("0z"), _tile("1m")]
+        assert decode_tiles(tiles) == tiles
+
+    def test_infeasible_input_returned_unchanged(self):
+        tiles = [_tile("1m") for _ in range(5)]
+        assert decode_tiles(tiles) == tiles
+
+    def test_require_complete_prefers_winning_hand(self):
+        codes = ["1m", "2m", "3m", "4p", "5p", "6p", "7s", "8s", "9s", "1z", "1z", "1z", "9m"]
+        tiles = [_tile(code) for code in codes]
+        # Last tile looks slightly more like 8m, but only 9m completes the pair
+        tiles.append(_tile("8m", (("8m", 0.55), ("9m", 0.45))))
+
+        assert decode_tiles(tiles)[-1].code == "8m"
+        assert decode_tiles(tiles, require_complete=True)[-1].code == "9m"
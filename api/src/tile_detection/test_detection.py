@@ -1,3 +1,4 @@
+import pathlib
 from unittest.mock import MagicMock
 
 import cv2
@@ -5,7 +6,13 @@ import numpy as np
 import pytest
 
 from src.tile import DetectedTile
-from src.tile_detection.detection import decode_image, detect_tiles, sort_tiles
+from src.tile_detection.detection import (
+    DEFAULT_MODEL_PATH,
+    decode_image,
+    detect_tiles,
+    resolve_model_path,
+    sort_tiles,
+)
 
 
 class TestDecodeImage:
@@ -184,6 +191,20 @@ class TestDetectTiles:
         assert len(tiles) == 1
         assert tiles[0].is_rotated is False
 
+    def test_keeps_top_k_alternatives(self):
+        mock_model = MagicMock()
+        mock_box = self._create_mock_box(1, 0.6, [10, 20, 30, 40])
+        mock_result = self._create_mock_result([mock_box], {0: "2s", 1: "3s", 2: "0s", 3: "5s"})
+        mock_result.class_scores = np.array([[0.3, 0.6, 0.01, 0.2]])
+        mock_model.return_value = [mock_result]
+
+        image = np.zeros((100, 100, 3), dtype=np.uint8)
+        tiles = detect_tiles(mock_model, image)
+
+        assert tiles[0].code == "3s"
+        assert [code for code, _ in tiles[0].alternatives] == ["3s", "2s", "5s"]
+        assert tiles[0].alternatives[0][1] == 0.6
+
     def test_returns_detected_tile_instances(self):
         mock_model = MagicMock()
         mock_box = self._create_mock_box(0, 0.95, [10, 20, 30, 40])
@@ -195,6 +216,42 @@ class TestDetectTiles:
 
         assert all(isinstance(tile, DetectedTile) for tile in tiles)
 
+    def test_imgsz_is_passed_to_the_model(self):
+        mock_model = MagicMock()
+        mock_model.return_value = []
+
+        image = np.zeros((100, 100, 3), dtype=np.uint8)
+        detect_tiles(mock_model, image, imgsz=416)
+        assert mock_model.call_args.kwargs["imgsz"] == 416
+
+        detect_tiles(mock_model, image)
+        assert "imgsz" not in mock_model.call_args.kwargs
+
+    def test_reports_model_call_time(self):
+        mock_model = MagicMock()
+        mock_model.return_value = []
+        seconds = []
+
+        detect_tiles(mock_model, np.zeros((100, 100, 3), dtype=np.uint8), imgsz=416, on_inference=seconds.append)
+
+        assert len(seconds) == 1
+        assert seconds[0] >= 0
+
+    def test_reclassifier_refines_before_decoding(self):
+        mock_model = MagicMock()
+        mock_box = self._create_mock_box(0, 0.4, [10, 20, 30, 40])
+        mock_model.return_value = [self._create_mock_result([mock_box], {0: "1m"})]
+        reclassifier = MagicMock()
+        reclassifier.refine.side_effect = lambda image, tiles: [
+            DetectedTile(code="0p", confidence=0.9, bbox=t.bbox) for t in tiles
+        ]
+
+        image = np.zeros((100, 100, 3), dtype=np.uint8)
+        tiles = detect_tiles(mock_model, image, reclassifier=reclassifier)
+
+        assert reclassifier.refine.call_args.args[0] is image
+        assert [t.code for t in tiles] == ["0p"]
+
 
 class TestSortTiles:
     def _tile(self, code: str, bbox: tuple[int, int, int, int]) -> DetectedTile:
@@ -263,3 +320,17 @@ class TestSortTiles:
         image = np.zeros((300, 400, 3), dtype=np.uint8)
         tiles = detect_tiles(mock_model, image)
         assert [t.code for t in tiles] == ["1m", "5p"]
+
+
+class TestResolveModelPath:
+    def test_explicit_path_wins(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("MODEL_PATH", "/env/model.pt")
+        assert resolve_model_path(tmp_path / "x.pt") == tmp_path / "x.pt"
+
+    def test_env_var_selects_model(self, monkeypatch):
+        monkeypatch.setenv("MODEL_PATH", "/env/student.pt")
+        assert resolve_model_path() == pathlib.Path("/env/student.pt")
+
+    def test_defaults_to_bundled_weights(self, monkeypatch):
+        monkeypatch.delenv("MODEL_PATH", raising=False)
+        assert resolve_model_path() == DEFAULT_MODEL_PATH
@@ -0,0 +1,164 @@
+from unittest.mock import MagicMock
+
+import cv2
+import numpy as np
+import pytest
+
+from src.tile import DetectedTile
+from src.tile_detection import evaluation
+from src.tile_detection.evaluation import (
+    ClassMetrics,
+    Prediction,
+    PredictionCache,
+    evaluate_model,
+    iou,
+    load_dataset,
+    match_tiles,
+    read_labels,
+)
+
+
+def _tile(code: str, bbox: tuple[int, int, int, int], confidence: float = 0.9) -> DetectedTile:
+    return DetectedTile(code=code, confidence=confidence, bbox=bbox)
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    """A two-image dataset laid out like a Roboflow YOLO export."""
+    images = tmp_path / "valid" / "images"
+    labels = tmp_path / "valid" / "labels"
+    images.mkdir(parents=True)
+    labels.mkdir(parents=True)
+
+    for name in ["a", "b"]:
+        cv2.imwrite(str(images / f"{name}.png"), np.zeros((100, 200, 3), dtype=np.uint8))
+    # a: 1m at x 20-40 then 2m at x 60-80; b: a single 1m
+    (labels / "a.txt").write_text("0 0.15 0.5 0.1 0.4\n1 0.35 0.5 0.1 0.4\n")
+    (labels / "b.txt").write_text("0 0.15 0.5 0.1 0.4\n")
+
+    data_yaml = tmp_path / "data.yaml"
+    data_yaml.write_text("val: ../valid/images\nnames: ['1m', '2m']\n")
+    return data_yaml
+
+
+class TestLoadDataset:
+    def test_reads_split_and_names(self, dataset):
+        images, names = load_dataset(dataset)
+        assert names == ["1m", "2m"]
+        assert [i.image_path.name for i in images] == ["a.png", "b.png"]
+        assert images[0].label_path.name == "a.txt"
+        assert images[0].label_path.parent.name == "labels"
+
+    def test_missing_split_raises(self, dataset):
+        with pytest.raises(ValueError, match="Split 'test' not found"):
+            load_dataset(dataset, "test")
+
+
+class TestReadLabels:
+    def test_converts_normalized_boxes(self, dataset):
+        images, names = load_dataset(dataset)
+        tiles = read_labels(images[0].label_path, names, 200, 100)
+        assert [t.code for t in tiles] == ["1m", "2m"]
+        assert tiles[0].bbox == (20, 30, 40, 70)
+
+    def test_missing_label_file_is_empty(self, tmp_path):
+        assert read_labels(tmp_path / "none.txt", ["1m"], 10, 10) == []
+
+
+class TestMatching:
+    def test_iou(self):
+        assert iou((0, 0, 10, 10), (0, 0, 10, 10)) == 1.0
+        assert iou((0, 0, 10, 10), (20, 20, 30, 30)) == 0.0
+        assert iou((0, 0, 10, 10), (5, 0, 15, 10)) == pytest.approx(1 / 3)
+
+    def test_counts_tp_fp_fn_per_class(self):
+        truth = [_tile("1m", (0, 0, 10, 10)), _tile("2m", (20, 0, 30, 10))]
+        predicted = [_tile("1m", (1, 0, 11, 10)), _tile("3m", (20, 0, 30, 10))]
+        per_class: dict[str, ClassMetrics] = {}
+
+        match_tiles(predicted, truth, per_class)
+
+        assert per_class["1m"].true_positives == 1
+        assert per_class["3m"].false_positives == 1
+        assert per_class["2m"].false_negatives == 1
+        assert per_class["1m"].precision == 1.0
+        assert per_class["2m"].recall == 0.0
+
+    def test_each_truth_matched_once(self):
+        truth = [_tile("1m", (0, 0, 10, 10))]
+        predicted = [_tile("1m", (0, 0, 10, 10), 0.9), _tile("1m", (0, 0, 10, 10), 0.5)]
+        per_class: dict[str, ClassMetrics] = {}
+
+        match_tiles(predicted, truth, per_class)
+
+        assert per_class["1m"].true_positives == 1
+        assert per_class["1m"].false_positives == 1
+
+
+class TestPredictionCache:
+    def test_roundtrip(self, tmp_path):
+        tile = DetectedTile(code="1m", confidence=0.6, bbox=(1, 2, 3, 4), alternatives=(("1m", 0.6), ("7m", 0.3)))
+        cache = PredictionCache(tmp_path, "abc123")
+        cache.put("img", Prediction([tile], 0.25, (200, 100)))
+
+        reloaded = PredictionCache(tmp_path, "abc123").get("img")
+        assert reloaded == Prediction([tile], 0.25, (200, 100))
+
+    def test_different_model_hash_misses(self, tmp_path):
+        PredictionCache(tmp_path, "abc123").put("img", Prediction([], 0.1, (1, 1)))
+        assert PredictionCache(tmp_path, "def456").get("img") is None
+
+    def test_different_imgsz_misses(self, tmp_path):
+        PredictionCache(tmp_path, "abc123").put("img", Prediction([], 0.1, (1, 1)))
+        assert PredictionCache(tmp_path, "abc123", imgsz=416).get("img") is None
+
+
+class TestEvaluateModel:
+    def _mock_model(self):
+        def make_box(cls_id, xyxy):
+            box = MagicMock()
+            box.cls = [cls_id]
+            box.conf = [0.9]
+            box.xyxy = [MagicMock()]
+            box.xyxy[0].tolist.return_value = xyxy
+            return box
+
+        result = MagicMock()
+        result.boxes = [make_box(0, [20, 30, 40, 70]), make_box(1, [60, 30, 80, 70])]
+        result.names = {0: "1m", 1: "2m"}
+        model = MagicMock()
+        model.return_value = [result]
+        return model
+
+    def test_reports_metrics_and_uses_cache(self, dataset, tmp_path, monkeypatch):
+        model = self._mock_model()
+        monkeypatch.setattr(evaluation, "load_model", lambda path: model)
+        weights = tmp_path / "best.pt"
+        weights.write_bytes(b"weights")
+
+        report = evaluate_model(dataset, weights, cache_dir=tmp_path / "cache")
+
+        assert report.images == 2
+        assert report.exact_hands == 1  # image b has an extra 2m prediction
+        assert report.per_class["1m"].recall == 1.0
+        assert report.per_class["2m"].precision == 0.5
+        assert report.cached_images == 0
+        assert model.call_count == 2
+
+        rerun = evaluate_model(dataset, weights, cache_dir=tmp_path / "cache")
+
+        assert rerun.cached_images == 2
+        assert rerun.exact_hands == 1
+        assert model.call_count == 2
+
+    def test_unreadable_images_are_skipped(self, dataset, tmp_path, monkeypatch):
+        model = self._mock_model()
+        monkeypatch.setattr(evaluation, "load_model", lambda path: model)
+        images, _ = evaluation.load_dataset(dataset)
+        images[0].image_path.write_bytes(b"not an image")
+        weights = tmp_path / "best.pt"
+        weights.write_bytes(b"weights")
+
+        report = evaluate_model(dataset, weights)
+
+        assert (report.images, report.unreadable) == (len(images) - 1, 1)
@@ -0,0 +1,97 @@
+import math
+
+import pytest
+
+from src.tile import DetectedTile
+from src.tile_detection.detection import sort_tiles
+from src.tile_detection.layout import analyze_layout, fit_row_angle
+
+TILE_W = 40
+TILE_H = 56
+
+
+def _tilted_row(
+    codes: list[str],
+    degrees: float = 0.0,
+    origin: tuple[float, float] = (100, 100),
+    gaps_before: dict[int, float] | None = None,
+    rotated: set[int] = frozenset(),
+) -> list[DetectedTile]:
+    """Tiles laid left to right along a line tilted by `degrees`, as axis-aligned boxes."""
+    gaps_before = gaps_before or {}
+    angle = math.radians(degrees)
+    cos, sin = math.cos(angle), math.sin(angle)
+    tiles = []
+    u = 0.0
+    for i, code in enumerate(codes):
+        u += gaps_before.get(i, 2)
+        w, h = (TILE_H, TILE_W) if i in rotated else (TILE_W, TILE_H)
+        # Bottom-aligned like tiles on a table: sideways tiles sit lower in the row
+        cu, cv = u + w / 2, (TILE_H - h) / 2
+        cx = origin[0] + cu * cos - cv * sin
+        cy = origin[1] + cu * sin + cv * cos
+        half_w = (w * cos + h * abs(sin)) / 2
+        half_h = (w * abs(sin) + h * cos) / 2
+        bbox = (round(cx - half_w), round(cy - half_h), round(cx + half_w), round(cy + half_h))
+        tiles.append(DetectedTile(code=code, confidence=0.9, bbox=bbox))
+        u += w
+    return tiles
+
+
+HAND = ["1m", "2m", "3m", "4p", "5p", "6p", "7s", "8s", "9s", "1z", "1z", "1z", "5z", "5z"]
+
+
+class TestFitRowAngle:
+    @pytest.mark.parametrize("degrees", [-12, -5, 0, 7, 14])
+    def test_recovers_tilt(self, degrees):
+        angle = fit_row_angle(_tilted_row(HAND, degrees))
+        assert math.degrees(angle) == pytest.approx(degrees, abs=1.5)
+
+    def test_ignores_other_rows(self):
+        tiles = _tilted_row(HAND, 5) + _tilted_row(HAND, 5, origin=(100, 300))
+        assert math.degrees(fit_row_angle(tiles)) == pytest.approx(5, abs=1.5)
+
+
+class TestAnalyzeLayout:
+    def test_tilted_hand_is_one_row(self):
+        tiles = _tilted_row(HAND, 10)
+        layout = analyze_layout(list(reversed(tiles)))
+        assert len(layout.rows) == 1
+        assert [list(reversed(tiles))[i].code for i in layout.order] == HAND
+        assert not any(layout.rotated)
+
+    def test_rows_ordered_top_to_bottom(self):
+        discards = _tilted_row(["9p", "8p", "7p"], 3, origin=(100, 40))
+        hand = _tilted_row(HAND, 3, origin=(80, 200))
+        layout = analyze_layout(hand + discards)
+        assert [[len(g) for g in row] for row in layout.rows] == [[3], [14]]
+        assert [(hand + discards)[i].code for i in layout.order] == ["9p", "8p", "7p"] + HAND
+
+    def test_groups_and_rotated_meld_tile(self):
+        codes = HAND[:11] + ["1z", "1z", "1z"]
+        tiles = _tilted_row(codes, -6, gaps_before={11: 30}, rotated={11})
+        layout = analyze_layout(tiles)
+
+        assert layout.rows == [[list(range(11)), [11, 12, 13]]]
+        assert [i for i, r in enumerate(layout.rotated) if r] == [11]
+
+    def test_scattered_tiles(self):
+        tiles = [
+            DetectedTile(code="7z", confidence=0.9, bbox=(100, 500, 150, 600)),
+            DetectedTile(code="1m", confidence=0.9, bbox=(400, 100, 450, 200)),
+        ]
+        assert analyze_layout(tiles).is_scattered
+
+    def test_empty(self):
+        assert analyze_layout([]).rows == []
+
+
+class TestSortTilesLayout:
+    def test_tilted_photo_keeps_row_order(self):
+        tiles = _tilted_row(["9m", "1p", "5s", "2m"], 12)
+        assert [t.code for t in sort_tiles(tiles[::-1])] == ["9m", "1p", "5s", "2m"]
+
+    def test_hand_row_above_meld_row(self):
+        hand = _tilted_row(HAND[:10], origin=(50, 50))
+        melds = _tilted_row(["3s", "2s", "4s"], origin=(400, 150), rotated={0})
+        assert [t.code for t in sort_tiles(melds + hand)] == HAND[:10] + ["3s", "2s", "4s"]
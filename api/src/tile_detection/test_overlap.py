@@ -0,0 +1,84 @@
+import itertools
+import pathlib
+import random
+
+import cv2
+import pytest
+
+from src.tile import DetectedTile
+from src.tile_detection.detection import DEFAULT_MODEL_PATH, detect_tiles, load_model
+from src.tile_detection.overlap import iou, overlapping_pairs, suppress_overlaps
+
+TEST_IMAGES = pathlib.Path(__file__).resolve().parents[3] / "test-images"
+
+
+def _tile(code, bbox, confidence=0.9, alternatives=()):
+    return DetectedTile(code=code, confidence=confidence, bbox=bbox, alternatives=alternatives)
+
+
+class TestOverlappingPairs:
+    def test_matches_all_pairs(self):
+        rng = random.Random(0)
+        boxes = []
+        for _ in range(300):
+            x, y = rng.randrange(0, 2000), rng.randrange(0, 1000)
+            boxes.append((x, y, x + rng.randrange(20, 60), y + rng.randrange(30, 80)))
+
+        expected = [(i, j) for i, j in itertools.combinations(range(len(boxes)), 2) if iou(boxes[i], boxes[j]) > 0.3]
+
+        assert sorted(overlapping_pairs(boxes, 0.3)) == expected
+
+    def test_column_aligned_boxes(self):
+        # Tiles stacked in columns share x-ranges, so every box stays open across its column
+        boxes = [(x, y, x + 40, y + 60) for x in (0, 30, 200) for y in range(0, 3000, 50)]
+
+        expected = [(i, j) for i, j in itertools.combinations(range(len(boxes)), 2) if iou(boxes[i], boxes[j]) > 0.1]
+
+        assert sorted(overlapping_pairs(boxes, 0.1)) == expected
+
+    def test_touching_tiles_do_not_overlap(self):
+        assert overlapping_pairs([(0, 0, 40, 60), (40, 0, 80, 60), (82, 0, 122, 60)]) == []
+
+
+class TestSuppressOverlaps:
+    def test_keeps_more_confident_class(self):
+        tiles = [
+            _tile("1m", (0, 0, 40, 60)),
+            _tile("7p", (100, 0, 140, 60), 0.6, (("7p", 0.6), ("1p", 0.2))),
+            _tile("7s", (102, 1, 141, 61), 0.8, (("7s", 0.8), ("1s", 0.1))),
+        ]
+
+        result = suppress_overlaps(tiles)
+
+        assert [t.code for t in result] == ["1m", "7s"]
+        assert result[1].alternatives == (("7s", 0.8), ("7p", 0.6), ("1p", 0.2))
+
+    def test_chain_keeps_non_overlapping_ends(self):
+        # a overlaps b, b overlaps c, a and c don't overlap: b is dropped by a, c survives
+        tiles = [
+            _tile("1m", (0, 0, 40, 60), 0.9),
+            _tile("2m", (10, 0, 50, 60), 0.8),
+            _tile("3m", (22, 0, 62, 60), 0.7),
+        ]
+        assert [t.code for t in suppress_overlaps(tiles)] == ["1m", "3m"]
+
+    def test_leaves_no_overlapping_boxes(self):
+        rng = random.Random(1)
+        tiles = []
+        for _ in range(200):
+            x, y = rng.randrange(0, 1000), rng.randrange(0, 500)
+            tiles.append(_tile("1m", (x, y, x + 40, y + 60), rng.random()))
+
+        assert overlapping_pairs([t.bbox for t in suppress_overlaps(tiles)]) == []
+
+    def test_no_overlap_is_unchanged(self):
+        tiles = [_tile("1m", (0, 0, 40, 60)), _tile("2m", (42, 0, 82, 60))]
+        assert suppress_overlaps(tiles) == tiles
+
+
+@pytest.mark.skipif(not DEFAULT_MODEL_PATH.exists(), reason="model weights (best.pt) not available")
+@pytest.mark.parametrize("image_path", sorted(TEST_IMAGES.glob("*")), ids=lambda p: p.name)
+def test_no_duplicate_boxes_on_test_images(image_path):
+    tiles = detect_tiles(load_model(), cv2.imread(str(image_path)))
+    boxes = [t.bbox for t in tiles]
+    assert overlapping_pairs(boxes) == []
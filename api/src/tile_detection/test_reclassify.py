@@ -0,0 +1,96 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import torch
+
+from src.tile import DetectedTile
+from src.tile_detection.reclassify import CropReclassifier, crop_tile
+
+NAMES = {0: "5m", 1: "0m", 2: "2p", 3: "3p"}
+IMAGE = np.zeros((200, 400, 3), dtype=np.uint8)
+
+
+def _classifier(probs: list[float]) -> MagicMock:
+    """Classifier returning the same class probabilities for every crop."""
+    classifier = MagicMock()
+    classifier.names = NAMES
+    classifier.side_effect = lambda crops, **kwargs: [
+        SimpleNamespace(probs=SimpleNamespace(data=torch.tensor(probs))) for _ in crops
+    ]
+    return classifier
+
+
+def _tile(code: str, confidence: float, x: int = 10) -> DetectedTile:
+    return DetectedTile(code, confidence, (x, 20, x + 40, 76), alternatives=((code, confidence),))
+
+
+def test_only_uncertain_tiles_are_cropped_in_one_batch():
+    classifier = _classifier([0.1, 0.8, 0.05, 0.05])
+    reclassifier = CropReclassifier(classifier, confidence_threshold=0.6)
+    tiles = [_tile("5m", 0.9, 10), _tile("5m", 0.4, 60), _tile("2p", 0.5, 110)]
+
+    reclassifier.refine(IMAGE, tiles)
+
+    classifier.assert_called_once()
+    crops = classifier.call_args.args[0]
+    assert len(crops) == 2
+    assert crops[0].shape[:2] == (68, 48)  # native resolution plus padding
+
+
+def test_classifier_changes_code_and_alternatives():
+    reclassifier = CropReclassifier(_classifier([0.1, 0.85, 0.03, 0.02]))
+    tiles = [_tile("5m", 0.9, 10), _tile("5m", 0.45, 60)]
+
+    refined = reclassifier.refine(IMAGE, tiles)
+
+    assert refined[0] == tiles[0]
+    assert refined[1].code == "0m"
+    assert refined[1].bbox == tiles[1].bbox
+    assert [code for code, _ in refined[1].alternatives][:2] == ["0m", "5m"]
+    assert reclassifier.stats.changed == 1
+    assert reclassifier.stats.crops == 1
+
+
+def test_boxes_outside_the_image_are_not_cropped():
+    classifier = _classifier([0.1, 0.85, 0.03, 0.02])
+    reclassifier = CropReclassifier(classifier)
+    outside = DetectedTile("5m", 0.3, (500, 20, 540, 76))
+    tiles = [outside, _tile("5m", 0.45, 60)]
+
+    refined = reclassifier.refine(IMAGE, tiles)
+
+    assert len(classifier.call_args.args[0]) == 1
+    assert refined[0] == outside
+    assert refined[1].code == "0m"
+
+    classifier.reset_mock()
+    assert reclassifier.refine(IMAGE, [outside]) == [outside]
+    classifier.assert_not_called()
+
+
+def test_budget_keeps_least_confident_tiles():
+    classifier = _classifier([0.0, 0.0, 0.0, 1.0])
+    reclassifier = CropReclassifier(classifier, budget_seconds=0.02)
+    reclassifier.seconds_per_crop = 0.01
+    tiles = [_tile("2p", 0.5, 10), _tile("2p", 0.2, 60), _tile("2p", 0.3, 110)]
+
+    refined = reclassifier.refine(IMAGE, tiles)
+
+    assert [t.code for t in refined] == ["2p", "3p", "3p"]
+    assert reclassifier.stats.over_budget == 1
+
+
+def test_confident_image_skips_classifier():
+    classifier = _classifier([1.0, 0.0, 0.0, 0.0])
+    reclassifier = CropReclassifier(classifier)
+    tiles = [_tile("5m", 0.9)]
+
+    assert reclassifier.refine(IMAGE, tiles) == tiles
+    classifier.assert_not_called()
+    assert reclassifier.stats.images == 1
+
+
+def test_crop_tile_clamps_to_image():
+    crop = crop_tile(IMAGE, (0, 0, 40, 60))
+    assert crop.shape[:2] == (66, 44)
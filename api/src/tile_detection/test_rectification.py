@@ -0,0 +1,182 @@
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+
+from src.tile import DetectedTile
+from src.tile_detection.detection import predict_tiles_rectified
+from src.tile_detection.overlap import iou
+from src.tile_detection.rectification import (
+    FIRST_PASS_IMGSZ,
+    MIN_TILES,
+    TILE_ASPECT,
+    estimate_rectification,
+    map_tiles_back,
+    rectify_image,
+)
+
+TILE_W = 40
+TILE_H = 56
+IMAGE_SIZE = (1280, 960)
+
+
+def _camera_homography(tilt: float) -> np.ndarray:
+    """Table plane → image for a camera pitched towards the far (top) edge; 0 is top-down."""
+    # Tiles at the top of the image shrink by 1 / (1 + tilt), converging on the center column
+    cx = IMAGE_SIZE[0] / 2
+    center = np.array([[1.0, 0.0, -cx], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+    pitch = np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, -tilt / IMAGE_SIZE[1], 1.0 + tilt]])
+    return np.linalg.inv(center) @ pitch @ center
+
+
+def _project(points: np.ndarray, homography: np.ndarray) -> np.ndarray:
+    return cv2.perspectiveTransform(points.reshape(-1, 1, 2).astype(np.float32), homography).reshape(-1, 2)
+
+
+def _table_corners(rows: int = 3, per_row: int = 14) -> list[np.ndarray]:
+    """Corners of the tiles of a few rows centered on the table, in table coordinates."""
+    corners = []
+    left = IMAGE_SIZE[0] / 2 - per_row * (TILE_W + 2) / 2
+    for row in range(rows):
+        y = 150 + row * (TILE_H + 120)
+        for col in range(per_row):
+            x = left + col * (TILE_W + 2)
+            corners.append(np.array([(x, y), (x + TILE_W, y), (x + TILE_W, y + TILE_H), (x, y + TILE_H)]))
+    return corners
+
+
+def _tiles(corners: list[np.ndarray], homography: np.ndarray) -> list[DetectedTile]:
+    tiles = []
+    for quad in corners:
+        points = _project(quad, homography)
+        x1, y1 = points.min(axis=0)
+        x2, y2 = points.max(axis=0)
+        tiles.append(DetectedTile("1m", 0.9, (round(x1), round(y1), round(x2), round(y2))))
+    return tiles
+
+
+def _width_spread(widths: list[float]) -> float:
+    return float(np.std(widths) / np.mean(widths))
+
+
+def test_tilted_photo_rectifies_to_uniform_tile_size():
+    camera = _camera_homography(tilt=1.5)
+    corners = _table_corners()
+    rectification = estimate_rectification(_tiles(corners, camera), IMAGE_SIZE)
+    assert rectification is not None
+
+    before = [np.ptp(_project(quad, camera)[:, 0]) for quad in corners]
+    after = [np.ptp(_project(quad, rectification.homography @ camera)[:, 0]) for quad in corners]
+    assert _width_spread(before) > 0.1
+    assert _width_spread(after) < 0.05
+
+
+def test_rectified_tiles_keep_their_aspect_ratio():
+    camera = _camera_homography(tilt=1.5)
+    corners = _table_corners()
+    rectification = estimate_rectification(_tiles(corners, camera), IMAGE_SIZE)
+    assert rectification is not None
+
+    for quad in corners:
+        points = _project(quad, rectification.homography @ camera)
+        aspect = np.ptp(points[:, 1]) / np.ptp(points[:, 0])
+        # Estimated from axis-aligned boxes, which are a little wider than the slanted tiles
+        assert abs(aspect / TILE_ASPECT - 1) < 0.2
+
+
+def test_rectified_image_contains_every_tile():
+    camera = _camera_homography(tilt=2.0)
+    corners = _table_corners()
+    rectification = estimate_rectification(_tiles(corners, camera), IMAGE_SIZE)
+    assert rectification is not None
+
+    width, height = rectification.size
+    for quad in corners:
+        points = _project(quad, rectification.homography @ camera)
+        assert points[:, 0].min() >= 0 and points[:, 0].max() <= width
+        assert points[:, 1].min() >= 0 and points[:, 1].max() <= height
+
+
+def test_top_down_photo_is_not_rectified():
+    tiles = _tiles(_table_corners(), _camera_homography(tilt=0.0))
+    assert estimate_rectification(tiles, IMAGE_SIZE) is None
+
+
+def test_too_few_tiles_are_not_rectified():
+    tiles = _tiles(_table_corners(rows=1, per_row=MIN_TILES - 1), _camera_homography(tilt=1.5))
+    assert estimate_rectification(tiles, IMAGE_SIZE) is None
+
+
+def test_map_tiles_back_recovers_original_boxes():
+    camera = _camera_homography(tilt=1.5)
+    corners = _table_corners()
+    original = _tiles(corners, camera)
+    rectification = estimate_rectification(original, IMAGE_SIZE)
+    assert rectification is not None
+
+    rectified = _tiles(corners, rectification.homography @ camera)
+    mapped = map_tiles_back(rectified, rectification)
+    assert all(iou(a.bbox, b.bbox) > 0.8 for a, b in zip(mapped, original))
+    assert [t.code for t in mapped] == [t.code for t in original]
+
+
+def test_map_tiles_back_empty():
+    rectification = estimate_rectification(_tiles(_table_corners(), _camera_homography(1.5)), IMAGE_SIZE)
+    assert rectification is not None
+    assert map_tiles_back([], rectification) == []
+
+
+def test_map_tiles_back_clips_to_the_original_image():
+    rectification = estimate_rectification(_tiles(_table_corners(), _camera_homography(1.5)), IMAGE_SIZE)
+    assert rectification is not None
+    center = rectification.size[0] // 2
+    # Far enough above the rectified view to land above the photo's top edge
+    straddling = DetectedTile("1m", 0.9, (center - 20, -300, center + 20, 10))
+    beyond = DetectedTile("2m", 0.9, (center - 20, -300, center + 20, -200))
+
+    mapped = map_tiles_back([straddling, beyond], rectification)
+
+    assert [t.code for t in mapped] == ["1m"]
+    x1, y1, x2, y2 = mapped[0].bbox
+    assert y1 == 0 and 0 <= x1 < x2 <= IMAGE_SIZE[0] and 0 < y2 <= IMAGE_SIZE[1]
+
+
+def test_rectify_image_has_rectified_size():
+    rectification = estimate_rectification(_tiles(_table_corners(), _camera_homography(1.5)), IMAGE_SIZE)
+    assert rectification is not None
+    image = np.zeros((IMAGE_SIZE[1], IMAGE_SIZE[0], 3), dtype=np.uint8)
+    warped = rectify_image(image, rectification)
+    assert warped.shape[:2] == (rectification.size[1], rectification.size[0])
+
+
+def test_predict_tiles_rectified_detects_on_warped_image():
+    camera = _camera_homography(tilt=1.5)
+    tilted = _tiles(_table_corners(), camera)
+    calls = []
+
+    def fake_predict(model, image, imgsz=None, on_inference=None):
+        calls.append((image.shape, imgsz))
+        return tilted if imgsz is not None else [DetectedTile("2p", 0.8, (10, 10, 40, 50))]
+
+    image = np.zeros((IMAGE_SIZE[1], IMAGE_SIZE[0], 3), dtype=np.uint8)
+    with patch("src.tile_detection.detection.predict_tiles", fake_predict):
+        tiles = predict_tiles_rectified(None, image)
+
+    rectification = estimate_rectification(tilted, IMAGE_SIZE)
+    assert rectification is not None
+    assert calls == [(image.shape, FIRST_PASS_IMGSZ), ((rectification.size[1], rectification.size[0], 3), None)]
+    assert tiles == map_tiles_back([DetectedTile("2p", 0.8, (10, 10, 40, 50))], rectification)
+
+
+def test_predict_tiles_rectified_skips_warp_for_top_down_photo():
+    flat = _tiles(_table_corners(), _camera_homography(tilt=0.0))
+    calls = []
+
+    def fake_predict(model, image, imgsz=None, on_inference=None):
+        calls.append(imgsz)
+        return flat
+
+    image = np.zeros((IMAGE_SIZE[1], IMAGE_SIZE[0], 3), dtype=np.uint8)
+    with patch("src.tile_detection.detection.predict_tiles", fake_predict):
+        assert predict_tiles_rectified(None, image) == flat
+    assert calls == [FIRST_PASS_IMGSZ, None]
@@ -0,0 +1,156 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.tile_detection.registry import (
+    DEFAULT_REGISTRY_DIR,
+    ModelRegistry,
+    ModelSwitcher,
+    ServingModel,
+    load_serving_model,
+    resolve_registry_dir,
+)
+
+NAMES = {0: "1m", 1: "2m"}
+
+
+def _model(names=NAMES) -> MagicMock:
+    model = MagicMock()
+    model.names = names
+    model.return_value = []
+    return model
+
+
+@pytest.fixture
+def registry(tmp_path):
+    for version in ("v1", "v2"):
+        (tmp_path / f"{version}.pt").write_bytes(b"weights")
+    return ModelRegistry(tmp_path)
+
+
+class TestModelRegistry:
+    def test_lists_versions(self, registry):
+        assert registry.versions() == ["v1", "v2"]
+
+    def test_missing_directory_has_no_versions(self, tmp_path):
+        assert ModelRegistry(tmp_path / "missing").versions() == []
+
+    def test_path_of_known_version(self, registry, tmp_path):
+        assert registry.path("v2") == tmp_path / "v2.pt"
+
+    def test_unknown_version_raises(self, registry):
+        with pytest.raises(KeyError):
+            registry.path("v3")
+
+    def test_path_traversal_is_rejected(self, registry, tmp_path):
+        (tmp_path / "nested").mkdir()
+        (tmp_path / "nested" / "v9.pt").write_bytes(b"weights")
+        with pytest.raises(KeyError):
+            registry.path("nested/v9")
+
+    def test_active_version_round_trip(self, registry):
+        assert registry.active_version() is None
+        registry.set_active("v2")
+        assert registry.active_version() == "v2"
+
+
+class TestModelSwitcher:
+    def test_activation_swaps_model_once_warm(self, registry):
+        new = _model()
+        switcher = ModelSwitcher(registry, ServingModel("v1", _model()), load=lambda path: new)
+        switcher.activate("v2")
+        switcher.wait()
+
+        assert switcher.current == ServingModel("v2", new)
+        assert new.called  # warmed up before serving
+        assert registry.active_version() == "v2"
+        assert switcher.status.loading is None
+        assert switcher.status.error is None
+
+    def test_in_flight_reference_keeps_old_model(self, registry):
+        old, new = _model(), _model()
+        release = threading.Event()
+
+        def load(path):
+            release.wait()
+            return new
+
+        switcher = ModelSwitcher(registry, ServingModel("v1", old), load=load)
+        in_flight = switcher.current
+        switcher.activate("v2")
+        assert switcher.status.loading == "v2"
+        assert switcher.current.model is old  # still serving while loading
+
+        release.set()
+        switcher.wait()
+        assert in_flight.model is old
+        assert switcher.current.model is new
+
+    def test_unknown_version_raises(self, registry):
+        switcher = ModelSwitcher(registry, ServingModel("v1", _model()), load=lambda path: _model())
+        with pytest.raises(KeyError):
+            switcher.activate("v3")
+
+    def test_second_activation_while_loading_is_refused(self, registry):
+        release = threading.Event()
+
+        def load(path):
+            release.wait()
+            return _model()
+
+        switcher = ModelSwitcher(registry, ServingModel("v1", _model()), load=load)
+        switcher.activate("v2")
+        with pytest.raises(RuntimeError):
+            switcher.activate("v1")
+        release.set()
+        switcher.wait()
+
+    def test_different_classes_are_refused(self, registry):
+        old = _model()
+        switcher = ModelSwitcher(registry, ServingModel("v1", old), load=lambda path: _model({0: "1p"}))
+        switcher.activate("v2")
+        switcher.wait()
+
+        assert switcher.current.model is old
+        assert "different classes" in switcher.status.error
+        assert registry.active_version() is None
+
+    def test_load_failure_keeps_serving(self, registry):
+        def load(path):
+            raise RuntimeError("corrupt weights")
+
+        switcher = ModelSwitcher(registry, ServingModel("v1", _model()), load=load)
+        switcher.activate("v2")
+        switcher.wait()
+        assert switcher.current.version == "v1"
+        assert switcher.status.error == "v2: corrupt weights"
+
+
+class TestResolveRegistryDir:
+    def test_explicit_path_wins(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("MODEL_REGISTRY_DIR", "/env/models")
+        assert resolve_registry_dir(tmp_path) == tmp_path
+
+    def test_env_var(self, monkeypatch):
+        monkeypatch.setenv("MODEL_REGISTRY_DIR", "/env/models")
+        assert str(resolve_registry_dir()) == "/env/models"
+
+    def test_default(self, monkeypatch):
+        monkeypatch.delenv("MODEL_REGISTRY_DIR", raising=False)
+        assert resolve_registry_dir() == DEFAULT_REGISTRY_DIR
+
+
+class TestLoadServingModel:
+    def test_loads_active_version(self, registry, tmp_path):
+        registry.set_active("v2")
+        with patch("src.tile_detection.registry.load_model", return_value=_model()) as load:
+            serving = load_serving_model(registry)
+        assert serving.version == "v2"
+        load.assert_called_once_with(tmp_path / "v2.pt", None)
+        assert serving.model.called  # warmed up
+
+    def test_falls_back_to_model_path(self, registry, monkeypatch):
+        monkeypatch.setenv("MODEL_PATH", "/env/student.pt")
+        with patch("src.tile_detection.registry.load_model", return_value=_model()):
+            assert load_serving_model(registry).version == "student"
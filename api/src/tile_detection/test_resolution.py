@@ -0,0 +1,152 @@
+import threading
+import time
+
+from src.tile_detection.resolution import (
+    DEFAULT_TARGET_SECONDS,
+    ResolutionController,
+    resolve_latency_target,
+)
+
+SMALL_IMAGE = (480, 640, 3)
+LARGE_IMAGE = (3024, 4032, 3)
+
+
+def _controller(latency: float | None = 0.1, target: float = 0.5) -> ResolutionController:
+    controller = ResolutionController(target_seconds=target)
+    if latency is not None:
+        controller.record(640, latency)
+    return controller
+
+
+def _choose_with_backlog(controller: ResolutionController, backlog: int, shape=SMALL_IMAGE) -> int:
+    """Choose while `backlog` detections, this one included, are pending."""
+    entered = [controller.pending() for _ in range(backlog)]
+    for context in entered:
+        context.__enter__()
+    try:
+        return controller.choose(shape)
+    finally:
+        for context in entered:
+            context.__exit__(None, None, None)
+
+
+def test_default_size_before_any_timing():
+    controller = _controller(latency=None)
+    assert _choose_with_backlog(controller, 10) == 640
+
+
+def test_default_size_with_short_backlog():
+    assert _choose_with_backlog(_controller(), 1) == 640
+    assert _choose_with_backlog(_controller(), 5) == 640
+
+
+def test_backlog_lowers_resolution():
+    # 0.1 s at 640 is ~0.056 s at 480 and ~0.042 s at 416
+    assert _choose_with_backlog(_controller(), 8) == 480
+    assert _choose_with_backlog(_controller(), 12) == 416
+
+
+def test_smallest_size_when_nothing_fits():
+    assert _choose_with_backlog(_controller(), 100) == 416
+
+
+def test_slow_model_lowers_resolution_without_a_backlog():
+    assert _choose_with_backlog(_controller(latency=1.0), 1) == 416
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_idle_large_photo_gets_higher_resolution():
+    clock = FakeClock()
+    controller = ResolutionController(target_seconds=0.5, clock=clock)
+    controller.record(640, 0.1)
+    # Too soon after the last detection: a 960 pass (~0.225 s) would not fit the gap
+    clock.now = 0.1
+    assert _choose_with_backlog(controller, 1, LARGE_IMAGE) == 640
+    clock.now = 1.0
+    assert _choose_with_backlog(controller, 1, LARGE_IMAGE) == 960
+    # Not for photos that are no larger than the default input
+    assert _choose_with_backlog(controller, 1, SMALL_IMAGE) == 640
+    # Nor when other detections are waiting
+    assert _choose_with_backlog(controller, 2, LARGE_IMAGE) == 640
+
+
+def test_latency_is_normalized_to_default_size():
+    controller = ResolutionController()
+    controller.record(320, 0.025)
+    assert controller.stats.latency_seconds == 0.1
+    assert controller.expected_seconds(480) == 0.1 * (480 / 640) ** 2
+
+
+def test_latency_is_smoothed():
+    controller = _controller(latency=0.1)
+    controller.record(640, 0.2)
+    assert 0.1 < controller.stats.latency_seconds < 0.2
+
+
+def test_pending_counts_and_stats():
+    controller = _controller()
+    with controller.pending():
+        with controller.pending():
+            assert controller.pending_count == 2
+        controller.choose(SMALL_IMAGE)
+    assert controller.pending_count == 0
+    assert controller.stats.max_pending == 2
+    assert controller.stats.requests == 1
+    assert controller.stats.chosen == {640: 1}
+
+
+def test_pending_released_on_error():
+    controller = _controller()
+    try:
+        with controller.pending():
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert controller.pending_count == 0
+
+
+def test_load_scenario_degrades_and_recovers():
+    """A burst queues up behind a model whose latency grows with imgsz ** 2, then traffic stops."""
+    controller = ResolutionController(target_seconds=0.1)
+    model_lock = threading.Lock()
+    base_seconds = 0.02
+    chosen: list[tuple[int, int]] = []
+    burst = threading.Barrier(13)
+
+    def request():
+        burst.wait()
+        with controller.pending(), model_lock:
+            imgsz = controller.choose(SMALL_IMAGE)
+            chosen.append((controller.pending_count, imgsz))
+            with controller.timed(imgsz):
+                time.sleep(base_seconds * (imgsz / 640) ** 2)
+
+    controller.record(640, base_seconds)
+    threads = [threading.Thread(target=request) for _ in range(12)]
+    for thread in threads:
+        thread.start()
+    burst.wait()
+    for thread in threads:
+        thread.join()
+
+    # Requests that found more than five pending ran below 640, the tail of the burst at 640
+    assert controller.stats.max_pending > 5
+    assert all(imgsz < 640 for pending, imgsz in chosen if pending > 5)
+    assert 640 in controller.stats.chosen and min(controller.stats.chosen) < 640
+    # Once the burst has drained the next request is back at full resolution
+    assert _choose_with_backlog(controller, 1) == 640
+
+
+def test_resolve_latency_target(monkeypatch):
+    monkeypatch.delenv("DETECTION_LATENCY_TARGET", raising=False)
+    assert resolve_latency_target() == DEFAULT_TARGET_SECONDS
+    monkeypatch.setenv("DETECTION_LATENCY_TARGET", "0.25")
+    assert resolve_latency_target() == 0.25
+    assert resolve_latency_target(1.0) == 1.0
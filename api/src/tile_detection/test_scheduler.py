@@ -0,0 +1,236 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.tile_detection.scheduler import DeadlineExceeded, InferenceScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _wait_until(condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def _queue_behind_holder(scheduler: InferenceScheduler, requests: list[tuple[str, str]]) -> list[str]:
+    """Queue `requests` (client, priority) one by one while the model is held; returns the order they ran in."""
+    order: list[str] = []
+    release = threading.Event()
+
+    def hold():
+        with scheduler.slot("holder"):
+            release.wait()
+
+    def request(client: str, priority: str):
+        with scheduler.slot(client, priority):
+            order.append(client)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    _wait_until(lambda: scheduler._busy)
+    threads = []
+    for client, priority in requests:
+        thread = threading.Thread(target=request, args=(client, priority))
+        expected = scheduler.waiting() + 1
+        thread.start()
+        _wait_until(lambda: scheduler.waiting() == expected)
+        threads.append(thread)
+    release.set()
+    for thread in [holder, *threads]:
+        thread.join()
+    return order
+
+
+def test_idle_model_is_granted_at_once():
+    scheduler = InferenceScheduler()
+    with scheduler.slot("a") as grant:
+        assert grant.queue_seconds == 0.0
+    assert scheduler.stats.granted["interactive"] == 1
+
+
+def test_interactive_goes_before_bulk():
+    scheduler = InferenceScheduler()
+    order = _queue_behind_holder(scheduler, [("uploader", "bulk"), ("uploader", "bulk"), ("camera", "interactive")])
+    assert order == ["camera", "uploader", "uploader"]
+
+
+def test_waiting_is_counted_per_priority():
+    scheduler = InferenceScheduler()
+    release = threading.Event()
+
+    def hold():
+        with scheduler.slot("holder"):
+            release.wait()
+
+    def request(priority: str):
+        with scheduler.slot("client", priority):
+            pass
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    _wait_until(lambda: scheduler._busy)
+    bulk = threading.Thread(target=request, args=("bulk",))
+    bulk.start()
+    _wait_until(lambda: scheduler.waiting() == 1)
+    assert (scheduler.waiting("interactive"), scheduler.waiting("bulk")) == (0, 1)
+    release.set()
+    for thread in (holder, bulk):
+        thread.join()
+    assert scheduler.waiting("bulk") == 0
+
+
+def test_clients_share_a_class_fairly():
+    scheduler = InferenceScheduler()
+    requests = [("bulk-client", "interactive")] * 4 + [("other", "interactive")]
+    order = _queue_behind_holder(scheduler, requests)
+    # The late client's one request runs second, not after the four already queued
+    assert order == ["bulk-client", "other", "bulk-client", "bulk-client", "bulk-client"]
+
+
+def test_client_weights():
+    scheduler = InferenceScheduler(client_weights={"heavy": 2.0})
+    order = _queue_behind_holder(scheduler, [("light", "interactive")] * 3 + [("heavy", "interactive")] * 4)
+    assert order[:6] == ["light", "heavy", "heavy", "light", "heavy", "heavy"]
+
+
+def test_queue_time_is_reported():
+    scheduler = InferenceScheduler()
+    grants = []
+    release = threading.Event()
+
+    def hold():
+        with scheduler.slot("a"):
+            release.wait()
+
+    def request():
+        with scheduler.slot("b") as grant:
+            grants.append(grant)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    _wait_until(lambda: scheduler._busy)
+    waiter = threading.Thread(target=request)
+    waiter.start()
+    _wait_until(lambda: scheduler.waiting() == 1)
+    time.sleep(0.05)
+    release.set()
+    holder.join()
+    waiter.join()
+    assert grants[0].queue_seconds >= 0.05
+    assert scheduler.stats.queue_seconds["interactive"] >= 0.05
+
+
+def test_past_deadline_is_rejected_immediately():
+    clock = FakeClock()
+    clock.now = 10.0
+    scheduler = InferenceScheduler(clock=clock)
+    with pytest.raises(DeadlineExceeded):
+        with scheduler.slot("a", deadline=5.0):
+            pass
+    assert scheduler.stats.dropped["interactive"] == 1
+
+
+def test_deadline_expires_while_waiting():
+    scheduler = InferenceScheduler()
+    errors = []
+
+    def request():
+        try:
+            with scheduler.slot("b", deadline=time.monotonic() + 0.05):
+                pass
+        except DeadlineExceeded as e:
+            errors.append(e)
+
+    with scheduler.slot("a"):
+        thread = threading.Thread(target=request)
+        thread.start()
+        thread.join()
+    assert len(errors) == 1
+    assert scheduler.waiting() == 0
+    assert scheduler.stats.dropped["interactive"] == 1
+    # The model is free again afterwards
+    with scheduler.slot("c") as grant:
+        assert grant.queue_seconds == 0.0
+
+
+def test_late_request_is_dropped_when_its_turn_comes():
+    clock = FakeClock()
+    scheduler = InferenceScheduler(clock=clock)
+    outcome = []
+
+    def request(client: str, deadline: float | None):
+        try:
+            with scheduler.slot(client, deadline=deadline):
+                outcome.append(client)
+        except DeadlineExceeded:
+            outcome.append(f"{client} dropped")
+
+    with scheduler.slot("holder"):
+        # A deadline far off in real time, so only the fake clock can expire it
+        late = threading.Thread(target=request, args=("late", 100.0))
+        late.start()
+        _wait_until(lambda: scheduler.waiting() == 1)
+        on_time = threading.Thread(target=request, args=("on-time", None))
+        on_time.start()
+        _wait_until(lambda: scheduler.waiting() == 2)
+        clock.now = 200.0
+    late.join()
+    on_time.join()
+    assert sorted(outcome) == ["late dropped", "on-time"]
+    assert scheduler.stats.dropped["interactive"] == 1
+
+
+def test_async_waiters_hold_no_thread():
+    scheduler = InferenceScheduler()
+    order = []
+
+    async def request(client: str, priority: str):
+        async with scheduler.aslot(client, priority):
+            order.append(client)
+            await asyncio.sleep(0)
+
+    async def main():
+        async with scheduler.aslot("holder"):
+            tasks = [asyncio.create_task(request(f"bulk{i}", "bulk")) for i in range(100)]
+            tasks.append(asyncio.create_task(request("camera", "interactive")))
+            while scheduler.waiting() < 101:
+                await asyncio.sleep(0)
+            assert threading.active_count() == threads
+        await asyncio.gather(*tasks)
+
+    threads = threading.active_count()
+    asyncio.run(main())
+    assert order[0] == "camera"
+    assert len(order) == 101
+
+
+def test_async_deadline_and_cancellation_leave_the_queue():
+    scheduler = InferenceScheduler()
+
+    async def main():
+        async with scheduler.aslot("holder"):
+            with pytest.raises(DeadlineExceeded):
+                async with scheduler.aslot("late", deadline=time.monotonic() + 0.02):
+                    pass
+            gone = asyncio.create_task(scheduler.aslot("gone").__aenter__())
+            while scheduler.waiting() < 1:
+                await asyncio.sleep(0)
+            gone.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await gone
+            assert scheduler.waiting() == 0
+        async with scheduler.aslot("next") as grant:
+            assert grant.queue_seconds == 0.0
+
+    asyncio.run(main())
+    assert scheduler.stats.dropped["interactive"] == 1
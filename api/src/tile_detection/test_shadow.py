@@ -0,0 +1,98 @@
+import random
+import threading
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from src.tile import DetectedTile
+from src.tile_detection.shadow import ShadowEvaluator
+
+IMAGE = np.zeros((100, 100, 3), dtype=np.uint8)
+LIVE = [
+    DetectedTile("1m", 0.9, (0, 0, 10, 14)),
+    DetectedTile("2m", 0.9, (10, 0, 20, 14)),
+]
+
+
+def _evaluator(sample_rate: float = 1.0) -> ShadowEvaluator:
+    return ShadowEvaluator("v2", MagicMock(), sample_rate, rng=random.Random(0))
+
+
+def test_agreeing_candidate():
+    shadow = _evaluator()
+    with patch("src.tile_detection.shadow.detect_tiles", return_value=list(LIVE)):
+        assert shadow.submit(IMAGE, LIVE, live_seconds=0.1)
+        shadow.wait()
+    shadow.close()
+
+    stats = shadow.stats
+    assert (stats.sampled, stats.completed, stats.exact) == (1, 1, 1)
+    assert stats.tiles.precision == stats.tiles.recall == 1.0
+    assert stats.live_seconds == 0.1
+    assert stats.latency_ratio is not None
+
+
+def test_disagreeing_candidate():
+    candidate = [DetectedTile("1m", 0.9, (0, 0, 10, 14)), DetectedTile("3m", 0.9, (10, 0, 20, 14))]
+    shadow = _evaluator()
+    with patch("src.tile_detection.shadow.detect_tiles", return_value=candidate):
+        shadow.submit(IMAGE, LIVE, live_seconds=0.1)
+        shadow.wait()
+    shadow.close()
+
+    stats = shadow.stats
+    assert stats.exact == 0
+    assert stats.exact_rate == 0.0
+    assert stats.tiles.precision == stats.tiles.recall == 0.5
+
+
+def test_candidate_uses_the_reclassifier():
+    reclassifier = MagicMock()
+    evaluator = ShadowEvaluator("v2", MagicMock(), 1.0, rng=random.Random(0), reclassifier=reclassifier)
+    with patch("src.tile_detection.shadow.detect_tiles", return_value=list(LIVE)) as detect:
+        evaluator.submit(IMAGE, LIVE, 0.1)
+        evaluator.wait()
+
+    assert detect.call_args.kwargs["reclassifier"] is reclassifier
+
+
+def test_sampling_rate():
+    shadow = _evaluator(sample_rate=0.0)
+    assert not shadow.submit(IMAGE, LIVE, live_seconds=0.1)
+    assert shadow.stats.sampled == 0
+    shadow.close()
+
+
+def test_busy_candidate_drops_samples():
+    release = threading.Event()
+
+    def slow_detect(*args, **kwargs):
+        release.wait()
+        return list(LIVE)
+
+    shadow = _evaluator()
+    with patch("src.tile_detection.shadow.detect_tiles", slow_detect):
+        assert shadow.submit(IMAGE, LIVE, live_seconds=0.1)
+        assert not shadow.submit(IMAGE, LIVE, live_seconds=0.1)
+        release.set()
+        shadow.wait()
+    shadow.close()
+    assert (shadow.stats.sampled, shadow.stats.dropped, shadow.stats.completed) == (2, 1, 1)
+
+
+def test_candidate_failure_is_counted():
+    shadow = _evaluator()
+    with patch("src.tile_detection.shadow.detect_tiles", side_effect=RuntimeError("boom")):
+        shadow.submit(IMAGE, LIVE, live_seconds=0.1)
+        shadow.wait()
+        # The candidate is free again after a failure
+        assert shadow.submit(IMAGE, LIVE, live_seconds=0.1)
+        shadow.wait()
+    shadow.close()
+    assert shadow.stats.failed == 2
+
+
+def test_invalid_sample_rate():
+    with pytest.raises(ValueError):
+        ShadowEvaluator("v2", MagicMock(), 1.5)
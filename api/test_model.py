@@ -1,13 +1,10 @@
 import pathlib
 import sys
 
-from src.tile_detection.detection import detect_tiles
-
-# Patch WindowsPath for models trained on Windows
-pathlib.WindowsPath = pathlib.PosixPath
-
 import cv2
-from ultralytics import YOLO
+
+from src.tile_detection.batch import annotate_image
+from src.tile_detection.detection import detect_tiles, load_model
 
 HONOR_TILES = {
     "1z": "East Wind",
@@ -52,30 +49,15 @@ def main():
         print(f"Error: Model not found at {model_path}")
         sys.exit(1)
 
-    model = YOLO(model_path)
+    model = load_model(model_path)
     image = cv2.imread(str(image_path))
     results = detect_tiles(model, image)
 
-
     print("Detected tiles:")
     for result in results:
-        box = result.bbox
-        confidence = result.confidence
-        x1, y1, x2, y2 = box
-        tile_name = result.code
-
-        print(f"  {tile_name}: {confidence:.2%}")
-
-        cv2.rectangle(image, (x1, y1), (x2, y2), (0, 255, 0), 2)
-
-        label = f"{tile_name} {confidence:.0%}"
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        font_scale = 0.5
-        thickness = 1
-        (text_w, text_h), baseline = cv2.getTextSize(label, font, font_scale, thickness)
+        print(f"  {result.code}: {result.confidence:.2%}")
 
-        cv2.rectangle(image, (x1, y1 - text_h - 6), (x1 + text_w, y1), (0, 255, 0), -1)
-        cv2.putText(image, label, (x1, y1 - 4), font, font_scale, (0, 0, 0), thickness)
+    image = annotate_image(image, results)
 
     output_path = image_path.stem + "_output" + image_path.suffix
     cv2.imwrite(output_path, image)
@@ -0,0 +1,66 @@
+import argparse
+import os
+import pathlib
+import sys
+
+from src.thread_config import (
+    best_measurement,
+    candidate_configs,
+    measure,
+    resolve_thread_config_path,
+    save_thread_config,
+)
+
+API_ROOT = pathlib.Path(__file__).parent
+DEFAULT_IMAGES = API_ROOT.parent / "test-images"
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp"}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark detection across worker, torch and OpenCV thread counts and save the fastest."
+    )
+    parser.add_argument("--images", type=pathlib.Path, default=DEFAULT_IMAGES, help="Directory of test photos")
+    parser.add_argument("--model", type=pathlib.Path, help="Model weights (default: MODEL_PATH or best.pt)")
+    parser.add_argument("--cpus", type=int, default=os.cpu_count() or 1, help="Cores to tune for")
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=1,
+        help="Most server workers to try. Game sessions live in process memory, so only raise this "
+        "when clients don't rely on sessions or a sticky proxy sits in front",
+    )
+    parser.add_argument("--passes", type=int, default=3, help="Passes over the images per worker")
+    parser.add_argument("-o", "--output", type=pathlib.Path, help="Config file (default: THREAD_CONFIG_PATH)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    image_paths = sorted(p for p in args.images.glob("*") if p.suffix.lower() in IMAGE_SUFFIXES)
+    if not image_paths:
+        print(f"Error: No images found in {args.images}")
+        sys.exit(1)
+
+    configs = candidate_configs(args.cpus, args.max_workers)
+    print(f"Tuning {len(configs)} configurations on {len(image_paths)} images, {args.cpus} cores")
+    print(f"{'workers':>7} {'torch':>5} {'opencv':>6} {'images/s':>9} {'median':>8}")
+    measurements = []
+    for config in configs:
+        measurement = measure(config, args.model, image_paths, args.passes)
+        measurements.append(measurement)
+        print(
+            f"{config.workers:7} {config.torch_threads:5} {config.opencv_threads:6} "
+            f"{measurement.images_per_second:9.2f} {measurement.median_seconds * 1000:6.0f}ms"
+        )
+
+    best = best_measurement(measurements)
+    output = resolve_thread_config_path(args.output)
+    save_thread_config(output, best)
+    print(f"\nBest: {best.config} at {best.images_per_second:.2f} images/s")
+    print(f"Saved to {output}; the server applies it on its next start")
+
+
+if __name__ == "__main__":
+    main()
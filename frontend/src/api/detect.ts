@@ -1,4 +1,8 @@
-import type { TileDetectionResponse } from "../types/api.ts";
+import type {
+  CorrectedTile,
+  CorrectionResponse,
+  TileDetectionResponse,
+} from "../types/api.ts";
 
 export async function detectTiles(imageBlob: Blob): Promise<TileDetectionResponse> {
   const formData = new FormData();
@@ -16,3 +20,21 @@ export async function detectTiles(imageBlob: Blob): Promise<TileDetectionRespons
 
   return response.json() as Promise<TileDetectionResponse>;
 }
+
+export async function submitCorrection(
+  detectionId: string,
+  tiles: CorrectedTile[],
+): Promise<CorrectionResponse> {
+  const response = await fetch(`/api/detections/${detectionId}/corrections`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ tiles }),
+  });
+
+  if (!response.ok) {
+    const errorText = await response.text();
+    throw new Error(`Correction failed: ${response.status} - ${errorText}`);
+  }
+
+  return response.json() as Promise<CorrectionResponse>;
+}
@@ -1,6 +1,11 @@
 export type TileCode = string;
 export type HandSlot = TileCode | null;
 
+export interface TileAlternative {
+  code: string;
+  confidence: number;
+}
+
 export interface DetectedTile {
   code: string;
   confidence: number;
@@ -11,11 +16,34 @@ export interface DetectedTile {
   is_rotated: boolean;
   suit: string | null;
   number: number | null;
+  alternatives?: TileAlternative[];
+}
+
+export interface TileLayout {
+  angle: number;
+  rows: number[][][];
 }
 
 export interface TileDetectionResponse {
   tiles: DetectedTile[];
   count: number;
+  layout?: TileLayout | null;
+  detection_id?: string | null;
+  image_hash?: string | null;
+  imgsz?: number | null;
+  model_version?: string | null;
+  queue_seconds?: number | null;
+  inference_seconds?: number | null;
+}
+
+export interface CorrectedTile {
+  code: string;
+  bbox: [number, number, number, number];
+}
+
+export interface CorrectionResponse {
+  correction_id: string;
+  detection_id: string;
 }
 
 export type MeldType = "chi" | "pon";
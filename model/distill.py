@@ -0,0 +1,243 @@
+import argparse
+import os
+import shutil
+import time
+from pathlib import Path
+
+import yaml
+from ultralytics import YOLO
+from ultralytics.data.utils import check_det_dataset, img2label_paths
+
+from train import PROJECT_ROOT, train_model
+
+TEACHER_PATH = PROJECT_ROOT.parent / "api" / "best.pt"
+STUDENT_WEIGHTS = "yolov8n.pt"
+DISTILL_NAME = "distill"
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp", ".bmp"}
+
+
+def _list_images(source: str | list[str]) -> list[Path]:
+    sources = source if isinstance(source, list) else [source]
+    images: list[Path] = []
+    for entry in sources:
+        path = Path(entry)
+        if path.is_dir():
+            images.extend(p for p in sorted(path.rglob("*")) if p.suffix.lower() in IMAGE_SUFFIXES)
+        elif path.suffix == ".txt":
+            images.extend(Path(line.strip()) for line in path.read_text().splitlines() if line.strip())
+        else:
+            images.append(path)
+    return images
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    dst.unlink(missing_ok=True)
+    try:
+        os.symlink(src.resolve(), dst)
+    except OSError:  # symlinks need extra privileges on Windows
+        shutil.copy2(src, dst)
+
+
+def _unique_stem(stem: str, used: set[str]) -> str:
+    """`stem`, or `stem_2`, `stem_3`... if another image already took it."""
+    candidate, n = stem, 1
+    while candidate in used:
+        n += 1
+        candidate = f"{stem}_{n}"
+    used.add(candidate)
+    return candidate
+
+
+def build_distillation_dataset(
+    teacher: YOLO,
+    data: Path,
+    output_dir: Path,
+    conf: float = 0.5,
+    unlabeled: list[Path] | None = None,
+    teacher_labels_all: bool = False,
+) -> Path:
+    """Build the student's training split from the teacher's predictions.
+
+    With `teacher_labels_all` the student trains on the teacher's confident
+    boxes for every training image, hand-labeled or not, which is
+    distillation with the teacher's outputs as hard targets. Otherwise
+    hand-labeled images keep their ground truth and only training images
+    without a label file, and any `unlabeled` images or directories, get
+    teacher labels. Validation stays on ground truth either way.
+
+    `output_dir` is rebuilt from scratch, so earlier runs leave nothing
+    behind. Returns the data.yaml describing the new dataset.
+    """
+    dataset = check_det_dataset(str(data))
+    shutil.rmtree(output_dir, ignore_errors=True)
+    images_dir = output_dir / "train" / "images"
+    labels_dir = output_dir / "train" / "labels"
+    images_dir.mkdir(parents=True)
+    labels_dir.mkdir(parents=True)
+
+    # Images from different source directories may share a name
+    used: set[str] = set()
+    images = _list_images(dataset["train"])
+    kept = 0
+    to_label: list[tuple[Path, str]] = []
+    for image_path, label_path in zip(images, img2label_paths([str(p) for p in images])):
+        stem = _unique_stem(image_path.stem, used)
+        if Path(label_path).exists() and not teacher_labels_all:
+            _link_or_copy(image_path, images_dir / f"{stem}{image_path.suffix}")
+            _link_or_copy(Path(label_path), labels_dir / f"{stem}.txt")
+            kept += 1
+        else:
+            to_label.append((image_path, stem))
+    from_split = len(to_label)
+    for source in unlabeled or []:
+        to_label.extend((path, _unique_stem(path.stem, used)) for path in _list_images(str(source)))
+
+    boxes = 0
+    if to_label:
+        paths = [str(image_path) for image_path, _ in to_label]
+        for (image_path, stem), result in zip(
+            to_label, teacher.predict(paths, conf=conf, stream=True, verbose=False)
+        ):
+            rows = [[cls_id, *box] for cls_id, box in zip(result.boxes.cls.tolist(), result.boxes.xywhn.tolist())]
+            boxes += len(rows)
+            _link_or_copy(image_path, images_dir / f"{stem}{image_path.suffix}")
+            (labels_dir / f"{stem}.txt").write_text(
+                "".join(f"{int(r[0])} {r[1]:.6f} {r[2]:.6f} {r[3]:.6f} {r[4]:.6f}\n" for r in rows)
+            )
+
+    print(
+        f"Kept ground truth for {kept} images; teacher labeled {from_split} training images "
+        f"and {len(to_label) - from_split} extra unlabeled images ({boxes} boxes)"
+    )
+    if not to_label:
+        print("Every image kept its ground truth, so this trains the student without distillation")
+
+    data_yaml = output_dir / "data.yaml"
+    data_yaml.write_text(
+        yaml.safe_dump(
+            {
+                "train": str(images_dir.resolve()),
+                "val": dataset["val"],
+                "nc": dataset["nc"],
+                "names": [dataset["names"][i] for i in sorted(dataset["names"])],
+            }
+        )
+    )
+    return data_yaml
+
+
+def cpu_latency_ms(model: YOLO, images: list[Path], imgsz: int = 640, warmup: int = 3) -> float:
+    """Mean single-image CPU inference latency in milliseconds."""
+    for image in images[:warmup]:
+        model.predict(str(image), imgsz=imgsz, device="cpu", verbose=False)
+
+    start = time.perf_counter()
+    for image in images:
+        model.predict(str(image), imgsz=imgsz, device="cpu", verbose=False)
+    return (time.perf_counter() - start) / len(images) * 1000
+
+
+def compare_models(teacher_path: Path, student_path: Path, data: Path, latency_images: int = 50) -> dict:
+    """Compare mAP on the validation split and CPU latency of teacher and student."""
+    dataset = check_det_dataset(str(data))
+    sample = _list_images(dataset["val"])[:latency_images]
+    report = {}
+
+    for label, path in (("teacher", teacher_path), ("student", student_path)):
+        model = YOLO(path)
+        metrics = model.val(data=str(data), device="cpu", verbose=False, plots=False)
+        report[label] = {
+            "mAP50": float(metrics.box.map50),
+            "mAP50-95": float(metrics.box.map),
+            "cpu_ms": cpu_latency_ms(model, sample) if sample else float("nan"),
+            "size_mb": path.stat().st_size / 1e6,
+        }
+
+    print(f"{'':<8} {'mAP50':>7} {'mAP50-95':>9} {'CPU ms':>8} {'MB':>6}")
+    for label, row in report.items():
+        print(f"{label:<8} {row['mAP50']:>7.3f} {row['mAP50-95']:>9.3f} {row['cpu_ms']:>8.1f} {row['size_mb']:>6.1f}")
+    return report
+
+
+def distill_model(
+    teacher_path: Path = TEACHER_PATH,
+    student_weights: str = STUDENT_WEIGHTS,
+    epochs: int = 50,
+    imgsz: int = 640,
+    batch: int = 16,
+    workers: int = 8,
+    device: str | None = None,
+    pseudo_conf: float = 0.5,
+    unlabeled: list[Path] | None = None,
+    teacher_labels_all: bool = False,
+) -> Path:
+    """Distill the teacher into a nano-sized student and compare the two.
+
+    The student's best.pt can be served by pointing the API's MODEL_PATH at it.
+    """
+    data = PROJECT_ROOT / "data/data.yaml"
+    teacher = YOLO(teacher_path)
+
+    distill_data = build_distillation_dataset(
+        teacher,
+        data,
+        PROJECT_ROOT / "data" / DISTILL_NAME,
+        conf=pseudo_conf,
+        unlabeled=unlabeled,
+        teacher_labels_all=teacher_labels_all,
+    )
+    run_dir = train_model(
+        epochs=epochs,
+        imgsz=imgsz,
+        batch=batch,
+        workers=workers,
+        device=device,
+        weights=student_weights,
+        name=DISTILL_NAME,
+        data=distill_data,
+    )
+
+    student_path = run_dir / "weights" / "best.pt"
+    compare_models(teacher_path, student_path, data)
+    return student_path
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Distill best.pt into a smaller student model.")
+    parser.add_argument("--teacher", type=Path, default=TEACHER_PATH)
+    parser.add_argument("--student", default=STUDENT_WEIGHTS, help="Student starting weights")
+    parser.add_argument("--epochs", type=int, default=50)
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--batch", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--device")
+    parser.add_argument("--pseudo-conf", type=float, default=0.5, help="Teacher confidence for pseudo-labels")
+    parser.add_argument(
+        "--unlabeled", type=Path, nargs="+", help="Extra unlabeled images or directories for the teacher to label"
+    )
+    parser.add_argument(
+        "--teacher-labels-all",
+        action="store_true",
+        help="Train on the teacher's boxes for hand-labeled images too, instead of their ground truth",
+    )
+    parser.add_argument("--compare-only", type=Path, metavar="STUDENT_PT", help="Skip training, only compare")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.compare_only:
+        compare_models(args.teacher, args.compare_only, PROJECT_ROOT / "data/data.yaml")
+    else:
+        distill_model(
+            teacher_path=args.teacher,
+            student_weights=args.student,
+            epochs=args.epochs,
+            imgsz=args.imgsz,
+            batch=args.batch,
+            workers=args.workers,
+            device=args.device,
+            pseudo_conf=args.pseudo_conf,
+            unlabeled=args.unlabeled,
+            teacher_labels_all=args.teacher_labels_all,
+        )
@@ -1,5 +1,39 @@
+import argparse
+from pathlib import Path
+
 from train import train_model
 
-if __name__ == "__main__":
-    train_model()
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Train the tile detection model.")
+    parser.add_argument("--epochs", type=int, default=20)
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--batch", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=8, help="Dataloader workers")
+    parser.add_argument("--device", help="cpu, mps or a CUDA index (auto-detected by default)")
+    parser.add_argument(
+        "--cache",
+        choices=["ram", "disk", "none"],
+        default="ram",
+        help="Cache decoded images in RAM (resized) or as full-resolution .npy files on disk",
+    )
+    parser.add_argument("--resume", type=Path, metavar="RUN_DIR", help="Resume a run, e.g. runs/train2")
+    parser.add_argument("--weights", default="yolov8s.pt", help="Starting weights")
+    parser.add_argument("--data", type=Path, help="Dataset data.yaml (defaults to data/data.yaml)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    run_dir = train_model(
+        epochs=args.epochs,
+        imgsz=args.imgsz,
+        batch=args.batch,
+        workers=args.workers,
+        device=args.device,
+        cache=False if args.cache == "none" else args.cache,
+        resume=args.resume,
+        weights=args.weights,
+        data=args.data,
+    )
+    print("Run saved to:", run_dir)
@@ -2,28 +2,78 @@ from ultralytics import YOLO
 from pathlib import Path
 import torch
 
+PROJECT_ROOT = Path(__file__).resolve().parent
+RUN_NAME = "train"
+
+
+def select_device() -> str:
+    """Pick the best available training device: CUDA GPU, Apple MPS, or CPU."""
+    if torch.cuda.is_available():
+        return "0"
+    if torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
+
 def print_torch_version():
     print(torch.__version__)
     print("CUDA available:", torch.cuda.is_available())
-    print("GPU:", torch.cuda.get_device_name(0))
+    if torch.cuda.is_available():
+        print("GPU:", torch.cuda.get_device_name(0))
+    else:
+        print("CPU threads:", torch.get_num_threads())
+
+
+def last_checkpoint(run_dir: Path) -> Path:
+    return run_dir / "weights" / "last.pt"
 
-def train_model():
 
-    project_root = Path(__file__).resolve().parent
+def train_model(
+    epochs: int = 20,
+    imgsz: int = 640,
+    batch: int = 16,
+    workers: int = 8,
+    device: str | None = None,
+    cache: str | bool = "ram",
+    resume: Path | None = None,
+    weights: str = "yolov8s.pt",
+    name: str = RUN_NAME,
+    data: Path | None = None,
+) -> Path:
+    """Train the tile detector and return its run directory.
+
+    cache="ram" keeps the decoded, resized images in memory for all epochs;
+    cache="disk" writes each decoded image once as a full-resolution .npy
+    array next to it, so later runs skip JPEG decoding but still resize.
+    Each run gets a new directory (runs/train, runs/train2, ...); pass one
+    as `resume` to continue from its last.pt with its original settings.
+    """
+    project_root = PROJECT_ROOT
 
     print_torch_version()
 
-    model = YOLO("yolov8s.pt")
+    if resume:
+        checkpoint = last_checkpoint(resume)
+        if not checkpoint.exists():
+            raise FileNotFoundError(f"No checkpoint to resume from at {checkpoint}")
+        model = YOLO(checkpoint)
+        model.train(resume=True)
+        return Path(model.trainer.save_dir)
+
+    device = device or select_device()
+    print("Device:", device)
+
+    model = YOLO(weights)
 
     model.train(
-        data=project_root / "data/data.yaml",
-        epochs=20,
-        imgsz=640,
-        batch=16,
-        device=0,
+        data=data or project_root / "data/data.yaml",
+        epochs=epochs,
+        imgsz=imgsz,
+        batch=batch,
+        workers=workers,
+        device=device,
+        cache=cache,
         project=project_root / "runs",
-        name="train"
+        name=name,
     )
-
-
-
+    return Path(model.trainer.save_dir)